@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark del almacén SQLite: inserción por lotes y filtros en SQL.
+
+Uso:
+
+    python -m benchmarks.almacen --n 200000 --n-individual 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.carga_lote import crear_muebles
+from src.services.almacen import AlmacenSQLite
+from src.services.tienda import TiendaMuebles
+
+
+def _medir(etiqueta: str, funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    print(f"{etiqueta:<34} {time.perf_counter() - inicio:8.3f} s")
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=200_000, help="muebles del lote")
+    parser.add_argument(
+        "--n-individual",
+        type=int,
+        default=5_000,
+        help="muebles para el alta uno a uno (0 para omitirla)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        if args.n_individual:
+            muebles = crear_muebles(args.n_individual)
+            with AlmacenSQLite(os.path.join(directorio, "individual.db")) as almacen:
+                tienda = TiendaMuebles("Individual", almacen)
+                segundos = time.perf_counter()
+                for mueble in muebles:
+                    tienda.agregar_mueble(mueble)
+                segundos = time.perf_counter() - segundos
+            print(
+                f"agregar_mueble ({len(muebles):,}):".ljust(34)
+                + f" {segundos:8.3f} s ({segundos / len(muebles) * 1e6:.1f} µs/mueble)"
+            )
+
+        ruta = os.path.join(directorio, "lote.db")
+        muebles = crear_muebles(args.n)
+        with AlmacenSQLite(ruta) as almacen:
+            tienda = TiendaMuebles("Lote", almacen)
+            _medir(
+                f"agregar_muebles_lote ({args.n:,}):",
+                tienda.agregar_muebles_lote,
+                muebles,
+            )
+        del muebles, tienda
+
+        with AlmacenSQLite(ruta) as almacen:
+            tienda = _medir(
+                "abrir tienda (resumen en SQL):", TiendaMuebles, "R", almacen
+            )
+            madera = _medir(
+                "filtrar_por_material en SQL:", tienda.filtrar_por_material, "madera"
+            )
+            rango = _medir(
+                "filtrar_por_precio en SQL:", tienda.filtrar_por_precio, 100, 150
+            )
+            _medir("cargar inventario completo:", lambda: len(list(tienda.inventario)))
+            print(f"coincidencias: material={len(madera):,} precio={len(rango):,}")
+
+
+if __name__ == "__main__":
+    main()
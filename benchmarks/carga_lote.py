@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carga del inventario: alta mueble a mueble frente a lote.
+
+Uso:
+
+    python -m benchmarks.carga_lote --n 1000000 --n-individual 100000
+"""
+
+import argparse
+import time
+from typing import List
+
+from benchmarks.catalogo_cadenas import FABRICAS, generar_filas
+from src.services.tienda import TiendaMuebles
+
+
+def crear_muebles(cantidad: int) -> List[object]:
+    """Muebles sintéticos a partir de filas CSV reproducibles."""
+    muebles = []
+    for fila in generar_filas(cantidad):
+        tipo, nombre, material, color, tapizado = fila.split(",")
+        muebles.append(FABRICAS[tipo](nombre, material, color, tapizado))
+    return muebles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=1_000_000, help="muebles del lote")
+    parser.add_argument(
+        "--n-individual",
+        type=int,
+        default=100_000,
+        help="muebles para el alta uno a uno (0 para omitirla)",
+    )
+    args = parser.parse_args()
+
+    if args.n_individual:
+        muebles = crear_muebles(args.n_individual)
+        tienda = TiendaMuebles("Individual")
+        inicio = time.perf_counter()
+        for mueble in muebles:
+            tienda.agregar_mueble(mueble)
+        segundos = time.perf_counter() - inicio
+        print(
+            f"agregar_mueble:       {len(muebles):>9,} muebles en {segundos:6.2f} s "
+            f"({segundos / len(muebles) * 1e6:.1f} µs/mueble)"
+        )
+
+    muebles = crear_muebles(args.n)
+    tienda = TiendaMuebles("Lote")
+    inicio = time.perf_counter()
+    resumen = tienda.agregar_muebles_lote(muebles)
+    segundos = time.perf_counter() - inicio
+    print(
+        f"agregar_muebles_lote: {resumen['agregados']:>9,} muebles en {segundos:6.2f} s "
+        f"({segundos / len(muebles) * 1e6:.1f} µs/mueble)"
+    )
+
+
+if __name__ == "__main__":
+    main()
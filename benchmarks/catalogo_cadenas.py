@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria de un catálogo sintético grande.
+
+Simula una importación: cada fila llega como texto y se parte con
+``split``, de modo que material, color y tapizado son cadenas nuevas en
+cada mueble aunque sus valores se repitan. Uso:
+
+    python -m benchmarks.catalogo_cadenas --n 1000000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.escritorio import Escritorio
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sillon import Sillon
+from src.models.concretos.sofa import Sofa
+
+MATERIALES = ["Madera", "Roble", "Pino", "Metal", "Tela", "Cuero", "Vidrio"]
+COLORES = ["Negro", "Blanco", "Café", "Gris", "Beige", "Natural", "Rojo"]
+TAPIZADOS = ["tela", "cuero", ""]
+
+FABRICAS: Dict[str, Callable[[str, str, str, str], object]] = {
+    "Silla": lambda n, m, c, t: Silla(n, m, c, 150.0, material_tapizado=t or None),
+    "Mesa": lambda n, m, c, t: Mesa(n, m, c, 500.0),
+    "Sofa": lambda n, m, c, t: Sofa(n, m, c, 1200.0, material_tapizado=t or None),
+    "Armario": lambda n, m, c, t: Armario(n, m, c, 600),
+    "Escritorio": lambda n, m, c, t: Escritorio(n, m, c, 500),
+    "Sillon": lambda n, m, c, t: Sillon(n, m, c, 800, material_tapizado=t or None),
+}
+
+
+def generar_filas(cantidad: int, semilla: int = 42) -> List[str]:
+    """Filas CSV ``tipo,nombre,material,color,tapizado`` reproducibles."""
+    azar = random.Random(semilla)
+    tipos = list(FABRICAS)
+    return [
+        ",".join(
+            (
+                azar.choice(tipos),
+                f"Mueble {i}",
+                azar.choice(MATERIALES),
+                azar.choice(COLORES),
+                azar.choice(TAPIZADOS),
+            )
+        )
+        for i in range(cantidad)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=1_000_000, help="muebles a crear")
+    args = parser.parse_args()
+
+    filas = generar_filas(args.n)
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    catalogo = []
+    for fila in filas:
+        tipo, nombre, material, color, tapizado = fila.split(",")
+        catalogo.append(FABRICAS[tipo](nombre, material, color, tapizado))
+    del filas
+    segundos = time.perf_counter() - inicio
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    distintos = len(
+        {id(m.material) for m in catalogo} | {id(m.color) for m in catalogo}
+    )
+    print(f"Muebles:              {len(catalogo):,}")
+    print(f"Memoria retenida:     {actual / 2**20:,.1f} MiB")
+    print(f"Bytes por mueble:     {actual / len(catalogo):,.1f}")
+    print(f"Objetos material+color distintos: {distintos:,}")
+    print(f"Tiempo de carga:      {segundos:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
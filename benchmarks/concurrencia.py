@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark de cajas concurrentes: ventas por segundo según la cantidad de hilos.
+
+Cada venta espera a que su cambio esté en disco (WAL síncrono), que es el
+camino dominado por E/S; con más hilos el WAL junta más cambios por
+``fsync``.
+
+Uso:
+
+    python -m benchmarks.concurrencia --n 4000 --hilos 1 2 4 8
+"""
+
+import argparse
+import builtins
+import tempfile
+import threading
+import time
+
+from benchmarks.carga_lote import crear_muebles
+from src.services.recuperacion import RegistroCambios
+from src.services.tienda import TiendaMuebles
+
+
+def _medir(muebles: list, hilos: int, ventana: float) -> float:
+    """Vende todos los muebles repartidos entre ``hilos`` cajas; devuelve segundos."""
+    with tempfile.TemporaryDirectory() as directorio:
+        with RegistroCambios(
+            directorio, cada=0, ventana=ventana, sincrono=True
+        ) as cambios:
+            tienda = TiendaMuebles("Bench", cambios=cambios)
+            tienda.agregar_muebles_lote(muebles)
+            largada = threading.Barrier(hilos + 1)
+
+            def caja(numero: int) -> None:
+                largada.wait()
+                for mueble in muebles[numero::hilos]:
+                    tienda.vender_producto(mueble.nombre)
+
+            cajas = [threading.Thread(target=caja, args=(n,)) for n in range(hilos)]
+            for hilo in cajas:
+                hilo.start()
+            largada.wait()
+            inicio = time.perf_counter()
+            for hilo in cajas:
+                hilo.join()
+            segundos = time.perf_counter() - inicio
+            assert len(tienda.inventario) == 0
+            return segundos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=4000, help="muebles a vender")
+    parser.add_argument("--hilos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument(
+        "--ventana", type=float, default=0.0, help="ventana del WAL (segundos)"
+    )
+    args = parser.parse_args()
+
+    # nombres únicos: cada venta quita exactamente el mueble de su caja
+    muebles = crear_muebles(args.n)
+    for numero, mueble in enumerate(muebles):
+        mueble.nombre = f"{mueble.nombre} #{numero}"
+
+    imprimir, builtins.print = builtins.print, lambda *a, **k: None
+    try:
+        resultados = [(h, _medir(muebles, h, args.ventana)) for h in args.hilos]
+    finally:
+        builtins.print = imprimir
+    base = args.n / resultados[0][1]
+    for hilos, segundos in resultados:
+        ventas = args.n / segundos
+        print(
+            f"{hilos:2d} hilos: {segundos:7.3f} s  {ventas:9,.0f} ventas/s  "
+            f"x{ventas / base:4.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark del diario de ventas: latencia de venta y fsync por grupo.
+
+"con diario" confirma cada venta tras su fsync; "asíncrono" devuelve la
+venta sin esperar al disco.
+
+Uso:
+
+    python -m benchmarks.diario --ventas 20000 --ventana 0.002
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from src.models.concretos.silla import Silla
+from src.services.diario import DiarioVentas
+from src.services.tienda import TiendaMuebles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ventas", type=int, default=20_000, help="ventas a registrar")
+    parser.add_argument(
+        "--ventana", type=float, default=0.002, help="ventana de durabilidad (s)"
+    )
+    args = parser.parse_args()
+
+    silla = Silla("Silla Bench", "Madera", "Café", 100.0)
+    with tempfile.TemporaryDirectory() as directorio:
+        for etiqueta, diario in (
+            ("sin diario", None),
+            (
+                "con diario",
+                DiarioVentas(os.path.join(directorio, "v.log"), args.ventana),
+            ),
+            (
+                "asíncrono",
+                DiarioVentas(
+                    os.path.join(directorio, "a.log"), args.ventana, sincrono=False
+                ),
+            ),
+        ):
+            tienda = TiendaMuebles("Bench", diario=diario)
+            latencias = []
+            inicio = time.perf_counter()
+            for _ in range(args.ventas):
+                antes = time.perf_counter()
+                tienda.realizar_venta(silla, "cliente")
+                latencias.append(time.perf_counter() - antes)
+            if diario is not None:
+                diario.esperar()
+            total = time.perf_counter() - inicio
+            latencias.sort()
+            print(
+                f"{etiqueta}: {args.ventas:,} ventas en {total:.2f} s | "
+                f"mediana {statistics.median(latencias) * 1e6:.1f} µs, "
+                f"p99 {latencias[int(len(latencias) * 0.99)] * 1e6:.1f} µs"
+            )
+            if diario is not None:
+                print(f"  fsync: {diario.estadisticas()['grupos']:,} grupos")
+                diario.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la instantánea binaria: guardar, adjuntar y primera consulta.
+
+Uso:
+
+    python -m benchmarks.instantanea --n 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.carga_lote import crear_muebles
+from src.services.instantanea import cargar_instantanea, guardar_instantanea
+from src.services.tienda import TiendaMuebles
+
+
+def _medir(etiqueta: str, funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    print(f"{etiqueta:<34}{time.perf_counter() - inicio:8.3f} s")
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=1_000_000, help="muebles")
+    args = parser.parse_args()
+
+    tienda = TiendaMuebles("Benchmark")
+    tienda.agregar_muebles_lote(crear_muebles(args.n))
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "catalogo.bin")
+        resumen = _medir(
+            "guardar_instantanea", lambda: guardar_instantanea(tienda, ruta)
+        )
+        print(f"  {resumen['muebles']:,} muebles, {resumen['bytes'] / 2**20:,.1f} MiB")
+
+        nueva = TiendaMuebles()
+        instantanea = _medir(
+            "cargar_instantanea", lambda: cargar_instantanea(nueva, ruta)
+        )
+        _medir("obtener_estadisticas", nueva.obtener_estadisticas)
+        _medir("primera consulta (indexa)", lambda: nueva.filtrar_por_precio(100, 200))
+        _medir("segunda consulta", lambda: nueva.buscar_muebles_por_nombre("mueble 42"))
+        print(f"  muebles materializados: {instantanea.materializados:,}")
+
+
+if __name__ == "__main__":
+    main()
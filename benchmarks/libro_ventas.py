@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark del libro de ventas: registro, memoria y consultas agregadas.
+
+Uso:
+
+    python -m benchmarks.libro_ventas --ventas 2000000 --clientes 50000
+"""
+
+import argparse
+import random
+import time
+
+from src.services.libro_ventas import LibroVentas
+
+_TIPOS = ["Silla", "Mesa", "Sofa", "Sillon", "Cama", "Armario", "Cajonera"]
+
+
+def _medir(etiqueta: str, funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    print(f"{etiqueta:<34} {time.perf_counter() - inicio:8.3f} s")
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--ventas", type=int, default=2_000_000, help="ventas a registrar"
+    )
+    parser.add_argument(
+        "--clientes", type=int, default=50_000, help="clientes distintos"
+    )
+    args = parser.parse_args()
+
+    azar = random.Random(0)
+    inicio = time.time() - 30 * 86400
+    libro = LibroVentas()
+
+    def registrar() -> None:
+        for i in range(args.ventas):
+            precio = round(azar.uniform(50, 1500), 2)
+            libro.registrar(
+                {
+                    "mueble": f"Mueble {i % 1000}",
+                    "precio_original": precio,
+                    "descuento": 0,
+                    "precio_final": precio,
+                    "cliente": f"cliente{azar.randrange(args.clientes)}",
+                },
+                _TIPOS[i % len(_TIPOS)],
+                inicio + i * (30 * 86400 / args.ventas),
+            )
+
+    _medir(f"registrar ({args.ventas:,}):", registrar)
+    print(f"{'memoria de columnas:':<34} {libro.memoria() / 1e6:8.1f} MB")
+    _medir("ingresos_por_tipo:", libro.ingresos_por_tipo)
+    _medir("ingresos_por_cliente:", libro.ingresos_por_cliente)
+    _medir("ingresos_por_ventana (hora):", libro.ingresos_por_ventana, "hora")
+    _medir("ingresos_por_ventana (dia):", libro.ingresos_por_ventana, "dia")
+    _medir(
+        "ingresos_por_tipo (última semana):",
+        lambda: libro.ingresos_por_tipo(desde=inicio + 23 * 86400),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria: bytes por instancia de cada clase concreta de mueble.
+
+Crea N instancias de cada tipo y mide con ``tracemalloc`` la memoria que
+quedó reservada. Uso:
+
+    python -m benchmarks.memoria_muebles --n 20000
+"""
+
+import argparse
+import tracemalloc
+from typing import Callable, Dict
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.cajonera import Cajonera
+from src.models.concretos.cama import Cama
+from src.models.concretos.escritorio import Escritorio
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sillon import Sillon
+from src.models.concretos.sofa import Sofa
+from src.models.concretos.sofacama import SofaCama
+
+# Los textos y números se crean fuera de la medición y se comparten, para
+# contar solo el coste del objeto en sí.
+FABRICAS: Dict[str, Callable[[], object]] = {
+    "Silla": lambda: Silla("Silla", "Madera", "Café", 150.0, material_tapizado="tela"),
+    "Mesa": lambda: Mesa("Mesa", "Roble", "Natural", 500.0, capacidad_personas=6),
+    "Sofa": lambda: Sofa("Sofa", "Tela", "Gris", 1200.0, material_tapizado="tela"),
+    "Cama": lambda: Cama("Cama", "Pino", "Blanco", 400.0, "queen", True, True),
+    "SofaCama": lambda: SofaCama("SofaCama", "Tela", "Beige", 1500.0),
+    "Armario": lambda: Armario("Armario", "Pino", "Blanco", 600, 4, 2, True),
+    "Cajonera": lambda: Cajonera("Cajonera", "Metal", "Gris", 180, 3, True),
+    "Escritorio": lambda: Escritorio("Escritorio", "Madera", "Negro", 500),
+    "Sillon": lambda: Sillon(
+        "Sillon", "Cuero", "Marrón", 800, material_tapizado="cuero"
+    ),
+}
+
+
+def medir(fabrica: Callable[[], object], cantidad: int) -> float:
+    """Bytes promedio que ocupa cada instancia creada por ``fabrica``."""
+    fabrica()  # calentar cachés internas del intérprete
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    instancias = [fabrica() for _ in range(cantidad)]
+    fin, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # descontar la lista que guarda las instancias
+    return (fin - inicio) / cantidad - 8 if instancias else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=20000, help="instancias por tipo")
+    args = parser.parse_args()
+
+    print(f"{'Tipo':<12}{'bytes/instancia':>18}")
+    total = 0.0
+    for nombre, fabrica in FABRICAS.items():
+        bytes_por_item = medir(fabrica, args.n)
+        total += bytes_por_item
+        print(f"{nombre:<12}{bytes_por_item:>18.1f}")
+    print(f"{'Promedio':<12}{total / len(FABRICAS):>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
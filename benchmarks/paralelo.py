@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark de valoración y reporte en varios procesos: aceleración por núcleos.
+
+Mide ``valorar_inventario`` (recalcula el precio de cada mueble) y
+``generar_reporte_inventario`` con distinta cantidad de procesos sobre el
+mismo catálogo sintético, y comprueba que el resultado no cambia.
+
+Uso:
+
+    python -m benchmarks.paralelo --n 1000000 --procesos 1 2 4 8
+"""
+
+import argparse
+import builtins
+import time
+
+from benchmarks.carga_lote import crear_muebles
+from src.services.paralelo import TAMAÑO_BLOQUE
+from src.services.tienda import TiendaMuebles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=1_000_000, help="muebles")
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--bloque", type=int, default=TAMAÑO_BLOQUE)
+    args = parser.parse_args()
+
+    imprimir, builtins.print = builtins.print, lambda *a, **k: None
+    try:
+        tienda = TiendaMuebles("Bench")
+        tienda.agregar_muebles_lote(crear_muebles(args.n))
+    finally:
+        builtins.print = imprimir
+
+    for nombre, medir in (
+        ("valoración", lambda p: tienda.valorar_inventario(p, args.bloque)),
+        ("reporte", lambda p: tienda.generar_reporte_inventario(p)),
+    ):
+        base = referencia = None
+        for procesos in args.procesos:
+            inicio = time.perf_counter()
+            resultado = medir(procesos)
+            segundos = time.perf_counter() - inicio
+            if referencia is None:
+                base, referencia = segundos, resultado
+            assert resultado == referencia, f"{nombre} con {procesos} procesos"
+            print(
+                f"{nombre:<11} {procesos:2d} procesos: {segundos:7.3f} s  "
+                f"{args.n / segundos:11,.0f} muebles/s  x{base / segundos:4.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
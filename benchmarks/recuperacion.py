@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark de recuperación: instantánea más cola del WAL tras una caída.
+
+Uso:
+
+    python -m benchmarks.recuperacion --n 1000000 --ventas 100000
+"""
+
+import argparse
+import builtins
+import tempfile
+import time
+
+from benchmarks.carga_lote import crear_muebles
+from src.services.recuperacion import RegistroCambios
+from src.services.tienda import TiendaMuebles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=1_000_000, help="muebles")
+    parser.add_argument(
+        "--ventas",
+        type=int,
+        default=100_000,
+        help="ventas anotadas tras la instantánea",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        muebles = crear_muebles(args.n)
+        # se mide la recuperación, no la durabilidad: el WAL no espera el fsync
+        with RegistroCambios(directorio, cada=0, sincrono=False) as cambios:
+            tienda = TiendaMuebles("Bench", cambios=cambios)
+            tienda.agregar_muebles_lote(muebles)
+            inicio = time.perf_counter()
+            cambios.tomar_instantanea()
+            print(
+                f"instantánea ({args.n:,} muebles):   {time.perf_counter() - inicio:7.3f} s"
+            )
+
+            # un día de ventas: la mitad vende un mueble, la otra mitad solo cobra
+            nombres = [m.nombre for m in muebles[: args.ventas // 2]]
+            imprimir, builtins.print = builtins.print, lambda *a, **k: None
+            try:
+                inicio = time.perf_counter()
+                for nombre in nombres:
+                    tienda.vender_producto(nombre)
+                for mueble in muebles[: args.ventas - len(nombres)]:
+                    tienda.realizar_venta(mueble)
+                segundos = time.perf_counter() - inicio
+            finally:
+                builtins.print = imprimir
+            print(f"ventas anotadas ({args.ventas:,}):       {segundos:7.3f} s")
+            esperado = tienda.obtener_estadisticas()
+        del tienda, muebles
+
+        inicio = time.perf_counter()
+        with RegistroCambios(directorio, cada=0) as cambios:
+            recuperada = TiendaMuebles("Bench", cambios=cambios)
+            estadisticas = recuperada.obtener_estadisticas()
+            print(
+                f"recuperación (sin indexar):      {time.perf_counter() - inicio:7.3f} s"
+            )
+            assert estadisticas == esperado
+            inicio = time.perf_counter()
+            recuperada.filtrar_por_precio(100, 150)
+            print(
+                f"primera consulta (indexa):       {time.perf_counter() - inicio:7.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark de reservas: costo por operación según las reservas pendientes.
+
+Reserva ``n`` muebles distintos (de ``2n`` en la tienda) con vencimientos al
+azar y mide reservar, consultar (un filtro, que antes revisa la agenda),
+cancelar y vencer una décima parte. Con el montículo el costo por
+operación crece como log n.
+
+Uso:
+
+    python -m benchmarks.reservas --n 1000 10000 100000
+"""
+
+import argparse
+import builtins
+import random
+import time
+
+from benchmarks.carga_lote import crear_muebles
+from src.services.tienda import TiendaMuebles
+
+
+def _medir(n: int) -> str:
+    azar = random.Random(n)
+    muebles = crear_muebles(2 * n)
+    for numero, mueble in enumerate(muebles):
+        mueble.nombre = f"{mueble.nombre} #{numero}"
+    tienda = TiendaMuebles("Bench")
+    tienda.agregar_muebles_lote(muebles)
+    ahora = time.time()
+
+    inicio = time.perf_counter()
+    numeros = [
+        tienda.reservar(m, azar.uniform(60, 3600), ahora=ahora)["reserva"]
+        for m in muebles[::2]
+    ]
+    reservar = (time.perf_counter() - inicio) / n
+
+    inicio = time.perf_counter()
+    for _ in range(1000):
+        tienda.obtener_mas_baratos(5)
+    consultar = (time.perf_counter() - inicio) / 1000
+
+    inicio = time.perf_counter()
+    for numero in numeros[: n // 10]:
+        tienda.cancelar_reserva(numero)
+    cancelar = (time.perf_counter() - inicio) / (n // 10)
+
+    # el 10% que vence primero
+    limite = sorted(r["vence"] for r in tienda.reservas())[n // 10]
+    inicio = time.perf_counter()
+    vencidas = tienda.vencer_reservas(limite)
+    vencer = (time.perf_counter() - inicio) / max(vencidas, 1)
+
+    return (
+        f"{n:>9,} reservas: reservar {reservar * 1e6:6.1f} µs  "
+        f"consultar {consultar * 1e6:6.1f} µs  cancelar {cancelar * 1e6:5.1f} µs  "
+        f"vencer {vencer * 1e6:5.1f} µs/reserva"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    for n in args.n:
+        imprimir, builtins.print = builtins.print, lambda *a, **k: None
+        try:
+            linea = _medir(n)
+        finally:
+            builtins.print = imprimir
+        print(linea)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga del servidor HTTP/JSON: latencia p50/p99 por ruta.
+
+Abre varias conexiones persistentes y en cada una envía tandas de
+peticiones con pipelining. Sin ``--puerto`` levanta un servidor local en
+otro proceso con un catálogo sintético.
+
+Uso:
+
+    python -m benchmarks.servidor_http --muebles 100000 --peticiones 20000
+    python -m benchmarks.servidor_http --puerto 8080
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.carga_lote import crear_muebles
+from src.services.catalogo import mueble_a_registro
+
+_MATERIALES = ["Madera", "Roble", "Pino", "Metal", "Tela", "Cuero", "Vidrio"]
+
+
+def _mezcla(azar: random.Random, muebles: int) -> Tuple[str, str, bytes]:
+    """Una petición al azar: (ruta para el informe, método y destino, cuerpo)."""
+    sorteo = azar.random()
+    if sorteo < 0.35:
+        material = azar.choice(_MATERIALES)
+        return "/muebles", f"GET /muebles?material={material}&limite=20", b""
+    if sorteo < 0.65:
+        return "/buscar", f"GET /buscar?q=mueble+{azar.randrange(100)}&limite=20", b""
+    if sorteo < 0.85:
+        return "/estadisticas", "GET /estadisticas", b""
+    if sorteo < 0.99:
+        cuerpo = json.dumps({"nombre": f"Mueble {azar.randrange(muebles)}"})
+        return "/ventas", "POST /ventas", cuerpo.encode()
+    return "/valoracion", "GET /valoracion", b""
+
+
+async def _leer_respuesta(lector: asyncio.StreamReader) -> int:
+    estado = int((await lector.readline()).split()[1])
+    largo = 0
+    while (linea := await lector.readline()) != b"\r\n":
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        if nombre.lower() == "content-length":
+            largo = int(valor)
+    await lector.readexactly(largo)
+    return estado
+
+
+async def _conexion(
+    anfitrion: str,
+    puerto: int,
+    tandas: int,
+    profundidad: int,
+    semilla: int,
+    muebles: int,
+    latencias: Dict[str, List[float]],
+    errores: List[int],
+) -> None:
+    azar = random.Random(semilla)
+    lector, escritor = await asyncio.open_connection(anfitrion, puerto)
+    try:
+        for _ in range(tandas):
+            tanda = [_mezcla(azar, muebles) for _ in range(profundidad)]
+            datos = b"".join(
+                f"{linea} HTTP/1.1\r\nHost: {anfitrion}\r\n"
+                f"Content-Length: {len(cuerpo)}\r\n\r\n".encode()
+                + cuerpo
+                for _, linea, cuerpo in tanda
+            )
+            enviado = time.perf_counter()
+            escritor.write(datos)
+            await escritor.drain()
+            for ruta, _, _ in tanda:
+                estado = await _leer_respuesta(lector)
+                latencias.setdefault(ruta, []).append(time.perf_counter() - enviado)
+                if estado != 200:
+                    errores.append(estado)
+    finally:
+        escritor.close()
+
+
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def _informe(latencias: Dict[str, List[float]]) -> None:
+    todas = [v for valores in latencias.values() for v in valores]
+    print(f"{'ruta':<14} {'peticiones':>10} {'p50 ms':>9} {'p99 ms':>9} {'máx ms':>9}")
+    for ruta, valores in sorted(latencias.items()) + [("total", todas)]:
+        print(
+            f"{ruta:<14} {len(valores):>10,} {_percentil(valores, 50) * 1000:9.2f} "
+            f"{_percentil(valores, 99) * 1000:9.2f} {max(valores) * 1000:9.2f}"
+        )
+
+
+def _levantar_servidor(muebles: int, directorio: str) -> Tuple[subprocess.Popen, int]:
+    """Servidor local en otro proceso con un catálogo sintético (JSON Lines)."""
+    ruta = os.path.join(directorio, "catalogo.jsonl")
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        for mueble in crear_muebles(muebles):
+            archivo.write(json.dumps(mueble_a_registro(mueble)) + "\n")
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "src.services.servidor", "--catalogo", ruta]
+        + ["--puerto", "0"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    # "Escuchando en http://127.0.0.1:<puerto>"
+    return proceso, int(proceso.stdout.readline().rsplit(":", 1)[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--anfitrion", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, help="servidor ya en marcha")
+    parser.add_argument("--muebles", type=int, default=100_000, help="catálogo local")
+    parser.add_argument("--peticiones", type=int, default=20_000)
+    parser.add_argument("--conexiones", type=int, default=16)
+    parser.add_argument("--profundidad", type=int, default=4, help="pipelining")
+    args = parser.parse_args()
+
+    tandas = max(1, args.peticiones // (args.conexiones * args.profundidad))
+    latencias: Dict[str, List[float]] = {}
+    errores: List[int] = []
+
+    async def correr(puerto: int) -> float:
+        inicio = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _conexion(
+                    args.anfitrion,
+                    puerto,
+                    tandas,
+                    args.profundidad,
+                    numero,
+                    args.muebles,
+                    latencias,
+                    errores,
+                )
+                for numero in range(args.conexiones)
+            )
+        )
+        return time.perf_counter() - inicio
+
+    with tempfile.TemporaryDirectory() as directorio:
+        proceso = None
+        puerto = args.puerto
+        if puerto is None:
+            proceso, puerto = _levantar_servidor(args.muebles, directorio)
+        try:
+            segundos = asyncio.run(correr(puerto))
+        finally:
+            if proceso is not None:
+                proceso.terminate()
+                proceso.wait()
+
+    total = sum(len(v) for v in latencias.values())
+    print(
+        f"{total:,} peticiones en {segundos:.2f} s ({total / segundos:,.0f}/s), "
+        f"{args.conexiones} conexiones x {args.profundidad} en vuelo, "
+        f"{len(errores)} respuestas no 200"
+    )
+    _informe(latencias)
+
+
+if __name__ == "__main__":
+    main()
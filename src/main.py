@@ -4,6 +4,15 @@ Punto de entrada principal para la aplicación Tienda de Muebles.
 Este archivo inicializa la aplicación y proporciona datos de ejemplo.
 """
 
+import os
+
+from services.almacen import AlmacenSQLite
+from services.catalogo import importar_catalogo
+from services.descuentos import ReglaDescuento
+from services.diario import DiarioVentas
+from services.instantanea import cargar_instantanea, guardar_instantanea
+from services.libro_ventas import LibroVentas
+from services.recuperacion import RegistroCambios
 from services.tienda import TiendaMuebles
 from ui.menu import MenuTienda
 
@@ -207,13 +216,32 @@ def crear_catalogo_inicial(tienda: "TiendaMuebles") -> None:
         + [sofacama]
     )
 
-    for mueble in todos_los_muebles:
-        resultado = tienda.agregar_mueble(mueble)
-        print(f"  ✓ {resultado}")
+    resumen = tienda.agregar_muebles_lote(todos_los_muebles)
+    print(f"  ✓ {resumen['agregados']} muebles agregados")
+    for posicion, error in resumen["errores"]:
+        print(f"  ✗ {todos_los_muebles[posicion]}: {error}")
 
     print("✅ Catálogo inicial creado con éxito!")
 
 
+def cargar_catalogo_archivo(tienda: "TiendaMuebles", ruta: str) -> None:
+    """
+    Carga el catálogo desde un archivo CSV o JSON Lines en lugar del de ejemplo.
+
+    Args:
+        tienda: Instancia de TiendaMuebles donde agregar los muebles
+        ruta: Archivo de catálogo
+    """
+    print(f"📂 Importando catálogo desde {ruta}...")
+    resumen = importar_catalogo(tienda, ruta)
+    print(f"  ✓ {resumen['agregados']} de {resumen['leidos']} muebles agregados")
+    if resumen["rechazados"]:
+        print(
+            f"  ✗ {resumen['rechazados']} filas rechazadas "
+            f"(ver {resumen['archivo_rechazos']})"
+        )
+
+
 def crear_comedores_ejemplo(tienda: "TiendaMuebles") -> None:
     """
     Crea comedores de ejemplo para demostrar la composición.
@@ -300,6 +328,16 @@ def aplicar_descuentos_ejemplo(tienda: "TiendaMuebles") -> None:
         resultado = tienda.aplicar_descuento(categoria, porcentaje)
         print(f"  ✓ {resultado}")
 
+    # 5% extra por comedor completo (4 sillas o más), con tope combinado
+    regla = ReglaDescuento("set completo", "comedor", 5, minimo_sillas=4)
+    print(f"  ✓ {tienda.agregar_regla_descuento(regla)}")
+    # lo mismo al cobrar mesa y sillas sueltas en un mismo carrito
+    regla = ReglaDescuento(
+        "comedor en carrito", None, 5, requiere={"mesa": 1, "silla": 4}
+    )
+    print(f"  ✓ {tienda.agregar_regla_descuento(regla)}")
+    print(f"  ✓ {tienda.fijar_tope_descuento(40)}")
+
     print("✅ Descuentos aplicados!")
 
 
@@ -340,18 +378,53 @@ def main():
     - Herencia múltiple con el sofá-cama
     - Encapsulación y abstracción en toda la jerarquía
     """
+    # INSTANTANEA_MUEBLES=ruta.bin: si el archivo existe se arranca desde él
+    # y al salir se vuelve a guardar con el estado de la sesión
+    ruta_instantanea = os.environ.get("INSTANTANEA_MUEBLES")
+    # BASE_MUEBLES=ruta.db: inventario, ventas y descuentos persisten en SQLite
+    ruta_base = os.environ.get("BASE_MUEBLES")
+    # DIARIO_VENTAS=ruta.log: cada venta se anexa a un diario durable
+    ruta_diario = os.environ.get("DIARIO_VENTAS")
+    # RECUPERACION_MUEBLES=carpeta: instantánea + WAL de cambios; tras una
+    # caída se arranca desde la última instantánea más la cola del WAL
+    ruta_recuperacion = os.environ.get("RECUPERACION_MUEBLES")
+    tienda = None
+    almacen = None
+    diario = None
+    cambios = None
     try:
         print("🏠 Bienvenido a la Tienda de Muebles - Taller OOP 🏠")
         print("=" * 50)
 
-        tienda = TiendaMuebles("Mueblería Moderna OOP")
+        if ruta_base:
+            almacen = AlmacenSQLite(ruta_base)
+        if ruta_diario:
+            diario = DiarioVentas(ruta_diario)
+        if ruta_recuperacion:
+            cambios = RegistroCambios(ruta_recuperacion)
+        tienda = TiendaMuebles(
+            "Mueblería Moderna OOP", almacen, diario, cambios, LibroVentas()
+        )
         print(f"🏪 Inicializando {tienda.nombre}...")
 
-        crear_catalogo_inicial(tienda)
-
-        crear_comedores_ejemplo(tienda)
-
-        aplicar_descuentos_ejemplo(tienda)
+        if almacen is not None and len(tienda.inventario):
+            print(f"🗄️ Inventario recuperado de {ruta_base}")
+        elif cambios is not None and len(tienda.inventario):
+            print(f"♻️ Tienda recuperada de {ruta_recuperacion}")
+        elif ruta_instantanea and os.path.exists(ruta_instantanea):
+            print(f"⚡ Cargando instantánea {ruta_instantanea}...")
+            cargar_instantanea(tienda, ruta_instantanea)
+        else:
+            # CATALOGO_MUEBLES=ruta.csv|ruta.jsonl carga un catálogo externo
+            ruta_catalogo = os.environ.get("CATALOGO_MUEBLES")
+            if ruta_catalogo:
+                cargar_catalogo_archivo(tienda, ruta_catalogo)
+            else:
+                crear_catalogo_inicial(tienda)
+
+            crear_comedores_ejemplo(tienda)
+
+            aplicar_descuentos_ejemplo(tienda)
 
         mostrar_estadisticas_iniciales(tienda)
 
@@ -370,6 +443,22 @@ def main():
 
         traceback.print_exc()
     finally:
+        if ruta_instantanea and tienda is not None:
+            try:
+                resumen = guardar_instantanea(tienda, ruta_instantanea)
+                print(f"💾 Instantánea guardada: {resumen['muebles']} muebles")
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar la instantánea: {e}")
+        if diario is not None:
+            diario.cerrar()
+        if cambios is not None and tienda is not None:
+            try:
+                cambios.tomar_instantanea()
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar la instantánea de recuperación: {e}")
+            cambios.cerrar()
+        if almacen is not None:
+            almacen.cerrar()
         print("\n" + "=" * 50)
         print("✨ Programa finalizado. ¡Gracias por usar la Tienda de Muebles! ✨")
 
@@ -0,0 +1,50 @@
+"""
+Pool compartido de cadenas repetidas (patrón flyweight).
+
+Materiales, colores y tapizados se repiten en casi todo el catálogo. Los
+constructores y setters de los muebles pasan esos valores por ``internar``
+para que valores iguales compartan un único objeto en memoria; como
+consecuencia, comparar dos de ellos se resuelve por identidad.
+"""
+
+import sys
+from typing import Dict, Optional
+
+# Valor canónico de cada cadena vista
+_POOL: Dict[str, str] = {}
+
+
+def internar(valor: Optional[str]) -> Optional[str]:
+    """
+    Devuelve la instancia compartida de ``valor``.
+
+    Los valores que no son ``str`` (por ejemplo ``None``) se devuelven sin
+    cambios.
+
+    Args:
+        valor: Cadena a compartir
+
+    Returns:
+        Optional[str]: Objeto canónico igual a ``valor``
+    """
+    if type(valor) is not str:
+        return valor
+    return _POOL.setdefault(valor, valor)
+
+
+def estadisticas_pool() -> Dict[str, int]:
+    """
+    Tamaño actual del pool de cadenas.
+
+    Returns:
+        dict: {"cadenas": int, "bytes": int}
+    """
+    return {
+        "cadenas": len(_POOL),
+        "bytes": sum(sys.getsizeof(cadena) for cadena in _POOL),
+    }
+
+
+def limpiar_pool() -> None:
+    """Vacía el pool; los muebles existentes conservan sus cadenas."""
+    _POOL.clear()
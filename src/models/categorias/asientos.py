@@ -4,6 +4,7 @@ Esta clase agrupa las características comunes de sillas, sillones y sofás.
 """
 
 from abc import ABC, abstractmethod
+from src.models.cadenas import internar
 from src.models.mueble import Mueble
 
 
@@ -20,6 +21,8 @@ class Asiento(Mueble, ABC):
     - Polimorfismo: Permite diferentes implementaciones del cálculo de comodidad
     """
 
+    __slots__ = ("_capacidad_personas", "_tiene_respaldo", "_material_tapizado")
+
     def __init__(
         self,
         nombre: str,
@@ -43,7 +46,7 @@ class Asiento(Mueble, ABC):
 
         self._capacidad_personas = capacidad_personas
         self._tiene_respaldo = tiene_respaldo
-        self._material_tapizado = material_tapizado
+        self._material_tapizado = internar(material_tapizado)
 
     @property
     def capacidad_personas(self) -> int:
@@ -56,6 +59,7 @@ class Asiento(Mueble, ABC):
         if value <= 0:
             raise ValueError("La capacidad debe ser mayor a 0")
         self._capacidad_personas = value
+        self._invalidar_precio()
 
     @property
     def tiene_respaldo(self) -> bool:
@@ -66,6 +70,7 @@ class Asiento(Mueble, ABC):
     def tiene_respaldo(self, value: bool) -> None:
         """Setter para respaldo."""
         self._tiene_respaldo = value
+        self._invalidar_precio()
 
     @property
     def material_tapizado(self) -> str:
@@ -75,7 +80,8 @@ class Asiento(Mueble, ABC):
     @material_tapizado.setter
     def material_tapizado(self, value: str) -> None:
         """Setter para material de tapizado."""
-        self._material_tapizado = value
+        self._material_tapizado = internar(value)
+        self._invalidar_precio()
 
     def calcular_factor_comodidad(self) -> float:
         """
@@ -104,6 +104,19 @@ class Comedor:
             precio_total += silla.calcular_precio()
         return round(precio_total, 2)
 
+    def calcular_precio(self) -> float:
+        """
+        Precio del comedor como unidad de venta.
+
+        Permite venderlo con ``TiendaMuebles.realizar_venta``, que aplica el
+        descuento por set completo si hay una regla para comedores. En el
+        inventario se surte por piezas (``TiendaMuebles.agregar_comedor``).
+
+        Returns:
+            float: Precio total del comedor
+        """
+        return self.calcular_precio_total()
+
     def obtener_descripcion_completa(self) -> str:
         """
         Obtiene una descripción completa del comedor y todos sus componentes.
@@ -4,6 +4,7 @@ Representa un armario genérico.
 """
 
 # from ..mueble import Mueble
+from ..cadenas import internar
 
 
 class Armario:
@@ -11,6 +12,16 @@ class Armario:
     Clase concreta que representa un armario.
     """
 
+    __slots__ = (
+        "nombre",
+        "material",
+        "color",
+        "precio_base",
+        "num_puertas",
+        "num_cajones",
+        "tiene_espejos",
+    )
+
     def __init__(
         self,
         nombre: str,
@@ -22,8 +33,8 @@ class Armario:
         tiene_espejos: bool = False,
     ):
         self.nombre = nombre
-        self.material = material
-        self.color = color
+        self.material = internar(material)
+        self.color = internar(color)
         self.precio_base = int(precio_base) if precio_base is not None else 0
         self.num_puertas = num_puertas
         self.num_cajones = num_cajones
@@ -4,6 +4,7 @@ Representa una cajonera genérica.
 """
 
 # from ..mueble import Mueble
+from ..cadenas import internar
 
 
 class Cajonera:
@@ -11,6 +12,15 @@ class Cajonera:
     Clase concreta que representa una cajonera.
     """
 
+    __slots__ = (
+        "nombre",
+        "material",
+        "color",
+        "precio_base",
+        "num_cajones",
+        "tiene_ruedas",
+    )
+
     def __init__(
         self,
         nombre: str,
@@ -21,8 +31,8 @@ class Cajonera:
         tiene_ruedas: bool = False,
     ):
         self.nombre = nombre
-        self.material = material
-        self.color = color
+        self.material = internar(material)
+        self.color = internar(color)
         self.precio_base = int(precio_base) if precio_base is not None else 0
         self.num_cajones = num_cajones
         self.tiene_ruedas = tiene_ruedas
@@ -3,7 +3,7 @@ Clase concreta Cama.
 Representa una cama genérica.
 """
 
-from ..mueble import Mueble
+from ..mueble import Mueble, precio_en_cache
 
 
 class Cama(Mueble):
@@ -11,6 +11,11 @@ class Cama(Mueble):
     Clase concreta que representa una cama.
     """
 
+    # Sofa y Cama no pueden aportar slots propios a la vez (SofaCama hereda
+    # de ambas), así que los atributos de Cama viven en un ``__dict__`` que
+    # SofaCama nunca llega a crear porque los redeclara como slots.
+    __slots__ = ("__dict__",)
+
     def __init__(
         self,
         nombre: str,
@@ -38,6 +43,7 @@ class Cama(Mueble):
         if value not in tamaños_validos:
             raise ValueError(f"Tamaño debe ser uno de: {tamaños_validos}")
         self._tamaño = value
+        self._invalidar_precio()
 
     @property
     def incluye_colchon(self) -> bool:
@@ -49,6 +55,7 @@ class Cama(Mueble):
         """Getter para cabecera."""
         return self._tiene_cabecera
 
+    @precio_en_cache
     def calcular_precio(self) -> float:
         """Calcula el precio final de la cama."""
         precio = self.precio_base
@@ -4,6 +4,7 @@ Representa un escritorio genérico.
 """
 
 # from ..mueble import Mueble
+from ..cadenas import internar
 
 
 class Escritorio:
@@ -11,6 +12,18 @@ class Escritorio:
     Clase concreta que representa un escritorio.
     """
 
+    __slots__ = (
+        "nombre",
+        "material",
+        "color",
+        "precio_base",
+        "forma",
+        "tiene_cajones",
+        "num_cajones",
+        "largo",
+        "tiene_iluminacion",
+    )
+
     def __init__(
         self,
         nombre: str,
@@ -24,8 +37,8 @@ class Escritorio:
         tiene_iluminacion: bool = False,
     ):
         self.nombre = nombre
-        self.material = material
-        self.color = color
+        self.material = internar(material)
+        self.color = internar(color)
         self.precio_base = int(precio_base) if precio_base is not None else 0
         self.forma = forma
         self.tiene_cajones = tiene_cajones
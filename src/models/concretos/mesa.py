@@ -4,6 +4,7 @@ Representa una mesa genérica.
 """
 
 from ..categorias.superficies import Superficie
+from ..mueble import precio_en_cache
 
 
 class Mesa(Superficie):
@@ -11,6 +12,8 @@ class Mesa(Superficie):
     Clase concreta que representa una mesa.
     """
 
+    __slots__ = ("_forma", "_capacidad_personas")
+
     def __init__(
         self,
         nombre: str,
@@ -39,6 +42,7 @@ class Mesa(Superficie):
         if value not in formas_validas:
             raise ValueError(f"Forma debe ser una de: {formas_validas}")
         self._forma = value
+        self._invalidar_precio()
 
     @property
     def capacidad_personas(self) -> int:
@@ -51,7 +55,9 @@ class Mesa(Superficie):
         if value <= 0:
             raise ValueError("La capacidad debe ser mayor a 0")
         self._capacidad_personas = value
+        self._invalidar_precio()
 
+    @precio_en_cache
     def calcular_precio(self) -> float:
         """Calcula el precio final de la mesa."""
         precio = self.precio_base
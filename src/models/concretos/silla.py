@@ -4,6 +4,7 @@ Implementa un mueble de asiento específico para una persona.
 """
 
 from ..categorias.asientos import Asiento
+from ..mueble import precio_en_cache
 
 
 class Silla(Asiento):
@@ -13,6 +14,13 @@ class Silla(Asiento):
     oficina (altura regulable, ruedas).
     """
 
+    __slots__ = (
+        "_numero_patas",
+        "_tipo_madera",
+        "_altura_regulable",
+        "_tiene_ruedas",
+    )
+
     def __init__(
         self,
         nombre: str,
@@ -42,6 +50,7 @@ class Silla(Asiento):
     @altura_regulable.setter
     def altura_regulable(self, value: bool) -> None:
         self._altura_regulable = value
+        self._invalidar_precio()
 
     @property
     def tiene_ruedas(self) -> bool:
@@ -50,6 +59,7 @@ class Silla(Asiento):
     @tiene_ruedas.setter
     def tiene_ruedas(self, value: bool) -> None:
         self._tiene_ruedas = value
+        self._invalidar_precio()
 
     @property
     def numero_patas(self) -> int:
@@ -59,6 +69,7 @@ class Silla(Asiento):
     def tipo_madera(self) -> str:
         return self._tipo_madera
 
+    @precio_en_cache
     def calcular_precio(self) -> float:
         """Calcula el precio final de la silla aplicando factores de comodidad y extras."""
         precio = self.precio_base
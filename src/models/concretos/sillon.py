@@ -4,6 +4,7 @@ Implementa un mueble de asiento para más de una persona, con brazos y respaldo.
 """
 
 # from ..categorias.asientos import Asiento
+from ..cadenas import internar
 
 
 class Sillon:
@@ -12,6 +13,19 @@ class Sillon:
     Hereda de Asiento y añade características específicas.
     """
 
+    __slots__ = (
+        "nombre",
+        "material",
+        "color",
+        "precio_base",
+        "capacidad_personas",
+        "tiene_respaldo",
+        "material_tapizado",
+        "tiene_brazos",
+        "es_reclinable",
+        "tiene_reposapiés",
+    )
+
     def __init__(
         self,
         nombre: str,
@@ -26,12 +40,12 @@ class Sillon:
         tiene_reposapiés: bool = False,
     ):
         self.nombre = nombre
-        self.material = material
-        self.color = color
+        self.material = internar(material)
+        self.color = internar(color)
         self.precio_base = int(precio_base) if precio_base is not None else 0
         self.capacidad_personas = capacidad_personas
         self.tiene_respaldo = tiene_respaldo
-        self.material_tapizado = material_tapizado
+        self.material_tapizado = internar(material_tapizado)
         self.tiene_brazos = tiene_brazos
         self.es_reclinable = es_reclinable
         self.tiene_reposapiés = tiene_reposapiés
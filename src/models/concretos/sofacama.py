@@ -4,6 +4,7 @@ Esta clase hereda tanto de Sofa como de Cama.
 
 from .sofa import Sofa
 from .cama import Cama
+from ..mueble import precio_en_cache
 
 
 class SofaCama(Sofa, Cama):
@@ -13,6 +14,16 @@ class SofaCama(Sofa, Cama):
     y normaliza entradas (precio, capacidad, tamaño).
     """
 
+    # Atributos de la parte Cama; al ser slots el ``__dict__`` heredado de
+    # Cama queda sin crear.
+    __slots__ = (
+        "_tamaño",
+        "_incluye_colchon",
+        "_tiene_cabecera",
+        "_mecanismo_conversion",
+        "_modo_actual",
+    )
+
     def __init__(
         self,
         nombre: str,
@@ -66,6 +77,7 @@ class SofaCama(Sofa, Cama):
         self._mecanismo_conversion = mecanismo_conversion
         self._modo_actual = "sofa"
 
+    @precio_en_cache
     def calcular_precio(self) -> float:
         """Calcula el precio combinando sofá y complementos de cama."""
         precio = super().calcular_precio()
@@ -119,12 +131,14 @@ class SofaCama(Sofa, Cama):
         if self._modo_actual == "cama":
             return "El sofá-cama ya está en modo cama"
         self._modo_actual = "cama"
+        self._invalidar_precio()
         return f"Sofá convertido a cama usando mecanismo {self.mecanismo_conversion}"
 
     def convertir_a_sofa(self) -> str:
         if self._modo_actual == "sofa":
             return "El sofá-cama ya está en modo sofá"
         self._modo_actual = "sofa"
+        self._invalidar_precio()
         return f"Cama convertida a sofá usando mecanismo {self.mecanismo_conversion}"
 
     def obtener_descripcion(self) -> str:
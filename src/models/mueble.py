@@ -4,6 +4,45 @@ Este es el punto de partida de nuestra jerarquía de clases.
 """
 
 from abc import ABC, abstractmethod
+from functools import wraps
+from typing import Callable, Dict
+
+from .cadenas import internar
+
+# Contadores globales de la caché de precios (aciertos y fallos)
+_ESTADISTICAS_CACHE_PRECIO: Dict[str, int] = {"aciertos": 0, "fallos": 0}
+
+
+def precio_en_cache(calcular: Callable[["Mueble"], float]) -> Callable:
+    """
+    Decorador que memoriza el resultado de ``calcular_precio`` por instancia.
+
+    El valor se guarda en ``_precio_cache`` y se descarta cada vez que un
+    setter de la jerarquía llama a ``_invalidar_precio``. Cuando una
+    subclase invoca la versión del padre mediante ``super()`` el cálculo se
+    hace sin caché, para no guardar un precio parcial.
+
+    Args:
+        calcular: Implementación de ``calcular_precio`` a envolver
+
+    Returns:
+        Callable: Método con caché
+    """
+
+    @wraps(calcular)
+    def envoltura(self: "Mueble") -> float:
+        if type(self).calcular_precio is not envoltura:
+            return calcular(self)
+        precio = self._precio_cache
+        if precio is not None:
+            _ESTADISTICAS_CACHE_PRECIO["aciertos"] += 1
+            return precio
+        _ESTADISTICAS_CACHE_PRECIO["fallos"] += 1
+        precio = calcular(self)
+        self._precio_cache = precio
+        return precio
+
+    return envoltura
 
 
 class Mueble(ABC):
@@ -16,8 +55,19 @@ class Mueble(ABC):
     Conceptos OOP aplicados:
     - Abstracción: Define una interfaz común sin implementación específica
     - Encapsulación: Usa atributos privados con getters/setters
+
+    Las clases concretas pueden decorar ``calcular_precio`` con
+    ``precio_en_cache``; todo setter de la jerarquía invalida esa caché.
+
+    Toda la jerarquía declara ``__slots__``: cada subclase lista solo los
+    atributos que añade, de modo que las instancias no llevan ``__dict__``.
+    La excepción es ``Cama``, que declara ``("__dict__",)`` porque no puede
+    aportar slots propios junto a ``Sofa`` en ``SofaCama``; ``SofaCama``
+    redeclara esos atributos como slots y no llega a crear el ``__dict__``.
     """
 
+    __slots__ = ("_nombre", "_material", "_color", "_precio_base", "_precio_cache")
+
     def __init__(self, nombre: str, material: str, color: str, precio_base: float):
         """
         Constructor de la clase Mueble.
@@ -29,9 +79,30 @@ class Mueble(ABC):
             precio_base: Precio base antes de aplicar modificadores
         """
         self._nombre = nombre
-        self._material = material
-        self._color = color
+        self._material = internar(material)
+        self._color = internar(color)
         self._precio_base = precio_base
+        self._precio_cache = None
+
+    def _invalidar_precio(self) -> None:
+        """Descarta el precio memorizado; lo llaman los setters al cambiar un atributo."""
+        self._precio_cache = None
+
+    @staticmethod
+    def estadisticas_cache_precio() -> Dict[str, int]:
+        """
+        Aciertos y fallos acumulados de la caché de ``calcular_precio``.
+
+        Returns:
+            dict: {"aciertos": int, "fallos": int}
+        """
+        return dict(_ESTADISTICAS_CACHE_PRECIO)
+
+    @staticmethod
+    def reiniciar_estadisticas_cache_precio() -> None:
+        """Pone a cero los contadores de la caché de precios."""
+        _ESTADISTICAS_CACHE_PRECIO["aciertos"] = 0
+        _ESTADISTICAS_CACHE_PRECIO["fallos"] = 0
 
     @property
     def nombre(self) -> str:
@@ -44,6 +115,7 @@ class Mueble(ABC):
         if not value or not value.strip():
             raise ValueError("El nombre no puede estar vacío")
         self._nombre = value.strip()
+        self._invalidar_precio()
 
     @property
     def material(self) -> str:
@@ -55,7 +127,8 @@ class Mueble(ABC):
         """Setter para el material con validación."""
         if not value or not value.strip():
             raise ValueError("El material no puede estar vacío")
-        self._material = value.strip()
+        self._material = internar(value.strip())
+        self._invalidar_precio()
 
     @property
     def color(self) -> str:
@@ -67,7 +140,8 @@ class Mueble(ABC):
         """Setter para el color con validación."""
         if not value or not value.strip():
             raise ValueError("El color no puede estar vacío")
-        self._color = value.strip()
+        self._color = internar(value.strip())
+        self._invalidar_precio()
 
     @property
     def precio_base(self) -> float:
@@ -80,6 +154,7 @@ class Mueble(ABC):
         if value < 0:
             raise ValueError("El precio base no puede ser negativo")
         self._precio_base = value
+        self._invalidar_precio()
 
     @abstractmethod
     def calcular_precio(self) -> float:
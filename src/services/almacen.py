@@ -0,0 +1,470 @@
+"""
+Almacén persistente de la tienda sobre SQLite.
+
+``AlmacenSQLite`` guarda el inventario y el estado de ``TiendaMuebles`` en un
+archivo SQLite en modo WAL, de modo que sobreviven al cierre del programa.
+Hay una tabla por categoría (asientos, superficies, almacenamiento) con una
+columna por parámetro del constructor de sus tipos, más el precio final ya
+calculado y el material normalizado, indexados para que los filtros del
+menú (material, rango de precio, tipo) se resuelvan en SQL.
+
+Las escrituras usan una única conexión protegida por un candado; las
+lecturas toman una conexión de un pool pequeño, así que varios hilos pueden
+consultar a la vez (WAL admite lectores concurrentes con un escritor). Cada
+sentencia SQL se arma una sola vez por tabla y ``sqlite3`` la reutiliza
+desde su caché de sentencias preparadas.
+
+Los contadores de ventas viven en su propia fila (tabla ``ventas``) y cada
+venta les suma su cantidad y sus centavos con un ``UPDATE``: vender no
+vuelve a escribir el estado completo, que solo se guarda cuando cambian
+los descuentos, las reglas o el tope.
+"""
+
+import heapq
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.services.catalogo import TIPOS_MUEBLE, campos_de, registro_simple
+
+# Tipos de mueble que guarda cada tabla
+CATEGORIAS: Dict[str, Tuple[str, ...]] = {
+    "asientos": ("Silla", "Sofa", "SofaCama", "Sillon"),
+    "superficies": ("Mesa", "Escritorio", "Cama"),
+    "almacenamiento": ("Armario", "Cajonera"),
+}
+
+_TABLA_DE_TIPO: Dict[str, str] = {
+    tipo: tabla for tabla, tipos in CATEGORIAS.items() for tipo in tipos
+}
+
+_TIPOS_SQL = {bool: "INTEGER", int: "INTEGER", float: "REAL", str: "TEXT"}
+
+# Columnas de control, antes de los campos del constructor
+_COLUMNAS_FIJAS = ("clave", "tipo", "material_clave", "precio", "centavos")
+
+# Filas leídas por lote al recorrer una tabla
+_TAMAÑO_LECTURA = 1000
+
+# (clave, registro para ``registro_a_mueble``, precio final o None)
+Fila = Tuple[int, Dict[str, Any], Optional[float]]
+
+
+def _clave_material(material: Any) -> Optional[str]:
+    """Material sin espacios ni mayúsculas, como lo indexa ``InventarioIndexado``."""
+    if not isinstance(material, str):
+        return None
+    return material.strip().casefold() or None
+
+
+class _Tabla:
+    """Esquema y sentencias SQL de una categoría."""
+
+    __slots__ = ("nombre", "campos", "posiciones", "insertar", "seleccion")
+
+    def __init__(self, nombre: str, tipos: Iterable[str]) -> None:
+        campos: Dict[str, type] = {}
+        for tipo in tipos:
+            for campo, primitivo in campos_de(TIPOS_MUEBLE[tipo]):
+                campos.setdefault(campo, primitivo)
+        columnas = _COLUMNAS_FIJAS + tuple(campos)
+        self.nombre = nombre
+        self.campos = list(campos.items())
+        # posición de cada campo de cada tipo dentro de una fila de ``seleccion``
+        self.posiciones: Dict[str, List[Tuple[str, int]]] = {
+            tipo: [
+                (campo, columnas.index(campo))
+                for campo, _ in campos_de(TIPOS_MUEBLE[tipo])
+            ]
+            for tipo in tipos
+        }
+        lista = ", ".join(f'"{columna}"' for columna in columnas)
+        marcas = ", ".join("?" * len(columnas))
+        self.insertar = f"INSERT OR REPLACE INTO {nombre} ({lista}) VALUES ({marcas})"
+        self.seleccion = f"SELECT {lista} FROM {nombre}"
+
+    def esquema(self) -> List[str]:
+        """Sentencias que crean la tabla y sus índices si no existen."""
+        definiciones = [
+            "clave INTEGER PRIMARY KEY",
+            "tipo TEXT NOT NULL",
+            "material_clave TEXT",
+            "precio REAL",
+            "centavos INTEGER",
+        ] + [f'"{campo}" {_TIPOS_SQL[tipo]}' for campo, tipo in self.campos]
+        n = self.nombre
+        return [
+            f"CREATE TABLE IF NOT EXISTS {n} ({', '.join(definiciones)})",
+            f"CREATE INDEX IF NOT EXISTS {n}_material ON {n} (material_clave, clave)",
+            f"CREATE INDEX IF NOT EXISTS {n}_precio ON {n} (precio, clave)",
+            f"CREATE INDEX IF NOT EXISTS {n}_tipo ON {n} (tipo, clave)",
+        ]
+
+    def valores(
+        self, clave: int, registro: Dict[str, Any], precio: Optional[float]
+    ) -> Tuple[Any, ...]:
+        """Parámetros de ``insertar`` para un registro de ``registro_simple``."""
+        centavos = None if precio is None else round(precio * 100)
+        return (
+            clave,
+            registro["tipo"],
+            _clave_material(registro.get("material")),
+            precio,
+            centavos,
+        ) + tuple(registro.get(campo) for campo, _ in self.campos)
+
+    def fila(self, valores: Tuple[Any, ...]) -> Fila:
+        """Convierte una fila de ``seleccion`` en (clave, registro, precio)."""
+        tipo = valores[1]
+        registro = {"tipo": tipo}
+        for campo, posicion in self.posiciones[tipo]:
+            registro[campo] = valores[posicion]
+        return valores[0], registro, valores[3]
+
+
+# (tabla, registro, precio) listo para insertar; lo crea ``AlmacenSQLite.preparar``
+Pendiente = Tuple[_Tabla, Dict[str, Any], Optional[float]]
+
+
+class AlmacenSQLite:
+    """
+    Inventario y estado de una tienda guardados en un archivo SQLite.
+
+    Cada mueble se identifica por una clave entera creciente y única entre
+    las tres tablas, así que ordenar por clave reproduce el orden en que se
+    agregó al catálogo. Los muebles se guardan como los parámetros de su
+    constructor (``registro_simple``) y se leen como registros que
+    ``registro_a_mueble`` convierte de nuevo en objetos.
+
+    Args:
+        ruta: Archivo de la base de datos (se crea si no existe)
+        lectores: Conexiones de solo lectura que mantiene el pool
+    """
+
+    def __init__(self, ruta: str, lectores: int = 4) -> None:
+        if lectores < 1:
+            raise ValueError("El pool necesita al menos una conexión de lectura")
+        self.ruta = ruta
+        self._tablas: Dict[str, _Tabla] = {
+            nombre: _Tabla(nombre, tipos) for nombre, tipos in CATEGORIAS.items()
+        }
+        self._escritor = self._conectar()
+        self._escritor.execute("PRAGMA journal_mode=WAL")
+        self._candado = threading.Lock()
+        with self._escritor:
+            for tabla in self._tablas.values():
+                for sentencia in tabla.esquema():
+                    self._escritor.execute(sentencia)
+            self._escritor.execute(
+                "CREATE TABLE IF NOT EXISTS estado (clave TEXT PRIMARY KEY, valor TEXT)"
+            )
+            self._escritor.execute(
+                "CREATE TABLE IF NOT EXISTS ventas (clave TEXT PRIMARY KEY, "
+                "vendidos INTEGER NOT NULL, centavos INTEGER NOT NULL)"
+            )
+            fila = self._escritor.execute(
+                "SELECT valor FROM estado WHERE clave = 'tienda'"
+            ).fetchone()
+            if fila is not None:
+                # bases anteriores guardaban los contadores dentro del estado
+                self._sembrar_ventas(self._escritor, json.loads(fila[0]))
+        self._siguiente_clave = 1 + max(
+            self._escritor.execute(
+                f"SELECT COALESCE(MAX(clave), 0) FROM {n}"
+            ).fetchone()[0]
+            for n in self._tablas
+        )
+        self._lectores: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._conexiones = [self._conectar() for _ in range(lectores)]
+        for conexion in self._conexiones:
+            self._lectores.put(conexion)
+
+    def _conectar(self) -> sqlite3.Connection:
+        conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        return conexion
+
+    @contextmanager
+    def _lectura(self) -> Iterator[sqlite3.Connection]:
+        """Presta una conexión del pool de lectura (espera si están todas en uso)."""
+        conexion = self._lectores.get()
+        try:
+            yield conexion
+        finally:
+            self._lectores.put(conexion)
+
+    @contextmanager
+    def _escritura(self) -> Iterator[sqlite3.Connection]:
+        """Conexión de escritura en exclusiva, dentro de una transacción."""
+        with self._candado, self._escritor:
+            yield self._escritor
+
+    def cerrar(self) -> None:
+        """Cierra todas las conexiones."""
+        for conexion in self._conexiones:
+            conexion.close()
+        self._escritor.close()
+
+    def __enter__(self) -> "AlmacenSQLite":
+        return self
+
+    def __exit__(self, *excepcion: Any) -> None:
+        self.cerrar()
+
+    # --- Escritura ---
+
+    def admite(self, mueble: Any) -> bool:
+        """Si el mueble se puede guardar: tipo con tabla y campos simples."""
+        try:
+            self.preparar(mueble)
+        except ValueError:
+            return False
+        return True
+
+    def preparar(self, mueble: Any, precio: Optional[float] = None) -> Pendiente:
+        """
+        Convierte un mueble en una fila pendiente para ``agregar_preparados``.
+
+        Permite validar un lote antes de tocar la base sin convertir cada
+        mueble dos veces.
+
+        Raises:
+            ValueError: Si el tipo no tiene tabla o un campo no es un valor simple
+        """
+        registro = registro_simple(mueble)
+        nombre = _TABLA_DE_TIPO.get(registro["tipo"])
+        if nombre is None:
+            raise ValueError(f"tipo de mueble sin tabla: {registro['tipo']!r}")
+        return self._tablas[nombre], registro, precio
+
+    def agregar(self, mueble: Any, precio: Optional[float] = None) -> int:
+        """
+        Guarda un mueble. Devuelve su clave.
+
+        Raises:
+            ValueError: Si el tipo del mueble no se puede guardar
+        """
+        return self.agregar_preparados([self.preparar(mueble, precio)])[0]
+
+    def agregar_lote(self, pares: Iterable[Tuple[Any, Optional[float]]]) -> List[int]:
+        """
+        Guarda muchos muebles en una sola transacción.
+
+        Si un mueble no se puede guardar no se guarda ninguno.
+
+        Args:
+            pares: Pares (mueble, precio final o None)
+
+        Returns:
+            List[int]: Claves asignadas, en el orden recibido
+
+        Raises:
+            ValueError: Si algún mueble es de un tipo que no se puede guardar
+        """
+        return self.agregar_preparados(
+            [self.preparar(mueble, precio) for mueble, precio in pares]
+        )
+
+    def agregar_preparados(self, pendientes: List[Pendiente]) -> List[int]:
+        """
+        Inserta filas de ``preparar`` en una sola transacción.
+
+        Las filas se agrupan por tabla y se insertan con un ``executemany``
+        por tabla.
+
+        Returns:
+            List[int]: Claves asignadas, en el orden recibido
+        """
+        por_tabla: Dict[str, List[Tuple[Any, ...]]] = {}
+        with self._escritura() as conexion:
+            claves = list(
+                range(self._siguiente_clave, self._siguiente_clave + len(pendientes))
+            )
+            for clave, (tabla, registro, precio) in zip(claves, pendientes):
+                por_tabla.setdefault(tabla.nombre, []).append(
+                    tabla.valores(clave, registro, precio)
+                )
+            for nombre, filas in por_tabla.items():
+                conexion.executemany(self._tablas[nombre].insertar, filas)
+            self._siguiente_clave += len(claves)
+        return claves
+
+    def actualizar(self, clave: int, mueble: Any, precio: Optional[float]) -> None:
+        """Reescribe la fila de ``clave`` con los atributos actuales del mueble."""
+        tabla, registro, precio = self.preparar(mueble, precio)
+        with self._escritura() as conexion:
+            conexion.execute(tabla.insertar, tabla.valores(clave, registro, precio))
+
+    def quitar(self, clave: int) -> bool:
+        """Borra un mueble. Devuelve False si la clave no existía."""
+        with self._escritura() as conexion:
+            borrados = sum(
+                conexion.execute(f"DELETE FROM {n} WHERE clave = ?", (clave,)).rowcount
+                for n in self._tablas
+            )
+        return borrados > 0
+
+    def vender(self, claves: List[int], vendidos: int, centavos: int) -> None:
+        """
+        Borra los muebles vendidos y suma la venta en una sola transacción.
+
+        Args:
+            claves: Claves de los muebles vendidos
+            vendidos: Unidades vendidas
+            centavos: Valor de la venta en centavos
+        """
+        with self._escritura() as conexion:
+            for nombre in self._tablas:
+                conexion.executemany(
+                    f"DELETE FROM {nombre} WHERE clave = ?", [(c,) for c in claves]
+                )
+            self._sumar(conexion, vendidos, centavos)
+
+    def sumar_ventas(self, vendidos: int, centavos: int) -> None:
+        """Suma una venta a los contadores sin tocar el resto del estado."""
+        with self._escritura() as conexion:
+            self._sumar(conexion, vendidos, centavos)
+
+    def guardar_estado(self, estado: Dict[str, Any]) -> None:
+        """
+        Guarda el estado de la tienda (``TiendaMuebles.exportar_estado``).
+
+        Los contadores de ventas del estado solo se usan si la base todavía
+        no tiene los suyos; después cuentan las sumas de cada venta.
+        """
+        with self._escritura() as conexion:
+            conexion.execute(
+                "INSERT OR REPLACE INTO estado (clave, valor) VALUES ('tienda', ?)",
+                (json.dumps(estado, ensure_ascii=False),),
+            )
+            self._sembrar_ventas(conexion, estado)
+
+    @staticmethod
+    def _sumar(conexion: sqlite3.Connection, vendidos: int, centavos: int) -> None:
+        conexion.execute(
+            "INSERT INTO ventas (clave, vendidos, centavos) VALUES ('tienda', ?, ?) "
+            "ON CONFLICT (clave) DO UPDATE SET "
+            "vendidos = vendidos + excluded.vendidos, "
+            "centavos = centavos + excluded.centavos",
+            (vendidos, centavos),
+        )
+
+    @staticmethod
+    def _sembrar_ventas(conexion: sqlite3.Connection, estado: Dict[str, Any]) -> None:
+        """Crea la fila de contadores desde ``estado`` si todavía no existe."""
+        conexion.execute(
+            "INSERT OR IGNORE INTO ventas (clave, vendidos, centavos) "
+            "VALUES ('tienda', ?, ?)",
+            (
+                int(estado.get("total_muebles_vendidos", 0)),
+                round(float(estado.get("valor_total_ventas", 0.0)) * 100),
+            ),
+        )
+
+    # --- Lectura ---
+
+    def leer_estado(self) -> Optional[Dict[str, Any]]:
+        """
+        Último estado guardado con los contadores de ventas al día.
+
+        Returns:
+            dict o None: El estado, o None si la base está recién creada
+        """
+        with self._lectura() as conexion:
+            fila = conexion.execute(
+                "SELECT valor FROM estado WHERE clave = 'tienda'"
+            ).fetchone()
+            ventas = conexion.execute(
+                "SELECT vendidos, centavos FROM ventas WHERE clave = 'tienda'"
+            ).fetchone()
+        if fila is None:
+            return None
+        estado = json.loads(fila[0])
+        if ventas is not None:
+            estado["total_muebles_vendidos"] = ventas[0]
+            estado["valor_total_ventas"] = ventas[1] / 100
+        return estado
+
+    def resumen(self) -> Tuple[int, int, Dict[str, int]]:
+        """
+        Totales del inventario guardado, sin leer los muebles.
+
+        Returns:
+            tuple: (cantidad, suma de precios en centavos, cantidad por tipo)
+        """
+        cantidad = total_centavos = 0
+        por_tipo: Dict[str, int] = {}
+        with self._lectura() as conexion:
+            for nombre in self._tablas:
+                for tipo, n, centavos in conexion.execute(
+                    f"SELECT tipo, COUNT(*), COALESCE(SUM(centavos), 0) "
+                    f"FROM {nombre} GROUP BY tipo"
+                ):
+                    cantidad += n
+                    total_centavos += centavos
+                    por_tipo[tipo] = n
+        return cantidad, total_centavos, por_tipo
+
+    def _consultar(
+        self, condicion: str, orden: str, parametros: Tuple[Any, ...]
+    ) -> Iterator[Fila]:
+        """
+        Filas de las tres tablas que cumplen ``condicion``, ordenadas por ``orden``.
+
+        Cada tabla se lee en orden por su índice y los resultados se mezclan
+        con ``heapq.merge``, sin ordenar en Python.
+        """
+        with self._lectura() as conexion:
+            flujos = []
+            for tabla in self._tablas.values():
+                cursor = conexion.execute(
+                    f"{tabla.seleccion} {condicion} ORDER BY {orden}", parametros
+                )
+                flujos.append(map(tabla.fila, _por_lotes(cursor)))
+            if orden == "clave":
+                yield from heapq.merge(*flujos, key=lambda f: f[0])
+            else:
+                yield from heapq.merge(*flujos, key=lambda f: (f[2], f[0]))
+
+    def recorrer(self) -> Iterator[Fila]:
+        """Todos los muebles en orden de clave (orden de catálogo)."""
+        return self._consultar("", "clave", ())
+
+    def filtrar_por_material(self, material: str) -> List[Fila]:
+        """Muebles cuyo material coincide sin distinguir mayúsculas, por clave."""
+        clave = _clave_material(material)
+        if clave is None:
+            return []
+        return list(self._consultar("WHERE material_clave = ?", "clave", (clave,)))
+
+    def filtrar_por_precio(self, minimo: float, maximo: float) -> List[Fila]:
+        """Muebles con precio final en [minimo, maximo], de menor a mayor."""
+        return list(
+            self._consultar(
+                "WHERE precio BETWEEN ? AND ?", "precio, clave", (minimo, maximo)
+            )
+        )
+
+    def filtrar_por_tipo(self, tipo: str) -> List[Fila]:
+        """Muebles de un tipo concreto, por clave."""
+        tabla = _TABLA_DE_TIPO.get(tipo)
+        if tabla is None:
+            return []
+        with self._lectura() as conexion:
+            cursor = conexion.execute(
+                f"{self._tablas[tabla].seleccion} WHERE tipo = ? ORDER BY clave",
+                (tipo,),
+            )
+            return [self._tablas[tabla].fila(f) for f in cursor]
+
+
+def _por_lotes(cursor: sqlite3.Cursor) -> Iterator[Tuple[Any, ...]]:
+    """Filas de un cursor leídas de ``_TAMAÑO_LECTURA`` en ``_TAMAÑO_LECTURA``."""
+    while True:
+        filas = cursor.fetchmany(_TAMAÑO_LECTURA)
+        if not filas:
+            return
+        yield from filas
@@ -0,0 +1,63 @@
+"""
+Carrito de compra para cobrar varios muebles en una sola operación.
+
+``TiendaMuebles.cobrar`` toma el carrito, calcula los precios de todas las
+líneas de una vez (con las reglas de carrito del motor de descuentos) y
+confirma bajas, contadores y registros en un solo paso: o se vende todo el
+carrito o no se vende nada.
+"""
+
+from typing import Any, Iterator, List, Optional
+
+
+class Carrito:
+    """
+    Líneas de una compra, un mueble del inventario por línea.
+
+    Args:
+        cliente: Nombre del cliente para el comprobante
+    """
+
+    def __init__(self, cliente: Optional[str] = None) -> None:
+        self.cliente = cliente
+        self._lineas: List[Any] = []
+
+    @property
+    def lineas(self) -> List[Any]:
+        return self._lineas.copy()
+
+    def __len__(self) -> int:
+        return len(self._lineas)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._lineas)
+
+    def agregar(self, mueble: Any, cantidad: int = 1) -> None:
+        """
+        Agrega un mueble (``cantidad`` veces si hay varios iguales en stock).
+
+        Raises:
+            ValueError: Si el mueble es None o la cantidad no es positiva
+        """
+        if mueble is None:
+            raise ValueError("No se puede agregar None al carrito")
+        if cantidad < 1:
+            raise ValueError("La cantidad debe ser positiva")
+        self._lineas.extend([mueble] * cantidad)
+
+    def agregar_comedor(self, comedor: Any) -> None:
+        """Agrega la mesa y las sillas de un comedor como líneas separadas."""
+        self.agregar(comedor.mesa)
+        for silla in comedor.sillas:
+            self.agregar(silla)
+
+    def quitar(self, mueble: Any) -> bool:
+        """Quita una línea del mueble indicado. Devuelve False si no estaba."""
+        for indice, linea in enumerate(self._lineas):
+            if linea is mueble:
+                del self._lineas[indice]
+                return True
+        return False
+
+    def vaciar(self) -> None:
+        self._lineas.clear()
@@ -1 +1,452 @@
-# Catalogo
+"""
+Importación de catálogos desde archivos CSV o JSON Lines.
+
+La carga es un pipeline de generadores, de modo que en memoria solo vive el
+lote que se está insertando y no el archivo completo:
+
+    leer_registros  ->  construir_muebles  ->  agregar_muebles_lote
+    (parseo)            (tipo + validación)    (inserción por lotes)
+
+Cada registro trae una columna ``tipo`` (Silla, Mesa, SofaCama, ...) y una
+columna por parámetro del constructor de esa clase; los valores vacíos se
+omiten y toman el valor por defecto. Las filas que no se pueden leer,
+construir o validar se escriben en un archivo de rechazos (JSON Lines, con
+el número de línea y el motivo) y la carga continúa.
+"""
+
+import csv
+import inspect
+import json
+import os
+import re
+import unicodedata
+from itertools import islice
+from operator import attrgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+    get_args,
+)
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.cajonera import Cajonera
+from src.models.concretos.cama import Cama
+from src.models.concretos.escritorio import Escritorio
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sillon import Sillon
+from src.models.concretos.sofa import Sofa
+from src.models.concretos.sofacama import SofaCama
+
+if TYPE_CHECKING:
+    from src.services.tienda import TiendaMuebles
+
+# Clases que se pueden importar, por nombre de tipo
+TIPOS_MUEBLE: Dict[str, type] = {
+    clase.__name__: clase
+    for clase in (
+        Silla,
+        Mesa,
+        Sofa,
+        Cama,
+        SofaCama,
+        Armario,
+        Cajonera,
+        Escritorio,
+        Sillon,
+    )
+}
+
+_VERDADEROS = {"1", "true", "verdadero", "si", "sí", "s", "yes", "y", "x"}
+_FALSOS = {"0", "false", "falso", "no", "n"}
+
+# (linea, registro crudo, mueble o None, error o None)
+Fila = Tuple[int, Any, Any, Optional[str]]
+
+
+def _clave_tipo(nombre: str) -> str:
+    """Normaliza un nombre de tipo: "Sofá-cama" y "SOFACAMA" dan "sofacama"."""
+    descompuesto = unicodedata.normalize("NFKD", nombre)
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return re.sub(r"[\W_]+", "", sin_acentos.casefold())
+
+
+_TIPOS_POR_CLAVE: Dict[str, type] = {
+    _clave_tipo(nombre): clase for nombre, clase in TIPOS_MUEBLE.items()
+}
+
+
+def _a_bool(valor: Any) -> bool:
+    if isinstance(valor, bool):
+        return valor
+    texto = str(valor).strip().casefold()
+    if texto in _VERDADEROS:
+        return True
+    if texto in _FALSOS:
+        return False
+    raise ValueError(f"valor booleano no reconocido: {valor!r}")
+
+
+def _a_int(valor: Any) -> Union[int, float]:
+    if isinstance(valor, bool):
+        raise ValueError(f"se esperaba un número: {valor!r}")
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        numero = float(valor)
+    # "3.0" es un entero válido; "499.9" se deja al constructor
+    return int(numero) if numero.is_integer() else numero
+
+
+def _a_float(valor: Any) -> float:
+    if isinstance(valor, bool):
+        raise ValueError(f"se esperaba un número: {valor!r}")
+    return float(valor)
+
+
+def _a_str(valor: Any) -> str:
+    return valor.strip() if isinstance(valor, str) else str(valor)
+
+
+_CONVERSORES: Dict[Any, Callable[[Any], Any]] = {
+    bool: _a_bool,
+    int: _a_int,
+    float: _a_float,
+    str: _a_str,
+}
+
+
+def _primitivos(parametro: inspect.Parameter) -> List[type]:
+    """Tipos simples (bool, int, float, str) que admite un parámetro, en orden."""
+    anotacion = parametro.annotation
+    if anotacion is inspect.Parameter.empty:
+        por_defecto = parametro.default
+        vacio = por_defecto is inspect.Parameter.empty or por_defecto is None
+        anotacion = str if vacio else type(por_defecto)
+    tipos = [o for o in (get_args(anotacion) or (anotacion,)) if o in _CONVERSORES]
+    return tipos or [str]
+
+
+def _conversor(parametro: inspect.Parameter) -> Callable[[Any], Any]:
+    """Conversor de texto al tipo anotado del parámetro (o al de su valor por defecto)."""
+    opciones = [_CONVERSORES[tipo] for tipo in _primitivos(parametro)]
+    if len(opciones) == 1:
+        return opciones[0]
+
+    def convertir(valor: Any) -> Any:
+        # anotaciones como ``int | str``: vale la primera que acepte el valor
+        for opcion in opciones[:-1]:
+            try:
+                return opcion(valor)
+            except (TypeError, ValueError):
+                pass
+        return opciones[-1](valor)
+
+    return convertir
+
+
+_PARAMETROS: Dict[type, List[inspect.Parameter]] = {}
+_FIRMAS: Dict[type, Dict[str, Tuple[bool, Callable[[Any], Any]]]] = {}
+_CAMPOS: Dict[type, List[Tuple[str, type]]] = {}
+
+
+def _parametros(clase: type) -> List[inspect.Parameter]:
+    """Parámetros con nombre del constructor de ``clase`` (sin ``self``), cacheados."""
+    parametros = _PARAMETROS.get(clase)
+    if parametros is None:
+        parametros = _PARAMETROS[clase] = [
+            p
+            for p in list(inspect.signature(clase.__init__).parameters.values())[1:]
+            if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
+        ]
+    return parametros
+
+
+def _firma(clase: type) -> Dict[str, Tuple[bool, Callable[[Any], Any]]]:
+    """Parámetros del constructor: nombre -> (obligatorio, conversor). Se cachea por clase."""
+    firma = _FIRMAS.get(clase)
+    if firma is None:
+        firma = _FIRMAS[clase] = {
+            p.name: (p.default is inspect.Parameter.empty, _conversor(p))
+            for p in _parametros(clase)
+        }
+    return firma
+
+
+def campos_de(clase: type) -> List[Tuple[str, type]]:
+    """
+    Campos de un tipo de mueble: los parámetros de su constructor.
+
+    Cada mueble expone un atributo o propiedad con el nombre de cada
+    parámetro, así que estos campos bastan para reconstruirlo.
+
+    Args:
+        clase: Clase concreta de mueble
+
+    Returns:
+        List: Pares (nombre, tipo simple) en el orden del constructor
+    """
+    campos = _CAMPOS.get(clase)
+    if campos is None:
+        campos = _CAMPOS[clase] = [
+            (p.name, _primitivos(p)[0]) for p in _parametros(clase)
+        ]
+    return campos
+
+
+_LECTORES: Dict[type, Tuple[Tuple[str, ...], Callable[[Any], Tuple]]] = {}
+
+
+def lector_campos(
+    clase: type,
+) -> Optional[Tuple[Tuple[str, ...], Callable[[Any], Tuple]]]:
+    """
+    Lector rápido de los campos de un tipo de ``TIPOS_MUEBLE``.
+
+    Args:
+        clase: Clase concreta de mueble
+
+    Returns:
+        tuple: (nombres de los campos, función que devuelve la tupla de sus
+        valores para un mueble), o None si la clase no está en ``TIPOS_MUEBLE``
+    """
+    lector = _LECTORES.get(clase)
+    # solo se guardan los aciertos: cada mock con spec es una clase nueva
+    if lector is None and TIPOS_MUEBLE.get(clase.__name__) is clase:
+        campos = tuple(campo for campo, _ in campos_de(clase))
+        obtener = attrgetter(*campos)
+        if len(campos) == 1:
+            lector = (campos, lambda item, obtener=obtener: (obtener(item),))
+        else:
+            lector = (campos, obtener)
+        _LECTORES[clase] = lector
+    return lector
+
+
+def mueble_a_registro(mueble: Any) -> Dict[str, Any]:
+    """
+    Inversa de ``registro_a_mueble``: registro plano con ``tipo`` y sus campos.
+
+    Raises:
+        ValueError: Si el mueble no es de un tipo de ``TIPOS_MUEBLE``
+    """
+    clase = getattr(mueble, "__class__", type(mueble))
+    if TIPOS_MUEBLE.get(clase.__name__) is not clase:
+        raise ValueError(f"tipo de mueble no exportable: {clase.__name__!r}")
+    registro = {"tipo": clase.__name__}
+    for campo, _ in campos_de(clase):
+        registro[campo] = getattr(mueble, campo, None)
+    return registro
+
+
+def registro_simple(mueble: Any) -> Dict[str, Any]:
+    """
+    ``mueble_a_registro`` que además exige valores simples en cada campo.
+
+    Es el registro que se puede guardar tal cual en JSON o en SQL.
+
+    Raises:
+        ValueError: Si el tipo no se puede exportar o un campo no es None,
+            bool, int, float o str
+    """
+    registro = mueble_a_registro(mueble)
+    for campo, valor in registro.items():
+        if valor is not None and type(valor) not in _CONVERSORES:
+            raise ValueError(f"valor no guardable en {campo!r}: {valor!r}")
+    return registro
+
+
+def registro_a_mueble(registro: Dict[str, Any]) -> Any:
+    """
+    Construye un mueble a partir de un registro plano.
+
+    Args:
+        registro: Diccionario con ``tipo`` y los parámetros del constructor
+
+    Returns:
+        Mueble: Instancia de la clase indicada por ``tipo``
+
+    Raises:
+        ValueError: Si el tipo no existe, falta un campo obligatorio, hay un
+            campo desconocido o un valor no se puede convertir
+    """
+    campos = {
+        unicodedata.normalize("NFC", str(clave).strip()): valor
+        for clave, valor in registro.items()
+        if clave is not None
+        and valor is not None
+        and not (isinstance(valor, str) and not valor.strip())
+    }
+    tipo = campos.pop("tipo", None)
+    if tipo is None:
+        raise ValueError("falta la columna 'tipo'")
+    clase = _TIPOS_POR_CLAVE.get(_clave_tipo(str(tipo)))
+    if clase is None:
+        raise ValueError(f"tipo de mueble desconocido: {tipo!r}")
+
+    firma = _firma(clase)
+    argumentos = {}
+    for campo, valor in campos.items():
+        if campo not in firma:
+            raise ValueError(f"campo desconocido para {clase.__name__}: {campo!r}")
+        try:
+            argumentos[campo] = firma[campo][1](valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"valor inválido para {campo!r}: {valor!r}") from None
+    faltan = [
+        c
+        for c, (obligatorio, _) in firma.items()
+        if obligatorio and c not in argumentos
+    ]
+    if faltan:
+        raise ValueError(f"faltan campos obligatorios: {', '.join(faltan)}")
+    return clase(**argumentos)
+
+
+def _detectar_formato(ruta: str) -> str:
+    extension = os.path.splitext(ruta)[1].casefold()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension in (".csv", ".txt"):
+        return "csv"
+    raise ValueError(
+        f"No se reconoce el formato de {ruta!r}; indique formato='csv' o 'jsonl'"
+    )
+
+
+def leer_registros(
+    archivo: TextIO, formato: str
+) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Primera etapa: parsea el archivo fila a fila.
+
+    Args:
+        archivo: Archivo de texto abierto
+        formato: "csv" (con cabecera) o "jsonl" (un objeto JSON por línea)
+
+    Yields:
+        Tuple: (número de línea, registro o texto crudo, error o None)
+    """
+    if formato == "csv":
+        lector = csv.DictReader(archivo)
+        for registro in lector:
+            linea = lector.line_num
+            if None in registro:
+                yield linea, registro, "la fila tiene más columnas que la cabecera"
+            else:
+                yield linea, registro, None
+    elif formato == "jsonl":
+        for linea, texto in enumerate(archivo, start=1):
+            if not texto.strip():
+                continue
+            try:
+                registro = json.loads(texto)
+            except json.JSONDecodeError as error:
+                yield linea, texto.rstrip("\n"), f"JSON inválido: {error.msg}"
+                continue
+            if isinstance(registro, dict):
+                yield linea, registro, None
+            else:
+                yield linea, registro, "se esperaba un objeto JSON"
+    else:
+        raise ValueError(f"Formato no soportado: {formato!r}")
+
+
+def construir_muebles(
+    registros: Iterable[Tuple[int, Any, Optional[str]]],
+) -> Iterator[Fila]:
+    """
+    Segunda etapa: resuelve el tipo y construye cada mueble.
+
+    Yields:
+        Fila: (línea, registro crudo, mueble o None, error o None)
+    """
+    for linea, registro, error in registros:
+        if error is not None:
+            yield linea, registro, None, error
+            continue
+        try:
+            yield linea, registro, registro_a_mueble(registro), None
+        except Exception as exc:
+            yield linea, registro, None, str(exc)
+
+
+def importar_catalogo(
+    tienda: "TiendaMuebles",
+    ruta: str,
+    formato: Optional[str] = None,
+    ruta_rechazos: Optional[str] = None,
+    tamaño_lote: int = 5000,
+) -> Dict[str, Any]:
+    """
+    Importa un catálogo CSV o JSON Lines a la tienda en streaming.
+
+    Los muebles válidos se insertan con ``agregar_muebles_lote`` de
+    ``tamaño_lote`` en ``tamaño_lote``; la validación de precio es la misma
+    que la del alta individual. El archivo de rechazos solo se crea si hay
+    alguna fila rechazada.
+
+    Args:
+        tienda: Tienda donde agregar los muebles
+        ruta: Archivo de entrada
+        formato: "csv" o "jsonl" (por defecto se deduce de la extensión)
+        ruta_rechazos: Archivo de rechazos (por defecto ``<ruta>.rechazos.jsonl``)
+        tamaño_lote: Muebles por llamada a ``agregar_muebles_lote``
+
+    Returns:
+        dict: {"leidos": int, "agregados": int, "rechazados": int,
+               "archivo_rechazos": str o None}
+    """
+    if tamaño_lote <= 0:
+        raise ValueError("El tamaño de lote debe ser mayor a 0")
+    formato = formato or _detectar_formato(ruta)
+    ruta_rechazos = ruta_rechazos or f"{ruta}.rechazos.jsonl"
+    resumen: Dict[str, Any] = {
+        "leidos": 0,
+        "agregados": 0,
+        "rechazados": 0,
+        "archivo_rechazos": None,
+    }
+    rechazos: Optional[TextIO] = None
+
+    def rechazar(linea: int, registro: Any, error: str) -> None:
+        nonlocal rechazos
+        if rechazos is None:
+            rechazos = open(ruta_rechazos, "w", encoding="utf-8")
+            resumen["archivo_rechazos"] = ruta_rechazos
+        fila = {"linea": linea, "error": error, "registro": registro}
+        rechazos.write(json.dumps(fila, ensure_ascii=False, default=str) + "\n")
+        resumen["rechazados"] += 1
+
+    try:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            filas = construir_muebles(leer_registros(archivo, formato))
+            while True:
+                lote: List[Fila] = list(islice(filas, tamaño_lote))
+                if not lote:
+                    break
+                resumen["leidos"] += len(lote)
+                validas: List[Fila] = []
+                for fila in lote:
+                    if fila[3] is None:
+                        validas.append(fila)
+                    else:
+                        rechazar(fila[0], fila[1], fila[3])
+                resultado = tienda.agregar_muebles_lote(f[2] for f in validas)
+                resumen["agregados"] += resultado["agregados"]
+                for posicion, error in resultado["errores"]:
+                    linea, registro = validas[posicion][:2]
+                    rechazar(linea, registro, error)
+    finally:
+        if rechazos is not None:
+            rechazos.close()
+    return resumen
@@ -0,0 +1,532 @@
+"""
+Inventario columnar respaldado por NumPy.
+
+Para analítica sobre millones de muebles no conviene un objeto Python por
+pieza. ``InventarioColumnar`` guarda cada tipo concreto como una estructura
+de arreglos (una columna tipada por atributo) y reproduce la fórmula de
+``calcular_precio`` de cada clase con expresiones vectorizadas, de modo que
+valoración, filtro por precio y agrupaciones son operaciones sobre arreglos.
+
+Las columnas se almacenan en ``array.array`` (8 bytes por número, 1 por
+booleano) y los cálculos las leen sin copiar con ``numpy.frombuffer``;
+``columna`` entrega una copia para que nadie retenga una vista que impida
+seguir agregando filas. Los textos repetidos (material, color, forma,
+tapizado...) se codifican como enteros contra un diccionario de valores.
+"""
+
+import inspect
+import math
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.cajonera import Cajonera
+from src.models.concretos.cama import Cama
+from src.models.concretos.escritorio import Escritorio
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sillon import Sillon
+from src.models.concretos.sofa import Sofa
+from src.models.concretos.sofacama import SofaCama
+
+# Códigos de columna: "f" float64, "i" int64, "b" booleano, "c" categoría
+_CODIGO_ARRAY = {"f": "d", "i": "q", "b": "b", "c": "I"}
+_DTYPE = {"f": np.float64, "i": np.int64, "b": np.int8, "c": np.uint32}
+
+# Clases cuyo constructor trunca precio_base a int y cuyo precio es entero
+_TIPOS_ENTEROS = ("Armario", "Cajonera", "Escritorio", "Sillon")
+
+# Columnas específicas de cada tipo (además de nombre, material, color y precio_base)
+ESQUEMAS: Dict[str, Tuple[type, Tuple[Tuple[str, str], ...]]] = {
+    "Silla": (
+        Silla,
+        (
+            ("numero_patas", "i"),
+            ("tipo_madera", "c"),
+            ("tiene_respaldo", "b"),
+            ("material_tapizado", "c"),
+            ("altura_regulable", "b"),
+            ("tiene_ruedas", "b"),
+        ),
+    ),
+    "Mesa": (
+        Mesa,
+        (
+            ("forma", "c"),
+            ("largo", "f"),
+            ("ancho", "f"),
+            ("altura", "f"),
+            ("capacidad_personas", "i"),
+        ),
+    ),
+    "Sofa": (
+        Sofa,
+        (
+            ("capacidad_personas", "i"),
+            ("tiene_respaldo", "b"),
+            ("material_tapizado", "c"),
+            ("tiene_brazos", "b"),
+            ("es_modular", "b"),
+            ("incluye_cojines", "b"),
+        ),
+    ),
+    "Cama": (
+        Cama,
+        (("tamaño", "c"), ("incluye_colchon", "b"), ("tiene_cabecera", "b")),
+    ),
+    "SofaCama": (
+        SofaCama,
+        (
+            ("capacidad_personas", "i"),
+            ("material_tapizado", "c"),
+            ("tamaño_cama", "c"),
+            ("incluye_colchon", "b"),
+            ("mecanismo_conversion", "c"),
+        ),
+    ),
+    "Armario": (
+        Armario,
+        (("num_puertas", "i"), ("num_cajones", "i"), ("tiene_espejos", "b")),
+    ),
+    "Cajonera": (Cajonera, (("num_cajones", "i"), ("tiene_ruedas", "b"))),
+    "Escritorio": (
+        Escritorio,
+        (
+            ("forma", "c"),
+            ("tiene_cajones", "b"),
+            ("num_cajones", "i"),
+            ("largo", "f"),
+            ("tiene_iluminacion", "b"),
+        ),
+    ),
+    "Sillon": (
+        Sillon,
+        (
+            ("capacidad_personas", "i"),
+            ("tiene_respaldo", "b"),
+            ("material_tapizado", "c"),
+            ("tiene_brazos", "b"),
+            ("es_reclinable", "b"),
+            ("tiene_reposapiés", "b"),
+        ),
+    ),
+}
+
+
+def _redondear_2(valores: np.ndarray) -> np.ndarray:
+    """
+    Equivalente vectorizado de ``round(x, 2)`` de Python.
+
+    ``np.round`` escala por 100 antes de redondear y puede diferir de
+    Python cuando ``x * 100`` queda prácticamente en ,5; esos pocos casos se
+    recalculan con ``round`` para que el resultado sea idéntico.
+    """
+    escalado = valores * 100
+    resultado = np.round(escalado) / 100
+    dudosos = np.flatnonzero(np.abs(escalado - np.floor(escalado) - 0.5) < 1e-6)
+    for i in dudosos:
+        resultado[i] = round(float(valores[i]), 2)
+    return resultado
+
+
+class _Diccionario:
+    """Codificación de textos repetidos como enteros (valor <-> código)."""
+
+    def __init__(self) -> None:
+        self.valores: List[Any] = []
+        self._codigos: Dict[Any, int] = {}
+
+    def codigo(self, valor: Any) -> int:
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def buscar(self, valor: Any) -> Optional[int]:
+        return self._codigos.get(valor)
+
+    def tabla(self, funcion: Callable[[Any], Any], dtype: Any) -> np.ndarray:
+        """Aplica ``funcion`` a cada valor distinto; se indexa luego con los códigos."""
+        return np.array([funcion(v) for v in self.valores], dtype=dtype)
+
+
+def _valores_por_defecto(clase: type) -> Dict[str, Any]:
+    """Valores por defecto de los parámetros del constructor de una clase."""
+    parametros = inspect.signature(clase.__init__).parameters.values()
+    return {
+        p.name: p.default
+        for p in parametros
+        if p.default is not inspect.Parameter.empty
+    }
+
+
+class _ColumnasTipo:
+    """Estructura de arreglos de un tipo concreto de mueble."""
+
+    def __init__(self, nombre_tipo: str) -> None:
+        clase, campos = ESQUEMAS[nombre_tipo]
+        self.nombre_tipo = nombre_tipo
+        self.clase = clase
+        codigo_base = "i" if nombre_tipo in _TIPOS_ENTEROS else "f"
+        self.tipos: Dict[str, str] = {"precio_base": codigo_base}
+        self.tipos.update(campos)
+        self.columnas: Dict[str, array] = {
+            campo: array(_CODIGO_ARRAY[codigo]) for campo, codigo in self.tipos.items()
+        }
+        self.columnas["material"] = array("I")
+        self.columnas["color"] = array("I")
+        self.categorias: Dict[str, _Diccionario] = {
+            campo: _Diccionario() for campo, codigo in campos if codigo == "c"
+        }
+        self.nombres: List[str] = []
+        self.por_defecto = _valores_por_defecto(clase)
+        self._precios: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def _vista(self, campo: str) -> np.ndarray:
+        """
+        Vista NumPy (sin copia) de una columna, para usar dentro de un cálculo.
+
+        Mientras exista una vista el ``array`` no puede crecer (``agregar``
+        lanzaría ``BufferError``): no se debe guardar ni devolver.
+        """
+        codigo = self.tipos.get(campo, "c")
+        return np.frombuffer(self.columnas[campo], dtype=_DTYPE[codigo])
+
+    def columna(self, campo: str) -> np.ndarray:
+        """Copia NumPy de una columna (sigue valiendo tras nuevas altas)."""
+        return self._vista(campo).copy()
+
+    def agregar(
+        self,
+        nombre: str,
+        codigo_material: int,
+        codigo_color: int,
+        valores: Dict[str, Any],
+    ) -> int:
+        self.nombres.append(nombre)
+        self.columnas["material"].append(codigo_material)
+        self.columnas["color"].append(codigo_color)
+        for campo, codigo in self.tipos.items():
+            valor = valores[campo]
+            if codigo == "c":
+                valor = self.categorias[campo].codigo(valor)
+            elif codigo == "b":
+                valor = 1 if valor else 0
+            elif codigo == "i":
+                valor = int(valor)
+            else:
+                valor = float(valor)
+            self.columnas[campo].append(valor)
+        self._precios = None
+        return len(self.nombres) - 1
+
+    def precios(self) -> np.ndarray:
+        """Precios finales de todas las filas (se cachean hasta el próximo alta)."""
+        if self._precios is None:
+            if not self.nombres:
+                self._precios = np.empty(0, dtype=np.float64)
+            else:
+                self._precios = _FORMULAS[self.nombre_tipo](self)
+        return self._precios
+
+    def valor(self, campo: str, fila: int) -> Any:
+        """Valor original de una celda (decodifica categorías y booleanos)."""
+        dato = self.columnas[campo][fila]
+        codigo = self.tipos[campo]
+        if codigo == "c":
+            return self.categorias[campo].valores[dato]
+        if codigo == "b":
+            return bool(dato)
+        return dato
+
+
+# --- Fórmulas vectorizadas ---
+# Cada una replica exactamente el orden de operaciones de calcular_precio
+# de la clase correspondiente; sumar 0.0 donde la condición no se cumple no
+# altera el resultado en coma flotante.
+
+
+def _si(condicion: np.ndarray, valor: float) -> np.ndarray:
+    return np.where(condicion != 0, valor, 0.0)
+
+
+def _si_entero(condicion: np.ndarray, valor: int) -> np.ndarray:
+    return np.where(condicion != 0, valor, 0).astype(np.int64)
+
+
+def _es_valor(t: _ColumnasTipo, campo: str, valor: Any) -> np.ndarray:
+    codigo = t.categorias[campo].buscar(valor)
+    if codigo is None:
+        return np.zeros(len(t), dtype=bool)
+    return t._vista(campo) == codigo
+
+
+def _tabla(t: _ColumnasTipo, campo: str, funcion: Callable, dtype: Any) -> np.ndarray:
+    return t.categorias[campo].tabla(funcion, dtype)[t._vista(campo)]
+
+
+def _suma_tapizado(valor: Any) -> float:
+    """Suma del factor de comodidad según el tapizado (Asiento)."""
+    if valor:
+        if valor.lower() == "cuero":
+            return 0.2
+        if valor.lower() == "tela":
+            return 0.1
+    return 0.0
+
+
+def _suma_tapizado_sofacama(valor: Any) -> float:
+    """Suma del factor de comodidad según el tapizado (SofaCama)."""
+    if isinstance(valor, str):
+        return _suma_tapizado(valor)
+    return 0.0
+
+
+def _factor_comodidad(t: _ColumnasTipo, suma_tapizado: Callable) -> np.ndarray:
+    factor = 1.0 + _si(t._vista("tiene_respaldo"), 0.1)
+    factor = factor + _tabla(t, "material_tapizado", suma_tapizado, np.float64)
+    return factor + (t._vista("capacidad_personas") - 1) * 0.05
+
+
+def _precios_silla(t: _ColumnasTipo) -> np.ndarray:
+    precio = t._vista("precio_base") + _si(t._vista("altura_regulable"), 10.0)
+    precio = precio + _si(t._vista("tiene_ruedas"), 15.0)
+    return _redondear_2(precio)
+
+
+def _precios_mesa(t: _ColumnasTipo) -> np.ndarray:
+    area = t._vista("largo") * t._vista("ancho")
+    factor = 1.0 + (area / 10000) * 0.05
+    precio = t._vista("precio_base") * factor
+    precio = precio + np.where(~_es_valor(t, "forma", "rectangular"), 50.0, 0.0)
+    capacidad = t._vista("capacidad_personas")
+    precio = precio + np.where(capacidad > 6, 100.0, np.where(capacidad > 4, 50.0, 0.0))
+    return _redondear_2(precio)
+
+
+def _precios_sofa(t: _ColumnasTipo) -> np.ndarray:
+    precio = t._vista("precio_base") * _factor_comodidad(t, _suma_tapizado)
+    precio = precio + _si(t._vista("tiene_brazos"), 150.0)
+    precio = precio + _si(t._vista("es_modular"), 200.0)
+    precio = precio + _si(t._vista("incluye_cojines"), 50.0)
+    return _redondear_2(precio)
+
+
+def _precios_cama(t: _ColumnasTipo) -> np.ndarray:
+    extra_tamaño = {"matrimonial": 200.0, "queen": 400.0, "king": 600.0}
+    precio = t._vista("precio_base") + _tabla(
+        t, "tamaño", lambda v: extra_tamaño.get(v, 0.0), np.float64
+    )
+    precio = precio + _si(t._vista("incluye_colchon"), 300.0)
+    precio = precio + _si(t._vista("tiene_cabecera"), 100.0)
+    return _redondear_2(precio)
+
+
+def _precios_sofacama(t: _ColumnasTipo) -> np.ndarray:
+    # Parte de sofá: siempre con respaldo y brazos, sin módulos ni cojines
+    factor = 1.0 + 0.1
+    factor = factor + _tabla(
+        t, "material_tapizado", _suma_tapizado_sofacama, np.float64
+    )
+    factor = _redondear_2(factor + (t._vista("capacidad_personas") - 1) * 0.05)
+    precio = _redondear_2(t._vista("precio_base") * factor + 150.0)
+    extra_tamaño = {"matrimonial": 200.0, "queen": 400.0, "king": 700.0}
+    extra_mecanismo = {"hidraulico": 150.0, "electrico": 300.0}
+    precio = precio + _tabla(
+        t, "tamaño_cama", lambda v: extra_tamaño.get(v, 0.0), np.float64
+    )
+    precio = precio + _si(t._vista("incluye_colchon"), 300.0)
+    precio = precio + _tabla(
+        t, "mecanismo_conversion", lambda v: extra_mecanismo.get(v, 0.0), np.float64
+    )
+    return _redondear_2(precio)
+
+
+def _precios_armario(t: _ColumnasTipo) -> np.ndarray:
+    precio = t._vista("precio_base") + t._vista("num_puertas") * 50
+    precio = precio + t._vista("num_cajones") * 30
+    return precio + _si_entero(t._vista("tiene_espejos"), 100)
+
+
+def _precios_cajonera(t: _ColumnasTipo) -> np.ndarray:
+    precio = t._vista("precio_base") + t._vista("num_cajones") * 20
+    return precio + _si_entero(t._vista("tiene_ruedas"), 30)
+
+
+def _precios_escritorio(t: _ColumnasTipo) -> np.ndarray:
+    cajones = np.where(t._vista("tiene_cajones") != 0, t._vista("num_cajones"), 0)
+    precio = t._vista("precio_base") + cajones * 25
+    precio = precio + np.where(t._vista("largo") > 1.5, 50, 0)
+    precio = precio + _si_entero(t._vista("tiene_iluminacion"), 40)
+    precio = precio + np.where(~_es_valor(t, "forma", "rectangular"), 30, 0)
+    return precio.astype(np.int64)
+
+
+def _precios_sillon(t: _ColumnasTipo) -> np.ndarray:
+    precio = t._vista("precio_base") + _tabla(
+        t, "material_tapizado", lambda v: 200 if v else 0, np.int64
+    )
+    precio = precio + _si_entero(t._vista("tiene_brazos"), 100)
+    precio = precio + _si_entero(t._vista("es_reclinable"), 250)
+    return precio + _si_entero(t._vista("tiene_reposapiés"), 80)
+
+
+_FORMULAS: Dict[str, Callable[[_ColumnasTipo], np.ndarray]] = {
+    "Silla": _precios_silla,
+    "Mesa": _precios_mesa,
+    "Sofa": _precios_sofa,
+    "Cama": _precios_cama,
+    "SofaCama": _precios_sofacama,
+    "Armario": _precios_armario,
+    "Cajonera": _precios_cajonera,
+    "Escritorio": _precios_escritorio,
+    "Sillon": _precios_sillon,
+}
+
+
+class InventarioColumnar:
+    """
+    Inventario analítico en formato columnar (estructura de arreglos por tipo).
+
+    Las filas se identifican con el par (tipo, fila). Los objetos de modelo
+    solo se construyen cuando se piden con ``materializar``.
+    """
+
+    def __init__(self) -> None:
+        self._tipos: Dict[str, _ColumnasTipo] = {}
+        self._materiales = _Diccionario()
+        self._colores = _Diccionario()
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self._tipos.values())
+
+    def _columnas(self, nombre_tipo: str) -> _ColumnasTipo:
+        columnas = self._tipos.get(nombre_tipo)
+        if columnas is None:
+            if nombre_tipo not in ESQUEMAS:
+                raise ValueError(f"Tipo de mueble no soportado: {nombre_tipo}")
+            columnas = self._tipos[nombre_tipo] = _ColumnasTipo(nombre_tipo)
+        return columnas
+
+    # --- Altas ---
+
+    def agregar_registro(self, tipo: str, **campos: Any) -> Tuple[str, int]:
+        """
+        Agrega una fila a partir de los argumentos del constructor del tipo.
+
+        Args:
+            tipo: Nombre de la clase concreta ("Silla", "Mesa", ...)
+            **campos: nombre, material, color, precio_base y atributos propios
+
+        Returns:
+            Tuple[str, int]: Identificador (tipo, fila) de la fila creada
+        """
+        t = self._columnas(tipo)
+        valores = dict(t.por_defecto)
+        valores.update(campos)
+        if tipo == "SofaCama":
+            # Misma normalización que hace el constructor de SofaCama
+            tamaño = valores["tamaño_cama"]
+            valores["tamaño_cama"] = (
+                tamaño.lower() if isinstance(tamaño, str) else "matrimonial"
+            )
+        fila = t.agregar(
+            valores["nombre"],
+            self._materiales.codigo(valores["material"]),
+            self._colores.codigo(valores["color"]),
+            valores,
+        )
+        return tipo, fila
+
+    def agregar_mueble(self, mueble: Any) -> Tuple[str, int]:
+        """Agrega una fila copiando los atributos de un objeto de modelo."""
+        tipo = type(mueble).__name__
+        t = self._columnas(tipo)
+        campos = {campo: getattr(mueble, campo) for campo in t.tipos}
+        for campo in ("nombre", "material", "color"):
+            campos[campo] = getattr(mueble, campo)
+        return self.agregar_registro(tipo, **campos)
+
+    # --- Consultas ---
+
+    def materializar(self, tipo: str, fila: int) -> Any:
+        """Construye el objeto de modelo de una fila."""
+        t = self._tipos[tipo]
+        argumentos = {campo: t.valor(campo, fila) for campo in t.tipos}
+        argumentos["nombre"] = t.nombres[fila]
+        argumentos["material"] = self._materiales.valores[t.columnas["material"][fila]]
+        argumentos["color"] = self._colores.valores[t.columnas["color"][fila]]
+        return t.clase(**argumentos)
+
+    def calcular_precios(self, tipo: str) -> np.ndarray:
+        """Precios finales de todas las filas de un tipo."""
+        t = self._tipos.get(tipo)
+        return t.precios() if t is not None else np.empty(0, dtype=np.float64)
+
+    def calcular_valor_inventario(self) -> float:
+        """Valor total del inventario, sumado en centavos enteros como ``TiendaMuebles``."""
+        centavos = 0
+        for t in self._tipos.values():
+            centavos += int(np.rint(t.precios() * 100).astype(np.int64).sum())
+        return round(centavos / 100, 2)
+
+    def filtrar_por_precio(
+        self, minimo: float = 0.0, maximo: float = math.inf
+    ) -> Dict[str, np.ndarray]:
+        """
+        Filas con precio final en [minimo, maximo].
+
+        Returns:
+            dict: tipo -> arreglo de números de fila
+        """
+        resultado: Dict[str, np.ndarray] = {}
+        for nombre_tipo, t in self._tipos.items():
+            precios = t.precios()
+            filas = np.flatnonzero((precios >= minimo) & (precios <= maximo))
+            if len(filas):
+                resultado[nombre_tipo] = filas
+        return resultado
+
+    def agrupar(self, por: str = "tipo") -> Dict[Any, Dict[str, float]]:
+        """
+        Cantidad y valor agrupados por "tipo", "material" o "color".
+
+        Returns:
+            dict: clave -> {"cantidad": int, "valor": float}
+        """
+        if por == "tipo":
+            return {
+                nombre_tipo: {
+                    "cantidad": len(t),
+                    "valor": round(
+                        int(np.rint(t.precios() * 100).astype(np.int64).sum()) / 100, 2
+                    ),
+                }
+                for nombre_tipo, t in self._tipos.items()
+                if len(t)
+            }
+        if por not in ("material", "color"):
+            raise ValueError("Solo se puede agrupar por tipo, material o color")
+        diccionario = self._materiales if por == "material" else self._colores
+        tamaño = len(diccionario.valores)
+        cantidades = np.zeros(tamaño, dtype=np.int64)
+        centavos = np.zeros(tamaño, dtype=np.int64)
+        for t in self._tipos.values():
+            if not len(t):
+                continue
+            codigos = np.frombuffer(t.columnas[por], dtype=np.uint32)
+            cantidades += np.bincount(codigos, minlength=tamaño)
+            np.add.at(centavos, codigos, np.rint(t.precios() * 100).astype(np.int64))
+        return {
+            diccionario.valores[i]: {
+                "cantidad": int(cantidades[i]),
+                "valor": round(int(centavos[i]) / 100, 2),
+            }
+            for i in np.flatnonzero(cantidades)
+        }
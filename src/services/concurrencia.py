@@ -0,0 +1,167 @@
+"""
+Primitivas de concurrencia para usar una ``TiendaMuebles`` desde varios hilos.
+
+- ``CandadosFranjas``: un arreglo fijo de candados; cada clave (p. ej. el
+  ``id`` de un mueble) usa siempre el mismo. Dos hilos que tocan el mismo
+  mueble se esperan; los que tocan muebles distintos casi nunca.
+- ``ContadorFragmentado``: contadores repartidos en fragmentos con candado
+  propio. Cada hilo suma siempre en el mismo fragmento y la lectura suma
+  todos, así que las ventas no compiten por un solo candado y no se pierden
+  incrementos.
+- ``CandadoCompartido``: candado de lectores y escritor. Muchos hilos lo
+  toman en modo compartido a la vez (y el mismo hilo puede volver a
+  tomarlo); el modo exclusivo espera a que lo suelten todos.
+"""
+
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Any, Hashable, Iterator, List, Sequence
+
+
+class CandadosFranjas:
+    """
+    Candados por franja: la clave ``k`` usa el candado ``hash(k) % franjas``.
+
+    Args:
+        franjas: Cantidad de candados
+    """
+
+    def __init__(self, franjas: int = 64) -> None:
+        if franjas < 1:
+            raise ValueError("Se necesita al menos una franja")
+        self._candados = [threading.Lock() for _ in range(franjas)]
+
+    @contextmanager
+    def __call__(self, *claves: Hashable) -> Iterator[None]:
+        """
+        Toma los candados de todas las claves.
+
+        Se toman en orden de franja y sin repetir, de modo que dos hilos con
+        claves en común nunca se bloquean mutuamente.
+        """
+        franjas = sorted({hash(clave) % len(self._candados) for clave in claves})
+        tomados: List[threading.Lock] = []
+        try:
+            for franja in franjas:
+                candado = self._candados[franja]
+                candado.acquire()
+                tomados.append(candado)
+            yield
+        finally:
+            for candado in reversed(tomados):
+                candado.release()
+
+
+class ContadorFragmentado:
+    """
+    Varios contadores numéricos sumados por fragmentos.
+
+    Args:
+        campos: Cantidad de contadores (p. ej. 2 para ventas y valor)
+        fragmentos: Cantidad de fragmentos; los hilos se reparten entre ellos
+    """
+
+    def __init__(self, campos: int, fragmentos: int = 16) -> None:
+        self._campos = campos
+        self._fragmentos = [[0] * campos for _ in range(fragmentos)]
+        self._candados = [threading.Lock() for _ in range(fragmentos)]
+        self._turno = itertools.count()
+        self._hilo = threading.local()
+
+    def _indice(self) -> int:
+        indice = getattr(self._hilo, "indice", None)
+        if indice is None:
+            indice = self._hilo.indice = next(self._turno) % len(self._fragmentos)
+        return indice
+
+    def sumar(self, *valores: Any) -> None:
+        """Suma ``valores`` (uno por campo) en el fragmento de este hilo."""
+        indice = self._indice()
+        fragmento = self._fragmentos[indice]
+        with self._candados[indice]:
+            for campo, valor in enumerate(valores):
+                fragmento[campo] += valor
+
+    def leer(self) -> List[Any]:
+        """Totales de cada campo (suma de todos los fragmentos)."""
+        totales: List[Any] = [0] * self._campos
+        for candado, fragmento in zip(self._candados, self._fragmentos):
+            with candado:
+                for campo, valor in enumerate(fragmento):
+                    totales[campo] += valor
+        return totales
+
+    def fijar(self, valores: Sequence[Any]) -> None:
+        """Reemplaza los totales (quedan en el primer fragmento)."""
+        for candado in self._candados:
+            candado.acquire()
+        try:
+            for fragmento in self._fragmentos:
+                fragmento[:] = [0] * self._campos
+            self._fragmentos[0][:] = list(valores)
+        finally:
+            for candado in self._candados:
+                candado.release()
+
+
+class CandadoCompartido:
+    """Candado de lectores y escritor con modo compartido reentrante."""
+
+    def __init__(self) -> None:
+        self._condicion = threading.Condition()
+        self._compartidos = 0
+        self._exclusivo = False
+        self._esperando_exclusivo = 0
+        self._hilo = threading.local()
+
+    def tomado(self) -> bool:
+        """Si este hilo lo tiene en modo compartido."""
+        return getattr(self._hilo, "profundidad", 0) > 0
+
+    @contextmanager
+    def compartido(self) -> Iterator[None]:
+        profundidad = getattr(self._hilo, "profundidad", 0)
+        if profundidad == 0:
+            with self._condicion:
+                # sin reentrada, un escritor en espera tiene preferencia
+                self._condicion.wait_for(
+                    lambda: not self._exclusivo and not self._esperando_exclusivo
+                )
+                self._compartidos += 1
+        self._hilo.profundidad = profundidad + 1
+        try:
+            yield
+        finally:
+            self._hilo.profundidad = profundidad
+            if profundidad == 0:
+                with self._condicion:
+                    self._compartidos -= 1
+                    if not self._compartidos:
+                        self._condicion.notify_all()
+
+    @contextmanager
+    def exclusivo(self) -> Iterator[None]:
+        """
+        Toma el candado en exclusiva.
+
+        Raises:
+            RuntimeError: Si este hilo lo tiene en modo compartido
+        """
+        if self.tomado():
+            raise RuntimeError("No se puede pasar de compartido a exclusivo")
+        with self._condicion:
+            self._esperando_exclusivo += 1
+            try:
+                self._condicion.wait_for(
+                    lambda: not self._exclusivo and not self._compartidos
+                )
+            finally:
+                self._esperando_exclusivo -= 1
+            self._exclusivo = True
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._exclusivo = False
+                self._condicion.notify_all()
@@ -0,0 +1,446 @@
+"""
+Motor de descuentos: reglas con vigencia, niveles y tope, compiladas a una
+tabla de decisión.
+
+Una ``ReglaDescuento`` se aplica a los muebles de una clase de la jerarquía,
+nombrada en minúsculas en singular o en plural: "silla", "mesas" o una
+categoría como "asiento", que cubre a ``Silla``, ``Sofa`` y ``SofaCama``
+(sin categoría, a todos). Puede limitarse a una ventana de tiempo
+``[desde, hasta)``, exigir un mínimo de sillas (comedores completos) o,
+como regla de carrito, exigir que la compra lleve ciertas cantidades por
+categoría (``requiere={"mesa": 1, "silla": 4}``).
+
+Las reglas se combinan así:
+
+- De las reglas de un mismo ``grupo`` se aplica una sola: la de la clase
+  más cercana en el MRO del mueble y, a igual distancia, la de mayor
+  porcentaje. Con grupos se escriben niveles ("5% desde 4 sillas, 8% desde
+  6") y se respeta el orden de la herencia múltiple (``SofaCama(Sofa,
+  Cama)``). Los descuentos por categoría de ``aplicar_descuento`` forman
+  el grupo ``"categoria"``.
+- Los grupos distintos se suman, hasta el ``tope`` combinado.
+
+``MotorDescuentos`` compila las reglas vigentes en una tabla
+(clase, nivel de sillas) -> ``Resolucion``. Cada entrada se resuelve una
+sola vez y la tabla se descarta cuando cambian las reglas o el tiempo cruza
+el inicio o el fin de alguna; evaluar un mueble es una búsqueda en un
+diccionario. Las reglas de carrito solo cuentan en ``evaluar_carrito``,
+que suma a la clave el conjunto de reglas que la compra cumple. Cada
+resolución explica las reglas que aplicó.
+
+La tabla compilada se publica como un solo objeto, de modo que varios
+hilos evalúan sin candado; cambiar reglas y recompilar sí lo toman.
+"""
+
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime
+from typing import AbstractSet, Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Grupo de los descuentos por categoría de ``TiendaMuebles.aplicar_descuento``
+GRUPO_CATEGORIA = "categoria"
+
+
+def _fecha(segundos: float) -> str:
+    return datetime.fromtimestamp(segundos).strftime("%Y-%m-%d %H:%M")
+
+
+def _distancia(categoria: str, mro: Tuple[type, ...]) -> Optional[int]:
+    """Posición en ``mro`` de la clase llamada ``categoria`` (singular o plural)."""
+    for posicion, clase in enumerate(mro):
+        nombre = clase.__name__.lower()
+        if categoria == nombre or categoria == f"{nombre}s":
+            return posicion
+    return None
+
+
+def _sillas_de(mueble: Any) -> int:
+    """Cantidad de sillas de un comedor (0 para los demás muebles)."""
+    try:
+        return len(getattr(mueble, "sillas", ()))
+    except TypeError:
+        return 0
+
+
+class ReglaDescuento:
+    """
+    Regla de descuento porcentual.
+
+    Args:
+        nombre: Identificador de la regla (una regla con el mismo nombre la
+            reemplaza)
+        categoria: Clase a la que se aplica, en minúsculas y en singular o
+            plural; None para todos los muebles
+        porcentaje: Descuento entre 0 y 100
+        desde: Inicio de la vigencia (segundos Unix, incluido)
+        hasta: Fin de la vigencia (segundos Unix, excluido)
+        minimo_sillas: Sillas que debe tener el mueble (comedores)
+        grupo: Reglas excluyentes entre sí; por defecto, el nombre
+        requiere: Unidades mínimas por categoría que debe llevar el carrito
+            (solo se aplica al cobrar un carrito)
+
+    Raises:
+        ValueError: Si el porcentaje, la vigencia o los mínimos no son válidos
+    """
+
+    __slots__ = (
+        "nombre",
+        "categoria",
+        "porcentaje",
+        "desde",
+        "hasta",
+        "minimo_sillas",
+        "grupo",
+        "requiere",
+    )
+
+    def __init__(
+        self,
+        nombre: str,
+        categoria: Optional[str],
+        porcentaje: float,
+        desde: Optional[float] = None,
+        hasta: Optional[float] = None,
+        minimo_sillas: int = 0,
+        grupo: Optional[str] = None,
+        requiere: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        if not isinstance(nombre, str) or not nombre.strip():
+            raise ValueError("La regla necesita un nombre")
+        try:
+            valido = 0 <= porcentaje <= 100
+        except TypeError:
+            valido = False
+        if not valido:
+            raise ValueError(f"Porcentaje inválido: {porcentaje!r}")
+        if desde is not None and hasta is not None and hasta <= desde:
+            raise ValueError("La vigencia debe terminar después de empezar")
+        if minimo_sillas < 0:
+            raise ValueError("El mínimo de sillas no puede ser negativo")
+        if requiere is not None and any(n < 1 for n in requiere.values()):
+            raise ValueError("Las unidades requeridas deben ser positivas")
+        self.nombre = nombre.strip()
+        self.categoria = categoria.strip().lower() if categoria else None
+        self.porcentaje = porcentaje
+        self.desde = desde
+        self.hasta = hasta
+        self.minimo_sillas = minimo_sillas
+        self.grupo = grupo or self.nombre
+        self.requiere = (
+            {c.strip().lower(): n for c, n in requiere.items()} if requiere else None
+        )
+
+    def vigente(self, ahora: float) -> bool:
+        return (self.desde is None or self.desde <= ahora) and (
+            self.hasta is None or ahora < self.hasta
+        )
+
+    def distancia(self, mro: Tuple[type, ...]) -> Optional[int]:
+        """Posición en el MRO de la clase que nombra la regla (None si no aplica)."""
+        if self.categoria is None:
+            return len(mro)
+        return _distancia(self.categoria, mro)
+
+    def describir(self) -> str:
+        """Explicación legible de la regla."""
+        partes = [f"{self.nombre}: {self.porcentaje:g}%"]
+        if self.categoria is not None:
+            partes.append(f"en {self.categoria}")
+        if self.minimo_sillas:
+            partes.append(f"con {self.minimo_sillas}+ sillas")
+        if self.requiere:
+            unidades = ", ".join(f"{n} {c}" for c, n in self.requiere.items())
+            partes.append(f"si el carrito lleva {unidades}")
+        if self.desde is not None:
+            partes.append(f"desde {_fecha(self.desde)}")
+        if self.hasta is not None:
+            partes.append(f"hasta {_fecha(self.hasta)}")
+        return " ".join(partes)
+
+    def a_dict(self) -> Dict[str, Any]:
+        """Forma serializable (JSON) de la regla."""
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+    @classmethod
+    def desde_dict(cls, datos: Mapping[str, Any]) -> "ReglaDescuento":
+        return cls(**datos)
+
+
+class Resolucion:
+    """
+    Descuento resuelto para una clase de mueble.
+
+    Attributes:
+        porcentaje: Descuento total tras el tope
+        reglas: Nombres de las reglas aplicadas
+        explicacion: Una línea por regla aplicada (y por el tope, si actuó)
+    """
+
+    __slots__ = ("porcentaje", "reglas", "explicacion")
+
+    def __init__(
+        self, porcentaje: float, reglas: Tuple[str, ...], explicacion: Tuple[str, ...]
+    ) -> None:
+        self.porcentaje = porcentaje
+        self.reglas = reglas
+        self.explicacion = explicacion
+
+    def __repr__(self) -> str:
+        return f"Resolucion({self.porcentaje!r}, {list(self.reglas)!r})"
+
+
+_SIN_DESCUENTO = Resolucion(0, (), ())
+
+
+class _Compilado:
+    """Reglas vigentes en un intervalo y la tabla de resoluciones que se llena."""
+
+    __slots__ = ("tabla", "vigentes", "de_carrito", "niveles", "tope", "desde", "hasta")
+
+    def __init__(
+        self,
+        vigentes: List[ReglaDescuento],
+        tope: float,
+        desde: float = float("inf"),
+        hasta: float = float("-inf"),
+    ) -> None:
+        self.tabla: Dict[Tuple[type, int, AbstractSet[str]], Resolucion] = {}
+        self.vigentes = vigentes
+        self.de_carrito = [r for r in vigentes if r.requiere]
+        self.niveles = sorted({r.minimo_sillas for r in vigentes} - {0})
+        self.tope = tope
+        self.desde = desde
+        self.hasta = hasta
+
+    def valido(self, ahora: float) -> bool:
+        return self.desde <= ahora < self.hasta
+
+
+class MotorDescuentos:
+    """
+    Reglas de descuento compiladas a una tabla de decisión.
+
+    Args:
+        tope: Porcentaje máximo combinado
+    """
+
+    def __init__(self, tope: float = 100) -> None:
+        self._reglas: Dict[str, ReglaDescuento] = {}
+        self._categorias: Dict[str, ReglaDescuento] = {}
+        self._candado = threading.Lock()
+        self.fijar_tope(tope)
+
+    # --- Definición ---
+
+    @property
+    def reglas(self) -> List[ReglaDescuento]:
+        """Reglas agregadas con ``agregar`` (sin las de categoría)."""
+        return list(self._reglas.values())
+
+    @property
+    def tope(self) -> float:
+        return self._tope
+
+    def fijar_tope(self, tope: float) -> None:
+        """
+        Cambia el porcentaje máximo combinado.
+
+        Raises:
+            ValueError: Si no está entre 0 y 100
+        """
+        try:
+            valido = 0 <= tope <= 100
+        except TypeError:
+            valido = False
+        if not valido:
+            raise ValueError(f"Tope inválido: {tope!r}")
+        with self._candado:
+            self._tope = tope
+            self._invalidar()
+
+    def agregar(self, regla: ReglaDescuento) -> None:
+        """Agrega una regla o reemplaza la del mismo nombre."""
+        with self._candado:
+            self._reglas[regla.nombre] = regla
+            self._invalidar()
+
+    def quitar(self, nombre: str) -> bool:
+        """Quita una regla; False si no existía."""
+        with self._candado:
+            if self._reglas.pop(nombre, None) is None:
+                return False
+            self._invalidar()
+            return True
+
+    def definir_categorias(self, descuentos: Mapping[str, float]) -> None:
+        """
+        Reemplaza los descuentos por categoría (``{"silla": 10, ...}``).
+
+        Cada uno es una regla del grupo ``GRUPO_CATEGORIA`` con el porcentaje
+        truncado a entero, como los aplicaba ``realizar_venta``.
+        """
+        categorias = {
+            clave: ReglaDescuento(
+                f"categoría {clave}", clave, int(porcentaje), grupo=GRUPO_CATEGORIA
+            )
+            for clave, porcentaje in descuentos.items()
+        }
+        with self._candado:
+            self._categorias = categorias
+            self._invalidar()
+
+    # --- Compilación ---
+
+    def _invalidar(self) -> None:
+        # se llama con el candado tomado
+        self._compilado = _Compilado([], self._tope)
+
+    def _vigente(self, ahora: float) -> _Compilado:
+        """Tabla compilada válida en ``ahora``; la recompila si hace falta."""
+        compilado = self._compilado
+        if compilado.valido(ahora):
+            return compilado
+        with self._candado:
+            if not self._compilado.valido(ahora):
+                self._compilado = self._compilar(ahora)
+            return self._compilado
+
+    def _compilar(self, ahora: float) -> _Compilado:
+        """Selecciona las reglas vigentes en ``ahora`` y el intervalo en que lo son."""
+        todas = list(self._categorias.values()) + list(self._reglas.values())
+        desde, hasta = float("-inf"), float("inf")
+        for regla in todas:
+            for limite in (regla.desde, regla.hasta):
+                if limite is None:
+                    continue
+                if limite <= ahora:
+                    desde = max(desde, limite)
+                else:
+                    hasta = min(hasta, limite)
+        vigentes = [r for r in todas if r.vigente(ahora)]
+        return _Compilado(vigentes, self._tope, desde, hasta)
+
+    def _resolver(
+        self,
+        compilado: _Compilado,
+        clase: type,
+        sillas: int,
+        de_carrito: AbstractSet[str],
+    ) -> Resolucion:
+        """
+        Combina las reglas vigentes para una clase con ``sillas`` sillas.
+
+        De las reglas de carrito solo entran las de ``de_carrito``.
+        """
+        mro = getattr(clase, "__mro__", (clase,))
+        elegidas: Dict[str, Tuple[int, ReglaDescuento]] = {}
+        for regla in compilado.vigentes:
+            if regla.minimo_sillas > sillas:
+                continue
+            if regla.requiere and regla.nombre not in de_carrito:
+                continue
+            distancia = regla.distancia(mro)
+            if distancia is None:
+                continue
+            actual = elegidas.get(regla.grupo)
+            if actual is None or (distancia, -regla.porcentaje) < (
+                actual[0],
+                -actual[1].porcentaje,
+            ):
+                elegidas[regla.grupo] = (distancia, regla)
+        if not elegidas:
+            return _SIN_DESCUENTO
+        aplicadas = [regla for _, regla in elegidas.values() if regla.porcentaje]
+        total = sum(regla.porcentaje for regla in aplicadas)
+        explicacion = [regla.describir() for regla in aplicadas]
+        if total > compilado.tope:
+            explicacion.append(f"tope combinado: {total:g}% -> {compilado.tope:g}%")
+            total = compilado.tope
+        return Resolucion(total, tuple(r.nombre for r in aplicadas), tuple(explicacion))
+
+    # --- Evaluación ---
+
+    def evaluar(
+        self,
+        mueble: Any,
+        ahora: Optional[float] = None,
+        de_carrito: AbstractSet[str] = frozenset(),
+    ) -> Resolucion:
+        """
+        Descuento que corresponde a un mueble.
+
+        Usa ``__class__`` para respetar los mocks con ``spec``.
+
+        Args:
+            mueble: Mueble o comedor a evaluar
+            ahora: Momento de la evaluación (segundos Unix; por defecto, ahora)
+            de_carrito: Reglas de carrito que cumple la compra (``frozenset``)
+
+        Returns:
+            Resolucion: Porcentaje total y reglas aplicadas
+        """
+        if ahora is None:
+            ahora = time.time()
+        compilado = self._vigente(ahora)
+        niveles = compilado.niveles
+        nivel = bisect_right(niveles, _sillas_de(mueble)) if niveles else 0
+        clave = (getattr(mueble, "__class__", type(mueble)), nivel, de_carrito)
+        resolucion = compilado.tabla.get(clave)
+        if resolucion is None:
+            # dos hilos pueden resolver la misma clave: el resultado es igual
+            sillas = niveles[nivel - 1] if nivel else 0
+            resolucion = compilado.tabla[clave] = self._resolver(
+                compilado, clave[0], sillas, de_carrito
+            )
+        return resolucion
+
+    def evaluar_lote(
+        self, muebles: Iterable[Any], ahora: Optional[float] = None
+    ) -> List[Resolucion]:
+        """
+        Evalúa muchos muebles (un carrito o el inventario) en un mismo instante.
+
+        Returns:
+            list: Una ``Resolucion`` por mueble, en el mismo orden
+        """
+        if ahora is None:
+            ahora = time.time()
+        return [self.evaluar(mueble, ahora) for mueble in muebles]
+
+    def evaluar_carrito(
+        self, muebles: Iterable[Any], ahora: Optional[float] = None
+    ) -> List[Resolucion]:
+        """
+        Evalúa las líneas de un carrito, con las reglas de carrito que cumple.
+
+        Las unidades por categoría se cuentan una vez por clase distinta.
+
+        Returns:
+            list: Una ``Resolucion`` por línea, en el mismo orden
+        """
+        muebles = list(muebles)
+        if ahora is None:
+            ahora = time.time()
+        compilado = self._vigente(ahora)
+        de_carrito: AbstractSet[str] = frozenset()
+        if compilado.de_carrito:
+            por_clase: Dict[type, int] = {}
+            for mueble in muebles:
+                clase = getattr(mueble, "__class__", type(mueble))
+                por_clase[clase] = por_clase.get(clase, 0) + 1
+            mros = {c: getattr(c, "__mro__", (c,)) for c in por_clase}
+            de_carrito = frozenset(
+                regla.nombre
+                for regla in compilado.de_carrito
+                if all(
+                    sum(
+                        n
+                        for clase, n in por_clase.items()
+                        if _distancia(categoria, mros[clase]) is not None
+                    )
+                    >= minimo
+                    for categoria, minimo in regla.requiere.items()
+                )
+            )
+        return [self.evaluar(mueble, ahora, de_carrito) for mueble in muebles]
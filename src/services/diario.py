@@ -0,0 +1,266 @@
+"""
+Diario de ventas: registro durable, solo de anexado, con commit en grupo.
+
+Cada venta que confirma ``TiendaMuebles.realizar_venta`` se anexa a un
+archivo como un marco binario:
+
+    longitud (u32) | crc32 del contenido (u32) | contenido JSON (UTF-8)
+
+``registrar`` serializa el registro y lo deja en una cola. Un hilo
+escritor junta todo lo que llega durante la ventana de durabilidad y lo
+escribe con un solo ``write`` y un solo ``fsync``. Una venta está
+confirmada (sobrevive a una caída) cuando el ``fsync`` de su grupo
+terminó; ``esperar`` bloquea hasta ese momento.
+
+Por defecto el diario es síncrono: ``registrar`` no devuelve la secuencia
+hasta que la venta está confirmada, así que nada de lo que la tienda da
+por vendido se pierde en una caída. Las cajas concurrentes siguen
+compartiendo ``fsync``: las ventas que llegan mientras se escribe un grupo
+salen juntas en el siguiente. Con ``sincrono=False`` la venta vuelve en
+microsegundos sin esperar al disco, a cambio de que una caída pierda hasta
+una ventana de durabilidad de ventas ya devueltas.
+
+Al abrir un diario existente se descarta la cola rota que pudo dejar una
+caída a mitad de escritura (un marco incompleto o con checksum inválido),
+de modo que los marcos nuevos siguen siendo legibles.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_MARCO = struct.Struct("<II")
+
+# Un marco más grande que esto se trata como basura al leer
+_MAXIMO_CONTENIDO = 1 << 20
+
+
+def _marcos(ruta: str) -> Iterator[Tuple[int, bytes]]:
+    """
+    Contenido de los marcos válidos con el desplazamiento donde termina cada uno.
+
+    Se detiene en el primer marco incompleto o con checksum inválido.
+    """
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    posicion = 0
+    while posicion + _MARCO.size <= len(datos):
+        longitud, crc = _MARCO.unpack_from(datos, posicion)
+        inicio = posicion + _MARCO.size
+        fin = inicio + longitud
+        if longitud > _MAXIMO_CONTENIDO or fin > len(datos):
+            return
+        contenido = datos[inicio:fin]
+        if zlib.crc32(contenido) != crc:
+            return
+        yield fin, contenido
+        posicion = fin
+
+
+def leer_ventas(ruta: str) -> Iterator[Dict[str, Any]]:
+    """
+    Ventas guardadas en un diario, en orden.
+
+    Args:
+        ruta: Archivo del diario
+
+    Returns:
+        Iterator: Registros de venta hasta el primer marco dañado
+    """
+    for _, contenido in _marcos(ruta):
+        yield json.loads(contenido)
+
+
+class DiarioVentas:
+    """
+    Escritor del diario de ventas con commit en grupo.
+
+    Args:
+        ruta: Archivo del diario (se crea si no existe)
+        ventana: Segundos que el escritor espera para juntar ventas antes de
+            cada ``fsync``. Cero sincroniza en cuanto el hilo despierta.
+        maximo_grupo: Ventas que cierran un grupo antes de agotar la ventana
+        sincrono: Si ``registrar`` espera el ``fsync`` de su venta. Con False
+            una caída puede perder hasta una ventana de ventas ya devueltas.
+    """
+
+    def __init__(
+        self,
+        ruta: str,
+        ventana: float = 0.002,
+        maximo_grupo: int = 1000,
+        sincrono: bool = True,
+    ) -> None:
+        if ventana < 0:
+            raise ValueError("La ventana de durabilidad no puede ser negativa")
+        if maximo_grupo < 1:
+            raise ValueError("El grupo debe admitir al menos una venta")
+        self.ruta = ruta
+        self.ventana = ventana
+        self.maximo_grupo = maximo_grupo
+        self.sincrono = sincrono
+        self._descriptor, existentes = self._abrir()
+        self._condicion = threading.Condition()
+        self._pendientes: List[bytes] = []
+        # las secuencias continúan la numeración de las ventas ya guardadas
+        self._secuencia = existentes  # última secuencia entregada
+        self._confirmada = existentes  # última secuencia con fsync
+        self._grupos = 0
+        self._urgente = False
+        self._cerrando = False
+        self._error: Optional[BaseException] = None
+        self._escritor = threading.Thread(
+            target=self._escribir, name="diario-ventas", daemon=True
+        )
+        self._escritor.start()
+
+    def _abrir(self) -> Tuple[int, int]:
+        """
+        Abre el diario para anexar, cortando la cola rota si la hay.
+
+        Returns:
+            tuple: (descriptor, cantidad de ventas ya guardadas)
+        """
+        valido = existentes = 0
+        if os.path.exists(self.ruta):
+            for valido, _ in _marcos(self.ruta):
+                existentes += 1
+        descriptor = os.open(self.ruta, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        if os.fstat(descriptor).st_size > valido:
+            os.ftruncate(descriptor, valido)
+            os.fsync(descriptor)
+        return descriptor, existentes
+
+    def __enter__(self) -> "DiarioVentas":
+        return self
+
+    def __exit__(self, *excepcion: Any) -> None:
+        self.cerrar()
+
+    # --- Productor (hilo de la venta) ---
+
+    def registrar(self, venta: Dict[str, Any]) -> int:
+        """
+        Encola una venta y devuelve su número de secuencia.
+
+        Si el diario es síncrono vuelve cuando la venta ya está en disco; si
+        no, vuelve enseguida y para saber que es durable se llama a
+        ``esperar`` con la secuencia devuelta.
+
+        Raises:
+            RuntimeError: Si el diario está cerrado o el escritor falló
+        """
+        contenido = json.dumps(venta, ensure_ascii=False, default=str).encode()
+        marco = _MARCO.pack(len(contenido), zlib.crc32(contenido)) + contenido
+        with self._condicion:
+            self._verificar()
+            self._pendientes.append(marco)
+            self._secuencia += 1
+            secuencia = self._secuencia
+            if len(self._pendientes) == 1 or len(self._pendientes) >= self.maximo_grupo:
+                self._condicion.notify_all()
+        if self.sincrono:
+            self.esperar(secuencia)
+        return secuencia
+
+    def esperar(
+        self, secuencia: Optional[int] = None, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Bloquea hasta que la venta ``secuencia`` (o todas) esté en disco.
+
+        Pide al escritor que no agote la ventana: quien espera ya pagó la
+        latencia y no tiene sentido retrasarlo más.
+
+        Returns:
+            bool: False si se agotó ``timeout`` antes de la confirmación
+
+        Raises:
+            RuntimeError: Si el escritor falló
+        """
+        with self._condicion:
+            objetivo = self._secuencia if secuencia is None else secuencia
+            if self._confirmada < objetivo:
+                self._urgente = True
+                self._condicion.notify_all()
+            confirmado = self._condicion.wait_for(
+                lambda: self._confirmada >= objetivo or self._error is not None,
+                timeout,
+            )
+            if self._error is not None:
+                raise RuntimeError(
+                    "El diario de ventas dejó de escribir"
+                ) from self._error
+            return confirmado
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente, detiene el escritor y cierra el archivo."""
+        with self._condicion:
+            if self._cerrando:
+                return
+            self._cerrando = True
+            self._condicion.notify_all()
+        self._escritor.join()
+        os.close(self._descriptor)
+
+    def estadisticas(self) -> Dict[str, int]:
+        """
+        Contadores del diario.
+
+        Returns:
+            dict: {"ventas": int, "confirmadas": int, "grupos": int}
+        """
+        with self._condicion:
+            return {
+                "ventas": self._secuencia,
+                "confirmadas": self._confirmada,
+                "grupos": self._grupos,
+            }
+
+    def _verificar(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("El diario de ventas dejó de escribir") from self._error
+        if self._cerrando:
+            raise RuntimeError("El diario de ventas está cerrado")
+
+    # --- Escritor (hilo propio) ---
+
+    def _escribir(self) -> None:
+        condicion = self._condicion
+        while True:
+            with condicion:
+                condicion.wait_for(lambda: self._pendientes or self._cerrando)
+                if not self._pendientes:
+                    return
+                # ventana de durabilidad: dejar que otras ventas se sumen al grupo
+                limite = time.monotonic() + self.ventana
+                while not (
+                    self._urgente
+                    or self._cerrando
+                    or len(self._pendientes) >= self.maximo_grupo
+                ):
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        break
+                    condicion.wait(restante)
+                grupo, self._pendientes = self._pendientes, []
+                ultima = self._secuencia
+                self._urgente = False
+            try:
+                datos = memoryview(b"".join(grupo))
+                while datos:
+                    datos = datos[os.write(self._descriptor, datos) :]
+                os.fsync(self._descriptor)
+            except OSError as error:
+                with condicion:
+                    self._error = error
+                    condicion.notify_all()
+                return
+            with condicion:
+                self._confirmada = ultima
+                self._grupos += 1
+                condicion.notify_all()
@@ -0,0 +1,77 @@
+"""
+Escritura de texto por trozos en archivos, sockets o cualquier flujo.
+
+Los reportes grandes se producen como fragmentos (ver
+``TiendaMuebles.iterar_reporte_inventario``). Aquí se escriben a medida que
+llegan, agrupados en trozos de al menos ``TAMAÑO_TROZO`` caracteres para no
+hacer una llamada a ``write`` por línea, sin juntar nunca el texto entero:
+la memoria depende del tamaño del trozo y de los fragmentos, no del total.
+
+El destino puede ser una ruta (se abre en UTF-8; con ``.gz`` o
+``comprimir=True`` se escribe con gzip) o un objeto con ``write``: un
+archivo abierto, un ``io.StringIO`` o ``socket.makefile("w")``. Para
+comprimir hacia un objeto ya abierto este debe aceptar bytes
+(``socket.makefile("wb")``, un archivo en modo ``"wb"``).
+"""
+
+import gzip
+import io
+from typing import IO, Any, Iterable, List, Optional, Union
+
+# Caracteres acumulados antes de cada write
+TAMAÑO_TROZO = 64 * 1024
+
+
+def _escribir(fragmentos: Iterable[str], flujo: IO[str], tamaño_trozo: int) -> int:
+    escritos = 0
+    trozo: List[str] = []
+    acumulado = 0
+    for fragmento in fragmentos:
+        trozo.append(fragmento)
+        trozo.append("\n")
+        acumulado += len(fragmento) + 1
+        if acumulado >= tamaño_trozo:
+            flujo.write("".join(trozo))
+            escritos += acumulado
+            trozo, acumulado = [], 0
+    if trozo:
+        flujo.write("".join(trozo))
+        escritos += acumulado
+    return escritos
+
+
+def escribir_fragmentos(
+    fragmentos: Iterable[str],
+    destino: Union[str, IO[Any]],
+    comprimir: Optional[bool] = None,
+    tamaño_trozo: int = TAMAÑO_TROZO,
+) -> int:
+    """
+    Escribe cada fragmento seguido de un salto de línea, por trozos.
+
+    Args:
+        fragmentos: Texto a escribir (se consume de a uno)
+        destino: Ruta o flujo con ``write``; un flujo no se cierra
+        comprimir: Escribir con gzip (None: solo si la ruta termina en ``.gz``)
+        tamaño_trozo: Caracteres mínimos por llamada a ``write``
+
+    Returns:
+        int: Caracteres escritos, antes de comprimir
+    """
+    if isinstance(destino, str):
+        if comprimir is None:
+            comprimir = destino.endswith(".gz")
+        if comprimir:
+            with gzip.open(destino, "wt", encoding="utf-8") as archivo:
+                return _escribir(fragmentos, archivo, tamaño_trozo)
+        with open(destino, "w", encoding="utf-8") as archivo:
+            return _escribir(fragmentos, archivo, tamaño_trozo)
+    if comprimir:
+        # cerrar el GzipFile escribe el final del gzip pero no cierra destino
+        with gzip.GzipFile(fileobj=destino, mode="wb") as comprimido:
+            with io.TextIOWrapper(comprimido, encoding="utf-8") as flujo:
+                return _escribir(fragmentos, flujo, tamaño_trozo)
+    escritos = _escribir(fragmentos, destino, tamaño_trozo)
+    if hasattr(destino, "flush"):
+        destino.flush()
+    return escritos
@@ -0,0 +1,433 @@
+"""
+Instantánea binaria del catálogo, leída con ``mmap``.
+
+Guarda el inventario, los descuentos y los contadores de ventas en un único
+archivo para que un reinicio no tenga que reconstruir el catálogo:
+
+    cabecera | registros de ancho fijo | tabla de cadenas | metadatos JSON
+
+Cada registro ocupa ``16 + 8 * campos`` bytes: el código de tipo, el precio
+final y un hueco de 8 bytes por parámetro del constructor (entero, flotante,
+booleano o índice en la tabla de cadenas; -1 es ``None``). La tabla de
+cadenas guarda cada texto distinto una sola vez (UTF-8 más una tabla de
+desplazamientos), lo que aprovecha que materiales y colores se repiten.
+
+Al cargarla el archivo se mapea en memoria y el inventario queda con carga
+diferida: cada mueble es un ``MuebleDiferido`` que lee sus campos directo
+del mapa y solo construye el objeto real cuando alguien lo usa más allá de
+nombre, material, color, tapizado y precio.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from src.models.cadenas import internar
+from src.models.mueble import Mueble
+from src.services.catalogo import TIPOS_MUEBLE, campos_de, mueble_a_registro
+
+if TYPE_CHECKING:
+    from src.services.tienda import TiendaMuebles
+
+_MAGICO = b"MUEBLES\x00"
+_VERSION = 1
+# mágico, versión, ancho de registro, registros, inicio y tamaño de la tabla
+# de cadenas, inicio y largo de los metadatos
+_CABECERA = struct.Struct("<8sIIQQQQQ")
+# código de tipo y precio final
+_PREFIJO = struct.Struct("<B7xd")
+_DESPLAZAMIENTOS = struct.Struct("<QQ")
+
+_CODIGOS = {str: "q", int: "q", float: "d", bool: "?7x"}
+_NOMBRES_TIPO = {str: "str", int: "int", float: "float", bool: "bool"}
+_TIPOS_POR_NOMBRE = {nombre: tipo for tipo, nombre in _NOMBRES_TIPO.items()}
+_LECTORES = {tipo: struct.Struct("<" + codigo) for tipo, codigo in _CODIGOS.items()}
+
+
+class _Disposicion:
+    """Distribución de los campos de un tipo de mueble dentro del registro."""
+
+    __slots__ = ("clase", "campos", "estructura", "posiciones")
+
+    def __init__(self, clase: type, campos: List[Tuple[str, type]], ancho: int):
+        self.clase = clase
+        self.campos = campos
+        relleno = ancho - _PREFIJO.size - 8 * len(campos)
+        self.estructura = struct.Struct(
+            "<B7xd" + "".join(_CODIGOS[tipo] for _, tipo in campos) + f"{relleno}x"
+        )
+        self.posiciones = {
+            nombre: (_PREFIJO.size + 8 * i, tipo)
+            for i, (nombre, tipo) in enumerate(campos)
+        }
+
+
+def _ancho_registro(campos_por_tipo: List[List[Tuple[str, type]]]) -> int:
+    return _PREFIJO.size + 8 * max((len(c) for c in campos_por_tipo), default=0)
+
+
+def guardar_instantanea(
+    tienda: "TiendaMuebles", ruta: str, extra: Optional[Dict[str, Any]] = None
+) -> Dict[str, int]:
+    """
+    Escribe la instantánea de la tienda en ``ruta``.
+
+    Se escribe en un archivo temporal que luego reemplaza al destino, así
+    que una instantánea mapeada por otra tienda sigue siendo válida. Los
+    muebles que no son de un tipo de ``TIPOS_MUEBLE`` (o que tienen un
+    campo numérico vacío) se omiten.
+
+    Args:
+        tienda: Tienda a guardar
+        ruta: Archivo destino
+        extra: Datos propios del llamador; se leen en ``metadatos["extra"]``
+
+    Returns:
+        dict: {"muebles": int, "omitidos": int, "cadenas": int, "bytes": int}
+    """
+    tipos = list(TIPOS_MUEBLE)
+    campos = [campos_de(TIPOS_MUEBLE[t]) for t in tipos]
+    ancho = _ancho_registro(campos)
+    disposiciones = [
+        _Disposicion(TIPOS_MUEBLE[t], c, ancho) for t, c in zip(tipos, campos)
+    ]
+    codigo_de = {t: i for i, t in enumerate(tipos)}
+    cadenas: Dict[str, int] = {}
+    muebles = omitidos = total_centavos = 0
+    por_tipo: Dict[str, int] = {}
+
+    def indice_cadena(texto: Any) -> int:
+        if texto is None:
+            return -1
+        indice = cadenas.get(texto)
+        if indice is None:
+            indice = cadenas[texto] = len(cadenas)
+        return indice
+
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(bytes(_CABECERA.size))
+        for item, precio in tienda.inventario.items_con_precio():
+            try:
+                registro = (
+                    item.a_registro()
+                    if type(item) is MuebleDiferido
+                    else mueble_a_registro(item)
+                )
+                codigo = codigo_de[registro["tipo"]]
+                valores = [
+                    indice_cadena(registro[c]) if tipo is str else tipo(registro[c])
+                    for c, tipo in disposiciones[codigo].campos
+                ]
+            except (ValueError, TypeError, KeyError):
+                omitidos += 1
+                continue
+            archivo.write(
+                disposiciones[codigo].estructura.pack(
+                    codigo, math.nan if precio is None else precio, *valores
+                )
+            )
+            muebles += 1
+            por_tipo[registro["tipo"]] = por_tipo.get(registro["tipo"], 0) + 1
+            if precio is not None:
+                total_centavos += round(precio * 100)
+
+        inicio_cadenas = archivo.tell()
+        codificadas = [texto.encode("utf-8") for texto in cadenas]
+        desplazamiento = 0
+        tabla = bytearray()
+        for texto in codificadas:
+            tabla += desplazamiento.to_bytes(8, "little")
+            desplazamiento += len(texto)
+        tabla += desplazamiento.to_bytes(8, "little")
+        archivo.write(tabla)
+        for texto in codificadas:
+            archivo.write(texto)
+
+        inicio_meta = archivo.tell()
+        metadatos = json.dumps(
+            {
+                "tienda": tienda.exportar_estado(),
+                "tipos": [
+                    {
+                        "tipo": t,
+                        "campos": [[n, _NOMBRES_TIPO[k]] for n, k in c],
+                    }
+                    for t, c in zip(tipos, campos)
+                ],
+                "total_centavos": total_centavos,
+                "por_tipo": por_tipo,
+                "extra": extra or {},
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        archivo.write(metadatos)
+        tamaño = archivo.tell()
+
+        archivo.seek(0)
+        archivo.write(
+            _CABECERA.pack(
+                _MAGICO,
+                _VERSION,
+                ancho,
+                muebles,
+                inicio_cadenas,
+                len(cadenas),
+                inicio_meta,
+                len(metadatos),
+            )
+        )
+        # en disco antes del reemplazo: una caída no deja la instantánea a medias
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+    return {
+        "muebles": muebles,
+        "omitidos": omitidos,
+        "cadenas": len(cadenas),
+        "bytes": tamaño,
+    }
+
+
+class Instantanea:
+    """
+    Vista de solo lectura sobre una instantánea mapeada en memoria.
+
+    Los textos se decodifican la primera vez que se leen y se guardan en
+    el pool de cadenas compartido.
+    """
+
+    def __init__(self, ruta: str) -> None:
+        """
+        Args:
+            ruta: Archivo escrito por ``guardar_instantanea``
+
+        Raises:
+            ValueError: Si el archivo no es una instantánea válida
+        """
+        with open(ruta, "rb") as archivo:
+            tamaño = os.fstat(archivo.fileno()).st_size
+            if tamaño < _CABECERA.size:
+                raise ValueError(f"{ruta!r} no es una instantánea de catálogo")
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magico,
+            version,
+            self._ancho,
+            self._registros,
+            self._inicio_cadenas,
+            cantidad_cadenas,
+            inicio_meta,
+            largo_meta,
+        ) = _CABECERA.unpack_from(self._mapa, 0)
+        if magico != _MAGICO or version != _VERSION:
+            raise ValueError(f"{ruta!r} no es una instantánea de catálogo")
+        if inicio_meta + largo_meta > tamaño:
+            raise ValueError(f"La instantánea {ruta!r} está truncada")
+        self.metadatos: Dict[str, Any] = json.loads(
+            self._mapa[inicio_meta : inicio_meta + largo_meta].decode("utf-8")
+        )
+        self._inicio_textos = self._inicio_cadenas + 8 * (cantidad_cadenas + 1)
+        self._cadenas: List[Optional[str]] = [None] * cantidad_cadenas
+        self._disposiciones = []
+        for tipo in self.metadatos["tipos"]:
+            campos = [(n, _TIPOS_POR_NOMBRE[k]) for n, k in tipo["campos"]]
+            clase = TIPOS_MUEBLE.get(tipo["tipo"])
+            if clase is None:
+                raise ValueError(
+                    f"Tipo de mueble desconocido en {ruta!r}: {tipo['tipo']}"
+                )
+            self._disposiciones.append(_Disposicion(clase, campos, self._ancho))
+        self.materializados = 0
+
+    def __len__(self) -> int:
+        return self._registros
+
+    def _inicio(self, fila: int) -> int:
+        if not 0 <= fila < self._registros:
+            raise IndexError(fila)
+        return _CABECERA.size + fila * self._ancho
+
+    def cadena(self, indice: int) -> Optional[str]:
+        """Texto ``indice`` de la tabla de cadenas (``None`` para -1)."""
+        if indice < 0:
+            return None
+        texto = self._cadenas[indice]
+        if texto is None:
+            desde, hasta = _DESPLAZAMIENTOS.unpack_from(
+                self._mapa, self._inicio_cadenas + 8 * indice
+            )
+            inicio = self._inicio_textos
+            texto = internar(self._mapa[inicio + desde : inicio + hasta].decode())
+            self._cadenas[indice] = texto
+        return texto
+
+    def disposicion(self, fila: int) -> _Disposicion:
+        return self._disposiciones[self._mapa[self._inicio(fila)]]
+
+    def clase(self, fila: int) -> type:
+        """Clase concreta del mueble de una fila."""
+        return self.disposicion(fila).clase
+
+    def precio(self, fila: int) -> Optional[float]:
+        """Precio final guardado (``None`` si no se pudo calcular al guardar)."""
+        precio = _PREFIJO.unpack_from(self._mapa, self._inicio(fila))[1]
+        return None if math.isnan(precio) else precio
+
+    def campo(self, fila: int, nombre: str) -> Any:
+        """
+        Lee un campo de una fila sin construir el mueble.
+
+        Raises:
+            AttributeError: Si el tipo de la fila no tiene ese campo
+        """
+        if not 0 <= fila < self._registros:
+            raise IndexError(fila)
+        inicio = _CABECERA.size + fila * self._ancho
+        disposicion = self._disposiciones[self._mapa[inicio]]
+        posicion = disposicion.posiciones.get(nombre)
+        if posicion is None:
+            raise AttributeError(nombre)
+        desplazamiento, tipo = posicion
+        valor = _LECTORES[tipo].unpack_from(self._mapa, inicio + desplazamiento)[0]
+        return self.cadena(valor) if tipo is str else valor
+
+    def registro(self, fila: int) -> Dict[str, Any]:
+        """Registro plano de una fila, como ``mueble_a_registro``."""
+        inicio = self._inicio(fila)
+        disposicion = self._disposiciones[self._mapa[inicio]]
+        valores = disposicion.estructura.unpack_from(self._mapa, inicio)[2:]
+        registro = {"tipo": disposicion.clase.__name__}
+        for (nombre, tipo), valor in zip(disposicion.campos, valores):
+            registro[nombre] = self.cadena(valor) if tipo is str else valor
+        return registro
+
+    def materializar(self, fila: int) -> Any:
+        """Construye el mueble real de una fila."""
+        registro = self.registro(fila)
+        clase = TIPOS_MUEBLE[registro.pop("tipo")]
+        self.materializados += 1
+        return clase(**registro)
+
+    def pares(self) -> Iterator[Tuple["MuebleDiferido", Optional[float]]]:
+        """Un ``MuebleDiferido`` por fila con su precio final."""
+        for fila in range(self._registros):
+            yield MuebleDiferido(self, fila), self.precio(fila)
+
+
+def _campo_rapido(nombre: str) -> property:
+    """Propiedad de ``MuebleDiferido`` que lee ``nombre`` del registro mapeado."""
+
+    def leer(self: "MuebleDiferido") -> Any:
+        objeto = self._objeto
+        if objeto is None:
+            # si el tipo no guarda el campo, ``__getattr__`` decide si el
+            # atributo existe (hay que construir el mueble) o no (p. ej. el
+            # tapizado de una Mesa)
+            return self._instantanea.campo(self._fila, nombre)
+        return getattr(objeto, nombre)
+
+    return property(leer)
+
+
+class MuebleDiferido:
+    """
+    Representante perezoso de un mueble guardado en una instantánea.
+
+    ``__class__`` devuelve la clase real, de modo que ``isinstance`` y los
+    índices por tipo lo tratan como el mueble que representa. Nombre,
+    material, color, tapizado, precio y ``str`` se leen del registro; para
+    cualquier otro atributo, método o asignación se construye el mueble una
+    sola vez y se delega en él.
+    """
+
+    __slots__ = ("_instantanea", "_fila", "_objeto")
+
+    nombre = _campo_rapido("nombre")
+    material = _campo_rapido("material")
+    color = _campo_rapido("color")
+    material_tapizado = _campo_rapido("material_tapizado")
+
+    def __init__(self, instantanea: Instantanea, fila: int) -> None:
+        object.__setattr__(self, "_instantanea", instantanea)
+        object.__setattr__(self, "_fila", fila)
+        object.__setattr__(self, "_objeto", None)
+
+    @property
+    def __class__(self) -> type:  # type: ignore[override]
+        if self._objeto is not None:
+            return self._objeto.__class__
+        return self._instantanea.clase(self._fila)
+
+    @property
+    def materializado(self) -> bool:
+        """Si ya se construyó el mueble real."""
+        return self._objeto is not None
+
+    def materializar(self) -> Any:
+        """Devuelve el mueble real, construyéndolo la primera vez."""
+        objeto = self._objeto
+        if objeto is None:
+            objeto = self._instantanea.materializar(self._fila)
+            object.__setattr__(self, "_objeto", objeto)
+        return objeto
+
+    def a_registro(self) -> Dict[str, Any]:
+        """Registro plano del mueble, sin construirlo si no hace falta."""
+        if self._objeto is not None:
+            return mueble_a_registro(self._objeto)
+        return self._instantanea.registro(self._fila)
+
+    def calcular_precio(self) -> Any:
+        if self._objeto is None:
+            precio = self._instantanea.precio(self._fila)
+            if precio is not None:
+                return precio
+        return self.materializar().calcular_precio()
+
+    def __getattr__(self, nombre: str) -> Any:
+        # también llega aquí cuando una propiedad rápida lanza AttributeError
+        if self._objeto is None and not hasattr(self.__class__, nombre):
+            raise AttributeError(nombre)
+        return getattr(self.materializar(), nombre)
+
+    def __setattr__(self, nombre: str, valor: Any) -> None:
+        setattr(self.materializar(), nombre, valor)
+
+    def __str__(self) -> str:
+        if self._objeto is None and self.__class__.__str__ is Mueble.__str__:
+            return f"{self.nombre} de {self.material} en color {self.color}"
+        return str(self.materializar())
+
+    def __repr__(self) -> str:
+        return repr(self.materializar())
+
+
+def cargar_instantanea(tienda: "TiendaMuebles", ruta: str) -> Instantanea:
+    """
+    Adjunta una instantánea a una tienda vacía.
+
+    Restaura nombre, descuentos y contadores de ventas al instante y deja el
+    inventario con carga diferida: los índices se construyen con
+    ``MuebleDiferido`` en la primera consulta que los necesite.
+
+    Args:
+        tienda: Tienda recién creada (inventario vacío)
+        ruta: Archivo escrito por ``guardar_instantanea``
+
+    Returns:
+        Instantanea: Vista sobre el archivo mapeado
+    """
+    instantanea = Instantanea(ruta)
+    metadatos = instantanea.metadatos
+    tienda.inventario.diferir_carga(
+        instantanea.pares,
+        len(instantanea),
+        metadatos["total_centavos"],
+        metadatos["por_tipo"],
+    )
+    tienda.restaurar_estado(metadatos["tienda"])
+    return instantanea
@@ -0,0 +1,250 @@
+"""
+Libro de ventas columnar.
+
+Cada venta de ``TiendaMuebles.realizar_venta`` se guarda como una fila de
+columnas tipadas en ``array.array``: fecha (float64, segundos Unix), precios
+y descuento (float64), importe en centavos (int64) y tipo, cliente y mueble
+como códigos enteros contra un diccionario de valores (uint32). Una venta
+ocupa 52 bytes, sin objetos Python por fila.
+
+Las consultas leen las columnas sin copiar con ``numpy.frombuffer`` y
+agregan con ``bincount`` sobre los códigos, así que los ingresos por tipo,
+por cliente o por ventana de tiempo no recorren diccionarios de Python.
+
+Un candado ordena registros y consultas entre hilos: mientras una vista
+NumPy está viva, ``array`` no puede crecer.
+"""
+
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from src.services.columnar import _Diccionario
+
+# Duración de las ventanas con nombre, en segundos
+VENTANAS: Dict[str, int] = {"hora": 3600, "dia": 86400}
+
+# Columnas numéricas: nombre -> código de ``array``
+_COLUMNAS = {
+    "fecha": "d",
+    "precio_original": "d",
+    "descuento": "d",
+    "precio_final": "d",
+    "centavos": "q",
+    "tipo": "I",
+    "cliente": "I",
+    "mueble": "I",
+}
+
+
+def _a_numero(valor: Any) -> float:
+    """Número de una venta, o NaN si no lo es (p. ej. un precio de un mock)."""
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class LibroVentas:
+    """
+    Registro en memoria de todas las ventas, en formato columnar.
+
+    Los importes se suman en centavos enteros, como el valor del inventario,
+    y se devuelven redondeados a dos decimales.
+    """
+
+    def __init__(self) -> None:
+        self._columnas: Dict[str, array] = {
+            nombre: array(codigo) for nombre, codigo in _COLUMNAS.items()
+        }
+        self._tipos = _Diccionario()
+        self._clientes = _Diccionario()
+        self._muebles = _Diccionario()
+        self._candado = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._columnas["fecha"])
+
+    def registrar(
+        self, venta: Dict[str, Any], tipo: str, fecha: Optional[float] = None
+    ) -> int:
+        """
+        Agrega una venta al libro.
+
+        Args:
+            venta: Resultado de ``realizar_venta``
+            tipo: Nombre de la clase del mueble vendido
+            fecha: Segundos Unix (por defecto, ahora)
+
+        Returns:
+            int: Número de fila de la venta
+        """
+        precio_final = _a_numero(venta.get("precio_final"))
+        with self._candado:
+            columnas = self._columnas
+            columnas["fecha"].append(time.time() if fecha is None else fecha)
+            columnas["precio_original"].append(_a_numero(venta.get("precio_original")))
+            columnas["descuento"].append(_a_numero(venta.get("descuento")))
+            columnas["precio_final"].append(precio_final)
+            columnas["centavos"].append(
+                0 if precio_final != precio_final else round(precio_final * 100)
+            )
+            columnas["tipo"].append(self._tipos.codigo(tipo))
+            columnas["cliente"].append(self._clientes.codigo(venta.get("cliente")))
+            columnas["mueble"].append(self._muebles.codigo(str(venta.get("mueble"))))
+            return len(self) - 1
+
+    def venta(self, fila: int) -> Dict[str, Any]:
+        """Reconstruye el diccionario de una venta registrada."""
+        c = self._columnas
+        return {
+            "mueble": self._muebles.valores[c["mueble"][fila]],
+            "tipo": self._tipos.valores[c["tipo"][fila]],
+            "precio_original": c["precio_original"][fila],
+            "descuento": c["descuento"][fila],
+            "precio_final": c["precio_final"][fila],
+            "cliente": self._clientes.valores[c["cliente"][fila]],
+            "fecha": c["fecha"][fila],
+        }
+
+    def memoria(self) -> int:
+        """Bytes ocupados por las columnas (sin contar los diccionarios)."""
+        return sum(c.itemsize * len(c) for c in self._columnas.values())
+
+    # --- Consultas ---
+
+    def _columna(self, nombre: str) -> np.ndarray:
+        """Vista NumPy (sin copia) de una columna; se usa con el candado tomado."""
+        return np.frombuffer(
+            self._columnas[nombre], dtype=self._columnas[nombre].typecode
+        )
+
+    def _mascara(
+        self, desde: Optional[float], hasta: Optional[float]
+    ) -> Optional[np.ndarray]:
+        """Filas con fecha en [desde, hasta), o None si no hay límites."""
+        if desde is None and hasta is None:
+            return None
+        fechas = self._columna("fecha")
+        mascara = np.ones(len(fechas), dtype=bool)
+        if desde is not None:
+            mascara &= fechas >= desde
+        if hasta is not None:
+            mascara &= fechas < hasta
+        return mascara
+
+    @staticmethod
+    def _totales(
+        codigos: np.ndarray, centavos: np.ndarray, tamaño: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """Ventas e ingresos por código, con ``bincount`` sobre los códigos."""
+        cantidades = np.bincount(codigos, minlength=tamaño)
+        # float64 suma enteros de forma exacta hasta 2**53 centavos
+        sumas = np.bincount(codigos, weights=centavos, minlength=tamaño)
+        return {
+            int(i): {
+                "ventas": int(cantidades[i]),
+                "ingresos": round(int(sumas[i]) / 100, 2),
+            }
+            for i in np.flatnonzero(cantidades)
+        }
+
+    def _agrupar(
+        self,
+        columna: str,
+        diccionario: _Diccionario,
+        desde: Optional[float],
+        hasta: Optional[float],
+    ) -> Dict[Any, Dict[str, Any]]:
+        codigos = self._columna(columna)
+        centavos = self._columna("centavos")
+        mascara = self._mascara(desde, hasta)
+        if mascara is not None:
+            codigos, centavos = codigos[mascara], centavos[mascara]
+        totales = self._totales(codigos, centavos, len(diccionario.valores))
+        return {diccionario.valores[i]: t for i, t in totales.items()}
+
+    def ingresos_por_tipo(
+        self, desde: Optional[float] = None, hasta: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Ventas e ingresos por tipo de mueble.
+
+        Args:
+            desde: Fecha mínima (segundos Unix, incluida)
+            hasta: Fecha máxima (segundos Unix, excluida)
+
+        Returns:
+            dict: tipo -> {"ventas": int, "ingresos": float}
+        """
+        # las vistas viven en el marco de _agrupar, que termina con el candado
+        with self._candado:
+            return self._agrupar("tipo", self._tipos, desde, hasta)
+
+    def ingresos_por_cliente(
+        self, desde: Optional[float] = None, hasta: Optional[float] = None
+    ) -> Dict[Optional[str], Dict[str, Any]]:
+        """
+        Ventas e ingresos por cliente (None agrupa las ventas sin cliente).
+
+        Returns:
+            dict: cliente -> {"ventas": int, "ingresos": float}
+        """
+        with self._candado:
+            return self._agrupar("cliente", self._clientes, desde, hasta)
+
+    def ingresos_por_ventana(
+        self,
+        ventana: Union[str, float] = "hora",
+        desde: Optional[float] = None,
+        hasta: Optional[float] = None,
+        desfase: float = 0.0,
+    ) -> Dict[datetime, Dict[str, Any]]:
+        """
+        Ventas e ingresos por ventana de tiempo.
+
+        Args:
+            ventana: "hora", "dia" o una duración en segundos
+            desde: Fecha mínima (segundos Unix, incluida)
+            hasta: Fecha máxima (segundos Unix, excluida)
+            desfase: Segundos respecto de UTC para alinear las ventanas
+                (p. ej. -18000 para días de UTC-5)
+
+        Returns:
+            dict: inicio de la ventana -> {"ventas": int, "ingresos": float},
+            en orden cronológico
+        """
+        segundos = VENTANAS.get(ventana) if isinstance(ventana, str) else ventana
+        if not segundos or segundos <= 0:
+            raise ValueError(f"Ventana de tiempo no válida: {ventana!r}")
+        with self._candado:
+            return self._por_ventana(segundos, desde, hasta, desfase)
+
+    def _por_ventana(
+        self,
+        segundos: float,
+        desde: Optional[float],
+        hasta: Optional[float],
+        desfase: float,
+    ) -> Dict[datetime, Dict[str, Any]]:
+        fechas = self._columna("fecha")
+        centavos = self._columna("centavos")
+        mascara = self._mascara(desde, hasta)
+        if mascara is not None:
+            fechas, centavos = fechas[mascara], centavos[mascara]
+        if not len(fechas):
+            return {}
+        ventanas = np.floor((fechas + desfase) / segundos).astype(np.int64)
+        primera = int(ventanas.min())
+        totales = self._totales(
+            ventanas - primera, centavos, int(ventanas.max()) - primera + 1
+        )
+        zona = timezone(timedelta(seconds=desfase))
+        return {
+            datetime.fromtimestamp((primera + i) * segundos - desfase, zona): t
+            for i, t in totales.items()
+        }
@@ -0,0 +1,254 @@
+"""
+Valoración y reporte del inventario repartidos en varios procesos.
+
+Recalcular el precio de millones de muebles es Python puro y ocupa un solo
+núcleo. Aquí el inventario se parte en bloques de registros compactos
+(tuplas con la ranura, el tipo, los valores de los campos del constructor
+y las unidades del SKU, sin los objetos) que se envían a un
+``ProcessPoolExecutor``. Cada proceso reconstruye una vez cada SKU de su
+bloque, calcula su precio y devuelve sumas parciales (precio por unidades)
+en centavos enteros por tipo, las ranuras cuyo precio cambió y,
+para el reporte, su fragmento de texto. Los resultados se combinan en el
+orden de los bloques, así que el resultado es idéntico al de un solo
+proceso (que usa las mismas funciones sin ejecutor).
+
+Los muebles que no son de un tipo de ``TIPOS_MUEBLE`` (composiciones,
+mocks) no se pueden reconstruir en otro proceso: se valoran en el proceso
+principal y en el reporte viajan como su línea ya armada.
+"""
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from src.services.catalogo import TIPOS_MUEBLE, lector_campos
+
+if TYPE_CHECKING:
+    from src.services.tienda import InventarioIndexado
+
+# Registros por bloque enviado a un proceso
+TAMAÑO_BLOQUE = 50_000
+
+# (nombre del tipo, campos del constructor) de cada código de tipo
+Tipos = Tuple[Tuple[str, Tuple[str, ...]], ...]
+# (ranura, código de tipo, valores de los campos, precio indexado, unidades);
+# el código -1 lleva (nombre, tipo) de un mueble que no se puede reconstruir
+Registro = Tuple[int, int, Tuple[Any, ...], Optional[float], int]
+# (ranura, mueble, precio indexado, unidades), como en el inventario
+Ranura = Tuple[int, Any, Optional[float], int]
+# (ranura, precio indexado, precio recalculado) de un precio que cambió
+Cambio = Tuple[int, Optional[float], Optional[float]]
+# ({tipo: [unidades, centavos]}, cambios)
+Parcial = Tuple[Dict[str, List[int]], List[Cambio]]
+
+
+def _precio(item: Any) -> Optional[float]:
+    """Como ``tienda._precio_de``: precio final, o None si no se puede calcular."""
+    try:
+        precio = float(item.calcular_precio())
+    except Exception:
+        return None
+    return None if precio != precio else precio
+
+
+def _sumar(
+    por_tipo: Dict[str, List[int]], tipo: str, precio: Optional[float], unidades: int
+) -> None:
+    parcial = por_tipo.setdefault(tipo, [0, 0])
+    parcial[0] += unidades
+    if precio is not None:
+        parcial[1] += round(precio * 100) * unidades
+
+
+def _bloques(
+    ranuras: Iterable[Ranura], tamaño: int, locales: Optional[List[Ranura]] = None
+) -> Iterator[Tuple[Tipos, List[Registro]]]:
+    """
+    Parte el inventario en bloques de registros compactos.
+
+    Un bloque se cierra al llegar a ``tamaño`` registros o a ``tamaño``
+    unidades, lo primero que ocurra.
+
+    Los muebles que no se pueden reconstruir se agregan a ``locales`` o, si
+    no se indica, viajan con el código -1.
+    """
+    codigos: Dict[type, int] = {}
+    tipos: List[Tuple[str, Tuple[str, ...]]] = []
+    bloque: List[Registro] = []
+    acumuladas = 0
+    for ranura, item, precio, unidades in ranuras:
+        clase = getattr(item, "__class__", type(item))
+        lector = lector_campos(clase)
+        if lector is None:
+            if locales is not None:
+                locales.append((ranura, item, precio, unidades))
+                continue
+            linea = (getattr(item, "nombre", repr(item)), clase.__name__)
+            bloque.append((ranura, -1, linea, precio, unidades))
+        else:
+            codigo = codigos.get(clase)
+            if codigo is None:
+                codigo = codigos[clase] = len(tipos)
+                tipos.append((clase.__name__, lector[0]))
+            bloque.append((ranura, codigo, lector[1](item), precio, unidades))
+        acumuladas += unidades
+        if len(bloque) >= tamaño or acumuladas >= tamaño:
+            yield tuple(tipos), bloque
+            bloque, acumuladas = [], 0
+    if bloque:
+        yield tuple(tipos), bloque
+
+
+def valorar_bloque(tipos: Tipos, registros: List[Registro]) -> Parcial:
+    """
+    Reconstruye y valora un bloque (corre en un proceso del ejecutor).
+
+    Returns:
+        tuple: ({tipo: [unidades, centavos]}, cambios de los muebles cuyo
+        precio recalculado no coincide con el indexado)
+    """
+    clases = [TIPOS_MUEBLE[nombre] for nombre, _ in tipos]
+    por_tipo: Dict[str, List[int]] = {}
+    cambios: List[Cambio] = []
+    for ranura, codigo, valores, indexado, unidades in registros:
+        nombre, campos = tipos[codigo]
+        try:
+            mueble = clases[codigo](**dict(zip(campos, valores)))
+        except Exception:
+            precio = None
+        else:
+            precio = _precio(mueble)
+        _sumar(por_tipo, nombre, precio, unidades)
+        if precio != indexado:
+            cambios.append((ranura, indexado, precio))
+    return por_tipo, cambios
+
+
+def reportar_bloque(tipos: Tipos, registros: List[Registro]) -> str:
+    """Líneas del reporte de un bloque (corre en un proceso del ejecutor)."""
+    posiciones = [campos.index("nombre") for _, campos in tipos]
+    lineas = []
+    for _, codigo, valores, _, unidades in registros:
+        if codigo < 0:
+            nombre, nombre_tipo = valores
+        else:
+            nombre, nombre_tipo = valores[posiciones[codigo]], tipos[codigo][0]
+        # una línea por unidad, como al recorrer el inventario
+        lineas.extend([f"- {nombre} ({nombre_tipo})"] * unidades)
+    return "\n".join(lineas)
+
+
+def _en_orden(
+    funcion: Callable,
+    bloques: Iterator[Tuple[Tipos, List[Registro]]],
+    procesos: Optional[int],
+) -> Iterator[Any]:
+    """
+    Aplica ``funcion`` a cada bloque y entrega los resultados en orden.
+
+    Con un proceso no se crea ejecutor. Con varios, los bloques se envían a
+    medida que se arman y hay a lo sumo dos por proceso en vuelo, de modo
+    que armar registros se solapa con el cálculo y la memoria no crece con
+    el inventario.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        for bloque in bloques:
+            yield funcion(*bloque)
+        return
+    en_vuelo: List[Future] = []
+    with ProcessPoolExecutor(procesos) as ejecutor:
+        for bloque in bloques:
+            en_vuelo.append(ejecutor.submit(funcion, *bloque))
+            if len(en_vuelo) >= 2 * procesos:
+                yield en_vuelo.pop(0).result()
+        for futuro in en_vuelo:
+            yield futuro.result()
+
+
+def _ejecutar(
+    funcion: Callable,
+    bloques: Iterator[Tuple[Tipos, List[Registro]]],
+    procesos: Optional[int],
+) -> List[Any]:
+    """Como ``_en_orden`` pero devuelve todos los resultados juntos."""
+    return list(_en_orden(funcion, bloques, procesos))
+
+
+def valorar(
+    inventario: "InventarioIndexado",
+    procesos: Optional[int] = None,
+    tamaño_bloque: int = TAMAÑO_BLOQUE,
+) -> Parcial:
+    """
+    Recalcula el precio de todo el inventario en ``procesos`` procesos.
+
+    Args:
+        inventario: Inventario a valorar (no se modifica)
+        procesos: Cantidad de procesos (None: todos los núcleos)
+        tamaño_bloque: Registros por bloque
+
+    Returns:
+        tuple: ({tipo: [unidades, centavos]} ordenado por tipo, cambios
+        (ranura, precio indexado, precio recalculado) de los precios que
+        no coinciden, para ``InventarioIndexado.corregir_precios``)
+    """
+    locales: List[Ranura] = []
+    parciales = _ejecutar(
+        valorar_bloque,
+        _bloques(inventario.ranuras_con_precio(), tamaño_bloque, locales),
+        procesos,
+    )
+    por_tipo: Dict[str, List[int]] = {}
+    cambios: List[Cambio] = []
+    for parcial_tipos, parcial_cambios in parciales:
+        for tipo, (muebles, centavos) in parcial_tipos.items():
+            total = por_tipo.setdefault(tipo, [0, 0])
+            total[0] += muebles
+            total[1] += centavos
+        cambios.extend(parcial_cambios)
+    for ranura, item, indexado, unidades in locales:
+        precio = _precio(item)
+        tipo = getattr(item, "__class__", type(item)).__name__
+        _sumar(por_tipo, tipo, precio, unidades)
+        if precio != indexado:
+            cambios.append((ranura, indexado, precio))
+    return dict(sorted(por_tipo.items())), cambios
+
+
+def reporte(
+    inventario: "InventarioIndexado",
+    procesos: Optional[int] = None,
+    tamaño_bloque: int = TAMAÑO_BLOQUE,
+) -> Iterator[str]:
+    """
+    Fragmentos del reporte de inventario (uno por bloque), en orden de catálogo.
+
+    Es perezoso: el inventario se lee de a un bloque (ver
+    ``InventarioIndexado.ranuras_por_bloques``) y cada fragmento se entrega
+    en cuanto está listo, así que la memoria depende del tamaño de bloque y
+    de los procesos, no del inventario.
+    """
+    ranuras = chain.from_iterable(inventario.ranuras_por_bloques(tamaño_bloque))
+    partes = _partir(ranuras, tamaño_bloque)
+    return _en_orden(reportar_bloque, _bloques(partes, tamaño_bloque), procesos)
+
+
+def _partir(ranuras: Iterable[Ranura], tamaño: int) -> Iterator[Ranura]:
+    """Reparte las unidades de cada ranura en partes de a lo sumo ``tamaño``."""
+    for ranura, item, precio, unidades in ranuras:
+        while unidades > tamaño:
+            yield ranura, item, precio, tamaño
+            unidades -= tamaño
+        yield ranura, item, precio, unidades
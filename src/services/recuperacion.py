@@ -0,0 +1,433 @@
+"""
+Recuperación rápida de la tienda: instantánea más registro de cambios (WAL).
+
+``RegistroCambios`` mantiene en un directorio:
+
+    instantanea.bin      última instantánea (``guardar_instantanea``)
+    cambios-<gen>.wal    cambios posteriores a la instantánea de esa generación
+
+Cada mutación de la tienda (alta, baja, venta, descuento, regla de
+descuento) se anexa al WAL con los marcos con checksum y el commit en grupo
+de ``DiarioVentas``. Cada ``cada`` cambios se toma una instantánea
+consistente, se abre el WAL de la generación siguiente y se borra el
+anterior. La tienda hace cada mutación dentro de ``operacion``: varias
+operaciones corren a la vez, y la instantánea espera a que terminen todas
+y no deja empezar otras mientras se escribe. Si el programa cae entre
+ambos pasos, la generación guardada en la instantánea indica qué WAL vale.
+
+Como el diario de ventas, el WAL es síncrono por defecto: ``anotar`` (y
+con él la mutación de la tienda) no vuelve hasta que el cambio está en
+disco, de modo que nada de lo que la tienda ya confirmó se pierde en una
+caída. Con ``sincrono=False`` cada cambio vuelve sin esperar el ``fsync``
+y una caída puede perder hasta una ventana de durabilidad de cambios.
+
+Al arrancar, ``recuperar`` adjunta la instantánea sin leer los muebles y
+repasa solo la cola del WAL sin tocar el inventario: ventas y descuentos van
+a los contadores, y altas, bajas y actualizaciones se combinan con la fuente
+diferida del inventario. Cada cambio lleva el registro del SKU que tocó (sus
+parámetros de constructor, que son su clave), las unidades y el precio, de
+modo que cantidad, valor y distribución por tipo se corrigen sin leer la
+instantánea y la tienda responde de inmediato; los muebles se indexan en la
+primera consulta que los necesita.
+
+Las bajas y actualizaciones se aplican al SKU de su registro, nunca al
+primer mueble con el mismo nombre: el repaso lleva las ranuras como las
+tenía la tienda (las de la instantánea, en su orden, y las altas nuevas al
+final) y el inventario recuperado tiene los mismos SKU, en el mismo orden
+y con las mismas unidades.
+"""
+
+import glob
+import os
+import re
+import threading
+from contextlib import contextmanager
+from itertools import groupby, repeat
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.services.catalogo import registro_a_mueble
+from src.services.concurrencia import CandadoCompartido
+from src.services.diario import DiarioVentas, leer_ventas
+from src.services.instantanea import Instantanea, guardar_instantanea
+
+if TYPE_CHECKING:
+    from src.services.tienda import TiendaMuebles
+
+_INSTANTANEA = "instantanea.bin"
+_PATRON_WAL = re.compile(r"cambios-(\d+)\.wal$")
+
+
+class RegistroCambios:
+    """
+    Instantáneas periódicas y WAL de mutaciones de una ``TiendaMuebles``.
+
+    Se pasa como ``cambios`` al crear la tienda, que llama a ``recuperar``
+    y desde entonces anota cada mutación con ``anotar`` dentro de
+    ``operacion``.
+
+    Args:
+        directorio: Carpeta de la instantánea y del WAL (se crea si no existe)
+        cada: Cambios entre instantáneas automáticas (0 las desactiva)
+        ventana: Ventana de durabilidad del WAL, en segundos
+        sincrono: Si cada cambio espera su ``fsync`` antes de volver
+    """
+
+    def __init__(
+        self,
+        directorio: str,
+        cada: int = 100_000,
+        ventana: float = 0.002,
+        sincrono: bool = True,
+    ) -> None:
+        if cada < 0:
+            raise ValueError("El intervalo de instantáneas no puede ser negativo")
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.cada = cada
+        self.ventana = ventana
+        self.sincrono = sincrono
+        self._tienda: Optional["TiendaMuebles"] = None
+        self._wal: Optional[DiarioVentas] = None
+        self._generacion = 0
+        self._pendientes = 0  # cambios desde la última instantánea
+        self._candado = threading.Lock()
+        # compartido durante cada operación de la tienda, exclusivo al compactar
+        self._operaciones = CandadoCompartido()
+        # la tienda recuperada puede seguir leyendo muebles de esta vista
+        self._instantanea: Optional[Instantanea] = None
+
+    @property
+    def ruta_instantanea(self) -> str:
+        return os.path.join(self.directorio, _INSTANTANEA)
+
+    def _ruta_wal(self, generacion: int) -> str:
+        return os.path.join(self.directorio, f"cambios-{generacion}.wal")
+
+    def __enter__(self) -> "RegistroCambios":
+        return self
+
+    def __exit__(self, *excepcion: Any) -> None:
+        self.cerrar()
+
+    # --- Arranque ---
+
+    def recuperar(self, tienda: "TiendaMuebles") -> Dict[str, int]:
+        """
+        Deja ``tienda`` (recién creada) como estaba tras el último cambio anotado.
+
+        Returns:
+            dict: {"generacion": int, "cambios": int (repasados del WAL),
+                   "muebles": int}
+
+        Raises:
+            ValueError: Si la instantánea está dañada
+        """
+        if self._tienda is not None:
+            raise ValueError("El registro de cambios ya está en uso")
+        instantanea = None
+        generacion = cantidad = total_centavos = 0
+        por_tipo: Dict[str, int] = {}
+        estado = tienda.exportar_estado()
+        if os.path.exists(self.ruta_instantanea):
+            instantanea = Instantanea(self.ruta_instantanea)
+            metadatos = instantanea.metadatos
+            generacion = metadatos["extra"].get("generacion", 0)
+            estado = metadatos["tienda"]
+            cantidad = len(instantanea)
+            total_centavos = metadatos["total_centavos"]
+            por_tipo = dict(metadatos["por_tipo"])
+        self._borrar_wal_viejos(generacion)
+
+        repaso = _Repaso()
+        repasados = 0
+        ruta_wal = self._ruta_wal(generacion)
+        cambios = leer_ventas(ruta_wal) if os.path.exists(ruta_wal) else ()
+        for cambio in cambios:
+            repasados += 1
+            operacion = cambio["op"]
+            if operacion == "agregar":
+                for registro, precio in cambio["muebles"]:
+                    repaso.agregar(registro, precio)
+                    cantidad += 1
+                    if precio is not None:
+                        total_centavos += round(precio * 100)
+                    por_tipo[registro["tipo"]] = por_tipo.get(registro["tipo"], 0) + 1
+            elif operacion == "sumar":
+                for registro, precio, unidades in cambio["muebles"]:
+                    repaso.sumar(registro, precio, unidades)
+                    cantidad += unidades
+                    if precio is not None:
+                        total_centavos += round(precio * 100) * unidades
+                    tipo = registro["tipo"]
+                    por_tipo[tipo] = por_tipo.get(tipo, 0) + unidades
+            elif operacion in ("venta", "cobro"):
+                # un cobro quita todas sus líneas y cuenta sus ventas de una
+                # vez; una venta por nombre trae su baja en el mismo cambio
+                vendidas = 0
+                for baja in cambio.get("quitar", ()):
+                    registro, unidades = baja["registro"], baja["unidades"]
+                    repaso.quitar(registro, baja["centavos"], unidades)
+                    vendidas += unidades
+                    cantidad -= unidades
+                    if baja["centavos"] is not None:
+                        total_centavos -= baja["centavos"] * unidades
+                    por_tipo[registro["tipo"]] -= unidades
+                    if not por_tipo[registro["tipo"]]:
+                        del por_tipo[registro["tipo"]]
+                estado["total_muebles_vendidos"] += (
+                    vendidas if operacion == "cobro" else 1
+                )
+                try:
+                    estado["valor_total_ventas"] += cambio["precio_final"]
+                except TypeError:
+                    pass  # como en realizar_venta: el contador no cambia
+            elif operacion == "actualizar":
+                repaso.actualizar(
+                    cambio["anterior"], cambio["registro"], cambio["precio"]
+                )
+                total_centavos += cambio["diferencia"]
+            elif operacion == "descuento":
+                estado["descuentos"][cambio["categoria"]] = cambio["porcentaje"]
+            elif operacion in ("regla", "quitar_regla"):
+                nombre = cambio.get("nombre") or cambio["regla"]["nombre"]
+                estado["reglas_descuento"] = [
+                    r
+                    for r in estado.get("reglas_descuento", [])
+                    if r["nombre"] != nombre
+                ]
+                if operacion == "regla":
+                    estado["reglas_descuento"].append(cambio["regla"])
+            elif operacion == "tope":
+                estado["tope_descuento"] = cambio["porcentaje"]
+
+        tienda.restaurar_estado(estado)
+        if cantidad:
+
+            def cargador() -> Iterator[Tuple[Any, Optional[float]]]:
+                return repaso.pares(instantanea.pares() if instantanea else ())
+
+            tienda.inventario.diferir_carga(
+                cargador, cantidad, total_centavos, por_tipo
+            )
+
+        self._tienda = tienda
+        self._instantanea = instantanea
+        self._generacion = generacion
+        self._pendientes = repasados
+        self._wal = DiarioVentas(ruta_wal, self.ventana, sincrono=self.sincrono)
+        return {"generacion": generacion, "cambios": repasados, "muebles": cantidad}
+
+    def _borrar_wal_viejos(self, generacion: int) -> None:
+        """Borra los WAL de otras generaciones (restos de una compactación a medias)."""
+        for ruta in glob.glob(os.path.join(self.directorio, "cambios-*.wal")):
+            coincidencia = _PATRON_WAL.search(ruta)
+            if coincidencia and int(coincidencia.group(1)) != generacion:
+                os.remove(ruta)
+
+    # --- Durante la sesión ---
+
+    @contextmanager
+    def operacion(self) -> Iterator[None]:
+        """
+        Envuelve una mutación de la tienda y sus ``anotar``.
+
+        Se puede anidar. Al salir de la más externa, si ya se alcanzaron
+        ``cada`` cambios, toma la instantánea.
+        """
+        with self._operaciones.compartido():
+            yield
+        if self.cada and self._pendientes >= self.cada:
+            if not self._operaciones.tomado():
+                self._compactar_si_toca()
+
+    def anotar(self, cambio: Dict[str, Any]) -> None:
+        """
+        Anexa una mutación ya aplicada a la tienda.
+
+        Raises:
+            RuntimeError: Si no se llamó antes a ``recuperar``
+        """
+        if self._wal is None:
+            raise RuntimeError("El registro de cambios no está asociado a una tienda")
+        self._wal.registrar(cambio)
+        with self._candado:
+            self._pendientes += 1
+
+    def _compactar_si_toca(self) -> None:
+        with self._operaciones.exclusivo():
+            # otro hilo pudo compactar mientras se esperaba el candado
+            if self._pendientes >= self.cada:
+                self._tomar_instantanea()
+
+    def esperar(self, timeout: Optional[float] = None) -> bool:
+        """Bloquea hasta que todos los cambios anotados estén en disco."""
+        return self._wal is None or self._wal.esperar(timeout=timeout)
+
+    def tomar_instantanea(self) -> Dict[str, int]:
+        """
+        Guarda una instantánea y compacta el WAL.
+
+        La instantánea lleva la generación nueva; después se abre el WAL de
+        esa generación y se borra el anterior, cuyos cambios ya están en la
+        instantánea. Espera a que terminen las operaciones en curso.
+
+        Returns:
+            dict: El resumen de ``guardar_instantanea``
+
+        Raises:
+            RuntimeError: Si se llama desde dentro de una ``operacion``
+        """
+        if self._tienda is None:
+            raise RuntimeError("El registro de cambios no está asociado a una tienda")
+        with self._operaciones.exclusivo():
+            return self._tomar_instantanea()
+
+    def _tomar_instantanea(self) -> Dict[str, int]:
+        nueva = self._generacion + 1
+        resumen = guardar_instantanea(
+            self._tienda, self.ruta_instantanea, {"generacion": nueva}
+        )
+        anterior, self._wal = (
+            self._wal,
+            DiarioVentas(self._ruta_wal(nueva), self.ventana, sincrono=self.sincrono),
+        )
+        anterior.cerrar()
+        os.remove(self._ruta_wal(self._generacion))
+        self._generacion = nueva
+        self._pendientes = 0
+        return resumen
+
+    def cerrar(self) -> None:
+        """Escribe los cambios pendientes y cierra el WAL."""
+        if self._wal is not None:
+            self._wal.cerrar()
+
+
+class _Ranura:
+    """
+    SKU del repaso: su registro, precio final y unidades.
+
+    Para un SKU de la instantánea ``registro`` es None mientras no se
+    actualice (valen los datos de la instantánea) y ``unidades`` es lo que
+    le sumó o restó el WAL; para un alta nueva son sus unidades.
+    """
+
+    __slots__ = ("registro", "precio", "unidades", "nueva")
+
+    def __init__(
+        self,
+        registro: Optional[Dict[str, Any]],
+        precio: Optional[float],
+        unidades: int,
+        nueva: bool,
+    ) -> None:
+        self.registro = registro
+        self.precio = precio
+        self.unidades = unidades
+        self.nueva = nueva
+
+
+def _clave(registro: Dict[str, Any], precio: Optional[float]) -> Tuple[Any, ...]:
+    """Clave de SKU de un registro con su precio, la misma que ``_clave_sku``."""
+    return (*registro.values(), None if precio is None else round(precio * 100))
+
+
+class _Repaso:
+    """
+    Ranuras de la tienda según los cambios del WAL, sobre la instantánea.
+
+    Solo guarda los SKU que tocó el WAL. Al cargar, los de la instantánea
+    salen en su orden con las unidades y los datos que les cambió el WAL, y
+    después las altas nuevas, como las ordena ``InventarioIndexado``.
+    """
+
+    def __init__(self) -> None:
+        # SKU en existencia por clave, y los de la instantánea ya tocados
+        self._vivas: Dict[Tuple[Any, ...], _Ranura] = {}
+        self._tocadas: Dict[Tuple[Any, ...], _Ranura] = {}
+        self._nuevas: List[_Ranura] = []
+
+    def _ranura(self, clave: Tuple[Any, ...]) -> _Ranura:
+        """SKU en existencia de ``clave``; si no es un alta del WAL, el de la instantánea."""
+        ranura = self._vivas.get(clave)
+        if ranura is None:
+            ranura = self._tocadas.setdefault(clave, _Ranura(None, None, 0, False))
+            self._vivas[clave] = ranura
+        return ranura
+
+    def agregar(self, registro: Dict[str, Any], precio: Optional[float]) -> None:
+        """
+        Una unidad de un cambio "agregar": abre un SKU al final.
+
+        Las unidades que se sumaron a un SKU que ya estaba vienen en un
+        "sumar", así que aquí solo se suma a un SKU abierto por este mismo
+        lote (las unidades repetidas de un lote).
+        """
+        clave = _clave(registro, precio)
+        ranura = self._vivas.get(clave)
+        if ranura is not None and ranura.nueva:
+            ranura.unidades += 1
+            return
+        ranura = _Ranura(registro, precio, 1, True)
+        self._nuevas.append(ranura)
+        self._vivas[clave] = ranura
+
+    def sumar(
+        self, registro: Dict[str, Any], precio: Optional[float], unidades: int
+    ) -> None:
+        """Unidades que se sumaron al SKU en existencia de ``registro`` y ``precio``."""
+        self._ranura(_clave(registro, precio)).unidades += unidades
+
+    def quitar(
+        self, registro: Dict[str, Any], centavos: Optional[int], unidades: int
+    ) -> None:
+        """Unidades vendidas del SKU de ``registro`` a ``centavos`` la unidad."""
+        clave = (*registro.values(), centavos)
+        ranura = self._ranura(clave)
+        ranura.unidades -= unidades
+        if ranura.nueva and ranura.unidades <= 0:
+            # la tienda liberó la ranura: un alta igual abre otra al final
+            del self._vivas[clave]
+
+    def actualizar(
+        self, anterior: Iterable[Any], registro: Dict[str, Any], precio: Optional[float]
+    ) -> None:
+        """El SKU de clave ``anterior`` pasa a ``registro``, en su misma ranura."""
+        clave = tuple(anterior)
+        ranura = self._ranura(clave)
+        del self._vivas[clave]
+        ranura.registro = registro
+        ranura.precio = precio
+        self._vivas[_clave(registro, precio)] = ranura
+
+    def pares(
+        self, instantanea: Iterable[Tuple[Any, Optional[float]]]
+    ) -> Iterator[Tuple[Any, Optional[float]]]:
+        """Pares (mueble, precio) por unidad, en orden de catálogo."""
+        if self._tocadas:
+            # Las unidades de una ranura están seguidas en la instantánea,
+            # pero dos ranuras con la misma clave (un ``actualizar`` que dejó
+            # idénticos dos SKU) no: al cargar se funden en la primera, así
+            # que lo que sumó o restó el WAL se aplica una sola vez, y lo que
+            # falte quitar pasa al grupo siguiente con esa clave.
+            pendientes = {c: r.unidades for c, r in self._tocadas.items()}
+            grupos = groupby(
+                instantanea, key=lambda par: _clave(par[0].a_registro(), par[1])
+            )
+            for clave, unidades in grupos:
+                ranura = self._tocadas.get(clave)
+                if ranura is None:
+                    yield from unidades
+                    continue
+                primero = next(unidades)
+                cantidad = 1 + sum(1 for _ in unidades) + pendientes[clave]
+                pendientes[clave] = min(cantidad, 0)
+                if ranura.registro is not None:
+                    primero = registro_a_mueble(ranura.registro), ranura.precio
+                yield from repeat(primero, max(cantidad, 0))
+        else:
+            yield from instantanea
+        for ranura in self._nuevas:
+            if ranura.unidades > 0:
+                par = registro_a_mueble(ranura.registro), ranura.precio
+                yield from repeat(par, ranura.unidades)
@@ -0,0 +1,126 @@
+"""
+Reservas de muebles con vencimiento.
+
+Un cliente puede apartar unidades del inventario durante un tiempo antes de
+pagarlas. Mientras dura la reserva esas unidades siguen en el inventario
+(y en su valor) pero no se pueden vender ni aparecen en los filtros; al
+vencer vuelven a estar disponibles.
+
+Los vencimientos se llevan en un montículo mínimo (``heapq``) de pares
+(vence, número): programar cuesta O(log n) y recoger las vencidas cuesta
+O(log n) por reserva vencida, sin recorrer las demás. Cancelar deja una
+lápida en el montículo que se descarta al llegar a la cima, y el montículo
+se reconstruye cuando las lápidas superan la mitad.
+
+Las reservas viven solo en memoria: tras reiniciar la tienda no queda
+ninguna. Lo vendido mientras duraban sí se recupera bien, porque el
+registro de cambios anota el SKU concreto de cada venta (no su nombre):
+si una venta por nombre saltó un mueble reservado, al recuperar se quita
+el que se vendió y no el reservado.
+"""
+
+import heapq
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class AgendaVencimientos:
+    """
+    Min-heap de vencimientos con borrado perezoso.
+
+    No es seguro entre hilos: quien la use debe protegerla con su candado.
+    """
+
+    __slots__ = ("_monticulo", "_vigentes", "_lapidas")
+
+    def __init__(self) -> None:
+        self._monticulo: List[Tuple[float, Hashable]] = []
+        self._vigentes: Dict[Hashable, float] = {}
+        self._lapidas = 0
+
+    def __len__(self) -> int:
+        return len(self._vigentes)
+
+    def __contains__(self, clave: Hashable) -> bool:
+        return clave in self._vigentes
+
+    def programar(self, clave: Hashable, vence: float) -> None:
+        """Programa (o reprograma) el vencimiento de ``clave``."""
+        if clave in self._vigentes:
+            self._lapidas += 1
+        self._vigentes[clave] = vence
+        heapq.heappush(self._monticulo, (vence, clave))
+
+    def cancelar(self, clave: Hashable) -> bool:
+        """Quita ``clave`` de la agenda. Devuelve False si no estaba."""
+        if self._vigentes.pop(clave, None) is None:
+            return False
+        self._lapidas += 1
+        if self._lapidas * 2 > len(self._monticulo):
+            self._compactar()
+        return True
+
+    def proximo(self) -> Optional[float]:
+        """Momento del próximo vencimiento (None si la agenda está vacía)."""
+        self._descartar_lapidas()
+        return self._monticulo[0][0] if self._monticulo else None
+
+    def vencidos(self, ahora: float) -> List[Hashable]:
+        """
+        Quita y devuelve las claves que vencen en ``ahora`` o antes.
+
+        Returns:
+            List: Claves en orden de vencimiento
+        """
+        resultado = []
+        monticulo = self._monticulo
+        while monticulo and monticulo[0][0] <= ahora:
+            vence, clave = heapq.heappop(monticulo)
+            if self._vigentes.get(clave) == vence:
+                del self._vigentes[clave]
+                resultado.append(clave)
+            else:
+                self._lapidas -= 1
+        return resultado
+
+    def _descartar_lapidas(self) -> None:
+        monticulo = self._monticulo
+        while monticulo and self._vigentes.get(monticulo[0][1]) != monticulo[0][0]:
+            heapq.heappop(monticulo)
+            self._lapidas -= 1
+
+    def _compactar(self) -> None:
+        """Reconstruye el montículo solo con las entradas vigentes."""
+        self._monticulo = [(vence, clave) for clave, vence in self._vigentes.items()]
+        heapq.heapify(self._monticulo)
+        self._lapidas = 0
+
+
+class Reserva:
+    """Unidades de un SKU del inventario apartadas para un cliente hasta ``vence``."""
+
+    __slots__ = ("numero", "ranura", "mueble", "cantidad", "cliente", "vence")
+
+    def __init__(
+        self,
+        numero: int,
+        ranura: int,
+        mueble: Any,
+        cantidad: int,
+        cliente: Optional[str],
+        vence: float,
+    ) -> None:
+        self.numero = numero
+        self.ranura = ranura
+        self.mueble = mueble
+        self.cantidad = cantidad
+        self.cliente = cliente
+        self.vence = vence
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "reserva": self.numero,
+            "mueble": getattr(self.mueble, "nombre", str(self.mueble)),
+            "cantidad": self.cantidad,
+            "cliente": self.cliente,
+            "vence": self.vence,
+        }
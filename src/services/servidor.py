@@ -0,0 +1,499 @@
+"""
+Servicio HTTP/JSON de una ``TiendaMuebles`` sobre asyncio.
+
+Las terminales de venta y la tienda web no importan objetos de Python:
+hablan con ``ServidorTienda`` (solo biblioteca estándar), que expone en
+JSON las consultas del catálogo, ``realizar_venta``, los descuentos y las
+estadísticas:
+
+    GET  /salud                       {"estado": "ok"}
+    GET  /muebles?tipo=&material=&color=&precio_min=&precio_max=&limite=
+    GET  /muebles/baratos?cantidad=   GET /muebles/caros?cantidad=
+    GET  /buscar?q=&limite=
+    GET  /estadisticas
+    GET  /descuentos                  POST /descuentos {"categoria", "porcentaje"}
+    POST /ventas {"nombre", "cliente"}
+    GET  /valoracion                  valor de lista y con descuentos
+
+Las conexiones son HTTP/1.1 persistentes (keep-alive) y admiten pipelining:
+las peticiones que llegan seguidas se atienden a la vez y las respuestas
+salen en el orden de llegada. Toda llamada a la tienda se hace en un
+ejecutor de hilos (la tienda es segura entre hilos), porque incluso una
+consulta puede esperar el candado del inventario o al almacén; las
+valoraciones, que recorren todo el inventario, van a un ejecutor propio
+para no ocupar los hilos de las consultas. El bucle de eventos solo lee,
+despacha y escribe.
+
+Uso:
+
+    python -m src.services.servidor --catalogo muebles.csv --puerto 8080
+"""
+
+import argparse
+import asyncio
+import json
+import math
+from concurrent.futures import Executor, ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from src.services.carrito import Carrito
+from src.services.catalogo import importar_catalogo, mueble_a_registro
+from src.services.tienda import TiendaMuebles
+
+# Límites de una petición
+_MAXIMO_CABECERAS = 100
+_MAXIMO_CUERPO = 1 << 20
+# Resultados por defecto de los listados
+_LIMITE = 100
+
+
+class ErrorHttp(Exception):
+    """Error que se responde al cliente con un código HTTP y un mensaje JSON."""
+
+    def __init__(self, estado: int, mensaje: str) -> None:
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+class _Peticion:
+    """Petición HTTP ya leída."""
+
+    __slots__ = ("metodo", "ruta", "consulta", "cuerpo", "mantener")
+
+    def __init__(
+        self,
+        metodo: str,
+        ruta: str,
+        consulta: Dict[str, str],
+        cuerpo: bytes,
+        mantener: bool,
+    ) -> None:
+        self.metodo = metodo
+        self.ruta = ruta
+        self.consulta = consulta
+        self.cuerpo = cuerpo
+        self.mantener = mantener
+
+    def json(self) -> Dict[str, Any]:
+        """
+        Cuerpo decodificado como objeto JSON.
+
+        Raises:
+            ErrorHttp: 400 si el cuerpo no es un objeto JSON
+        """
+        try:
+            datos = json.loads(self.cuerpo or b"{}")
+        except ValueError:
+            raise ErrorHttp(400, "cuerpo JSON inválido") from None
+        if not isinstance(datos, dict):
+            raise ErrorHttp(400, "se esperaba un objeto JSON")
+        return datos
+
+    def numero(self, nombre: str, defecto: float) -> float:
+        """
+        Parámetro numérico de la consulta.
+
+        Raises:
+            ErrorHttp: 400 si no es un número
+        """
+        valor = self.consulta.get(nombre)
+        if valor is None or valor == "":
+            return defecto
+        try:
+            return float(valor)
+        except ValueError:
+            raise ErrorHttp(400, f"parámetro {nombre} no numérico") from None
+
+    def entero(self, nombre: str, defecto: int) -> int:
+        valor = self.numero(nombre, defecto)
+        if valor < 0 or valor != int(valor):
+            raise ErrorHttp(400, f"parámetro {nombre} inválido")
+        return int(valor)
+
+
+async def _leer_peticion(lector: asyncio.StreamReader) -> Optional[_Peticion]:
+    """
+    Lee una petición completa, o None si el cliente cerró la conexión.
+
+    Raises:
+        ErrorHttp: Si la petición está mal formada o es demasiado grande
+    """
+    linea = await lector.readline()
+    if not linea:
+        return None
+    try:
+        metodo, destino, version = linea.decode("latin-1").split()
+    except ValueError:
+        raise ErrorHttp(400, "línea de petición inválida") from None
+    cabeceras: Dict[str, str] = {}
+    for _ in range(_MAXIMO_CABECERAS + 1):
+        linea = await lector.readline()
+        if linea in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        cabeceras[nombre.strip().lower()] = valor.strip()
+    else:
+        raise ErrorHttp(431, "demasiadas cabeceras")
+    try:
+        largo = int(cabeceras.get("content-length", 0))
+    except ValueError:
+        raise ErrorHttp(400, "Content-Length inválido") from None
+    if largo < 0 or largo > _MAXIMO_CUERPO:
+        raise ErrorHttp(413, "cuerpo demasiado grande")
+    cuerpo = await lector.readexactly(largo) if largo else b""
+
+    conexion = cabeceras.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        mantener = conexion == "keep-alive"
+    else:
+        mantener = conexion != "close"
+    partes = urlsplit(destino)
+    consulta = dict(parse_qsl(partes.query, keep_blank_values=True))
+    return _Peticion(metodo.upper(), partes.path, consulta, cuerpo, mantener)
+
+
+def _respuesta(estado: int, datos: Any, mantener: bool) -> bytes:
+    """Respuesta HTTP/1.1 completa con ``datos`` en JSON."""
+    cuerpo = json.dumps(datos, ensure_ascii=False, default=str).encode("utf-8")
+    cabeceras = (
+        f"HTTP/1.1 {estado} {HTTPStatus(estado).phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n"
+        f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+    )
+    return cabeceras.encode("latin-1") + cuerpo
+
+
+def _mueble_json(mueble: Any) -> Dict[str, Any]:
+    """Registro del mueble (tipo y campos) con su precio."""
+    try:
+        datos = mueble_a_registro(mueble)
+    except ValueError:
+        clase = getattr(mueble, "__class__", type(mueble))
+        datos = {"tipo": clase.__name__, "nombre": getattr(mueble, "nombre", None)}
+    try:
+        datos["precio"] = mueble.calcular_precio()
+    except Exception:
+        datos["precio"] = None
+    return datos
+
+
+def _muebles_json(muebles: List[Any], limite: int) -> Dict[str, Any]:
+    return {
+        "total": len(muebles),
+        "muebles": [_mueble_json(m) for m in muebles[:limite]],
+    }
+
+
+class ServidorTienda:
+    """
+    Servidor HTTP/JSON de una tienda.
+
+    Args:
+        tienda: Tienda a exponer
+        anfitrion: Dirección donde escuchar
+        puerto: Puerto (0 elige uno libre; ver ``puerto`` tras ``iniciar``)
+        hilos: Hilos del ejecutor de consultas y ventas
+        profundidad: Peticiones en curso por conexión con pipelining
+    """
+
+    def __init__(
+        self,
+        tienda: TiendaMuebles,
+        anfitrion: str = "127.0.0.1",
+        puerto: int = 0,
+        hilos: int = 8,
+        profundidad: int = 32,
+    ) -> None:
+        if profundidad < 1:
+            raise ValueError("La profundidad de pipelining debe ser positiva")
+        self.tienda = tienda
+        self.anfitrion = anfitrion
+        self._puerto = puerto
+        self.profundidad = profundidad
+        self._consultas: Executor = ThreadPoolExecutor(hilos, "tienda-consultas")
+        self._valoraciones: Executor = ThreadPoolExecutor(1, "tienda-valoraciones")
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        # (método, ruta) -> (función que recibe la petición, ejecutor o None)
+        self._rutas: Dict[Tuple[str, str], Tuple[Callable, Optional[Executor]]] = {
+            ("GET", "/salud"): (lambda p: {"estado": "ok"}, None),
+            ("GET", "/muebles"): (self._muebles, self._consultas),
+            ("GET", "/muebles/baratos"): (self._baratos, self._consultas),
+            ("GET", "/muebles/caros"): (self._caros, self._consultas),
+            ("GET", "/buscar"): (self._buscar, self._consultas),
+            ("GET", "/estadisticas"): (self._estadisticas, self._consultas),
+            ("GET", "/descuentos"): (self._descuentos, self._consultas),
+            ("POST", "/descuentos"): (self._aplicar_descuento, self._consultas),
+            ("POST", "/ventas"): (self._vender, self._consultas),
+            ("GET", "/valoracion"): (self._valoracion, self._valoraciones),
+        }
+
+    @property
+    def puerto(self) -> int:
+        if self._servidor is not None and self._servidor.sockets:
+            return self._servidor.sockets[0].getsockname()[1]
+        return self._puerto
+
+    async def iniciar(self) -> None:
+        """Empieza a aceptar conexiones."""
+        self._servidor = await asyncio.start_server(
+            self._atender, self.anfitrion, self._puerto
+        )
+
+    async def servir(self) -> None:
+        """Inicia (si hace falta) y atiende hasta que se cancele."""
+        if self._servidor is None:
+            await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def cerrar(self) -> None:
+        """Deja de aceptar conexiones y libera los ejecutores."""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        self._consultas.shutdown(wait=False)
+        self._valoraciones.shutdown(wait=False)
+
+    async def __aenter__(self) -> "ServidorTienda":
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *excepcion: Any) -> None:
+        await self.cerrar()
+
+    # --- Conexiones ---
+
+    async def _atender(
+        self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter
+    ) -> None:
+        """
+        Atiende una conexión persistente.
+
+        Cada petición leída se despacha en una tarea y su respuesta se
+        encola; otra tarea escribe las respuestas en orden. La cola limita
+        las peticiones en curso a ``profundidad``.
+        """
+        pendientes: "asyncio.Queue[Optional[asyncio.Future]]" = asyncio.Queue(
+            self.profundidad
+        )
+        escritura = asyncio.create_task(self._escribir(pendientes, escritor))
+        try:
+            while True:
+                try:
+                    peticion = await _leer_peticion(lector)
+                except ErrorHttp as error:
+                    respuesta = _respuesta(
+                        error.estado, {"error": error.mensaje}, mantener=False
+                    )
+                    await pendientes.put(_resuelta(respuesta))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    # cierre a mitad de petición o línea más larga que el límite
+                    break
+                if peticion is None:
+                    break
+                await pendientes.put(asyncio.ensure_future(self._responder(peticion)))
+                if not peticion.mantener:
+                    break
+        finally:
+            await pendientes.put(None)
+            await escritura
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _escribir(
+        pendientes: "asyncio.Queue[Optional[asyncio.Future]]",
+        escritor: asyncio.StreamWriter,
+    ) -> None:
+        conectado = True
+        while True:
+            respuesta = await pendientes.get()
+            if respuesta is None:
+                return
+            datos = await respuesta
+            if not conectado:
+                continue  # se siguen esperando para no dejar tareas sueltas
+            try:
+                escritor.write(datos)
+                await escritor.drain()
+            except ConnectionError:
+                conectado = False
+
+    async def _responder(self, peticion: _Peticion) -> bytes:
+        """Ejecuta la ruta de la petición y arma su respuesta."""
+        try:
+            ruta = self._rutas.get((peticion.metodo, peticion.ruta))
+            if ruta is None:
+                if any(r == peticion.ruta for _, r in self._rutas):
+                    raise ErrorHttp(405, f"método {peticion.metodo} no permitido")
+                raise ErrorHttp(404, f"no existe {peticion.ruta}")
+            funcion, ejecutor = ruta
+            if ejecutor is None:
+                datos = funcion(peticion)
+            else:
+                bucle = asyncio.get_running_loop()
+                datos = await bucle.run_in_executor(ejecutor, funcion, peticion)
+            estado = 200
+        except ErrorHttp as error:
+            estado, datos = error.estado, {"error": error.mensaje}
+        except Exception as error:
+            estado, datos = 500, {"error": f"{type(error).__name__}: {error}"}
+        return _respuesta(estado, datos, peticion.mantener)
+
+    # --- Rutas (corren en los ejecutores) ---
+
+    def _muebles(self, peticion: _Peticion) -> Dict[str, Any]:
+        """Catálogo filtrado; los filtros se combinan (intersección)."""
+        tienda = self.tienda
+        consulta = peticion.consulta
+        precio_min = peticion.numero("precio_min", 0.0)
+        precio_max = peticion.numero("precio_max", math.inf)
+        candidatos: Optional[List[Any]] = None
+        if "precio_min" in consulta or "precio_max" in consulta:
+            candidatos = tienda.filtrar_por_precio(precio_min, precio_max)
+        for campo, filtro in (
+            ("tipo", tienda.filtrar_por_tipo),
+            ("material", tienda.filtrar_por_material),
+            ("color", tienda.filtrar_por_color),
+        ):
+            if campo not in consulta:
+                continue
+            encontrados = filtro(consulta[campo])
+            if candidatos is None:
+                candidatos = encontrados
+            else:
+                ids = {id(m) for m in encontrados}
+                candidatos = [m for m in candidatos if id(m) in ids]
+        if candidatos is None:
+            candidatos = list(tienda.inventario)
+        return _muebles_json(candidatos, peticion.entero("limite", _LIMITE))
+
+    def _baratos(self, peticion: _Peticion) -> Dict[str, Any]:
+        cantidad = peticion.entero("cantidad", 5)
+        return _muebles_json(self.tienda.obtener_mas_baratos(cantidad), cantidad)
+
+    def _caros(self, peticion: _Peticion) -> Dict[str, Any]:
+        cantidad = peticion.entero("cantidad", 5)
+        return _muebles_json(self.tienda.obtener_mas_caros(cantidad), cantidad)
+
+    def _buscar(self, peticion: _Peticion) -> Dict[str, Any]:
+        encontrados = self.tienda.buscar_muebles_por_nombre(
+            peticion.consulta.get("q", "")
+        )
+        return _muebles_json(encontrados, peticion.entero("limite", _LIMITE))
+
+    def _estadisticas(self, peticion: _Peticion) -> Dict[str, Any]:
+        return self.tienda.obtener_estadisticas()
+
+    def _descuentos(self, peticion: _Peticion) -> Dict[str, Any]:
+        estado = self.tienda.exportar_estado()
+        return {
+            "descuentos": estado["descuentos"],
+            "reglas": estado["reglas_descuento"],
+            "tope": estado["tope_descuento"],
+        }
+
+    def _aplicar_descuento(self, peticion: _Peticion) -> Dict[str, Any]:
+        datos = peticion.json()
+        mensaje = self.tienda.aplicar_descuento(
+            datos.get("categoria"), datos.get("porcentaje")
+        )
+        if mensaje.startswith("Error"):
+            raise ErrorHttp(400, mensaje)
+        return {"mensaje": mensaje}
+
+    def _vender(self, peticion: _Peticion) -> Dict[str, Any]:
+        """
+        Vende una unidad del primer mueble disponible con el nombre indicado.
+
+        Pasa por ``cobrar`` como un carrito de una línea: quita la unidad
+        del inventario (sin tocar las reservadas) y la anota como cualquier
+        venta de caja. Si otra caja se la lleva antes responde 409.
+        """
+        datos = peticion.json()
+        nombre = datos.get("nombre")
+        if not isinstance(nombre, str):
+            raise ErrorHttp(400, "falta el nombre del mueble")
+        self.tienda.vencer_reservas()
+        encontrados = self.tienda.inventario.buscar_por_nombre(nombre)
+        if not encontrados:
+            raise ErrorHttp(404, f"no hay muebles llamados {nombre}")
+        carrito = Carrito(datos.get("cliente"))
+        carrito.agregar(encontrados[0])
+        recibo = self.tienda.cobrar(carrito)
+        if "error" in recibo:
+            raise ErrorHttp(409, recibo["error"])
+        return recibo["lineas"][0]
+
+    def _valoracion(self, peticion: _Peticion) -> Dict[str, Any]:
+        """
+        Recalcula el precio de todo el inventario, con y sin descuentos.
+
+        ``evaluar_descuentos`` recorre una copia del inventario, así que el
+        candado del inventario solo se toma para copiarlo.
+        """
+        lista = con_descuento = 0
+        por_tipo: Dict[str, Dict[str, Any]] = {}
+        evaluados = self.tienda.evaluar_descuentos()
+        for evaluado in evaluados:
+            final = round(evaluado["precio_final"] * 100)
+            tipo = por_tipo.setdefault(evaluado["tipo"], {"muebles": 0, "valor": 0})
+            tipo["muebles"] += 1
+            tipo["valor"] += final
+            lista += round(evaluado["precio_original"] * 100)
+            con_descuento += final
+        for tipo in por_tipo.values():
+            tipo["valor"] /= 100
+        return {
+            "muebles": len(evaluados),
+            "valor_lista": lista / 100,
+            "valor_con_descuento": con_descuento / 100,
+            "ahorro": (lista - con_descuento) / 100,
+            "por_tipo": por_tipo,
+        }
+
+
+def _resuelta(valor: Any) -> asyncio.Future:
+    futuro = asyncio.get_running_loop().create_future()
+    futuro.set_result(valor)
+    return futuro
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalogo", help="catálogo CSV o JSON Lines a importar")
+    parser.add_argument("--anfitrion", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--hilos", type=int, default=8)
+    args = parser.parse_args()
+
+    tienda = TiendaMuebles("Tienda HTTP")
+    if args.catalogo:
+        importar_catalogo(tienda, args.catalogo)
+
+    async def correr() -> None:
+        servidor = ServidorTienda(tienda, args.anfitrion, args.puerto, args.hilos)
+        await servidor.iniciar()
+        # la primera línea indica el puerto real (útil con --puerto 0)
+        print(f"Escuchando en http://{args.anfitrion}:{servidor.puerto}", flush=True)
+        try:
+            await servidor.servir()
+        finally:
+            await servidor.cerrar()
+
+    try:
+        asyncio.run(correr())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,1524 @@
-"""Implementación limpia de TiendaMuebles — versión única y compacta.
+"""
+Tienda de muebles: ``TiendaMuebles`` y su inventario indexado.
+
+El inventario se guarda en un ``InventarioIndexado``: una tabla de ranuras,
+una por SKU con su cantidad de unidades idénticas, con índices hash
+secundarios (tipo, material, color y nombre) y un índice ordenado por
+precio final, para que las búsquedas y filtros del menú no tengan que
+recorrer todo el inventario. La búsqueda por nombre usa un índice invertido
+de palabras sin acentos ni mayúsculas, y el valor total se lleva en
+centavos enteros.
+
+``TiendaMuebles`` vende muebles sueltos, por nombre o por carrito (con
+descuentos por categoría, reglas y un tope), aparta unidades con reservas
+que vencen y arma reportes y valoraciones en varios procesos. Se puede
+persistir en un almacén SQLite, anotar las ventas en un diario y en un
+libro en columnas, o recuperarse de una instantánea más un registro de
+cambios (WAL).
 
-Este archivo fue reemplazado para eliminar duplicados y marcadores de
-merge que estaban provocando SyntaxError. Contiene una clase sencilla
-pensada para ser usada por los tests unitarios del taller.
+Varios hilos (cajas) pueden usar la misma tienda. El inventario en memoria
+se protege con un candado propio que solo se toma durante operaciones
+cortas en memoria; la escritura en el almacén, el diario y el WAL se hace
+fuera de él, con candados por franja para cada mueble, y los contadores de
+ventas se reparten en fragmentos que se suman al leerlos.
 """
 
-from typing import Any, Dict, List, Optional
+import gc
+import itertools
+import math
+import re
+import threading
+import time
+import unicodedata
+import warnings
+from bisect import bisect_left, bisect_right, insort
+from contextlib import nullcontext
+from functools import lru_cache, wraps
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from src.models.composicion.comedor import Comedor
+from src.services.carrito import Carrito
+from src.services.catalogo import lector_campos, registro_a_mueble, registro_simple
+from src.services.concurrencia import CandadosFranjas, ContadorFragmentado
+from src.services.descuentos import MotorDescuentos, ReglaDescuento
+from src.services.escritura import escribir_fragmentos
+from src.services.paralelo import TAMAÑO_BLOQUE, reporte, valorar
+from src.services.reservas import AgendaVencimientos, Reserva
+
+if TYPE_CHECKING:
+    from src.services.almacen import AlmacenSQLite, Fila
+    from src.services.diario import DiarioVentas
+    from src.services.libro_ventas import LibroVentas
+    from src.services.recuperacion import RegistroCambios
+
+
+def _normalizar(valor: Any) -> Optional[str]:
+    """Normaliza un texto para usarlo como clave de índice (sin espacios ni mayúsculas)."""
+    if not isinstance(valor, str):
+        return None
+    valor = valor.strip().casefold()
+    return valor or None
+
+
+_PALABRA = re.compile(r"\w+")
+
+
+def _tokenizar(texto: Any) -> Tuple[str, ...]:
+    """
+    Divide un texto en palabras normalizadas para el índice invertido.
+
+    Aplica descomposición Unicode (NFKD), elimina las marcas de acento y
+    pliega mayúsculas, de modo que "Sofá" y "SOFA" producen "sofa". Un
+    texto ASCII no tiene acentos que quitar y se resuelve con ``lower``.
+    """
+    if not isinstance(texto, str):
+        return ()
+    if texto.isascii():
+        return tuple(_PALABRA.findall(texto.lower()))
+    return _tokenizar_unicode(texto)
+
+
+@lru_cache(maxsize=4096)
+def _tokenizar_unicode(texto: str) -> Tuple[str, ...]:
+    """Camino lento de ``_tokenizar``; se memoriza porque materiales y colores se repiten."""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return tuple(_PALABRA.findall(sin_acentos.casefold()))
+
+
+def _precio_de(item: Any) -> Optional[float]:
+    """Precio final como float, o None si no se puede calcular."""
+    try:
+        precio = float(item.calcular_precio())
+    except Exception:
+        return None
+    return None if math.isnan(precio) else precio
+
+
+def _a_centavos(precio: float) -> int:
+    """Convierte un precio a centavos enteros para sumar sin error de redondeo."""
+    return round(precio * 100)
+
+
+def _nombre_tipo(item: Any) -> str:
+    """Nombre de la clase concreta; usa ``__class__`` para respetar mocks con spec."""
+    return getattr(item, "__class__", type(item)).__name__
+
+
+_CLAVES_SKU: Dict[type, Callable[[Any], Tuple[Any, ...]]] = {}
+
+
+def _calculo_sku(tipo: type) -> Optional[Callable[[Any], Tuple[Any, ...]]]:
+    """Función que arma la clave de SKU de los muebles de ``tipo`` (cacheada)."""
+    calcular = _CLAVES_SKU.get(tipo)
+    if calcular is not None:
+        return calcular
+    if getattr(tipo, "a_registro", None) is not None:
+        # MuebleDiferido: el registro se lee sin construir el mueble
+        calcular = lambda item: tuple(item.a_registro().values())  # noqa: E731
+    else:
+        lector = lector_campos(tipo)
+        if lector is None:
+            return None
+        nombre, obtener = tipo.__name__, lector[1]
+        calcular = lambda item: (nombre, *obtener(item))  # noqa: E731
+    _CLAVES_SKU[tipo] = calcular
+    return calcular
+
+
+def _clave_sku(item: Any, precio: Optional[float] = None) -> Optional[Tuple[Any, ...]]:
+    """
+    Clave de SKU: el tipo del mueble, los valores de su constructor y su
+    precio final en centavos.
+
+    Dos muebles con la misma clave son unidades idénticas. El precio entra
+    en la clave porque hay estado que el constructor no fija (un setter
+    como ``tiene_respaldo`` o ``capacidad_personas``): dos muebles con los
+    mismos campos pero distinto precio no son el mismo SKU. Los que no son
+    exactamente de un tipo de ``TIPOS_MUEBLE`` (mocks, composiciones,
+    subclases propias) o tienen campos no hashables no tienen clave.
+
+    Args:
+        item: Mueble
+        precio: Precio final ya calculado (se calcula si no se indica)
+    """
+    calcular = _calculo_sku(type(item))
+    if calcular is None:
+        return None
+    if precio is None:
+        precio = _precio_de(item)
+    try:
+        clave = (*calcular(item), None if precio is None else _a_centavos(precio))
+        hash(clave)
+    except Exception:
+        return None
+    return clave
+
+
+def _identidad(item: Any) -> Hashable:
+    """Clave de SKU del mueble o, si no tiene, su ``id``."""
+    clave = _clave_sku(item)
+    return id(item) if clave is None else clave
+
+
+def _con_carga_completa(metodo: Callable) -> Callable:
+    """
+    Ejecuta ``metodo`` con el candado del inventario, tras completar la
+    carga diferida.
+    """
+
+    @wraps(metodo)
+    def envoltura(self: "InventarioIndexado", *args: Any, **kwargs: Any) -> Any:
+        with self._candado:
+            if self._carga_diferida is not None:
+                self._completar_carga()
+            return metodo(self, *args, **kwargs)
+
+    return envoltura
+
+
+class InventarioIndexado:
+    """
+    Almacén de inventario con índices hash secundarios.
+
+    Cada ranura (entero creciente) es un SKU: un mueble y la cantidad de
+    unidades idénticas en existencia. Al agregar un mueble de la misma clase,
+    con los mismos campos y el mismo precio final que uno ya indexado (ver
+    ``_clave_sku``) solo se suma su cantidad, y al venderlo se descuenta una
+    unidad; la ranura se libera con la última. Así seis sillas iguales
+    ocupan un objeto y una entrada de cada índice. Un mueble sin clave (mock,
+    composición) ocupa siempre su propia ranura, y uno cuyo mueble guardado
+    cambió sin ``actualizar`` no se suma a él.
+
+    Además de la tabla principal se mantienen índices por tipo concreto,
+    material y color normalizados y nombre exacto, de modo que un filtro
+    cuesta O(resultado) y no O(inventario). Los índices son diccionarios
+    ranura -> mueble, que conservan el orden de inserción del catálogo, y
+    devuelven cada SKU una vez.
+
+    El precio final se calcula una vez al indexar y se guarda en una lista
+    ordenada de pares (precio, ranura): los rangos de precio se resuelven
+    con búsqueda binaria más un corte de la lista. Al quitar un mueble su
+    par queda como lápida (deja de estar en ``_precios``) y la lista se
+    compacta cuando las lápidas superan la mitad, así que una venta no paga
+    el desplazamiento O(n) de borrar en medio de la lista.
+
+    El valor total del inventario se lleva como suma en centavos enteros
+    (punto fijo, exacta) de precio por unidades, que se actualiza en cada
+    alta, baja o cambio de precio, de modo que consultarlo cuesta O(1).
+
+    Para la búsqueda de texto hay un índice invertido palabra -> ranuras con
+    las palabras del nombre, el material y el tapizado, y un vocabulario
+    ordenado que permite buscar por prefijo ("sof" encuentra "sofacama").
+
+    Se comporta como una secuencia de solo lectura (``len``, iteración,
+    acceso por posición) de unidades, para no romper a quien recorre
+    ``tienda.inventario``: un SKU con tres unidades aparece tres veces.
+
+    Con ``diferir_carga`` el inventario arranca vacío y los muebles de una
+    fuente externa (p. ej. una instantánea) se indexan la primera vez que
+    una consulta los necesita; mientras tanto ``len``, ``valor_total`` y
+    ``contar_por_tipo`` responden con el resumen que entrega la fuente.
+
+    Las unidades reservadas (ver ``reservar``) siguen en el inventario y en
+    su valor, pero no se venden ni aparecen en filtros, búsquedas y rankings
+    de precio: un SKU queda oculto solo si todas sus unidades están
+    reservadas, y esos SKU se llevan en un conjunto para que los filtros no
+    paguen nada mientras no haya ninguno.
+
+    Cada operación pública toma un ``RLock`` del inventario, de modo que
+    varios hilos ven siempre índices coherentes. ``tomar`` y
+    ``tomar_por_nombre`` buscan y quitan en un solo paso, para que dos
+    hilos no vendan el mismo mueble.
+    """
+
+    def __init__(self) -> None:
+        self._items: Dict[int, Any] = {}
+        self._cantidades: Dict[int, int] = {}
+        self._unidades = 0
+        self._por_sku: Dict[Tuple[Any, ...], int] = {}
+        self._sku_de: Dict[int, Tuple[Any, ...]] = {}
+        self._reservadas: Dict[int, int] = {}
+        self._agotadas: Set[int] = set()
+        self._claves: Dict[int, Tuple[Any, ...]] = {}
+        self._ranuras_por_objeto: Dict[int, List[int]] = {}
+        self._por_tipo: Dict[str, Dict[int, Any]] = {}
+        self._por_material: Dict[str, Dict[int, Any]] = {}
+        self._por_color: Dict[str, Dict[int, Any]] = {}
+        self._por_nombre: Dict[Any, Dict[int, Any]] = {}
+        self._precios: Dict[int, float] = {}
+        self._orden_precio: List[Tuple[float, int]] = []
+        self._lapidas_precio = 0
+        self._total_centavos = 0
+        self._por_palabra: Dict[str, Dict[int, Any]] = {}
+        self._palabras_de: Dict[int, Tuple[str, ...]] = {}
+        self._vocabulario: List[str] = []
+        self._por_texto: Optional[Dict[str, Dict[int, Any]]] = None
+        self._texto_de: Dict[int, str] = {}
+        self._siguiente_ranura = 0
+        self._lista: Optional[List[Any]] = None
+        self._carga_diferida: Optional[Callable[[], Iterable]] = None
+        self._resumen_diferido: Optional[Dict[str, Any]] = None
+        self._candado = threading.RLock()
+
+    # --- Protocolo de secuencia ---
+
+    def __len__(self) -> int:
+        resumen = self._resumen_diferido
+        if resumen is not None:
+            return resumen["cantidad"]
+        return self._unidades
+
+    @_con_carga_completa
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._en_orden())
+
+    @_con_carga_completa
+    def __getitem__(self, posicion: Any) -> Any:
+        if self._lista is None:
+            self._lista = self._en_orden()
+        return self._lista[posicion]
+
+    @_con_carga_completa
+    def __contains__(self, item: Any) -> bool:
+        return self._ranuras_de_item(item) != ()
+
+    def __repr__(self) -> str:
+        return f"InventarioIndexado({len(self)} muebles)"
+
+    def _en_orden(self) -> List[Any]:
+        """Un elemento por unidad, en orden de catálogo."""
+        if self._unidades == len(self._items):
+            return list(self._items.values())
+        cantidades = self._cantidades
+        return [item for r, item in self._items.items() for _ in range(cantidades[r])]
+
+    # --- Mantenimiento ---
+
+    def _indices(self) -> Tuple[Dict[Any, Dict[int, Any]], ...]:
+        """Índices secundarios, en el mismo orden que las claves de ``_calcular_claves``."""
+        return (self._por_tipo, self._por_material, self._por_color, self._por_nombre)
+
+    @staticmethod
+    def _calcular_claves(item: Any) -> Tuple[Any, ...]:
+        """Extrae las claves de índice de un mueble (None si no aplica)."""
+        try:
+            nombre = getattr(item, "nombre", None)
+            hash(nombre)
+        except Exception:
+            nombre = None
+        return (
+            _nombre_tipo(item),
+            _normalizar(getattr(item, "material", None)),
+            _normalizar(getattr(item, "color", None)),
+            nombre,
+        )
+
+    @staticmethod
+    def _calcular_palabras(item: Any) -> Tuple[str, ...]:
+        """Palabras normalizadas de nombre, material y tapizado, sin repetir."""
+        palabras: Dict[str, None] = {}
+        for atributo in ("nombre", "material", "material_tapizado"):
+            try:
+                texto = getattr(item, atributo, None)
+            except Exception:
+                continue
+            for palabra in _tokenizar(texto):
+                palabras[palabra] = None
+        return tuple(palabras)
+
+    def _indexar(
+        self,
+        ranura: int,
+        item: Any,
+        precio: Optional[float] = None,
+        pendientes: Optional[Tuple[List[Tuple[float, int]], List[str]]] = None,
+        sku: Optional[Tuple[Any, ...]] = None,
+    ) -> None:
+        """
+        Indexa un mueble en todas las estructuras.
+
+        La cantidad de la ranura ya tiene que estar fijada. Con ``pendientes``
+        (carga por lotes) los pares de precio y las palabras nuevas del
+        vocabulario se acumulan en esas listas en vez de insertarse ordenados
+        uno a uno; ``agregar_lote`` los fusiona al final.
+        """
+        if sku is not None:
+            self._sku_de[ranura] = sku
+            # si otra ranura ya tiene ese SKU (tras ``actualizar``) se queda
+            self._por_sku.setdefault(sku, ranura)
+        claves = self._calcular_claves(item)
+        self._claves[ranura] = claves
+        for indice, clave in zip(self._indices(), claves):
+            if clave is not None:
+                grupo = indice.get(clave)
+                if grupo is None:
+                    grupo = indice[clave] = {}
+                grupo[ranura] = item
+        if precio is None:
+            precio = _precio_de(item)
+        if precio is not None:
+            if pendientes is None:
+                self._insertar_precio(ranura, precio)
+            else:
+                self._precios[ranura] = precio
+                self._total_centavos += _a_centavos(precio) * self._cantidades[ranura]
+                pendientes[0].append((precio, ranura))
+        palabras = self._calcular_palabras(item)
+        self._palabras_de[ranura] = palabras
+        for palabra in palabras:
+            lista = self._por_palabra.get(palabra)
+            if lista is None:
+                lista = self._por_palabra[palabra] = {}
+                if pendientes is None:
+                    insort(self._vocabulario, palabra)
+                else:
+                    pendientes[1].append(palabra)
+            lista[ranura] = item
+        if self._por_texto is not None:
+            self._indexar_texto(ranura, item)
+
+    def _indexar_texto(self, ranura: int, item: Any) -> None:
+        try:
+            texto = str(item)
+        except Exception:
+            return
+        self._texto_de[ranura] = texto
+        self._por_texto.setdefault(texto, {})[ranura] = item
+
+    def _insertar_precio(self, ranura: int, precio: float) -> None:
+        """Inserta (precio, ranura) en la lista ordenada, reviviendo su lápida si la hay."""
+        self._precios[ranura] = precio
+        self._total_centavos += _a_centavos(precio) * self._cantidades[ranura]
+        entrada = (precio, ranura)
+        posicion = bisect_left(self._orden_precio, entrada)
+        if (
+            posicion < len(self._orden_precio)
+            and self._orden_precio[posicion] == entrada
+        ):
+            self._lapidas_precio -= 1
+        else:
+            self._orden_precio.insert(posicion, entrada)
+
+    def _precio_vigente(self, entrada: Tuple[float, int]) -> bool:
+        """Una entrada de la lista de precios es válida si no es una lápida."""
+        return self._precios.get(entrada[1]) == entrada[0]
+
+    def _compactar_precios(self) -> None:
+        """Elimina las lápidas de la lista de precios en una sola pasada."""
+        self._orden_precio = [e for e in self._orden_precio if self._precio_vigente(e)]
+        self._lapidas_precio = 0
+
+    def _desindexar_precio(self, ranura: int) -> None:
+        """Deja como lápida la entrada de precio de una ranura."""
+        precio = self._precios.pop(ranura, None)
+        if precio is not None:
+            self._total_centavos -= _a_centavos(precio) * self._cantidades[ranura]
+            self._lapidas_precio += 1
+            if self._lapidas_precio * 2 > len(self._orden_precio):
+                self._compactar_precios()
+
+    def _desindexar(self, ranura: int) -> None:
+        self._desindexar_precio(ranura)
+        sku = self._sku_de.pop(ranura, None)
+        if sku is not None and self._por_sku.get(sku) == ranura:
+            del self._por_sku[sku]
+        if self._por_texto is not None:
+            texto = self._texto_de.pop(ranura, None)
+            if texto is not None:
+                grupo = self._por_texto[texto]
+                del grupo[ranura]
+                if not grupo:
+                    del self._por_texto[texto]
+        for palabra in self._palabras_de.pop(ranura, ()):
+            lista = self._por_palabra[palabra]
+            lista.pop(ranura, None)
+            if not lista:
+                del self._por_palabra[palabra]
+                del self._vocabulario[bisect_left(self._vocabulario, palabra)]
+        claves = self._claves.pop(ranura)
+        for indice, clave in zip(self._indices(), claves):
+            if clave is None:
+                continue
+            grupo = indice.get(clave)
+            if grupo is not None:
+                grupo.pop(ranura, None)
+                if not grupo:
+                    del indice[clave]
+
+    def _sumar_unidades(self, ranura: int, cantidad: int) -> None:
+        """Suma (o resta) unidades a un SKU ya indexado, con su valor."""
+        self._cantidades[ranura] += cantidad
+        self._unidades += cantidad
+        precio = self._precios.get(ranura)
+        if precio is not None:
+            self._total_centavos += _a_centavos(precio) * cantidad
+        self._lista = None
+        if self._reservadas:
+            self._revisar_agotada(ranura)
+
+    def _disponibles(self, ranura: int) -> int:
+        """Unidades de la ranura que no están reservadas."""
+        return self._cantidades[ranura] - self._reservadas.get(ranura, 0)
+
+    def _revisar_agotada(self, ranura: int) -> None:
+        """Marca u oculta la ranura según le queden unidades sin reservar."""
+        if ranura in self._cantidades and self._disponibles(ranura) <= 0:
+            self._agotadas.add(ranura)
+        else:
+            self._agotadas.discard(ranura)
+
+    def _visibles(self, ranuras: Dict[int, Any]) -> List[Any]:
+        """Muebles de un grupo de índice, sin los SKU con todo reservado."""
+        agotadas = self._agotadas
+        if not agotadas:
+            return list(ranuras.values())
+        return [item for r, item in ranuras.items() if r not in agotadas]
+
+    def _nueva_ranura(self, item: Any, cantidad: int) -> int:
+        """Reserva una ranura para un SKU nuevo (falta indexarlo)."""
+        ranura = self._siguiente_ranura
+        self._siguiente_ranura += 1
+        self._items[ranura] = item
+        self._cantidades[ranura] = cantidad
+        self._unidades += cantidad
+        self._ranuras_por_objeto.setdefault(id(item), []).append(ranura)
+        return ranura
+
+    def _ranura_de_sku(self, sku: Optional[Tuple[Any, ...]]) -> Optional[int]:
+        """
+        Ranura a la que se suman las unidades de ``sku`` (None: abrir otra).
+
+        El mueble guardado tiene que seguir teniendo esa clave: si se
+        modificó sin ``actualizar``, sus unidades ya no son iguales a las
+        nuevas, y la clave pasa a la ranura que se abra para ellas.
+        """
+        ranura = None if sku is None else self._por_sku.get(sku)
+        if ranura is None:
+            return None
+        if _clave_sku(self._items[ranura]) != sku:
+            del self._por_sku[sku]
+            return None
+        return ranura
+
+    @_con_carga_completa
+    def agregar(
+        self,
+        item: Any,
+        precio: Optional[float] = None,
+        cantidad: int = 1,
+        sumadas: Optional[List[bool]] = None,
+    ) -> int:
+        """
+        Agrega unidades de un mueble. Devuelve la ranura de su SKU.
+
+        Si ya hay un mueble idéntico (misma clave de SKU, también con el
+        precio) solo se suma ``cantidad`` a su ranura; si no, se indexa en
+        una ranura nueva.
+
+        Args:
+            item: Mueble a agregar
+            precio: Precio final ya calculado (se calcula si no se indica)
+            cantidad: Unidades que se agregan
+            sumadas: Si se indica, se le anexa si las unidades se sumaron a
+                un SKU que ya estaba
+        """
+        if precio is None:
+            precio = _precio_de(item)
+        sku = _clave_sku(item, precio)
+        ranura = self._ranura_de_sku(sku)
+        if sumadas is not None:
+            sumadas.append(ranura is not None)
+        if ranura is not None:
+            self._sumar_unidades(ranura, cantidad)
+            return ranura
+        ranura = self._nueva_ranura(item, cantidad)
+        self._indexar(ranura, item, precio, sku=sku)
+        self._lista = None
+        return ranura
+
+    @_con_carga_completa
+    def agregar_lote(
+        self,
+        items: Iterable[Tuple[Any, Optional[float]]],
+        sumadas: Optional[List[bool]] = None,
+    ) -> int:
+        """
+        Agrega muchos muebles de una vez. Devuelve las unidades agregadas.
+
+        Los índices hash se llenan SKU a SKU, pero la lista ordenada de
+        precios y el vocabulario se extienden y reordenan una sola vez al
+        final (Timsort fusiona el tramo ya ordenado con el nuevo), en lugar
+        de pagar una inserción ordenada O(n) por mueble. Los muebles
+        idénticos a uno ya indexado (o a uno anterior del lote) solo suman
+        una unidad.
+
+        Args:
+            items: Pares (mueble, precio final o None para calcularlo)
+            sumadas: Si se indica, se le anexa por cada mueble si se sumó a
+                un SKU que ya estaba antes del lote
+        """
+        agregadas = 0
+        # las ranuras desde aquí son SKU que abre este lote
+        primera_nueva = self._siguiente_ranura
+        pendientes: Tuple[List[Tuple[float, int]], List[str]] = ([], [])
+        # Un lote crea millones de diccionarios y tuplas que el recolector
+        # de ciclos revisaría una y otra vez sin encontrar basura.
+        recolector_activo = gc.isenabled()
+        gc.disable()
+        try:
+            for item, precio in items:
+                if precio is None:
+                    precio = _precio_de(item)
+                sku = _clave_sku(item, precio)
+                ranura = self._ranura_de_sku(sku)
+                if ranura is None:
+                    ranura = self._nueva_ranura(item, 1)
+                    self._indexar(ranura, item, precio, pendientes, sku)
+                else:
+                    self._sumar_unidades(ranura, 1)
+                if sumadas is not None:
+                    sumadas.append(ranura < primera_nueva)
+                agregadas += 1
+        finally:
+            # fusionar aunque el iterable falle a mitad, para no dejar
+            # ranuras indexadas fuera del orden de precios o del vocabulario
+            nuevos_precios, nuevas_palabras = pendientes
+            if nuevos_precios:
+                self._orden_precio.extend(nuevos_precios)
+                self._orden_precio.sort()
+            if nuevas_palabras:
+                self._vocabulario.extend(nuevas_palabras)
+                self._vocabulario.sort()
+            self._lista = None
+            if recolector_activo:
+                gc.enable()
+        return agregadas
+
+    def _ranuras_de_item(self, item: Any) -> Tuple[int, ...]:
+        """Ranuras del mueble: las suyas o, si no es el guardado, la de su SKU."""
+        ranuras = self._ranuras_por_objeto.get(id(item))
+        if ranuras:
+            return tuple(ranuras)
+        sku = _clave_sku(item)
+        ranura = None if sku is None else self._por_sku.get(sku)
+        return () if ranura is None else (ranura,)
+
+    @_con_carga_completa
+    def ranuras_de(self, items: Iterable[Any]) -> List[Optional[int]]:
+        """
+        Una ranura con unidad libre por cada aparición de cada mueble en ``items``.
+
+        Un mueble cuenta como una unidad de su SKU aunque no sea el objeto
+        guardado; cada ranura se asigna a lo sumo tantas veces como unidades
+        sin reservar tiene. Las apariciones sin unidad libre quedan en None.
+        """
+        usadas: Dict[int, int] = {}
+        resultado: List[Optional[int]] = []
+        for item in items:
+            libre = None
+            for ranura in self._ranuras_de_item(item):
+                if usadas.get(ranura, 0) < self._disponibles(ranura):
+                    libre = ranura
+                    usadas[ranura] = usadas.get(ranura, 0) + 1
+                    break
+            resultado.append(libre)
+        return resultado
+
+    @_con_carga_completa
+    def quitar_ranura(self, ranura: int) -> Any:
+        """
+        Quita una unidad del SKU de una ranura y devuelve su mueble.
+
+        No mira las reservas: quien llama elige una ranura con unidades
+        libres (``ranuras_de``, ``primera_ranura_por_nombre``).
+        """
+        item = self._items[ranura]
+        if self._cantidades[ranura] > 1:
+            self._sumar_unidades(ranura, -1)
+            return item
+        self._desindexar(ranura)
+        del self._items[ranura]
+        del self._cantidades[ranura]
+        self._unidades -= 1
+        ranuras = self._ranuras_por_objeto[id(item)]
+        ranuras.remove(ranura)
+        if not ranuras:
+            del self._ranuras_por_objeto[id(item)]
+        self._lista = None
+        return item
+
+    @_con_carga_completa
+    def quitar(self, item: Any) -> bool:
+        """Quita una unidad del mueble indicado. Devuelve False si no estaba."""
+        ranura = self.ranuras_de([item])[0]
+        if ranura is None:
+            return False
+        self.quitar_ranura(ranura)
+        return True
+
+    @_con_carga_completa
+    def tomar_por_nombre(self, nombre: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        Quita el primer mueble cuyo nombre o ``str()`` es ``nombre``.
+
+        Returns:
+            tuple: (mueble, precio final indexado), o None si no hay ninguno
+        """
+        ranura = self.primera_ranura_por_nombre(nombre)
+        if ranura is None:
+            return None
+        precio = self._precios.get(ranura)
+        return self.quitar_ranura(ranura), precio
+
+    @_con_carga_completa
+    def tomar(
+        self, items: List[Any], liberar: Optional[Dict[int, int]] = None
+    ) -> Tuple[List[float], List[Any]]:
+        """
+        Quita todos los muebles de ``items`` o ninguno.
+
+        Un mueble repetido se quita tantas veces como aparece. Los que no
+        tienen unidad libre o precio indexado cuentan como faltantes.
+
+        Args:
+            items: Muebles a quitar
+            liberar: Unidades reservadas por ranura que se liberan antes,
+                para vender una reserva; si falta algo siguen reservadas
+
+        Returns:
+            tuple: (precios de cada aparición, faltantes); si hay faltantes
+            no se quita nada y la lista de precios queda vacía
+        """
+        for ranura, cantidad in (liberar or {}).items():
+            self.liberar(ranura, cantidad)
+        ranuras = self.ranuras_de(items)
+        precios = [None if r is None else self._precios.get(r) for r in ranuras]
+        faltantes = [
+            item
+            for item, ranura, precio in zip(items, ranuras, precios)
+            if ranura is None or precio is None
+        ]
+        if faltantes:
+            for ranura, cantidad in (liberar or {}).items():
+                self._retener(ranura, cantidad)
+            return [], faltantes
+        for ranura in ranuras:
+            self.quitar_ranura(ranura)
+        return precios, []
+
+    def _retener(self, ranura: int, cantidad: int) -> None:
+        self._reservadas[ranura] = self._reservadas.get(ranura, 0) + cantidad
+        self._revisar_agotada(ranura)
+
+    @_con_carga_completa
+    def reservar(self, item: Any, cantidad: int = 1) -> Optional[Tuple[int, Any]]:
+        """
+        Aparta ``cantidad`` unidades libres del SKU de ``item``.
+
+        Args:
+            item: Mueble (o nombre, o ``str()`` de un mueble, como en
+                ``tomar_por_nombre``)
+            cantidad: Unidades a apartar
+
+        Returns:
+            tuple: (ranura, mueble guardado), o None si no hay tantas libres
+        """
+        if isinstance(item, str):
+            ranura = self.primera_ranura_por_nombre(item)
+            ranuras: Tuple[int, ...] = () if ranura is None else (ranura,)
+        else:
+            ranuras = self._ranuras_de_item(item)
+        for ranura in ranuras:
+            if self._disponibles(ranura) >= cantidad:
+                self._retener(ranura, cantidad)
+                return ranura, self._items[ranura]
+        return None
+
+    @_con_carga_completa
+    def liberar(self, ranura: int, cantidad: int) -> None:
+        """Devuelve a la venta unidades apartadas con ``reservar``."""
+        restantes = self._reservadas.get(ranura, 0) - cantidad
+        if restantes > 0:
+            self._reservadas[ranura] = restantes
+        else:
+            self._reservadas.pop(ranura, None)
+        self._revisar_agotada(ranura)
+
+    @_con_carga_completa
+    def reservadas(self) -> Dict[Hashable, int]:
+        """Unidades reservadas por identidad de SKU (ver ``identidad``)."""
+        resultado: Dict[Hashable, int] = {}
+        for ranura, cantidad in self._reservadas.items():
+            sku = self._sku_de.get(ranura)
+            clave = id(self._items[ranura]) if sku is None else sku
+            resultado[clave] = resultado.get(clave, 0) + cantidad
+        return resultado
+
+    @_con_carga_completa
+    def actualizar(self, item: Any) -> int:
+        """
+        Reindexa un mueble (claves y precio) cuyos atributos cambiaron.
+
+        ``item`` tiene que ser el objeto guardado, y el cambio vale para
+        todas las unidades de su SKU. Si queda idéntico a otro SKU, ambos
+        siguen en ranuras separadas.
+
+        Returns:
+            int: Cuánto cambió el valor del inventario, en centavos
+        """
+        anterior = self._total_centavos
+        precio = _precio_de(item)
+        sku = _clave_sku(item, precio)
+        for ranura in self._ranuras_por_objeto.get(id(item), []):
+            self._desindexar(ranura)
+            self._indexar(ranura, item, precio, sku=sku)
+        return self._total_centavos - anterior
+
+    @_con_carga_completa
+    def cantidad(self, item: Any) -> int:
+        """Unidades en existencia del SKU de ``item`` (0 si no está)."""
+        return sum(self._cantidades[r] for r in self._ranuras_de_item(item))
+
+    @_con_carga_completa
+    def identidad(self, item: Any) -> Hashable:
+        """
+        Clave de SKU con que se indexó ``item`` (o su ``id`` si no tiene).
+
+        Para el objeto guardado es la de cuando se indexó, aunque haya
+        cambiado después; para otro objeto, la que le corresponde ahora.
+        """
+        ranuras = self._ranuras_por_objeto.get(id(item))
+        if not ranuras:
+            return _identidad(item)
+        sku = self._sku_de.get(ranuras[0])
+        return id(item) if sku is None else sku
+
+    # --- Consultas ---
+
+    @_con_carga_completa
+    def en_ranura(self, ranura: int) -> Any:
+        """Mueble guardado en una ranura."""
+        return self._items[ranura]
+
+    @_con_carga_completa
+    def precio_en_ranura(self, ranura: int) -> Optional[float]:
+        """Precio final indexado del mueble de una ranura (None si no tiene)."""
+        return self._precios.get(ranura)
+
+    @_con_carga_completa
+    def ranuras(self) -> List[Tuple[int, Any]]:
+        """Pares (ranura, mueble) en orden de inserción."""
+        return list(self._items.items())
+
+    @_con_carga_completa
+    def ranuras_con_precio(self) -> List[Tuple[int, Any, Optional[float], int]]:
+        """(ranura, mueble, precio final indexado, unidades) en orden de inserción."""
+        precios, cantidades = self._precios, self._cantidades
+        return [
+            (r, item, precios.get(r), cantidades[r]) for r, item in self._items.items()
+        ]
+
+    def ranuras_por_bloques(
+        self, tamaño: int
+    ) -> Iterator[List[Tuple[int, Any, Optional[float], int]]]:
+        """
+        Como ``ranuras_con_precio`` pero en bloques de hasta ``tamaño`` unidades.
+
+        El candado se toma solo mientras se arma cada bloque, así que las
+        ventas siguen entre bloques y no se copia el inventario entero. Las
+        ranuras crecen en orden de inserción: cada bloque sigue desde la
+        última entregada, salta las que se quitaron entretanto e incluye
+        las agregadas después. Cada número de ranura se consulta una sola vez
+        en todo el recorrido.
+        """
+        siguiente = 0
+        while True:
+            bloque: List[Tuple[int, Any, Optional[float], int]] = []
+            unidades = 0
+            with self._candado:
+                if self._carga_diferida is not None:
+                    self._completar_carga()
+                items, precios, cantidades = (
+                    self._items,
+                    self._precios,
+                    self._cantidades,
+                )
+                fin = self._siguiente_ranura
+                for ranura in range(siguiente, fin):
+                    siguiente = ranura + 1
+                    if ranura not in items:
+                        continue
+                    bloque.append(
+                        (ranura, items[ranura], precios.get(ranura), cantidades[ranura])
+                    )
+                    unidades += cantidades[ranura]
+                    if unidades >= tamaño:
+                        break
+                else:
+                    siguiente = fin
+            if not bloque:
+                return
+            yield bloque
+
+    @_con_carga_completa
+    def filtrar_por_tipo(self, tipo: Any) -> List[Any]:
+        """Muebles de una clase concreta (acepta la clase o su nombre)."""
+        nombre = tipo.__name__ if isinstance(tipo, type) else str(tipo)
+        grupo = self._por_tipo.get(nombre)
+        if grupo is None:
+            buscado = nombre.casefold()
+            for clave, candidato in self._por_tipo.items():
+                if clave.casefold() == buscado:
+                    grupo = candidato
+                    break
+        return self._visibles(grupo) if grupo else []
+
+    @_con_carga_completa
+    def filtrar_por_material(self, material: str) -> List[Any]:
+        """Muebles cuyo material coincide sin distinguir mayúsculas."""
+        grupo = self._por_material.get(_normalizar(material))
+        return self._visibles(grupo) if grupo else []
+
+    @_con_carga_completa
+    def filtrar_por_color(self, color: str) -> List[Any]:
+        """Muebles cuyo color coincide sin distinguir mayúsculas."""
+        grupo = self._por_color.get(_normalizar(color))
+        return self._visibles(grupo) if grupo else []
+
+    @_con_carga_completa
+    def primera_ranura_por_nombre(self, nombre: str) -> Optional[int]:
+        """
+        Ranura del primer mueble con unidades libres cuyo nombre o ``str()``
+        es ``nombre``.
+
+        Equivale a recorrer el inventario en orden y quedarse con la primera
+        coincidencia, pero con dos búsquedas hash. El índice por ``str()`` se
+        construye la primera vez que se necesita y desde entonces se mantiene
+        de forma incremental.
+        """
+        if self._por_texto is None:
+            self._por_texto = {}
+            for ranura, item in self._items.items():
+                self._indexar_texto(ranura, item)
+        candidatas = []
+        for indice in (self._por_nombre, self._por_texto):
+            try:
+                grupo = indice.get(nombre)
+            except TypeError:
+                grupo = None
+            if grupo:
+                libre = next((r for r in grupo if r not in self._agotadas), None)
+                if libre is not None:
+                    candidatas.append(libre)
+        return min(candidatas) if candidatas else None
+
+    @_con_carga_completa
+    def buscar_por_nombre(self, nombre: Any) -> List[Any]:
+        """Muebles cuyo nombre es exactamente ``nombre``."""
+        try:
+            grupo = self._por_nombre.get(nombre)
+        except TypeError:
+            return []
+        return self._visibles(grupo) if grupo else []
+
+    def _listas_por_prefijo(self, prefijo: str) -> Dict[int, Any]:
+        """Unión de las listas de todas las palabras que empiezan por ``prefijo``."""
+        vocabulario = self._vocabulario
+        inicio = fin = bisect_left(vocabulario, prefijo)
+        while fin < len(vocabulario) and vocabulario[fin].startswith(prefijo):
+            fin += 1
+        if fin - inicio == 1:
+            return self._por_palabra[vocabulario[inicio]]
+        union: Dict[int, Any] = {}
+        for palabra in vocabulario[inicio:fin]:
+            union.update(self._por_palabra[palabra])
+        return union
+
+    @_con_carga_completa
+    def buscar(self, consulta: str) -> List[Any]:
+        """
+        Búsqueda por palabras con semántica AND, sin acentos ni mayúsculas.
+
+        Cada término de la consulta se compara como prefijo de las palabras
+        indexadas. Las listas se intersectan empezando por la más corta, así
+        que el coste depende del término más selectivo y no del inventario.
+
+        Args:
+            consulta: Texto libre, p. ej. "sofa cuero"
+
+        Returns:
+            List: Muebles que contienen todos los términos, en orden de catálogo
+        """
+        terminos = _tokenizar(consulta)
+        if not terminos:
+            return []
+        listas = []
+        for termino in dict.fromkeys(terminos):
+            lista = self._listas_por_prefijo(termino)
+            if not lista:
+                return []
+            listas.append(lista)
+        listas.sort(key=len)
+        menor, resto = listas[0], listas[1:]
+        agotadas = self._agotadas
+        ranuras = [
+            r for r in menor if r not in agotadas and all(r in otra for otra in resto)
+        ]
+        ranuras.sort()
+        return [self._items[r] for r in ranuras]
+
+    @_con_carga_completa
+    def filtrar_por_precio(
+        self, minimo: float = 0.0, maximo: float = math.inf
+    ) -> List[Any]:
+        """Muebles con precio final en [minimo, maximo], de menor a mayor."""
+        desde = bisect_left(self._orden_precio, (minimo, -1))
+        hasta = bisect_right(self._orden_precio, (maximo, math.inf))
+        agotadas = self._agotadas
+        return [
+            self._items[e[1]]
+            for e in self._orden_precio[desde:hasta]
+            if self._precio_vigente(e) and e[1] not in agotadas
+        ]
+
+    def _primeros_por_precio(self, entradas: Iterable, cantidad: int) -> List[Any]:
+        resultado: List[Any] = []
+        if cantidad <= 0:
+            return resultado
+        for entrada in entradas:
+            if self._precio_vigente(entrada) and entrada[1] not in self._agotadas:
+                resultado.append(self._items[entrada[1]])
+                if len(resultado) == cantidad:
+                    break
+        return resultado
+
+    @_con_carga_completa
+    def mas_baratos(self, cantidad: int) -> List[Any]:
+        """Los ``cantidad`` muebles más baratos, de menor a mayor precio."""
+        return self._primeros_por_precio(self._orden_precio, cantidad)
+
+    @_con_carga_completa
+    def mas_caros(self, cantidad: int) -> List[Any]:
+        """Los ``cantidad`` muebles más caros, de mayor a menor precio."""
+        return self._primeros_por_precio(reversed(self._orden_precio), cantidad)
+
+    def valor_total(self) -> float:
+        """Suma de los precios finales indexados, en O(1)."""
+        resumen = self._resumen_diferido
+        if resumen is not None:
+            return resumen["total_centavos"] / 100
+        return self._total_centavos / 100
+
+    @_con_carga_completa
+    def verificar_precios(self) -> float:
+        """
+        Recalcula el precio de cada mueble y corrige los que cambiaron.
+
+        Returns:
+            float: Deriva encontrada (valor recalculado - valor que se llevaba)
+        """
+        return self.corregir_precios(
+            [
+                (ranura, self._precios.get(ranura), _precio_de(item))
+                for ranura, item in self._items.items()
+            ]
+        )
+
+    @_con_carga_completa
+    def corregir_precios(
+        self, cambios: Iterable[Tuple[int, Optional[float], Optional[float]]]
+    ) -> float:
+        """
+        Aplica precios recalculados fuera del inventario (p. ej. en otros procesos).
+
+        Cada cambio (ranura, precio anterior, precio nuevo) se aplica solo si
+        la ranura sigue ocupada y su precio indexado sigue siendo el
+        anterior: si entre tanto se vendió o se actualizó, manda lo último.
+
+        Returns:
+            float: Deriva corregida (valor nuevo - valor anterior)
+        """
+        anterior = self._total_centavos
+        for ranura, indexado, precio in cambios:
+            if ranura not in self._items or self._precios.get(ranura) != indexado:
+                continue
+            if precio != indexado:
+                self._desindexar_precio(ranura)
+                if precio is not None:
+                    self._insertar_precio(ranura, precio)
+                self._cambiar_sku(ranura, precio)
+        return (self._total_centavos - anterior) / 100
+
+    def _cambiar_sku(self, ranura: int, precio: Optional[float]) -> None:
+        """Pone el precio corregido en la clave de SKU de la ranura."""
+        sku = self._sku_de.get(ranura)
+        if sku is None:
+            return
+        if self._por_sku.get(sku) == ranura:
+            del self._por_sku[sku]
+        sku = (*sku[:-1], None if precio is None else _a_centavos(precio))
+        self._sku_de[ranura] = sku
+        self._por_sku.setdefault(sku, ranura)
+
+    def contar_por_tipo(self) -> Dict[str, int]:
+        """Unidades por clase concreta."""
+        with self._candado:
+            if self._resumen_diferido is not None:
+                return dict(self._resumen_diferido["por_tipo"])
+            cantidades = self._cantidades
+            return {
+                tipo: sum(cantidades[r] for r in grupo)
+                for tipo, grupo in self._por_tipo.items()
+            }
+
+    # --- Carga diferida ---
+
+    def diferir_carga(
+        self,
+        cargador: Callable[[], Iterable[Tuple[Any, Optional[float]]]],
+        cantidad: int,
+        total_centavos: int,
+        por_tipo: Dict[str, int],
+    ) -> None:
+        """
+        Registra una fuente de muebles que se indexará al primer uso.
+
+        Args:
+            cargador: Función que devuelve los pares (mueble, precio final)
+            cantidad: Número de muebles que entregará el cargador
+            total_centavos: Suma de sus precios en centavos
+            por_tipo: Cantidad de muebles por clase concreta
+
+        Raises:
+            ValueError: Si el inventario no está vacío
+        """
+        with self._candado:
+            if self._items or self._carga_diferida is not None:
+                raise ValueError(
+                    "Solo se puede diferir la carga de un inventario vacío"
+                )
+            self._carga_diferida = cargador
+            self._resumen_diferido = {
+                "cantidad": cantidad,
+                "total_centavos": total_centavos,
+                "por_tipo": dict(por_tipo),
+            }
+
+    def _completar_carga(self) -> None:
+        cargador = self._carga_diferida
+        self._carga_diferida = None
+        self._resumen_diferido = None
+        self.agregar_lote(cargador())
+
+    def items_con_precio(self) -> Iterator[Tuple[Any, Optional[float]]]:
+        """
+        Pares (mueble, precio final indexado) en orden de catálogo, uno por unidad.
+
+        No fuerza la carga diferida: si aún no se hizo, recorre la fuente.
+        """
+        with self._candado:
+            if self._carga_diferida is not None:
+                return iter(self._carga_diferida())
+            precios, cantidades = self._precios, self._cantidades
+            pares = [
+                (item, precios.get(r))
+                for r, item in self._items.items()
+                for _ in range(cantidades[r])
+            ]
+        return iter(pares)
 
 
 class TiendaMuebles:
-    def __init__(self, nombre: str = "Tienda") -> None:
+    """
+    Tienda con inventario indexado en memoria.
+
+    Con un ``almacen`` (p. ej. ``AlmacenSQLite``) cada alta, baja, cambio y
+    venta se escribe también en él, y al crear la tienda se recupera lo que
+    tenía: el estado al momento y los muebles de forma diferida, al primer
+    uso del inventario. Los filtros por precio y material se resuelven en
+    el almacén; cada fila se traduce al objeto ya cargado con su clave, o se
+    construye una sola vez si el inventario aún no se cargó.
+
+    Con un ``diario`` cada venta se anexa además a un ``DiarioVentas`` y el
+    resultado de ``realizar_venta`` lleva su número de ``secuencia``. Con un
+    ``libro`` (un ``LibroVentas``) cada venta queda también en columnas en
+    memoria para consultar ingresos por tipo, cliente o ventana de tiempo.
+
+    Con ``cambios`` (un ``RegistroCambios``) la tienda se recupera de su
+    última instantánea más el WAL y anota en él cada alta, baja, venta y
+    descuento. Es excluyente con ``almacen``: ambos serían la fuente de
+    verdad del inventario.
+
+    Se puede usar desde varios hilos. Quitar muebles del inventario es
+    atómico (una venta por nombre o un cobro nunca venden dos veces el mismo
+    mueble); el almacén y el mapa de claves se tocan con el candado de la
+    franja de cada mueble, sin retener el del inventario, así que las cajas
+    solo se esperan si venden el mismo mueble. Los contadores de ventas son
+    un ``ContadorFragmentado``.
+
+    Con ``reservar`` un cliente aparta unidades durante un tiempo: no se
+    venden ni aparecen en filtros y búsquedas hasta que se vende la reserva,
+    se cancela o vence. Los vencimientos están en una ``AgendaVencimientos``
+    (un montículo) que cada consulta o venta revisa antes de mirar el
+    inventario; con nada vencido eso es mirar la cima. Las reservas viven
+    solo en memoria: no van al almacén ni al registro de cambios.
+    """
+
+    def __init__(
+        self,
+        nombre: str = "Tienda",
+        almacen: Optional["AlmacenSQLite"] = None,
+        diario: Optional["DiarioVentas"] = None,
+        cambios: Optional["RegistroCambios"] = None,
+        libro: Optional["LibroVentas"] = None,
+    ) -> None:
+        if almacen is not None and cambios is not None:
+            raise ValueError("Una tienda no puede usar almacén y registro de cambios")
         self.nombre: str = nombre
-        self._inventario: List[Any] = []
+        self._inventario: InventarioIndexado = InventarioIndexado()
         self._descuentos: Dict[str, float] = {}
-        self._total_muebles_vendidos: int = 0
-        self._valor_total_ventas: float = 0.0
+        self._motor = MotorDescuentos()
+        # muebles vendidos y valor de las ventas
+        self._ventas = ContadorFragmentado(2)
+        self._comedores: List[Any] = []
+        self._almacen = almacen
+        self._diario = diario
+        self._libro = libro
+        # mueble de cada clave del almacén y claves de cada SKU (o id, si el
+        # mueble no tiene SKU); las filas de un mismo SKU comparten objeto
+        self._por_clave: Dict[int, Any] = {}
+        self._claves_de: Dict[Hashable, List[int]] = {}
+        self._franjas = CandadosFranjas()
+        # exportar y guardar el estado, y cambiar descuentos, de a un hilo
+        self._candado_estado = threading.Lock()
+        self._candado_descuentos = threading.Lock()
+        self._reservas: Dict[int, Reserva] = {}
+        self._agenda = AgendaVencimientos()
+        self._numeros_reserva = itertools.count(1)
+        self._candado_reservas = threading.Lock()
+        self._registro_cambios = cambios
+        if almacen is not None:
+            self._abrir_almacen()
+        if cambios is not None:
+            cambios.recuperar(self)
 
     @property
-    def inventario(self) -> List[Any]:
+    def inventario(self) -> InventarioIndexado:
         return self._inventario
 
+    @property
+    def diario(self) -> Optional["DiarioVentas"]:
+        return self._diario
+
+    @property
+    def libro(self) -> Optional["LibroVentas"]:
+        return self._libro
+
+    @property
+    def _total_muebles_vendidos(self) -> int:
+        return self._ventas.leer()[0]
+
+    @property
+    def _valor_total_ventas(self) -> float:
+        return self._ventas.leer()[1]
+
+    # --- Almacén persistente ---
+
+    def _abrir_almacen(self) -> None:
+        """Recupera el estado guardado y difiere la carga de los muebles."""
+        estado = self._almacen.leer_estado()
+        if estado is None:
+            self._guardar_estado()
+        else:
+            self.restaurar_estado(estado)
+        cantidad, total_centavos, por_tipo = self._almacen.resumen()
+        if cantidad:
+            self._inventario.diferir_carga(
+                self._cargar_almacen, cantidad, total_centavos, por_tipo
+            )
+
+    def _cargar_almacen(self) -> Iterator[Tuple[Any, Optional[float]]]:
+        for clave, registro, precio in self._almacen.recorrer():
+            yield self._mueble_de(clave, registro), precio
+
+    def _asociar_clave(self, clave: int, mueble: Any, identidad: Hashable) -> Any:
+        """
+        Asocia una clave al objeto de su SKU (``mueble`` si es el primero).
+
+        Se llama con las franjas de la clave y de la identidad tomadas.
+        """
+        iguales = self._claves_de.setdefault(identidad, [])
+        if iguales:
+            mueble = self._por_clave[iguales[0]]
+        self._por_clave[clave] = mueble
+        iguales.append(clave)
+        return mueble
+
+    def _registrar_clave(self, clave: int, mueble: Any) -> None:
+        identidad = _identidad(mueble)
+        with self._franjas(clave, identidad):
+            self._asociar_clave(clave, mueble, identidad)
+
+    def _olvidar_clave(self, mueble: Any) -> Optional[int]:
+        """
+        Quita y devuelve una de las claves del SKU del mueble (None si no tiene).
+
+        Se llama con la franja del mueble tomada.
+        """
+        identidad = _identidad(mueble)
+        claves = self._claves_de.get(identidad)
+        if not claves:
+            return None
+        clave = claves.pop()
+        if not claves:
+            del self._claves_de[identidad]
+        del self._por_clave[clave]
+        return clave
+
+    def _mueble_de(self, clave: int, registro: Dict[str, Any]) -> Any:
+        """Objeto de una fila del almacén; se construye solo una vez por SKU."""
+        mueble = self._por_clave.get(clave)
+        if mueble is not None:
+            return mueble
+        nuevo = registro_a_mueble(registro)
+        identidad = _identidad(nuevo)
+        with self._franjas(clave, identidad):
+            mueble = self._por_clave.get(clave)
+            if mueble is None:
+                mueble = self._asociar_clave(clave, nuevo, identidad)
+        return mueble
+
+    def _muebles_de(self, filas: Iterable["Fila"]) -> List[Any]:
+        return [self._mueble_de(clave, registro) for clave, registro, _ in filas]
+
+    def _guardar_estado(self) -> None:
+        if self._almacen is not None:
+            # el último en guardar exporta después de todos los cambios previos
+            with self._candado_estado:
+                self._almacen.guardar_estado(self.exportar_estado())
+
+    def _operacion(self) -> ContextManager[Any]:
+        """Envuelve una mutación para que no la corte una instantánea."""
+        if self._registro_cambios is None:
+            return nullcontext()
+        return self._registro_cambios.operacion()
+
+    def _admite(self, mueble: Any) -> bool:
+        """Si el mueble se puede persistir con el almacén o el registro de cambios."""
+        if self._almacen is not None:
+            return self._almacen.admite(mueble)
+        if self._registro_cambios is not None:
+            try:
+                registro_simple(mueble)
+            except ValueError:
+                return False
+        return True
+
+    def _anotar(self, cambio: Dict[str, Any]) -> None:
+        if self._registro_cambios is not None:
+            self._registro_cambios.anotar(cambio)
+
+    def _anotar_altas(self, altas: List[List[Any]], sumadas: List[bool]) -> None:
+        """
+        Anota altas [registro, precio] con las marcas ``sumadas`` del inventario.
+
+        Las que abrieron un SKU van en un cambio "agregar" (al recuperar
+        quedan al final, como en el inventario); las que se sumaron a un SKU
+        que ya estaba van en un "sumar" con su registro y sus unidades, que
+        al recuperar se suman a ese SKU esté donde esté.
+        """
+        sumar: Dict[Tuple[Any, ...], List[Any]] = {}
+        nuevas = []
+        for (registro, precio), sumada in zip(altas, sumadas):
+            if not sumada:
+                nuevas.append([registro, precio])
+                continue
+            clave = (*registro.values(), precio)
+            if clave in sumar:
+                sumar[clave][2] += 1
+            else:
+                sumar[clave] = [registro, precio, 1]
+        if sumar:
+            self._anotar({"op": "sumar", "muebles": list(sumar.values())})
+        if nuevas:
+            self._anotar({"op": "agregar", "muebles": nuevas})
+
+    @staticmethod
+    def _bajas(pares: Iterable[Tuple[Any, Optional[float]]]) -> List[Dict[str, Any]]:
+        """
+        Bajas de un cambio: el registro de cada SKU vendido y sus unidades.
+
+        El registro y el precio forman la clave del SKU, así que al recuperar
+        se quita del mismo SKU aunque otro mueble tenga el mismo nombre.
+        """
+        bajas: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for mueble, precio in pares:
+            registro = registro_simple(mueble)
+            centavos = None if precio is None else _a_centavos(precio)
+            clave = (*registro.values(), centavos)
+            baja = bajas.get(clave)
+            if baja is None:
+                bajas[clave] = {
+                    "registro": registro,
+                    "unidades": 1,
+                    "centavos": centavos,
+                }
+            else:
+                baja["unidades"] += 1
+        return list(bajas.values())
+
     def agregar_producto(self, producto: Any) -> None:
         if producto is None:
             return
-        self._inventario.append(producto)
+        if not self._admite(producto):
+            raise ValueError(f"No se pueden persistir muebles {_nombre_tipo(producto)}")
+        precio = _precio_de(producto)
+        with self._operacion():
+            # la clave queda registrada antes de que otra caja pueda venderlo
+            if self._almacen is not None:
+                clave = self._almacen.agregar(producto, precio)
+                self._registrar_clave(clave, producto)
+            sumadas: List[bool] = []
+            self._inventario.agregar(producto, precio, sumadas=sumadas)
+            if self._registro_cambios is not None:
+                self._anotar_altas([[registro_simple(producto), precio]], sumadas)
 
-    def agregar_mueble(self, mueble: Any) -> str:
+    @staticmethod
+    def _validar_mueble(mueble: Any) -> Tuple[Any, Optional[str]]:
+        """Calcula y valida el precio de un mueble. Devuelve (precio, error)."""
         if mueble is None:
-            return "Error: mueble None"
+            return None, "Error: mueble None"
         try:
             precio = mueble.calcular_precio()
         except Exception:
-            return "Error al calcular precio"
+            return None, "Error al calcular precio"
         try:
             if precio <= 0:
-                return "Error: precio inválido"
+                return None, "Error: precio inválido"
         except Exception:
-            return "Error al validar precio"
-        self._inventario.append(mueble)
+            return None, "Error al validar precio"
+        return precio, None
+
+    def agregar_mueble(self, mueble: Any, cantidad: int = 1) -> str:
+        """
+        Valida y agrega ``cantidad`` unidades de un mueble.
+
+        Las unidades se suman al SKU de un mueble idéntico si ya hay uno.
+        El almacén y el registro de cambios guardan una fila por unidad.
+
+        Returns:
+            str: "mueble agregado" o el mensaje de error
+        """
+        if not isinstance(cantidad, int) or cantidad < 1:
+            return "Error: cantidad inválida"
+        precio, error = self._validar_mueble(mueble)
+        if error is not None:
+            return error
+        if not self._admite(mueble):
+            return "Error: tipo de mueble no persistible"
+        with self._operacion():
+            if self._almacen is not None:
+                fila = self._almacen.preparar(mueble, precio)
+                for clave in self._almacen.agregar_preparados([fila] * cantidad):
+                    self._registrar_clave(clave, mueble)
+            sumadas: List[bool] = []
+            self._inventario.agregar(mueble, precio, cantidad, sumadas)
+            if self._registro_cambios is not None:
+                alta = [registro_simple(mueble), precio]
+                self._anotar_altas([alta] * cantidad, sumadas * cantidad)
         return "mueble agregado"
 
+    def agregar_muebles_lote(self, muebles: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Valida y agrega un lote de muebles con una sola actualización de índices.
+
+        Cada mueble pasa la misma validación que ``agregar_mueble``; los
+        válidos se insertan juntos con ``InventarioIndexado.agregar_lote``.
+
+        Args:
+            muebles: Muebles a agregar (cualquier iterable)
+
+        Returns:
+            dict: {"agregados": int, "rechazados": int,
+                   "errores": [(posición en el lote, mensaje), ...]}
+        """
+        errores: List[Tuple[int, str]] = []
+        # con almacén, las filas de los aceptados se insertan en un lote antes
+        # de indexarlos (ninguna caja vende un mueble sin clave); con registro
+        # de cambios, se anotan en un solo cambio
+        aceptados: List[Tuple[Any, Any]] = []
+        persistir = self._almacen is not None or self._registro_cambios is not None
+
+        def validos() -> Iterator[Tuple[Any, Any]]:
+            for posicion, mueble in enumerate(muebles):
+                precio, error = self._validar_mueble(mueble)
+                if error is None and persistir:
+                    try:
+                        if self._almacen is not None:
+                            preparado = self._almacen.preparar(mueble, precio)
+                        else:
+                            preparado = [registro_simple(mueble), precio]
+                        aceptados.append((mueble, preparado))
+                    except ValueError:
+                        error = "Error: tipo de mueble no persistible"
+                if error is not None:
+                    errores.append((posicion, error))
+                    continue
+                yield mueble, precio
+
+        with self._operacion():
+            if self._almacen is None:
+                sumadas: List[bool] = []
+                agregados = self._inventario.agregar_lote(validos(), sumadas)
+                if aceptados:
+                    self._anotar_altas([p for _, p in aceptados], sumadas)
+            else:
+                pares = list(validos())
+                if aceptados:
+                    preparados = [p for _, p in aceptados]
+                    claves = self._almacen.agregar_preparados(preparados)
+                    for clave, (mueble, _) in zip(claves, aceptados):
+                        self._registrar_clave(clave, mueble)
+                agregados = self._inventario.agregar_lote(pares)
+        return {
+            "agregados": agregados,
+            "rechazados": len(errores),
+            "errores": errores,
+        }
+
     def agregar_comedor(self, comedor: Any) -> str:
+        """
+        Registra un comedor y surte su mesa y sus sillas como muebles sueltos.
+
+        Un ``Comedor`` tiene precio (para venderlo como set con
+        ``realizar_venta``), pero en el inventario nunca entra como una sola
+        pieza: así la mesa y las sillas se filtran, se venden por separado y
+        un carrito con todas cumple las reglas de carrito de comedor.
+        """
         if comedor is None:
             return "Error: comedor None"
+        self._comedores.append(comedor)
+        if isinstance(comedor, Comedor):
+            self.agregar_mueble(comedor.mesa)
+            for silla in comedor.sillas:
+                self.agregar_mueble(silla)
+            return "comedor agregado"
         try:
             res = self.agregar_mueble(comedor)
             if "agregado" in res:
@@ -57,49 +1533,699 @@ class TiendaMuebles:
             self.agregar_producto(s)
         return "comedor agregado"
 
+    def actualizar_mueble(self, mueble: Any) -> None:
+        """
+        Reindexa un mueble del inventario tras modificar sus atributos o su precio.
+
+        El cambio vale para todas las unidades de su SKU.
+
+        Raises:
+            ValueError: Si con almacén o registro de cambios el mueble queda
+                con un campo que no se puede guardar
+        """
+        anterior = self._inventario.identidad(mueble)
+        if self._registro_cambios is not None:
+            registro = registro_simple(mueble)
+            with self._operacion():
+                unidades = self._inventario.cantidad(mueble)
+                centavos = self._inventario.actualizar(mueble)
+                if unidades:
+                    self._anotar(
+                        {
+                            "op": "actualizar",
+                            "anterior": list(anterior),
+                            "registro": registro,
+                            "precio": _precio_de(mueble),
+                            "diferencia": centavos,
+                        }
+                    )
+            return
+        self._inventario.actualizar(mueble)
+        if self._almacen is not None:
+            precio = _precio_de(mueble)
+            actual = _identidad(mueble)
+            with self._franjas(anterior, actual):
+                claves = self._claves_de.pop(anterior, [])
+                for clave in claves:
+                    self._almacen.actualizar(clave, mueble, precio)
+                    self._por_clave[clave] = mueble
+                if claves:
+                    self._claves_de.setdefault(actual, []).extend(claves)
+
+    def buscar_muebles_por_nombre(self, termino: str) -> List[Any]:
+        """
+        Muebles que contienen todas las palabras buscadas (nombre o material).
+
+        No distingue acentos ni mayúsculas y admite prefijos: "sofa cuero"
+        encuentra "Sofá Chesterfield Clásico" de cuero.
+        """
+        if not isinstance(termino, str):
+            return []
+        self.vencer_reservas()
+        return self._inventario.buscar(termino)
+
+    def filtrar_por_tipo(self, tipo: Any) -> List[Any]:
+        """Muebles de un tipo concreto (clase o nombre de clase)."""
+        self.vencer_reservas()
+        return self._inventario.filtrar_por_tipo(tipo)
+
+    def filtrar_por_material(self, material: str) -> List[Any]:
+        """Muebles de un material, sin distinguir mayúsculas ni espacios."""
+        self.vencer_reservas()
+        if self._almacen is not None:
+            filas = self._almacen.filtrar_por_material(material)
+            return self._uno_por_sku(self._sin_reservadas(self._muebles_de(filas)))
+        return self._inventario.filtrar_por_material(material)
+
+    def filtrar_por_color(self, color: str) -> List[Any]:
+        """Muebles de un color, sin distinguir mayúsculas ni espacios."""
+        self.vencer_reservas()
+        return self._inventario.filtrar_por_color(color)
+
+    def filtrar_por_precio(
+        self, precio_min: float = 0.0, precio_max: float = math.inf
+    ) -> List[Any]:
+        """Muebles cuyo precio final está entre ``precio_min`` y ``precio_max``."""
+        self.vencer_reservas()
+        if self._almacen is not None:
+            filas = self._almacen.filtrar_por_precio(precio_min, precio_max)
+            return self._uno_por_sku(self._sin_reservadas(self._muebles_de(filas)))
+        return self._inventario.filtrar_por_precio(precio_min, precio_max)
+
+    def obtener_mas_baratos(self, cantidad: int = 5) -> List[Any]:
+        """Los muebles más baratos del inventario."""
+        self.vencer_reservas()
+        return self._inventario.mas_baratos(cantidad)
+
+    def obtener_mas_caros(self, cantidad: int = 5) -> List[Any]:
+        """Los muebles más caros del inventario."""
+        self.vencer_reservas()
+        return self._inventario.mas_caros(cantidad)
+
     def realizar_venta(self, mueble: Any, cliente: Optional[str] = None) -> Any:
+        return self._realizar_venta(mueble, cliente)
+
+    def _realizar_venta(
+        self,
+        mueble: Any,
+        cliente: Optional[str] = None,
+        bajas: Optional[List[Dict[str, Any]]] = None,
+    ) -> Any:
+        """
+        ``realizar_venta`` que anota en el mismo cambio las ``bajas`` del
+        inventario, para que una caída no deje la venta sin su baja.
+        """
         try:
             precio_original = mueble.calcular_precio()
         except Exception:
             return {"error": "no se pudo calcular precio"}
-        tipo = type(mueble).__name__.lower()
-        descuento_key: Optional[str] = None
-        if f"{tipo}s" in self._descuentos:
-            descuento_key = f"{tipo}s"
-        elif tipo in self._descuentos:
-            descuento_key = tipo
-        descuento = int(self._descuentos.get(descuento_key, 0)) if descuento_key else 0
+        resolucion = self._motor.evaluar(mueble)
+        descuento = resolucion.porcentaje
         precio_final = round(precio_original * (1 - descuento / 100.0), 2)
-        self._total_muebles_vendidos += 1
-        try:
-            self._valor_total_ventas += precio_final
-        except Exception:
-            pass
-        return {
+        # un precio que no es número (p. ej. de un mock) no suma al valor
+        valor = precio_final if isinstance(precio_final, (int, float)) else 0
+        with self._operacion():
+            self._ventas.sumar(1, valor)
+            if self._almacen is not None:
+                self._almacen.sumar_ventas(1, _a_centavos(valor))
+            cambio: Dict[str, Any] = {"op": "venta", "precio_final": precio_final}
+            if bajas:
+                cambio["quitar"] = bajas
+            self._anotar(cambio)
+        venta = {
             "mueble": getattr(mueble, "nombre", str(mueble)),
             "precio_original": precio_original,
             "descuento": descuento,
             "precio_final": precio_final,
             "cliente": cliente,
+            "explicacion": resolucion.explicacion,
+        }
+        if self._diario is not None or self._libro is not None:
+            clase, fecha = _nombre_tipo(mueble), time.time()
+            if self._libro is not None:
+                self._libro.registrar(venta, clase, fecha)
+            if self._diario is not None:
+                registro = dict(venta, tipo=clase, fecha=fecha)
+                venta["secuencia"] = self._diario.registrar(registro)
+        return venta
+
+    def cobrar(self, carrito: Carrito) -> Dict[str, Any]:
+        """
+        Vende todas las líneas de un carrito en una sola operación.
+
+        Los precios salen del índice del inventario y los descuentos se
+        resuelven de una vez para todo el carrito, con sus reglas de
+        carrito. Si alguna línea no está en el inventario no se vende
+        nada. Después se quitan todos los muebles y se actualizan los
+        contadores juntos: el almacén lo hace en una transacción y el
+        registro de cambios en un solo marco.
+
+        Args:
+            carrito: Compra a cobrar (no se modifica)
+
+        Returns:
+            dict: Comprobante {"cliente", "lineas" (una venta por línea, como
+            ``realizar_venta``; con diario, cada una con su ``secuencia``),
+            "cantidad", "subtotal", "ahorro", "total"} o {"error": str}
+        """
+        self.vencer_reservas()
+        return self._cobrar(carrito)
+
+    def _cobrar(
+        self, carrito: Carrito, liberar: Optional[Dict[int, int]] = None
+    ) -> Dict[str, Any]:
+        """``cobrar`` que antes libera las unidades reservadas de ``liberar``."""
+        lineas = carrito.lineas
+        if not lineas:
+            return {"error": "carrito vacío"}
+        resoluciones = self._motor.evaluar_carrito(lineas)
+        with self._operacion():
+            # quitar todas las líneas del inventario reserva el carrito: desde
+            # aquí ninguna otra caja puede venderlas
+            precios, faltantes = self._inventario.tomar(lineas, liberar)
+            if faltantes:
+                nombres = ", ".join(getattr(m, "nombre", str(m)) for m in faltantes)
+                return {"error": f"no disponible: {nombres}"}
+
+            ventas = []
+            subtotal = total = 0
+            for mueble, precio, resolucion in zip(lineas, precios, resoluciones):
+                precio_final = round(precio * (1 - resolucion.porcentaje / 100.0), 2)
+                subtotal += _a_centavos(precio)
+                total += _a_centavos(precio_final)
+                ventas.append(
+                    {
+                        "mueble": getattr(mueble, "nombre", str(mueble)),
+                        "precio_original": precio,
+                        "descuento": resolucion.porcentaje,
+                        "precio_final": precio_final,
+                        "cliente": carrito.cliente,
+                        "explicacion": resolucion.explicacion,
+                    }
+                )
+
+            if self._almacen is None:
+                self._ventas.sumar(len(lineas), total / 100)
+            else:
+                try:
+                    self._vender_en_almacen(lineas, total)
+                except BaseException:
+                    # devolver las líneas (quedan al final del catálogo)
+                    self._inventario.agregar_lote(zip(lineas, precios))
+                    raise
+            if self._registro_cambios is not None:
+                self._anotar(
+                    {
+                        "op": "cobro",
+                        "quitar": self._bajas(zip(lineas, precios)),
+                        "precio_final": total / 100,
+                    }
+                )
+        recibo = {
+            "cliente": carrito.cliente,
+            "lineas": ventas,
+            "cantidad": len(ventas),
+            "subtotal": subtotal / 100,
+            "ahorro": (subtotal - total) / 100,
+            "total": total / 100,
         }
+        if self._diario is not None or self._libro is not None:
+            fecha = time.time()
+            for venta, mueble in zip(ventas, lineas):
+                clase = _nombre_tipo(mueble)
+                if self._libro is not None:
+                    self._libro.registrar(venta, clase, fecha)
+                if self._diario is not None:
+                    registro = dict(venta, tipo=clase, fecha=fecha)
+                    venta["secuencia"] = self._diario.registrar(registro)
+        return recibo
+
+    def _vender_en_almacen(self, lineas: List[Any], total_centavos: int) -> None:
+        """Borra las filas de las líneas y suma las ventas en una transacción."""
+        identidades = [_identidad(mueble) for mueble in lineas]
+        with self._franjas(*set(identidades)):
+            # claves que quitará _olvidar_clave, sin tocar la memoria todavía
+            usadas: Dict[Hashable, int] = {}
+            claves = []
+            for identidad in identidades:
+                propias = self._claves_de.get(identidad, [])
+                vistas = usadas.get(identidad, 0)
+                if vistas < len(propias):
+                    claves.append(propias[-1 - vistas])
+                usadas[identidad] = vistas + 1
+            self._almacen.vender(claves, len(lineas), total_centavos)
+            self._ventas.sumar(len(lineas), total_centavos / 100)
+            for mueble in lineas:
+                self._olvidar_clave(mueble)
+
+    # --- Reservas ---
+
+    def reservar(
+        self,
+        mueble: Any,
+        duracion: float = 2 * 3600,
+        cliente: Optional[str] = None,
+        cantidad: int = 1,
+        ahora: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Aparta unidades de un mueble durante ``duracion`` segundos.
+
+        Args:
+            mueble: Mueble del inventario (o uno idéntico), o su nombre o
+                ``str()`` como en ``vender_producto``
+            duracion: Segundos hasta que la reserva vence
+            cliente: Quién reserva
+            cantidad: Unidades a apartar
+            ahora: Momento de la reserva (segundos Unix; por defecto, ahora)
+
+        Returns:
+            dict: {"reserva" (número), "mueble", "cantidad", "cliente",
+            "vence"} o {"error": str}
+        """
+        if not isinstance(cantidad, int) or cantidad < 1:
+            return {"error": "cantidad inválida"}
+        try:
+            valida = duracion > 0
+        except TypeError:
+            valida = False
+        if not valida:
+            return {"error": "duración inválida"}
+        ahora = time.time() if ahora is None else ahora
+        self.vencer_reservas(ahora)
+        apartado = self._inventario.reservar(mueble, cantidad)
+        if apartado is None:
+            nombre = (
+                mueble if isinstance(mueble, str) else getattr(mueble, "nombre", mueble)
+            )
+            return {"error": f"no disponible: {nombre}"}
+        ranura, guardado = apartado
+        with self._candado_reservas:
+            reserva = Reserva(
+                next(self._numeros_reserva),
+                ranura,
+                guardado,
+                cantidad,
+                cliente,
+                ahora + duracion,
+            )
+            self._reservas[reserva.numero] = reserva
+            self._agenda.programar(reserva.numero, reserva.vence)
+        return reserva.a_dict()
+
+    def _retirar_reserva(self, numero: int) -> Optional[Reserva]:
+        with self._candado_reservas:
+            reserva = self._reservas.pop(numero, None)
+            if reserva is not None:
+                self._agenda.cancelar(numero)
+        return reserva
+
+    def cancelar_reserva(self, numero: int) -> bool:
+        """Devuelve a la venta las unidades de una reserva. False si no existía."""
+        reserva = self._retirar_reserva(numero)
+        if reserva is None:
+            return False
+        self._inventario.liberar(reserva.ranura, reserva.cantidad)
+        return True
+
+    def vender_reserva(
+        self, numero: int, ahora: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Cobra las unidades de una reserva vigente, como ``cobrar``.
+
+        Returns:
+            dict: Comprobante de ``cobrar`` con el número de ``reserva``, o
+            {"error": str} si no existe o ya venció
+        """
+        self.vencer_reservas(ahora)
+        reserva = self._retirar_reserva(numero)
+        if reserva is None:
+            return {"error": f"reserva {numero} inexistente o vencida"}
+        carrito = Carrito(reserva.cliente)
+        carrito.agregar(reserva.mueble, reserva.cantidad)
+        recibo = self._cobrar(carrito, {reserva.ranura: reserva.cantidad})
+        if "error" in recibo:
+            # las unidades siguen apartadas: la reserva vuelve a la agenda
+            with self._candado_reservas:
+                self._reservas[numero] = reserva
+                self._agenda.programar(numero, reserva.vence)
+            return recibo
+        recibo["reserva"] = numero
+        return recibo
+
+    def vencer_reservas(self, ahora: Optional[float] = None) -> int:
+        """
+        Devuelve a la venta las reservas vencidas en ``ahora``. Devuelve cuántas.
+
+        Solo saca del montículo las vencidas, sin mirar las demás.
+        """
+        if not self._reservas:
+            return 0
+        ahora = time.time() if ahora is None else ahora
+        with self._candado_reservas:
+            vencidas = [self._reservas.pop(n) for n in self._agenda.vencidos(ahora)]
+        for reserva in vencidas:
+            self._inventario.liberar(reserva.ranura, reserva.cantidad)
+        return len(vencidas)
+
+    def reservas(self) -> List[Dict[str, Any]]:
+        """Reservas vigentes, de la que vence antes a la que vence después."""
+        self.vencer_reservas()
+        with self._candado_reservas:
+            vigentes = sorted(self._reservas.values(), key=lambda r: r.vence)
+            return [reserva.a_dict() for reserva in vigentes]
+
+    def _sin_reservadas(self, muebles: List[Any]) -> List[Any]:
+        """Quita de filas del almacén tantas unidades de cada SKU como hay reservadas."""
+        if not self._reservas:
+            return muebles
+        retenidas = self._inventario.reservadas()
+        libres = []
+        for mueble in muebles:
+            identidad = _identidad(mueble)
+            if retenidas.get(identidad, 0) > 0:
+                retenidas[identidad] -= 1
+            else:
+                libres.append(mueble)
+        return libres
+
+    @staticmethod
+    def _uno_por_sku(muebles: List[Any]) -> List[Any]:
+        """
+        Primera aparición de cada SKU en filas del almacén (una por unidad),
+        para devolver cada SKU una vez, como los filtros del inventario.
+        """
+        vistos: Set[Hashable] = set()
+        resultado = []
+        for mueble in muebles:
+            identidad = _identidad(mueble)
+            if identidad not in vistos:
+                vistos.add(identidad)
+                resultado.append(mueble)
+        return resultado
+
+    def aplicar_descuento(self, categoria: str, porcentaje: float) -> str:
+        """
+        Aplica un descuento porcentual a una categoría de muebles.
+
+        ``realizar_venta`` lo usa con los muebles de esa clase o de sus
+        subclases, nombrada en singular o en plural ("silla" o "sillas",
+        "asiento" para sillas y sofás). Si varias clases del MRO tienen
+        descuento, gana la más cercana.
+
+        Args:
+            categoria: Tipo de mueble, p. ej. "silla"
+            porcentaje: Descuento entre 0 y 100
+
+        Returns:
+            str: Mensaje de confirmación o de error
+        """
+        if not isinstance(categoria, str) or not categoria.strip():
+            return "Error: categoría vacía"
+        try:
+            valido = 0 <= porcentaje <= 100
+        except TypeError:
+            valido = False
+        if not valido:
+            return "Error: porcentaje inválido"
+        clave = categoria.strip().lower()
+        with self._operacion(), self._candado_descuentos:
+            self._descuentos[clave] = porcentaje
+            self._motor.definir_categorias(self._descuentos)
+            self._guardar_estado()
+            self._anotar(
+                {"op": "descuento", "categoria": clave, "porcentaje": porcentaje}
+            )
+        return f"Descuento de {porcentaje}% aplicado a {clave}"
+
+    def agregar_regla_descuento(self, regla: ReglaDescuento) -> str:
+        """
+        Activa una regla de descuento (o reemplaza la del mismo nombre).
+
+        Las reglas se suman a los descuentos por categoría según sus grupos,
+        hasta el tope combinado (ver ``src.services.descuentos``).
+
+        Returns:
+            str: Mensaje de confirmación
+        """
+        with self._operacion():
+            self._motor.agregar(regla)
+            self._guardar_estado()
+            self._anotar({"op": "regla", "regla": regla.a_dict()})
+        return f"Regla {regla.describir()} activa"
+
+    def quitar_regla_descuento(self, nombre: str) -> str:
+        """Desactiva la regla de descuento ``nombre``."""
+        with self._operacion():
+            if not self._motor.quitar(nombre):
+                return f"Error: no existe la regla {nombre}"
+            self._guardar_estado()
+            self._anotar({"op": "quitar_regla", "nombre": nombre})
+        return f"Regla {nombre} eliminada"
+
+    def fijar_tope_descuento(self, porcentaje: float) -> str:
+        """Limita el descuento combinado de cada venta a ``porcentaje``."""
+        with self._operacion():
+            try:
+                self._motor.fijar_tope(porcentaje)
+            except ValueError:
+                return "Error: porcentaje inválido"
+            self._guardar_estado()
+            self._anotar({"op": "tope", "porcentaje": porcentaje})
+        return f"Tope de descuento combinado: {porcentaje}%"
+
+    def evaluar_descuentos(
+        self, muebles: Optional[Iterable[Any]] = None, ahora: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Precio con descuento de muchos muebles sin venderlos.
+
+        Args:
+            muebles: Carrito a evaluar (por defecto, todo el inventario)
+            ahora: Momento de la evaluación (segundos Unix; por defecto, ahora)
 
-    def calcular_valor_inventario(self) -> float:
-        total = 0.0
-        for p in self._inventario:
+        Returns:
+            list: Por mueble, {"mueble", "tipo", "precio_original",
+            "descuento", "precio_final", "explicacion"}; los que no tienen
+            precio se omiten
+        """
+        muebles = list(self._inventario if muebles is None else muebles)
+        resultado = []
+        for mueble, resolucion in zip(
+            muebles, self._motor.evaluar_lote(muebles, ahora)
+        ):
             try:
-                total += float(p.calcular_precio())
+                precio = mueble.calcular_precio()
             except Exception:
                 continue
-        return round(total, 2)
+            resultado.append(
+                {
+                    "mueble": getattr(mueble, "nombre", str(mueble)),
+                    "tipo": _nombre_tipo(mueble),
+                    "precio_original": precio,
+                    "descuento": resolucion.porcentaje,
+                    "precio_final": round(
+                        precio * (1 - resolucion.porcentaje / 100.0), 2
+                    ),
+                    "explicacion": resolucion.explicacion,
+                }
+            )
+        return resultado
 
-    def generar_reporte_inventario(self) -> str:
-        lines: List[str] = [
-            f"REPORTE - {self.nombre}",
-            f"Total: {len(self._inventario)}",
-        ]
-        for p in self._inventario:
-            lines.append(f"- {getattr(p, 'nombre', repr(p))} ({type(p).__name__})")
-        return "\n".join(lines)
+    def calcular_valor_inventario(
+        self, verificar: bool = False, procesos: Optional[int] = 1
+    ) -> float:
+        """
+        Valor total del inventario (suma de precios finales).
+
+        Se mantiene de forma incremental, así que la consulta es O(1). Con
+        ``verificar=True`` se recalcula el precio de cada mueble (por si se
+        modificó sin llamar a ``actualizar_mueble``), se corrige el total y
+        se emite un ``RuntimeWarning`` si había deriva.
+
+        Args:
+            verificar: Si recalcular todo el inventario para detectar deriva
+            procesos: Procesos para el recálculo (None: todos los núcleos)
+
+        Returns:
+            float: Valor total redondeado a centavos
+        """
+        if verificar:
+            if procesos == 1:
+                deriva = self._inventario.verificar_precios()
+            else:
+                _, cambios = valorar(self._inventario, procesos)
+                deriva = self._inventario.corregir_precios(cambios)
+            if deriva:
+                warnings.warn(
+                    f"Valor de inventario desfasado en {deriva:+.2f}; corregido",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+        return round(self._inventario.valor_total(), 2)
+
+    def valorar_inventario(
+        self, procesos: Optional[int] = 1, tamaño_bloque: int = TAMAÑO_BLOQUE
+    ) -> Dict[str, Any]:
+        """
+        Recalcula el valor de lista de todo el inventario, desglosado por tipo.
+
+        A diferencia de ``calcular_valor_inventario`` no usa el total
+        incremental: reconstruye y valora cada mueble, repartiendo el trabajo
+        en ``procesos`` procesos. No corrige el índice de precios.
+
+        Args:
+            procesos: Cantidad de procesos (None: todos los núcleos)
+            tamaño_bloque: Muebles por bloque enviado a cada proceso
+
+        Returns:
+            dict: {"muebles", "valor", "por_tipo": {tipo: {"muebles", "valor"}}}
+        """
+        por_tipo, _ = valorar(self._inventario, procesos, tamaño_bloque)
+        return {
+            "muebles": sum(muebles for muebles, _ in por_tipo.values()),
+            "valor": sum(centavos for _, centavos in por_tipo.values()) / 100,
+            "por_tipo": {
+                tipo: {"muebles": muebles, "valor": centavos / 100}
+                for tipo, (muebles, centavos) in por_tipo.items()
+            },
+        }
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Resumen de la tienda para la pantalla de estadísticas.
+
+        Returns:
+            dict: Totales de inventario, ventas, descuentos y distribución por tipo
+        """
+        vendidos, valor = self._ventas.leer()
+        return {
+            "total_muebles": len(self._inventario),
+            "total_comedores": len(self._comedores),
+            "valor_inventario": self.calcular_valor_inventario(),
+            "descuentos_activos": dict(self._descuentos),
+            "ventas_realizadas": vendidos,
+            "total_muebles_vendidos": vendidos,
+            "valor_total_ventas": round(valor, 2),
+            "tipos_muebles": self._inventario.contar_por_tipo(),
+            "reservas_activas": len(self._reservas),
+        }
+
+    def exportar_estado(self) -> Dict[str, Any]:
+        """
+        Estado de la tienda que no vive en el inventario (para instantáneas).
+
+        Returns:
+            dict: nombre, descuentos, reglas de descuento y contadores de ventas
+        """
+        vendidos, valor = self._ventas.leer()
+        return {
+            "nombre": self.nombre,
+            "descuentos": dict(self._descuentos),
+            "reglas_descuento": [regla.a_dict() for regla in self._motor.reglas],
+            "tope_descuento": self._motor.tope,
+            "total_muebles_vendidos": vendidos,
+            "valor_total_ventas": valor,
+        }
+
+    def restaurar_estado(self, estado: Dict[str, Any]) -> None:
+        """Restaura lo guardado con ``exportar_estado``."""
+        self.nombre = estado.get("nombre", self.nombre)
+        motor = MotorDescuentos(estado.get("tope_descuento", 100))
+        with self._candado_descuentos:
+            self._descuentos = dict(estado.get("descuentos", {}))
+            motor.definir_categorias(self._descuentos)
+        for datos in estado.get("reglas_descuento", []):
+            motor.agregar(ReglaDescuento.desde_dict(datos))
+        self._motor = motor
+        self._ventas.fijar(
+            (
+                int(estado.get("total_muebles_vendidos", 0)),
+                float(estado.get("valor_total_ventas", 0.0)),
+            )
+        )
+
+    def iterar_reporte_inventario(
+        self, procesos: Optional[int] = 1, tamaño_bloque: int = TAMAÑO_BLOQUE
+    ) -> Iterator[str]:
+        """
+        Reporte de inventario por fragmentos: la cabecera y luego bloques de
+        hasta ``tamaño_bloque`` líneas (una por unidad), aunque un solo SKU
+        tenga más unidades.
+
+        El inventario se lee de a un bloque, de modo que las ventas siguen
+        mientras se consume y el reporte refleja lo que había al llegar a
+        cada bloque (la cabecera cuenta el total al empezar).
+
+        Args:
+            procesos: Cantidad de procesos (None: todos los núcleos)
+            tamaño_bloque: Unidades por fragmento
+
+        Returns:
+            Iterator[str]: Fragmentos sin salto de línea final
+        """
+        yield f"REPORTE - {self.nombre}\nTotal: {len(self._inventario)}"
+        if procesos != 1:
+            yield from reporte(self._inventario, procesos, tamaño_bloque)
+            return
+        lineas: List[str] = []
+        for bloque in self._inventario.ranuras_por_bloques(tamaño_bloque):
+            for _, item, _, unidades in bloque:
+                linea = (
+                    f"- {getattr(item, 'nombre', repr(item))} ({_nombre_tipo(item)})"
+                )
+                # un SKU con muchas unidades se reparte entre varios fragmentos
+                while unidades:
+                    tomadas = min(unidades, tamaño_bloque - len(lineas))
+                    lineas.extend(itertools.repeat(linea, tomadas))
+                    unidades -= tomadas
+                    if len(lineas) == tamaño_bloque:
+                        yield "\n".join(lineas)
+                        lineas = []
+        if lineas:
+            yield "\n".join(lineas)
+
+    def generar_reporte_inventario(self, procesos: Optional[int] = 1) -> str:
+        return "\n".join(self.iterar_reporte_inventario(procesos))
+
+    def escribir_reporte_inventario(
+        self,
+        destino: Union[str, IO[Any]],
+        procesos: Optional[int] = 1,
+        comprimir: Optional[bool] = None,
+        progreso: Optional[Callable[[int, int], None]] = None,
+        tamaño_bloque: int = TAMAÑO_BLOQUE,
+    ) -> int:
+        """
+        Escribe el reporte de inventario sin armarlo entero en memoria.
+
+        Args:
+            destino: Ruta (``.gz`` se comprime) o flujo de texto con ``write``
+                (un archivo, ``socket.makefile("w")``...)
+            procesos: Cantidad de procesos (None: todos los núcleos)
+            comprimir: Forzar o evitar gzip (ver ``escribir_fragmentos``)
+            progreso: Se llama con (unidades escritas, total) tras cada bloque
+            tamaño_bloque: Unidades por fragmento
+
+        Returns:
+            int: Unidades listadas en el reporte
+        """
+        fragmentos = self.iterar_reporte_inventario(procesos, tamaño_bloque)
+        total = len(self._inventario)
+        hechas = 0
+
+        def contar() -> Iterator[str]:
+            nonlocal hechas
+            yield next(fragmentos)  # cabecera
+            for fragmento in fragmentos:
+                yield fragmento
+                hechas += fragmento.count("\n") + 1
+                if progreso is not None:
+                    progreso(hechas, max(total, hechas))
+
+        escribir_fragmentos(contar(), destino, comprimir)
+        return hechas
 
     def agregar_producto_directo(self, producto: Any) -> None:
         """Alias para tests que quieran añadir sin pasar por validaciones extra."""
@@ -107,19 +2233,21 @@ class TiendaMuebles:
 
     def vender_producto(self, nombre_producto: str) -> bool:
         """Vender un producto por nombre. Imprime un mensaje y devuelve True si se vendió, False si no se encontró."""
-        for i, p in enumerate(self._inventario):
-            try:
-                nombre = getattr(p, "nombre", None)
-            except Exception:
-                nombre = None
-            if nombre == nombre_producto or str(p) == nombre_producto:
-                # registrar venta (usar realizar_venta para consistencia)
-                _ = self.realizar_venta(p)
-                # remover del inventario
-                try:
-                    del self._inventario[i]
-                except Exception:
-                    pass
-                print(f"Vendido: {nombre_producto}")
-                return True
-        return False
+        # quitar la primera coincidencia por nombre o str() en un solo paso,
+        # para que dos cajas no vendan el mismo mueble
+        self.vencer_reservas()
+        with self._operacion():
+            tomado = self._inventario.tomar_por_nombre(nombre_producto)
+            if tomado is None:
+                return False
+            vendido, precio = tomado
+            bajas = None
+            if self._registro_cambios is not None:
+                bajas = self._bajas([(vendido, precio)])
+            # la venta y su baja van en un solo cambio del WAL
+            self._realizar_venta(vendido, bajas=bajas)
+            if self._almacen is not None:
+                with self._franjas(_identidad(vendido)):
+                    self._almacen.quitar(self._olvidar_clave(vendido))
+        print(f"Vendido: {nombre_producto}")
+        return True
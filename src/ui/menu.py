@@ -8,10 +8,14 @@ from rich.table import Table
 from rich.console import Console
 from rich.text import Text
 from rich.panel import Panel
+from rich.progress import Progress
 
 from src.services.tienda import TiendaMuebles
 from src.models.mueble import Mueble
 
+# Hasta cuántas unidades se muestra el reporte en pantalla
+LINEAS_VISTA_REPORTE = 200
+
 
 class MenuTienda:
     """
@@ -63,7 +67,7 @@ class MenuTienda:
         for i, mueble in enumerate(muebles, 1):
             try:
                 precio = f"${mueble.calcular_precio():.2f}"
-                tipo = type(mueble).__name__
+                tipo = mueble.__class__.__name__
                 table.add_row(
                     str(i), mueble.nombre, tipo, mueble.material, mueble.color, precio
                 )
@@ -247,30 +251,40 @@ class MenuTienda:
                 self.console.print(f"  • {tipo}: {cantidad} unidades")
 
     def generar_reporte_interactivo(self):
-        """Genera y muestra el reporte de inventario."""
-
-        with self.console.status("[bold green]Generando reporte..."):
-            time.sleep(1)  # Simular tiempo de generación
-            reporte = self.tienda.generar_reporte_inventario()
-
-        panel = Panel(
-            reporte,
-            title="📋 Reporte de Inventario",
-            border_style="blue",
-            padding=(1, 2),
-        )
-
-        self.console.print(panel)
+        """Muestra el reporte de inventario y ofrece guardarlo en un archivo."""
+
+        total = len(self.tienda.inventario)
+        if total <= LINEAS_VISTA_REPORTE:
+            panel = Panel(
+                self.tienda.generar_reporte_inventario(),
+                title="📋 Reporte de Inventario",
+                border_style="blue",
+                padding=(1, 2),
+            )
+            self.console.print(panel)
+        else:
+            # un reporte de miles de líneas no entra en pantalla: solo a archivo
+            self.console.print(
+                f"[yellow]El inventario tiene {total} unidades; "
+                "el reporte solo se puede guardar en un archivo.[/yellow]"
+            )
 
         # Preguntar si desea guardar el reporte
         guardar = Confirm.ask("¿Deseas guardar el reporte en un archivo?")
         if guardar:
             filename = Prompt.ask(
-                "Nombre del archivo", default="reporte_inventario.txt"
+                "Nombre del archivo (.gz para comprimir)",
+                default="reporte_inventario.txt",
             )
             try:
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(reporte)
+                with Progress(console=self.console) as progress:
+                    tarea = progress.add_task("Escribiendo reporte...", total=total)
+                    self.tienda.escribir_reporte_inventario(
+                        filename,
+                        progreso=lambda hechas, de: progress.update(
+                            tarea, completed=hechas, total=de
+                        ),
+                    )
                 self.console.print(f"[green]Reporte guardado en {filename}[/green]")
             except Exception as e:
                 self.console.print(f"[red]Error al guardar: {str(e)}[/red]")
@@ -285,6 +299,8 @@ class MenuTienda:
             "cama",
             "armario",
             "escritorio",
+            "asiento",
+            "superficie",
         ]
 
         self.console.print("[cyan]Categorías disponibles:[/cyan]")
@@ -333,7 +349,7 @@ class MenuTienda:
         for i, mueble in enumerate(muebles, 1):
             try:
                 precio = f"${mueble.calcular_precio():.2f}"
-                tipo = type(mueble).__name__
+                tipo = mueble.__class__.__name__
 
                 row_data = [mueble.nombre, tipo, mueble.material, precio]
                 if numerada:
@@ -354,10 +370,27 @@ class MenuTienda:
         Método auxiliar privado.
 
         Args:
-            venta: Diccionario con información de la venta
+            venta: Resultado de ``realizar_venta`` o comprobante de ``cobrar``
+                (con una venta por línea en "lineas")
         """
 
-        comprobante = f"""
+        if "lineas" in venta:
+            productos = "\n".join(
+                f"  • {linea['mueble']}: ${linea['precio_original']:.2f}"
+                f" - {linea['descuento']:.1f}% = ${linea['precio_final']:.2f}"
+                for linea in venta["lineas"]
+            )
+            comprobante = (
+                "🧾 COMPROBANTE DE VENTA 🧾\n\n"
+                f"Cliente: {venta['cliente']}\n"
+                f"Productos ({venta['cantidad']}):\n{productos}\n\n"
+                f"Subtotal: ${venta['subtotal']:.2f}\n"
+                f"Ahorro: ${venta['ahorro']:.2f}\n"
+                f"TOTAL: ${venta['total']:.2f}\n\n"
+                "¡Gracias por su compra!"
+            )
+        else:
+            comprobante = f"""
         🧾 COMPROBANTE DE VENTA 🧾
 
         Cliente: {venta["cliente"]}
@@ -0,0 +1,42 @@
+from src.models.cadenas import estadisticas_pool, internar
+from src.models.concretos.armario import Armario
+from src.models.concretos.silla import Silla
+from src.models.concretos.sillon import Sillon
+
+
+def _nueva(texto):
+    # construir una cadena igual pero con otra identidad
+    return "".join(list(texto))
+
+
+def test_internar_devuelve_el_mismo_objeto_para_valores_iguales():
+    a, b = _nueva("Madera"), _nueva("Madera")
+    assert a is not b
+    assert internar(a) is internar(b)
+    assert internar(None) is None
+
+
+def test_muebles_comparten_material_color_y_tapizado():
+    s1 = Silla(
+        "S1", _nueva("Roble"), _nueva("Negro"), 100.0, material_tapizado=_nueva("tela")
+    )
+    s2 = Silla(
+        "S2", _nueva("Roble"), _nueva("Negro"), 100.0, material_tapizado=_nueva("tela")
+    )
+    assert s1.material is s2.material
+    assert s1.color is s2.color
+    assert s1.material_tapizado is s2.material_tapizado
+
+    s2.color = _nueva(" Gris ")
+    assert s2.color is internar("Gris")
+
+
+def test_clases_sin_mueble_tambien_usan_el_pool():
+    armario = Armario("A", _nueva("Pino"), _nueva("Blanco"), 600)
+    sillon = Sillon(
+        "S", _nueva("Pino"), _nueva("Blanco"), 800, material_tapizado=_nueva("cuero")
+    )
+    assert armario.material is sillon.material
+    assert armario.color is sillon.color
+    assert sillon.material_tapizado is internar("cuero")
+    assert estadisticas_pool()["cadenas"] >= 4
@@ -43,3 +43,89 @@ def test_calcular_precio_y_descripcion():
     m = ConcreteMueble("P", "M", "C", 50.0)
     assert m.calcular_precio() == 55.0
     assert "Concrete" in m.obtener_descripcion()
+
+
+class TestCachePrecio:
+    @pytest.fixture(autouse=True)
+    def contadores_limpios(self):
+        Mueble.reiniciar_estadisticas_cache_precio()
+
+    def test_precio_memorizado_cuenta_aciertos(self):
+        from src.models.concretos.mesa import Mesa
+
+        mesa = Mesa("Mesa", "Roble", "Natural", 200.0, capacidad_personas=6)
+        primero = mesa.calcular_precio()
+        assert mesa.calcular_precio() == primero
+        mesa.obtener_descripcion()
+        assert Mueble.estadisticas_cache_precio() == {"aciertos": 2, "fallos": 1}
+
+    @pytest.mark.parametrize(
+        "atributo,valor",
+        [("precio_base", 300.0), ("largo", 200.0), ("capacidad_personas", 8)],
+    )
+    def test_setters_invalidan_la_cache(self, atributo, valor):
+        from src.models.concretos.mesa import Mesa
+
+        mesa = Mesa("Mesa", "Roble", "Natural", 200.0)
+        antes = mesa.calcular_precio()
+        setattr(mesa, atributo, valor)
+        despues = mesa.calcular_precio()
+        # una mesa que nunca calculó su precio sirve de referencia
+        referencia = Mesa("Mesa", "Roble", "Natural", 200.0)
+        setattr(referencia, atributo, valor)
+        assert despues != antes
+        assert despues == referencia.calcular_precio()
+
+    def test_setter_de_asiento_invalida_precio_de_sofa(self):
+        from src.models.concretos.sofa import Sofa
+
+        sofa = Sofa("Sofa", "Tela", "Gris", 1000.0)
+        antes = sofa.calcular_precio()
+        sofa.material_tapizado = "cuero"
+        assert sofa.calcular_precio() > antes
+
+    def test_sofacama_no_memoriza_precio_parcial_del_sofa(self):
+        from src.models.concretos.sofacama import SofaCama
+
+        sofacama = SofaCama("SC", "Tela", "Beige", 500.0)
+        precio = sofacama.calcular_precio()
+        assert sofacama.calcular_precio() == precio
+        sofacama.convertir_a_cama()
+        assert sofacama.calcular_precio() == precio
+        assert Mueble.estadisticas_cache_precio()["fallos"] == 2
+
+
+class TestSlots:
+    @pytest.mark.parametrize(
+        "modulo,clase,args",
+        [
+            ("silla", "Silla", ("S", "Madera", "Café", 100.0)),
+            ("mesa", "Mesa", ("M", "Roble", "Natural", 200.0)),
+            ("sofa", "Sofa", ("So", "Tela", "Gris", 900.0)),
+            ("armario", "Armario", ("A", "Pino", "Blanco", 600)),
+            ("cajonera", "Cajonera", ("Ca", "Metal", "Gris", 180)),
+            ("escritorio", "Escritorio", ("E", "Madera", "Negro", 500)),
+            ("sillon", "Sillon", ("Si", "Cuero", "Marrón", 800)),
+        ],
+    )
+    def test_instancias_sin_dict(self, modulo, clase, args):
+        import importlib
+
+        tipo = getattr(importlib.import_module(f"src.models.concretos.{modulo}"), clase)
+        mueble = tipo(*args)
+        assert not hasattr(mueble, "__dict__")
+        with pytest.raises(AttributeError):
+            mueble.atributo_inexistente = 1
+
+    def test_sofacama_no_crea_dict_heredado_de_cama(self):
+        import gc
+
+        from src.models.concretos.cama import Cama
+        from src.models.concretos.sofacama import SofaCama
+
+        sofacama = SofaCama("SC", "Tela", "Beige", 500.0, tamaño_cama="Queen")
+        sofacama.convertir_a_cama()
+        assert isinstance(sofacama, Cama)
+        assert sofacama.tamaño == "queen"
+        assert sofacama.modo_actual == "cama"
+        assert not any(isinstance(r, dict) for r in gc.get_referents(sofacama))
@@ -0,0 +1,187 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.cama import Cama
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sofacama import SofaCama
+from src.services.almacen import AlmacenSQLite
+from src.services.tienda import TiendaMuebles
+
+
+def _catalogo():
+    return [
+        Silla("Silla Café", "Madera", "Café", 100.0, material_tapizado="cuero"),
+        Mesa("Mesa Redonda", "Roble", "Natural", 300.0, forma="redonda"),
+        SofaCama("SofaCama Loft", "Tela", "Gris", 900.0, tamaño_cama="King"),
+        Armario("Armario Doble", "Madera", "Blanco", 450, tiene_espejos=True),
+        Cama("Cama Simple", "Pino", "Blanco", 200.0, tamaño="individual"),
+    ]
+
+
+@pytest.fixture
+def ruta_base(tmp_path):
+    return str(tmp_path / "tienda.db")
+
+
+class TestAlmacenSQLite:
+    def test_persiste_inventario_y_estado(self, ruta_base):
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Mueblería Test", almacen)
+            tienda.agregar_muebles_lote(_catalogo())
+            tienda.aplicar_descuento("sillas", 10)
+            with pytest.MonkeyPatch.context() as parche:
+                parche.setattr("builtins.print", lambda *a, **k: None)
+                assert tienda.vender_producto("Mesa Redonda")
+            esperado = tienda.obtener_estadisticas()
+
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Otro nombre", almacen)
+            assert tienda.inventario._carga_diferida is not None
+            assert tienda.obtener_estadisticas() == esperado
+            assert tienda.nombre == "Mueblería Test"
+            assert [m.nombre for m in tienda.inventario] == [
+                "Silla Café",
+                "SofaCama Loft",
+                "Armario Doble",
+                "Cama Simple",
+            ]
+            silla = tienda.filtrar_por_tipo(Silla)[0]
+            assert silla.material_tapizado == "cuero"
+            assert tienda.realizar_venta(silla)["descuento"] == 10
+
+    def test_filtros_en_sql_respetan_la_identidad(self, ruta_base):
+        with AlmacenSQLite(ruta_base) as almacen:
+            TiendaMuebles("Test", almacen).agregar_muebles_lote(_catalogo())
+
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            madera = tienda.filtrar_por_material("  MADERA ")
+            assert [m.nombre for m in madera] == ["Silla Café", "Armario Doble"]
+            # aún sin cargar el inventario: las filas se construyeron a demanda
+            assert tienda.inventario._carga_diferida is not None
+
+            baratos = tienda.filtrar_por_precio(0, 500)
+            precios = [m.calcular_precio() for m in baratos]
+            assert precios == sorted(precios) and len(baratos) == 3
+            assert tienda.filtrar_por_precio(0, 500)[0] is baratos[0]
+
+            cargados = list(tienda.inventario)
+            assert cargados[0] is madera[0] and cargados[3] is madera[1]
+            assert tienda.filtrar_por_material("madera") == madera
+            assert tienda.filtrar_por_material("vidrio") == []
+
+    def test_actualizar_reescribe_la_fila(self, ruta_base):
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            mesa = Mesa("Mesa Larga", "Roble", "Natural", 300.0)
+            tienda.agregar_mueble(mesa)
+            mesa.precio_base = 1000.0
+            tienda.actualizar_mueble(mesa)
+
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            assert tienda.calcular_valor_inventario() == mesa.calcular_precio()
+            assert tienda.filtrar_por_precio(1000)[0].precio_base == 1000.0
+
+    def test_unidades_de_un_sku_comparten_objeto(self, ruta_base):
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            silla = Silla("Silla Familiar", "Madera", "Roble", 120.0)
+            tienda.agregar_mueble(silla, cantidad=4)
+            tienda.agregar_mueble(Silla("Silla Familiar", "Madera", "Roble", 120.0))
+            silla.precio_base = 100.0
+            tienda.actualizar_mueble(silla)
+            tienda.vender_producto("Silla Familiar")
+            assert almacen.resumen()[0] == 4
+
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            [guardada] = tienda.filtrar_por_material("madera")
+            assert list(tienda.inventario) == [guardada] * 4
+            assert tienda.calcular_valor_inventario() == 4 * silla.calcular_precio()
+            for _ in range(4):
+                tienda.vender_producto("Silla Familiar")
+            assert almacen.resumen()[0] == 0
+
+    def test_filtros_devuelven_cada_sku_una_vez(self, ruta_base):
+        en_memoria = TiendaMuebles("Test")
+        with AlmacenSQLite(ruta_base) as almacen:
+            con_almacen = TiendaMuebles("Test", almacen)
+            for tienda in (en_memoria, con_almacen):
+                for mueble in _catalogo():
+                    tienda.agregar_mueble(mueble, cantidad=3)
+                tienda.reservar("Mesa Redonda", cantidad=3)
+                tienda.reservar("Silla Café", cantidad=2)
+            for tienda in (en_memoria, con_almacen):
+                madera = [m.nombre for m in tienda.filtrar_por_material("madera")]
+                assert madera == ["Silla Café", "Armario Doble"]
+            assert [m.nombre for m in con_almacen.filtrar_por_precio(0, 1000)] == [
+                m.nombre for m in en_memoria.filtrar_por_precio(0, 1000)
+            ]
+            assert "Mesa Redonda" not in [
+                m.nombre for m in con_almacen.filtrar_por_precio(0, 1000)
+            ]
+
+    def test_vender_solo_suma_los_contadores(self, ruta_base):
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            tienda.agregar_muebles_lote(_catalogo())
+            almacen.guardar_estado = Mock(side_effect=AssertionError("estado"))
+            silla = tienda.filtrar_por_tipo(Silla)[0]
+            tienda.realizar_venta(silla)
+            with pytest.MonkeyPatch.context() as parche:
+                parche.setattr("builtins.print", lambda *a, **k: None)
+                assert tienda.vender_producto("Mesa Redonda")
+            esperado = tienda.obtener_estadisticas()["valor_total_ventas"]
+
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            estadisticas = tienda.obtener_estadisticas()
+            assert estadisticas["total_muebles_vendidos"] == 2
+            assert estadisticas["valor_total_ventas"] == esperado
+
+    def test_contadores_de_un_estado_anterior(self, ruta_base):
+        with AlmacenSQLite(ruta_base) as almacen:
+            with almacen._escritura() as conexion:
+                conexion.execute(
+                    "INSERT INTO estado (clave, valor) VALUES ('tienda', ?)",
+                    ('{"total_muebles_vendidos": 3, "valor_total_ventas": 12.5}',),
+                )
+                conexion.execute("DROP TABLE ventas")
+
+        with AlmacenSQLite(ruta_base) as almacen:
+            almacen.sumar_ventas(1, 250)
+            estado = almacen.leer_estado()
+            assert estado["total_muebles_vendidos"] == 4
+            assert estado["valor_total_ventas"] == 15.0
+
+    def test_rechaza_tipos_sin_tabla(self, ruta_base):
+        mock_mueble = Mock(spec=Silla)
+        mock_mueble.calcular_precio.return_value = 100.0
+        with AlmacenSQLite(ruta_base) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            assert tienda.agregar_mueble(mock_mueble).startswith("Error")
+            resumen = tienda.agregar_muebles_lote([mock_mueble, _catalogo()[0]])
+            assert resumen["agregados"] == 1 and resumen["rechazados"] == 1
+            with pytest.raises(ValueError):
+                tienda.agregar_producto(mock_mueble)
+            assert almacen.resumen()[0] == len(tienda.inventario) == 1
+
+    def test_lecturas_concurrentes(self, ruta_base):
+        with AlmacenSQLite(ruta_base, lectores=2) as almacen:
+            almacen.agregar_lote((m, m.calcular_precio()) for m in _catalogo() * 50)
+            resultados = []
+
+            def leer():
+                resultados.append(len(almacen.filtrar_por_material("madera")))
+
+            hilos = [threading.Thread(target=leer) for _ in range(8)]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            assert resultados == [100] * 8
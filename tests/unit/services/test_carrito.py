@@ -0,0 +1,144 @@
+import pytest
+
+from src.models.composicion.comedor import Comedor
+from src.models.concretos.armario import Armario
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.services.almacen import AlmacenSQLite
+from src.services.carrito import Carrito
+from src.services.descuentos import ReglaDescuento
+from src.services.diario import DiarioVentas, leer_ventas
+from src.services.libro_ventas import LibroVentas
+from src.services.recuperacion import RegistroCambios
+from src.services.tienda import TiendaMuebles
+
+
+def _comedor():
+    mesa = Mesa("Mesa Comedor", "Roble", "Natural", 300.0)
+    sillas = [Silla(f"Silla {i}", "Roble", "Natural", 50.0) for i in range(6)]
+    return Comedor("Familiar", mesa, sillas)
+
+
+def _surtir(tienda, comedor):
+    tienda.agregar_mueble(comedor.mesa)
+    for silla in comedor.sillas:
+        tienda.agregar_mueble(silla)
+    tienda.agregar_mueble(Armario("Armario", "Pino", "Blanco", 450))
+    tienda.agregar_regla_descuento(
+        ReglaDescuento("comedor completo", None, 5, requiere={"mesa": 1, "silla": 4})
+    )
+
+
+class TestCarrito:
+    def test_cobra_el_comedor_en_un_comprobante(self):
+        libro = LibroVentas()
+        tienda = TiendaMuebles("Test", libro=libro)
+        comedor = _comedor()
+        _surtir(tienda, comedor)
+        tienda.aplicar_descuento("silla", 10)
+        carrito = Carrito("Ana")
+        carrito.agregar_comedor(comedor)
+
+        recibo = tienda.cobrar(carrito)
+
+        assert recibo["cantidad"] == 7 and recibo["cliente"] == "Ana"
+        mesa, silla = recibo["lineas"][0], recibo["lineas"][1]
+        assert mesa["descuento"] == 5 and silla["descuento"] == 15
+        assert recibo["total"] == round(
+            mesa["precio_final"] + 6 * silla["precio_final"], 2
+        )
+        assert recibo["ahorro"] == round(recibo["subtotal"] - recibo["total"], 2)
+        assert len(tienda.inventario) == 1
+        assert tienda.obtener_estadisticas()["total_muebles_vendidos"] == 7
+        assert len(libro) == 7
+
+    def test_comedor_se_surte_por_piezas(self):
+        tienda = TiendaMuebles("Test")
+        comedor = _comedor()
+        assert tienda.agregar_comedor(comedor) == "comedor agregado"
+        assert len(tienda.inventario) == 7
+        assert len(tienda.filtrar_por_tipo("Silla")) == 6
+        tienda.agregar_regla_descuento(
+            ReglaDescuento(
+                "comedor completo", None, 5, requiere={"mesa": 1, "silla": 4}
+            )
+        )
+        carrito = Carrito()
+        carrito.agregar_comedor(comedor)
+        recibo = tienda.cobrar(carrito)
+        assert all(linea["descuento"] == 5 for linea in recibo["lineas"])
+        assert len(tienda.inventario) == 0
+
+    def test_regla_de_carrito_exige_las_unidades(self):
+        tienda = TiendaMuebles("Test")
+        comedor = _comedor()
+        _surtir(tienda, comedor)
+        carrito = Carrito()
+        carrito.agregar(comedor.mesa)
+        for silla in comedor.sillas[:3]:
+            carrito.agregar(silla)
+        recibo = tienda.cobrar(carrito)
+        assert recibo["ahorro"] == 0
+        assert all(linea["explicacion"] == () for linea in recibo["lineas"])
+
+    def test_linea_faltante_no_vende_nada(self):
+        tienda = TiendaMuebles("Test")
+        comedor = _comedor()
+        _surtir(tienda, comedor)
+        carrito = Carrito()
+        carrito.agregar_comedor(comedor)
+        carrito.agregar(comedor.sillas[0])  # una sola en stock
+
+        assert tienda.cobrar(carrito) == {"error": "no disponible: Silla 0"}
+        assert tienda.cobrar(Carrito()) == {"error": "carrito vacío"}
+        assert len(tienda.inventario) == 8
+        assert tienda.obtener_estadisticas()["total_muebles_vendidos"] == 0
+        with pytest.raises(ValueError):
+            carrito.agregar(comedor.mesa, cantidad=0)
+
+    def test_cobro_persiste_en_almacen_y_wal(self, tmp_path):
+        ruta = str(tmp_path / "tienda.db")
+        with AlmacenSQLite(ruta) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            comedor = _comedor()
+            _surtir(tienda, comedor)
+            carrito = Carrito()
+            carrito.agregar_comedor(comedor)
+            total = tienda.cobrar(carrito)["total"]
+        with AlmacenSQLite(ruta) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            assert [m.nombre for m in tienda.inventario] == ["Armario"]
+            assert tienda.obtener_estadisticas()["valor_total_ventas"] == total
+
+        directorio = str(tmp_path / "wal")
+        with RegistroCambios(directorio, cada=0, ventana=0) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            _surtir(tienda, _comedor())
+            carrito = Carrito()
+            # otros objetos, pero idénticos: son unidades de los mismos SKU
+            carrito.agregar_comedor(_comedor())
+            total = tienda.cobrar(carrito)["total"]
+        with RegistroCambios(directorio) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            assert [m.nombre for m in tienda.inventario] == ["Armario"]
+            estadisticas = tienda.obtener_estadisticas()
+            assert estadisticas["total_muebles_vendidos"] == 7
+            assert estadisticas["valor_total_ventas"] == total
+
+    def test_cobro_quita_el_sku_vendido_y_numera_cada_linea(self, tmp_path):
+        directorio = str(tmp_path / "wal")
+        ruta_diario = str(tmp_path / "ventas.log")
+        with RegistroCambios(directorio, cada=0, ventana=0) as cambios:
+            with DiarioVentas(ruta_diario, ventana=0) as diario:
+                tienda = TiendaMuebles("Test", diario=diario, cambios=cambios)
+                tienda.agregar_mueble(Silla("Silla", "Madera", "Café", 100.0))
+                tienda.agregar_mueble(Silla("Silla", "Metal", "Negro", 80.0), 2)
+                carrito = Carrito()
+                carrito.agregar(Silla("Silla", "Metal", "Negro", 80.0), cantidad=2)
+                recibo = tienda.cobrar(carrito)
+        assert [venta["secuencia"] for venta in recibo["lineas"]] == [1, 2]
+        assert len(list(leer_ventas(ruta_diario))) == 2
+
+        with RegistroCambios(directorio) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            assert [m.material for m in tienda.inventario] == ["Madera"]
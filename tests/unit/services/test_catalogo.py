@@ -0,0 +1,183 @@
+import json
+import tracemalloc
+
+import pytest
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sofacama import SofaCama
+from src.services.catalogo import importar_catalogo, registro_a_mueble
+from src.services.tienda import TiendaMuebles
+
+CSV_CATALOGO = """tipo,nombre,material,color,precio_base,numero_patas,forma,capacidad_personas,tamaño_cama,tiene_espejos
+Silla,Silla Nórdica,Madera,Blanco,80,4,,,,
+mesa,Mesa Roble,Roble,Natural,300.5,,redonda,6,,
+Sofá-cama,Sofacama Urbano,Tela,Gris,900,,,3,Queen,
+Armario,Armario Doble,Pino,Blanco,450,,,,,sí
+Dragon,Nada,Metal,Negro,10,,,,,
+Silla,Sin Precio,Madera,Negro,-5,,,,,
+Silla,Patas Raras,Madera,Negro,50,cuatro,,,,
+"""
+
+
+class TestRegistroAMueble:
+    def test_convierte_segun_la_firma_del_constructor(self):
+        mesa = registro_a_mueble(
+            {
+                "tipo": "Mesa",
+                "nombre": "M",
+                "material": "Roble",
+                "color": "Natural",
+                "precio_base": "200",
+                "largo": "150.5",
+                "capacidad_personas": "8.0",
+                "forma": "",
+            }
+        )
+        assert isinstance(mesa, Mesa)
+        assert mesa.largo == 150.5
+        assert mesa.capacidad_personas == 8
+        assert mesa.forma == "rectangular"
+
+    def test_booleanos_y_tipo_sin_acentos(self):
+        armario = registro_a_mueble(
+            {
+                "tipo": "ARMARIO",
+                "nombre": "A",
+                "material": "Pino",
+                "color": "Blanco",
+                "precio_base": 600,
+                "tiene_espejos": "Sí",
+            }
+        )
+        assert isinstance(armario, Armario) and armario.tiene_espejos is True
+
+    @pytest.mark.parametrize(
+        "registro,mensaje",
+        [
+            ({"nombre": "X"}, "tipo"),
+            ({"tipo": "Silla", "nombre": "X", "material": "M"}, "obligatorios"),
+            (
+                {
+                    "tipo": "Silla",
+                    "nombre": "X",
+                    "material": "M",
+                    "color": "C",
+                    "precio_base": 1,
+                    "ruedas": "si",
+                },
+                "desconocido",
+            ),
+            (
+                {
+                    "tipo": "Silla",
+                    "nombre": "X",
+                    "material": "M",
+                    "color": "C",
+                    "precio_base": 1,
+                    "tiene_ruedas": "quizas",
+                },
+                "inválido",
+            ),
+        ],
+    )
+    def test_errores_descriptivos(self, registro, mensaje):
+        with pytest.raises(ValueError, match=mensaje):
+            registro_a_mueble(registro)
+
+
+class TestImportarCatalogo:
+    def test_csv_con_rechazos(self, tmp_path):
+        ruta = tmp_path / "catalogo.csv"
+        ruta.write_text(CSV_CATALOGO, encoding="utf-8")
+        tienda = TiendaMuebles()
+
+        resumen = importar_catalogo(tienda, str(ruta), tamaño_lote=2)
+
+        assert resumen["leidos"] == 7
+        assert resumen["agregados"] == 4
+        assert resumen["rechazados"] == 3
+        assert [type(m) for m in tienda.inventario] == [Silla, Mesa, SofaCama, Armario]
+        assert tienda.inventario[2].tamaño == "queen"
+        rechazos = [
+            json.loads(linea)
+            for linea in open(resumen["archivo_rechazos"], encoding="utf-8")
+        ]
+        assert [r["linea"] for r in rechazos] == [6, 7, 8]
+        assert "desconocido" in rechazos[0]["error"]
+        assert rechazos[1]["error"] == "Error: precio inválido"
+        assert rechazos[2]["registro"]["numero_patas"] == "cuatro"
+
+    def test_jsonl_linea_corrupta_no_aborta(self, tmp_path):
+        ruta = tmp_path / "catalogo.jsonl"
+        filas = [
+            json.dumps(
+                {
+                    "tipo": "Silla",
+                    "nombre": "S",
+                    "material": "Madera",
+                    "color": "Café",
+                    "precio_base": 100,
+                    "tiene_ruedas": True,
+                }
+            ),
+            "{roto",
+            "",
+            json.dumps(["no", "es", "objeto"]),
+            json.dumps(
+                {
+                    "tipo": "Cama",
+                    "nombre": "C",
+                    "material": "Pino",
+                    "color": "Blanco",
+                    "precio_base": 400,
+                    "tamaño": "king",
+                }
+            ),
+        ]
+        ruta.write_text("\n".join(filas) + "\n", encoding="utf-8")
+        rechazos = tmp_path / "malas.jsonl"
+        tienda = TiendaMuebles()
+
+        resumen = importar_catalogo(tienda, str(ruta), ruta_rechazos=str(rechazos))
+
+        assert resumen["agregados"] == 2
+        assert resumen["rechazados"] == 2
+        assert tienda.inventario[0].tiene_ruedas is True
+        primera = json.loads(rechazos.read_text(encoding="utf-8").splitlines()[0])
+        assert primera["linea"] == 2 and primera["registro"] == "{roto"
+
+    def test_sin_rechazos_no_crea_archivo(self, tmp_path):
+        ruta = tmp_path / "ok.csv"
+        ruta.write_text(
+            "tipo,nombre,material,color,precio_base\nSilla,S,Madera,Café,10\n",
+            encoding="utf-8",
+        )
+        resumen = importar_catalogo(TiendaMuebles(), str(ruta))
+        assert resumen["archivo_rechazos"] is None
+        assert not (tmp_path / "ok.csv.rechazos.jsonl").exists()
+
+    def test_memoria_del_importador_no_crece_con_el_archivo(self, tmp_path):
+        class TiendaNula:
+            def agregar_muebles_lote(self, muebles):
+                n = sum(1 for _ in muebles)
+                return {"agregados": n, "rechazados": 0, "errores": []}
+
+        def pico(filas):
+            ruta = tmp_path / f"c{filas}.csv"
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                archivo.write("tipo,nombre,material,color,precio_base\n")
+                for i in range(filas):
+                    archivo.write(f"Silla,Silla {i},Madera,Negro,{50 + i % 7}\n")
+            tracemalloc.start()
+            importar_catalogo(TiendaNula(), str(ruta), tamaño_lote=500)
+            _, maximo = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return maximo
+
+        assert pico(20000) < pico(2000) * 2
+
+    def test_formato_desconocido(self, tmp_path):
+        with pytest.raises(ValueError, match="formato"):
+            importar_catalogo(TiendaMuebles(), str(tmp_path / "catalogo.xml"))
@@ -0,0 +1,199 @@
+import random
+
+import pytest
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.cajonera import Cajonera
+from src.models.concretos.cama import Cama
+from src.models.concretos.escritorio import Escritorio
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sillon import Sillon
+from src.models.concretos.sofa import Sofa
+from src.models.concretos.sofacama import SofaCama
+from src.services.columnar import InventarioColumnar
+from src.services.tienda import TiendaMuebles
+
+
+def _muebles_aleatorios(cantidad, semilla=7):
+    azar = random.Random(semilla)
+    tapizados = [None, "cuero", "Tela", "lino"]
+
+    def precio():
+        return round(azar.uniform(10, 3000), azar.choice([0, 1, 2, 3]))
+
+    fabricas = [
+        lambda i: Silla(
+            f"Silla {i}",
+            "Madera",
+            "Café",
+            precio(),
+            material_tapizado=azar.choice(tapizados),
+            altura_regulable=azar.random() < 0.5,
+            tiene_ruedas=azar.random() < 0.5,
+        ),
+        lambda i: Mesa(
+            f"Mesa {i}",
+            "Roble",
+            "Natural",
+            precio(),
+            forma=azar.choice(["rectangular", "redonda", "ovalada"]),
+            largo=azar.uniform(40, 300),
+            ancho=azar.uniform(40, 150),
+            capacidad_personas=azar.randint(1, 10),
+        ),
+        lambda i: Sofa(
+            f"Sofa {i}",
+            "Tela",
+            "Gris",
+            precio(),
+            azar.randint(1, 6),
+            azar.random() < 0.5,
+            azar.choice(tapizados),
+            azar.random() < 0.5,
+            azar.random() < 0.5,
+            azar.random() < 0.5,
+        ),
+        lambda i: Cama(
+            f"Cama {i}",
+            "Pino",
+            "Blanco",
+            precio(),
+            azar.choice(["individual", "matrimonial", "queen", "king"]),
+            azar.random() < 0.5,
+            azar.random() < 0.5,
+        ),
+        lambda i: SofaCama(
+            f"SofaCama {i}",
+            "Tela",
+            "Beige",
+            precio(),
+            azar.randint(1, 5),
+            azar.choice(["tela", "cuero", None]),
+            azar.choice(["matrimonial", "Queen", "king", "full"]),
+            azar.random() < 0.5,
+            azar.choice(["plegable", "hidraulico", "electrico"]),
+        ),
+        lambda i: Armario(
+            f"Armario {i}",
+            "Pino",
+            "Blanco",
+            precio(),
+            azar.randint(1, 6),
+            azar.randint(0, 4),
+            azar.random() < 0.5,
+        ),
+        lambda i: Cajonera(
+            f"Cajonera {i}",
+            "Metal",
+            "Gris",
+            precio(),
+            azar.randint(1, 8),
+            azar.random() < 0.5,
+        ),
+        lambda i: Escritorio(
+            f"Escritorio {i}",
+            "Madera",
+            "Negro",
+            precio(),
+            azar.choice(["rectangular", "L"]),
+            azar.random() < 0.5,
+            azar.randint(0, 4),
+            azar.uniform(0.8, 2.2),
+            azar.random() < 0.5,
+        ),
+        lambda i: Sillon(
+            f"Sillon {i}",
+            "Cuero",
+            "Marrón",
+            precio(),
+            azar.randint(1, 3),
+            True,
+            azar.choice(tapizados),
+            azar.random() < 0.5,
+            azar.random() < 0.5,
+            azar.random() < 0.5,
+        ),
+    ]
+    return [fabricas[i % len(fabricas)](i) for i in range(cantidad)]
+
+
+@pytest.fixture(scope="module")
+def muebles():
+    return _muebles_aleatorios(900)
+
+
+@pytest.fixture(scope="module")
+def columnar(muebles):
+    inventario = InventarioColumnar()
+    for mueble in muebles:
+        inventario.agregar_mueble(mueble)
+    return inventario
+
+
+def test_precios_vectorizados_identicos_a_los_objetos(muebles, columnar):
+    por_tipo = {}
+    for mueble in muebles:
+        por_tipo.setdefault(type(mueble).__name__, []).append(mueble.calcular_precio())
+    for tipo, esperados in por_tipo.items():
+        assert columnar.calcular_precios(tipo).tolist() == esperados, tipo
+
+
+def test_valor_inventario_igual_al_de_la_tienda(muebles, columnar):
+    tienda = TiendaMuebles()
+    for mueble in muebles:
+        tienda.agregar_mueble(mueble)
+    assert columnar.calcular_valor_inventario() == tienda.calcular_valor_inventario()
+    assert len(columnar) == len(muebles)
+
+
+def test_filtrar_por_precio(muebles, columnar):
+    filas = columnar.filtrar_por_precio(500, 1500)
+    encontrados = sum(len(f) for f in filas.values())
+    esperados = sum(1 for m in muebles if 500 <= m.calcular_precio() <= 1500)
+    assert encontrados == esperados
+    tipo, indices = next(iter(filas.items()))
+    assert 500 <= columnar.materializar(tipo, int(indices[0])).calcular_precio() <= 1500
+
+
+def test_agrupar_por_material_y_tipo(muebles, columnar):
+    por_material = columnar.agrupar("material")
+    assert sum(g["cantidad"] for g in por_material.values()) == len(muebles)
+    assert por_material["Pino"]["cantidad"] == sum(
+        1 for m in muebles if m.material == "Pino"
+    )
+    assert set(columnar.agrupar("tipo")) == {type(m).__name__ for m in muebles}
+    with pytest.raises(ValueError):
+        columnar.agrupar("forma")
+
+
+def test_agregar_registro_y_materializar():
+    inventario = InventarioColumnar()
+    tipo, fila = inventario.agregar_registro(
+        "SofaCama",
+        nombre="SC",
+        material="Tela",
+        color="Beige",
+        precio_base=1500.0,
+        tamaño_cama="Queen",
+        mecanismo_conversion="hidraulico",
+    )
+    sofacama = inventario.materializar(tipo, fila)
+    assert isinstance(sofacama, SofaCama)
+    assert sofacama.tamaño_cama == "queen"
+    assert inventario.calcular_precios("SofaCama")[0] == sofacama.calcular_precio()
+    with pytest.raises(ValueError):
+        inventario.agregar_registro("Lampara", nombre="L")
+
+
+def test_columna_es_copia_y_no_bloquea_altas():
+    inventario = InventarioColumnar()
+    inventario.agregar_registro(
+        "Mesa", nombre="M1", material="Pino", color="Natural", precio_base=100.0
+    )
+    precios_base = inventario._tipos["Mesa"].columna("precio_base")
+    inventario.agregar_registro(
+        "Mesa", nombre="M2", material="Pino", color="Natural", precio_base=200.0
+    )
+    assert precios_base.tolist() == [100.0]
+    assert len(inventario.calcular_precios("Mesa")) == 2
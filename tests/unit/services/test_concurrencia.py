@@ -0,0 +1,150 @@
+import random
+import threading
+
+import pytest
+
+from src.models.concretos.silla import Silla
+from src.services.almacen import AlmacenSQLite
+from src.services.carrito import Carrito
+from src.services.concurrencia import CandadoCompartido, ContadorFragmentado
+from src.services.libro_ventas import LibroVentas
+from src.services.recuperacion import RegistroCambios
+from src.services.tienda import TiendaMuebles
+
+_HILOS = 8
+_MUEBLES = 240
+
+
+@pytest.fixture(autouse=True)
+def sin_print(monkeypatch):
+    monkeypatch.setattr("builtins.print", lambda *a, **k: None)
+
+
+def _en_hilos(trabajo):
+    """Corre ``trabajo(numero)`` en varios hilos que arrancan a la vez."""
+    largada = threading.Barrier(_HILOS)
+    errores = []
+
+    def correr(numero):
+        largada.wait()
+        try:
+            trabajo(numero)
+        except BaseException as error:
+            errores.append(error)
+
+    hilos = [threading.Thread(target=correr, args=(n,)) for n in range(_HILOS)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert not errores, errores
+
+
+def _sillas():
+    return [
+        Silla(f"Silla {i}", "Madera", "Café", 50.0 + i % 7) for i in range(_MUEBLES)
+    ]
+
+
+def _vender_a_la_vez(tienda, muebles):
+    """
+    Cada hilo intenta vender todo el stock, por nombre o en carritos de tres.
+
+    Returns:
+        list: Nombres vendidos (con repeticiones si hubo doble venta)
+    """
+    vendidos = []
+    candado = threading.Lock()
+
+    def caja(numero):
+        azar = random.Random(numero)
+        orden = muebles.copy()
+        azar.shuffle(orden)
+        propios = []
+        for inicio in range(0, len(orden), 3):
+            tramo = orden[inicio : inicio + 3]
+            if numero % 2:
+                carrito = Carrito(f"caja {numero}")
+                for mueble in tramo:
+                    carrito.agregar(mueble)
+                if "error" not in tienda.cobrar(carrito):
+                    propios.extend(m.nombre for m in tramo)
+            else:
+                for mueble in tramo:
+                    if tienda.vender_producto(mueble.nombre):
+                        propios.append(mueble.nombre)
+        with candado:
+            vendidos.extend(propios)
+
+    _en_hilos(caja)
+    return vendidos
+
+
+class TestPrimitivas:
+    def test_contador_no_pierde_sumas(self):
+        contador = ContadorFragmentado(2, fragmentos=4)
+        _en_hilos(lambda _: [contador.sumar(1, 0.5) for _ in range(2000)])
+        assert contador.leer() == [_HILOS * 2000, _HILOS * 1000.0]
+        contador.fijar((3, 1.5))
+        assert contador.leer() == [3, 1.5]
+
+    def test_compartido_es_reentrante_y_excluye_al_exclusivo(self):
+        candado = CandadoCompartido()
+        with candado.compartido(), candado.compartido():
+            assert candado.tomado()
+            with pytest.raises(RuntimeError):
+                with candado.exclusivo():
+                    pass
+        with candado.exclusivo():
+            assert not candado.tomado()
+
+
+class TestVentasConcurrentes:
+    def test_sin_doble_venta_ni_contadores_perdidos(self):
+        libro = LibroVentas()
+        tienda = TiendaMuebles("Test", libro=libro)
+        muebles = _sillas()
+        tienda.agregar_muebles_lote(muebles)
+        valor = tienda.calcular_valor_inventario()
+
+        vendidos = _vender_a_la_vez(tienda, muebles)
+
+        assert sorted(vendidos) == sorted(m.nombre for m in muebles)
+        assert len(tienda.inventario) == 0
+        assert tienda.calcular_valor_inventario() == 0
+        estadisticas = tienda.obtener_estadisticas()
+        assert estadisticas["total_muebles_vendidos"] == _MUEBLES
+        assert estadisticas["valor_total_ventas"] == valor
+        assert len(libro) == _MUEBLES
+
+    def test_ventas_con_wal_se_recuperan(self, tmp_path):
+        directorio = str(tmp_path / "wal")
+        muebles = _sillas()
+        with RegistroCambios(directorio, cada=25, ventana=0) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            extra = [Silla(f"Extra {i}", "Pino", "Blanco", 40.0) for i in range(5)]
+            # diez nombres repetidos: vender por nombre también vende las copias
+            tienda.agregar_muebles_lote(muebles + _sillas()[:10] + extra)
+            vendidos = _vender_a_la_vez(tienda, muebles)
+            esperado = tienda.obtener_estadisticas()
+            restantes = sorted(m.nombre for m in tienda.inventario)
+        assert len(vendidos) == _MUEBLES + 10
+        assert restantes == [m.nombre for m in extra]
+        with RegistroCambios(directorio) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            assert tienda.obtener_estadisticas() == esperado
+            assert sorted(m.nombre for m in tienda.inventario) == restantes
+
+    def test_ventas_con_almacen(self, tmp_path):
+        ruta = str(tmp_path / "tienda.db")
+        muebles = _sillas()
+        with AlmacenSQLite(ruta) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            tienda.agregar_muebles_lote(muebles)
+            vendidos = _vender_a_la_vez(tienda, muebles)
+            esperado = tienda.obtener_estadisticas()
+        assert len(vendidos) == _MUEBLES
+        with AlmacenSQLite(ruta) as almacen:
+            tienda = TiendaMuebles("Test", almacen)
+            assert len(tienda.inventario) == 0
+            assert tienda.obtener_estadisticas() == esperado
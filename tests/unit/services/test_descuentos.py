@@ -0,0 +1,115 @@
+from unittest.mock import Mock
+
+import pytest
+
+from src.models.composicion.comedor import Comedor
+from src.models.concretos.cama import Cama
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sofacama import SofaCama
+from src.services.descuentos import MotorDescuentos, ReglaDescuento
+from src.services.tienda import TiendaMuebles
+
+# sábado 2026-10-17 00:00 UTC y el lunes siguiente
+_SABADO = 1792195200.0
+_LUNES = _SABADO + 2 * 86400
+
+
+def _comedor(sillas):
+    mesa = Mesa("Mesa", "Roble", "Natural", 200.0)
+    return Comedor("Comedor", mesa, [Silla("S", "Roble", "Café", 50.0)] * sillas)
+
+
+class TestMotorDescuentos:
+    def test_categoria_cubre_subclases(self):
+        motor = MotorDescuentos()
+        motor.definir_categorias({"asientos": 15})
+        assert motor.evaluar(Silla("S", "Madera", "Café", 100.0)).porcentaje == 15
+        assert motor.evaluar(SofaCama("SC", "Tela", "Gris", 800.0)).porcentaje == 15
+        assert motor.evaluar(Mesa("M", "Roble", "Natural", 200.0)).porcentaje == 0
+
+    def test_herencia_multiple_sigue_el_mro(self):
+        sofa_cama = SofaCama("SC", "Tela", "Gris", 800.0)
+        motor = MotorDescuentos()
+        motor.definir_categorias({"cama": 30})
+        assert motor.evaluar(sofa_cama).porcentaje == 30
+        # SofaCama -> Sofa -> Asiento -> Cama: el asiento está antes que la cama
+        motor.definir_categorias({"cama": 30, "asiento": 10})
+        assert motor.evaluar(sofa_cama).porcentaje == 10
+        assert motor.evaluar(Cama("C", "Pino", "Blanco", 300.0)).porcentaje == 30
+        motor.definir_categorias({"cama": 30, "asiento": 10, "sofacama": 5})
+        assert motor.evaluar(sofa_cama).porcentaje == 5
+
+    def test_mock_con_spec_usa_su_clase(self):
+        motor = MotorDescuentos()
+        motor.definir_categorias({"silla": 20})
+        assert motor.evaluar(Mock(spec=Silla)).porcentaje == 20
+        assert motor.evaluar(Mock()).porcentaje == 0
+
+    def test_vigencia_niveles_y_tope(self):
+        motor = MotorDescuentos(tope=40)
+        motor.definir_categorias({"mesa": 30})
+        motor.agregar(
+            ReglaDescuento("finde mesas", "mesas", 15, desde=_SABADO, hasta=_LUNES)
+        )
+        mesa = Mesa("M", "Roble", "Natural", 200.0)
+        assert motor.evaluar(mesa, _SABADO - 1).porcentaje == 30
+        resolucion = motor.evaluar(mesa, _SABADO + 3600)
+        assert resolucion.porcentaje == 40
+        assert resolucion.reglas == ("categoría mesa", "finde mesas")
+        assert resolucion.explicacion[-1] == "tope combinado: 45% -> 40%"
+        assert motor.evaluar(mesa, _LUNES).porcentaje == 30
+
+        motor.agregar(
+            ReglaDescuento("set 4", "comedor", 5, minimo_sillas=4, grupo="set")
+        )
+        motor.agregar(
+            ReglaDescuento("set 6", "comedor", 8, minimo_sillas=6, grupo="set")
+        )
+        porcentajes = [
+            c.porcentaje
+            for c in motor.evaluar_lote(
+                [_comedor(2), _comedor(4), _comedor(5), _comedor(6)], _LUNES
+            )
+        ]
+        assert porcentajes == [0, 5, 5, 8]
+
+    def test_regla_invalida(self):
+        with pytest.raises(ValueError):
+            ReglaDescuento("x", "mesa", 120)
+        with pytest.raises(ValueError):
+            ReglaDescuento("x", "mesa", 10, desde=_LUNES, hasta=_SABADO)
+        with pytest.raises(ValueError):
+            MotorDescuentos(tope=-1)
+
+
+class TestTiendaReglas:
+    def test_recompila_al_cambiar_descuentos(self):
+        tienda = TiendaMuebles("Test")
+        silla = Silla("S", "Madera", "Café", 100.0)
+        assert tienda.realizar_venta(silla)["descuento"] == 0
+        tienda.aplicar_descuento("asiento", 25)
+        venta = tienda.realizar_venta(silla)
+        assert venta["precio_final"] == 75.0
+        assert venta["explicacion"] == ("categoría asiento: 25% en asiento",)
+        tienda.restaurar_estado({"descuentos": {}})
+        assert tienda.realizar_venta(silla)["descuento"] == 0
+
+    def test_comedor_completo_y_estado(self):
+        tienda = TiendaMuebles("Test")
+        tienda.agregar_regla_descuento(
+            ReglaDescuento("set completo", "comedor", 5, minimo_sillas=4)
+        )
+        comedor = _comedor(4)
+        venta = tienda.realizar_venta(comedor)
+        esperado = round(comedor.calcular_precio_total() * 0.95, 2)
+        assert venta["precio_final"] == esperado
+
+        copia = TiendaMuebles("Copia")
+        copia.restaurar_estado(tienda.exportar_estado())
+        (evaluado,) = copia.evaluar_descuentos([comedor])
+        assert evaluado["precio_final"] == esperado
+        assert copia.quitar_regla_descuento("set completo") == (
+            "Regla set completo eliminada"
+        )
+        assert copia.evaluar_descuentos([comedor])[0]["descuento"] == 0
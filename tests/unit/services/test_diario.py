@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from src.models.concretos.silla import Silla
+from src.services.diario import DiarioVentas, leer_ventas
+from src.services.tienda import TiendaMuebles
+
+
+@pytest.fixture
+def ruta_diario(tmp_path):
+    return str(tmp_path / "ventas.log")
+
+
+class TestDiarioVentas:
+    def test_venta_confirmada_queda_en_disco(self, ruta_diario):
+        with DiarioVentas(ruta_diario, ventana=0.05) as diario:
+            tienda = TiendaMuebles("Test", diario=diario)
+            venta = tienda.realizar_venta(
+                Silla("Silla", "Madera", "Café", 100.0), "Ana"
+            )
+            assert venta["secuencia"] == 1
+            assert diario.esperar(venta["secuencia"], timeout=5)
+            (registro,) = leer_ventas(ruta_diario)
+        assert registro["mueble"] == "Silla" and registro["cliente"] == "Ana"
+        assert registro["tipo"] == "Silla"
+        assert registro["precio_final"] == venta["precio_final"]
+
+    def test_commit_en_grupo(self, ruta_diario):
+        with DiarioVentas(ruta_diario, ventana=0.02, sincrono=False) as diario:
+
+            def vender(hilo):
+                for i in range(50):
+                    diario.registrar({"hilo": hilo, "i": i})
+
+            hilos = [threading.Thread(target=vender, args=(h,)) for h in range(4)]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            assert diario.esperar(timeout=5)
+            estadisticas = diario.estadisticas()
+        assert estadisticas["confirmadas"] == estadisticas["ventas"] == 200
+        assert estadisticas["grupos"] < 200
+        ventas = list(leer_ventas(ruta_diario))
+        assert len(ventas) == 200
+        for h in range(4):
+            assert [v["i"] for v in ventas if v["hilo"] == h] == list(range(50))
+
+    def test_venta_devuelta_ya_esta_en_disco(self, ruta_diario):
+        with DiarioVentas(ruta_diario, ventana=10) as diario:
+            tienda = TiendaMuebles("Test", diario=diario)
+            venta = tienda.realizar_venta(Silla("Silla", "Madera", "Café", 100.0))
+            # sin cerrar el diario: lo que se ve en disco es lo que tuvo fsync
+            assert diario.estadisticas()["confirmadas"] == venta["secuencia"]
+            assert len(list(leer_ventas(ruta_diario))) == 1
+
+    def test_cerrar_escribe_lo_pendiente(self, ruta_diario):
+        diario = DiarioVentas(ruta_diario, ventana=10, sincrono=False)
+        for i in range(3):
+            diario.registrar({"i": i})
+        diario.cerrar()
+        assert [v["i"] for v in leer_ventas(ruta_diario)] == [0, 1, 2]
+        with pytest.raises(RuntimeError):
+            diario.registrar({"i": 3})
+
+    def test_cola_rota_se_descarta_al_reabrir(self, ruta_diario):
+        with DiarioVentas(ruta_diario, ventana=0) as diario:
+            diario.registrar({"i": 0})
+            diario.registrar({"i": 1})
+        with open(ruta_diario, "ab") as archivo:
+            archivo.write(b"\x40\x00\x00\x00basura")  # marco a medio escribir
+
+        with DiarioVentas(ruta_diario, ventana=0) as diario:
+            assert diario.registrar({"i": 2}) == 3
+        assert [v["i"] for v in leer_ventas(ruta_diario)] == [0, 1, 2]
+
+    def test_checksum_invalido_corta_la_lectura(self, ruta_diario):
+        with DiarioVentas(ruta_diario, ventana=0) as diario:
+            for i in range(3):
+                diario.registrar({"i": i})
+        with open(ruta_diario, "r+b") as archivo:
+            datos = bytearray(archivo.read())
+            datos[-3] ^= 0xFF  # corrompe el último marco
+            archivo.seek(0)
+            archivo.write(datos)
+        assert [v["i"] for v in leer_ventas(ruta_diario)] == [0, 1]
@@ -0,0 +1,68 @@
+import gzip
+import io
+
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.services.escritura import escribir_fragmentos
+from src.services.tienda import TiendaMuebles
+
+
+def _tienda():
+    tienda = TiendaMuebles("Test")
+    tienda.agregar_muebles_lote(
+        [Silla(f"Silla {i}", "Roble", "Café", 50.0 + i) for i in range(30)]
+    )
+    tienda.agregar_mueble(Mesa("Mesa Roble", "Roble", "Natural", 300.0), cantidad=4)
+    return tienda
+
+
+class TestEscritura:
+    def test_escribe_por_trozos_lo_mismo_que_el_reporte(self):
+        tienda = _tienda()
+        esperado = tienda.generar_reporte_inventario() + "\n"
+        avances = []
+        destino = io.StringIO()
+        unidades = tienda.escribir_reporte_inventario(
+            destino,
+            progreso=lambda hechas, total: avances.append((hechas, total)),
+            tamaño_bloque=8,
+        )
+        assert destino.getvalue() == esperado and unidades == 34
+        assert [hechas for hechas, _ in avances] == [8, 16, 24, 32, 34]
+        assert {total for _, total in avances} == {34}
+
+        en_procesos = io.StringIO()
+        tienda.escribir_reporte_inventario(en_procesos, procesos=2, tamaño_bloque=8)
+        assert en_procesos.getvalue() == esperado
+
+    def test_un_sku_con_muchas_unidades_se_reparte(self):
+        tienda = TiendaMuebles("Test")
+        tienda.agregar_mueble(Silla("Silla Roble", "Roble", "Café", 50.0), cantidad=25)
+        for procesos in (1, 2):
+            fragmentos = list(tienda.iterar_reporte_inventario(procesos, 10))
+            assert [f.count("\n") + 1 for f in fragmentos[1:]] == [10, 10, 5]
+            assert "\n".join(fragmentos) == tienda.generar_reporte_inventario()
+
+    def test_gzip_a_ruta_y_a_flujo_binario(self, tmp_path):
+        tienda = _tienda()
+        esperado = tienda.generar_reporte_inventario() + "\n"
+        ruta = str(tmp_path / "reporte.txt.gz")
+        tienda.escribir_reporte_inventario(ruta)
+        with gzip.open(ruta, "rt", encoding="utf-8") as archivo:
+            assert archivo.read() == esperado
+
+        binario = io.BytesIO()
+        escribir_fragmentos(["a", "b"], binario, comprimir=True, tamaño_trozo=1)
+        assert not binario.closed
+        assert gzip.decompress(binario.getvalue()) == b"a\nb\n"
+
+    def test_bloques_siguen_las_ventas_entre_bloques(self):
+        tienda = _tienda()
+        bloques = tienda.inventario.ranuras_por_bloques(10)
+        primero = next(bloques)
+        assert [item.nombre for _, item, _, _ in primero][-1] == "Silla 9"
+        tienda.vender_producto("Silla 10")
+        tienda.agregar_mueble(Silla("Silla Nueva", "Pino", "Blanco", 40.0))
+        nombres = [item.nombre for bloque in bloques for _, item, _, _ in bloque]
+        assert "Silla 10" not in nombres and nombres[0] == "Silla 11"
+        assert nombres[-2:] == ["Mesa Roble", "Silla Nueva"]
@@ -0,0 +1,122 @@
+import pytest
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sofacama import SofaCama
+from src.services.instantanea import (
+    Instantanea,
+    MuebleDiferido,
+    cargar_instantanea,
+    guardar_instantanea,
+)
+from src.services.tienda import TiendaMuebles
+
+
+@pytest.fixture
+def ruta_instantanea(tmp_path):
+    tienda = TiendaMuebles("Mueblería Test")
+    tienda.agregar_muebles_lote(
+        [
+            Silla("Silla Café", "Madera", "Café", 100.0, material_tapizado="cuero"),
+            Mesa("Mesa Redonda", "Roble", "Natural", 300.0, forma="redonda"),
+            SofaCama("SofaCama Loft", "Tela", "Gris", 900.0, tamaño_cama="King"),
+            Armario("Armario Doble", "Pino", "Blanco", 450, tiene_espejos=True),
+        ]
+    )
+    tienda.restaurar_estado(
+        {
+            "nombre": "Mueblería Test",
+            "descuentos": {"sillas": 10},
+            "total_muebles_vendidos": 7,
+            "valor_total_ventas": 1234.5,
+        }
+    )
+    ruta = tmp_path / "catalogo.bin"
+    resumen = guardar_instantanea(tienda, str(ruta))
+    assert resumen["muebles"] == 4 and resumen["omitidos"] == 0
+    return str(ruta), tienda
+
+
+class TestInstantanea:
+    def test_estadisticas_sin_indexar_ni_materializar(self, ruta_instantanea):
+        ruta, original = ruta_instantanea
+        tienda = TiendaMuebles()
+        instantanea = cargar_instantanea(tienda, ruta)
+
+        assert tienda.obtener_estadisticas() == original.obtener_estadisticas()
+        assert tienda.inventario._carga_diferida is not None
+        assert instantanea.materializados == 0
+
+    def test_consultas_indexan_sin_materializar(self, ruta_instantanea):
+        ruta, _ = ruta_instantanea
+        tienda = TiendaMuebles()
+        instantanea = cargar_instantanea(tienda, ruta)
+
+        (silla,) = tienda.buscar_muebles_por_nombre("cafe cuero")
+        assert tienda.filtrar_por_material("pino")[0].nombre == "Armario Doble"
+        assert [m.nombre for m in tienda.obtener_mas_caros(1)] == ["SofaCama Loft"]
+        assert isinstance(silla, Silla) and type(silla) is MuebleDiferido
+        assert tienda.filtrar_por_tipo(Silla) == [silla]
+        assert str(silla) == "Silla Café de Madera en color Café"
+        assert instantanea.materializados == 0
+
+    def test_materializa_al_usar_otros_atributos(self, ruta_instantanea):
+        ruta, _ = ruta_instantanea
+        tienda = TiendaMuebles()
+        instantanea = cargar_instantanea(tienda, ruta)
+        sofacama = tienda.filtrar_por_tipo("SofaCama")[0]
+
+        assert sofacama.tamaño == "king"
+        assert "SofaCama Loft" in sofacama.obtener_descripcion()
+        assert instantanea.materializados == 1
+        sofacama.precio_base = 1000.0
+        tienda.actualizar_mueble(sofacama)
+        assert tienda.filtrar_por_precio(0, 1000) == tienda.filtrar_por_precio(0, 1000)
+        assert sofacama.calcular_precio() > 900.0
+        assert instantanea.materializados == 1
+
+    def test_venta_aplica_descuento_del_tipo_real(self, ruta_instantanea):
+        ruta, _ = ruta_instantanea
+        tienda = TiendaMuebles()
+        cargar_instantanea(tienda, ruta)
+        silla = tienda.filtrar_por_tipo("Silla")[0]
+
+        venta = tienda.realizar_venta(silla)
+        assert venta["descuento"] == 10
+        assert tienda.obtener_estadisticas()["total_muebles_vendidos"] == 8
+
+    def test_guardar_desde_instantanea_es_estable(self, ruta_instantanea, tmp_path):
+        ruta, _ = ruta_instantanea
+        tienda = TiendaMuebles()
+        cargar_instantanea(tienda, ruta)
+        copia = tmp_path / "copia.bin"
+
+        guardar_instantanea(tienda, str(copia))
+
+        primera, segunda = Instantanea(ruta), Instantanea(str(copia))
+        assert [primera.registro(i) for i in range(4)] == [
+            segunda.registro(i) for i in range(4)
+        ]
+        assert segunda.materializados == 0
+
+    def test_sobrescribir_la_instantanea_adjunta(self, ruta_instantanea):
+        ruta, _ = ruta_instantanea
+        tienda = TiendaMuebles()
+        cargar_instantanea(tienda, ruta)
+        with pytest.MonkeyPatch.context() as parche:
+            parche.setattr("builtins.print", lambda *a, **k: None)
+            tienda.vender_producto("Mesa Redonda")
+
+        guardar_instantanea(tienda, ruta)
+
+        recargada = TiendaMuebles()
+        cargar_instantanea(recargada, ruta)
+        assert len(recargada.inventario) == 3
+        assert recargada.buscar_muebles_por_nombre("mesa") == []
+
+    def test_archivo_invalido(self, tmp_path):
+        ruta = tmp_path / "basura.bin"
+        ruta.write_bytes(b"no soy una instantanea" * 10)
+        with pytest.raises(ValueError, match="instantánea"):
+            Instantanea(str(ruta))
@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.services.libro_ventas import LibroVentas
+from src.services.tienda import TiendaMuebles
+
+# 2026-01-01 00:00:00 UTC
+_INICIO = 1767225600.0
+
+
+def _venta(precio, cliente=None, mueble="Silla"):
+    return {
+        "mueble": mueble,
+        "precio_original": precio,
+        "descuento": 0,
+        "precio_final": precio,
+        "cliente": cliente,
+    }
+
+
+class TestLibroVentas:
+    def test_tienda_registra_cada_venta(self):
+        libro = LibroVentas()
+        tienda = TiendaMuebles("Test", libro=libro)
+        tienda.aplicar_descuento("silla", 10)
+        venta = tienda.realizar_venta(Silla("Silla", "Madera", "Café", 100.0), "Ana")
+        tienda.realizar_venta(Mesa("Mesa", "Roble", "Natural", 200.0))
+
+        assert len(libro) == 2
+        fila = libro.venta(0)
+        assert fila["tipo"] == "Silla" and fila["cliente"] == "Ana"
+        assert fila["descuento"] == 10
+        assert fila["precio_final"] == venta["precio_final"]
+        assert libro.venta(1)["cliente"] is None
+
+    def test_ingresos_por_tipo_y_cliente_en_centavos(self):
+        libro = LibroVentas()
+        for _ in range(10):
+            libro.registrar(_venta(0.1, "Ana"), "Silla", _INICIO)
+        libro.registrar(_venta(250.5, "Luis", "Mesa"), "Mesa", _INICIO)
+        libro.registrar(_venta(99.99), "Silla", _INICIO)
+
+        assert libro.ingresos_por_tipo() == {
+            "Silla": {"ventas": 11, "ingresos": 100.99},
+            "Mesa": {"ventas": 1, "ingresos": 250.5},
+        }
+        por_cliente = libro.ingresos_por_cliente()
+        assert por_cliente["Ana"] == {"ventas": 10, "ingresos": 1.0}
+        assert por_cliente[None] == {"ventas": 1, "ingresos": 99.99}
+
+    def test_ingresos_por_ventana(self):
+        libro = LibroVentas()
+        libro.registrar(_venta(10.0), "Silla", _INICIO + 60)
+        libro.registrar(_venta(20.0), "Silla", _INICIO + 3000)
+        libro.registrar(_venta(5.0), "Mesa", _INICIO + 6 * 3600)
+
+        por_hora = libro.ingresos_por_ventana("hora")
+        assert list(por_hora) == [
+            datetime(2026, 1, 1, 0, tzinfo=timezone.utc),
+            datetime(2026, 1, 1, 6, tzinfo=timezone.utc),
+        ]
+        assert list(por_hora.values())[0] == {"ventas": 2, "ingresos": 30.0}
+
+        # en UTC-5 las dos primeras ventas caen el 31 de diciembre
+        por_dia = libro.ingresos_por_ventana("dia", desfase=-5 * 3600)
+        assert [(d.day, t["ventas"]) for d, t in por_dia.items()] == [(31, 2), (1, 1)]
+
+        filtrado = libro.ingresos_por_tipo(desde=_INICIO + 3600)
+        assert filtrado == {"Mesa": {"ventas": 1, "ingresos": 5.0}}
+
+    def test_ventana_invalida_y_libro_vacio(self):
+        libro = LibroVentas()
+        assert libro.ingresos_por_ventana("dia") == {}
+        assert libro.ingresos_por_tipo() == {}
+        with pytest.raises(ValueError):
+            libro.ingresos_por_ventana("semana")
+        with pytest.raises(ValueError):
+            libro.ingresos_por_ventana(0)
+
+    def test_memoria_compacta(self):
+        libro = LibroVentas()
+        for i in range(1000):
+            libro.registrar(_venta(10.0, f"cliente{i % 7}"), "Silla", _INICIO + i)
+        assert libro.memoria() == 1000 * 52
@@ -0,0 +1,55 @@
+import pytest
+
+from src.models.composicion.comedor import Comedor
+from src.models.concretos.armario import Armario
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sofa import Sofa
+from src.services.tienda import TiendaMuebles
+
+
+def _tienda():
+    tienda = TiendaMuebles("Test")
+    muebles = []
+    for i in range(40):
+        muebles.append(Silla(f"Silla {i}", "Roble", "Café", 50.0 + i))
+        muebles.append(Mesa(f"Mesa {i}", "Pino", "Natural", 200.0 + i))
+        muebles.append(Armario(f"Armario {i}", "Metal", "Gris", 400.0 + i))
+        muebles.append(Sofa(f"Sofá {i}", "Tela", "Azul", 600.0 + i))
+    tienda.agregar_muebles_lote(muebles)
+    mesa = Mesa("Mesa Comedor", "Roble", "Natural", 300.0)
+    tienda.agregar_mueble(Comedor("Familiar", mesa, [Silla("S", "Roble", "Café", 50)]))
+    return tienda, muebles
+
+
+class TestParalelo:
+    def test_valoracion_en_procesos_igual_a_la_serial(self):
+        tienda, _ = _tienda()
+        serial = tienda.valorar_inventario()
+        paralela = tienda.valorar_inventario(procesos=2, tamaño_bloque=7)
+        assert paralela == serial
+        assert serial["muebles"] == 161
+        assert serial["valor"] == tienda.calcular_valor_inventario()
+        assert serial["por_tipo"]["Comedor"]["muebles"] == 1
+        assert list(serial["por_tipo"]) == sorted(serial["por_tipo"])
+
+    def test_verificar_en_procesos_corrige_la_deriva(self):
+        tienda, muebles = _tienda()
+        antes = tienda.calcular_valor_inventario()
+        muebles[0].precio_base = 1050.0
+        muebles[5].precio_base = 1200.0
+        with pytest.warns(RuntimeWarning, match="desfasado"):
+            valor = tienda.calcular_valor_inventario(verificar=True, procesos=2)
+        assert valor > antes
+        assert valor == tienda.valorar_inventario()["valor"]
+        assert tienda.calcular_valor_inventario(verificar=True) == valor
+        assert tienda.obtener_mas_caros(1)[0] is muebles[5]
+
+    def test_reporte_en_procesos_igual_al_serial(self):
+        tienda, _ = _tienda()
+        assert tienda.generar_reporte_inventario(procesos=2) == (
+            tienda.generar_reporte_inventario()
+        )
+        assert TiendaMuebles("Vacía").generar_reporte_inventario(procesos=2) == (
+            "REPORTE - Vacía\nTotal: 0"
+        )
@@ -0,0 +1,207 @@
+import os
+
+import pytest
+
+from src.models.concretos.armario import Armario
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.models.concretos.sofacama import SofaCama
+from src.services.almacen import AlmacenSQLite
+from src.services.carrito import Carrito
+from src.services.catalogo import registro_simple
+from src.services.diario import leer_ventas
+from src.services.recuperacion import RegistroCambios
+from src.services.tienda import TiendaMuebles
+
+
+@pytest.fixture(autouse=True)
+def sin_print(monkeypatch):
+    monkeypatch.setattr("builtins.print", lambda *a, **k: None)
+
+
+def _sesion(directorio, cada=0):
+    """Tienda con un día de cambios; devuelve sus estadísticas y nombres."""
+    with RegistroCambios(directorio, cada=cada, ventana=0) as cambios:
+        tienda = TiendaMuebles("Mueblería Test", cambios=cambios)
+        tienda.agregar_muebles_lote(
+            [
+                Silla("Silla", "Madera", "Café", 100.0),
+                Mesa("Mesa", "Roble", "Natural", 300.0),
+                Silla("Silla", "Metal", "Negro", 80.0),
+            ]
+        )
+        tienda.aplicar_descuento("silla", 10)
+        tienda.agregar_mueble(Armario("Armario", "Pino", "Blanco", 450))
+        tienda.agregar_producto(Silla("Silla", "Plástico", "Blanco", 60.0))
+        assert tienda.vender_producto("Silla")
+        assert tienda.vender_producto("Mesa")
+        tienda.realizar_venta(Mesa("Mesa Suelta", "Roble", "Natural", 200.0))
+        return (
+            tienda.obtener_estadisticas(),
+            [(m.nombre, m.material) for m in tienda.inventario],
+        )
+
+
+def _ranuras(tienda):
+    """SKU del inventario en orden: (registro, precio, unidades)."""
+    return [
+        (registro_simple(item), precio, unidades)
+        for _, item, precio, unidades in tienda.inventario.ranuras_con_precio()
+    ]
+
+
+def _operaciones_mixtas(tienda, cambios, instantanea):
+    """Altas y sumas a SKU, ventas por nombre y por carrito y un cambio de precio."""
+    tienda.agregar_mueble(Mesa("Mesa", "Roble", "Natural", 300.0), cantidad=3)
+    tienda.agregar_muebles_lote(
+        [
+            Silla("Silla", "Madera", "Café", 100.0),
+            Silla("Silla", "Metal", "Negro", 80.0),
+            Silla("Silla", "Madera", "Café", 100.0),
+        ]
+    )
+    # la venta por nombre se lleva la primera "Silla": la de madera
+    assert tienda.vender_producto("Silla")
+    if instantanea:
+        cambios.tomar_instantanea()
+    tienda.agregar_mueble(Armario("Armario", "Pino", "Blanco", 450), cantidad=2)
+    # unidades que se suman a SKU anteriores, no al final del catálogo
+    tienda.agregar_mueble(Mesa("Mesa", "Roble", "Natural", 300.0))
+    tienda.agregar_muebles_lote(
+        [Silla("Silla", "Metal", "Negro", 80.0), Mesa("Mesa", "Pino", "Blanco", 90.0)]
+    )
+    mesa = tienda.filtrar_por_tipo(Mesa)[0]
+    mesa.precio_base = 250.0
+    tienda.actualizar_mueble(mesa)
+    assert tienda.vender_producto("Mesa")
+    carrito = Carrito()
+    carrito.agregar(Silla("Silla", "Metal", "Negro", 80.0))
+    carrito.agregar(tienda.filtrar_por_tipo(Armario)[0])
+    assert "error" not in tienda.cobrar(carrito)
+
+
+class TestRegistroCambios:
+    def test_recupera_desde_el_wal(self, tmp_path):
+        estadisticas, muebles = _sesion(str(tmp_path))
+
+        with RegistroCambios(str(tmp_path)) as cambios:
+            tienda = TiendaMuebles("Otro", cambios=cambios)
+            assert tienda.obtener_estadisticas() == estadisticas
+            assert tienda.inventario._carga_diferida is not None
+            assert [(m.nombre, m.material) for m in tienda.inventario] == muebles
+        assert muebles[0] == ("Silla", "Metal")
+
+    def test_instantanea_compacta_el_wal(self, tmp_path):
+        estadisticas, muebles = _sesion(str(tmp_path), cada=3)
+        archivos = sorted(os.listdir(tmp_path))
+        # siete cambios (cada venta por nombre es uno): dos instantáneas
+        assert archivos == ["cambios-2.wal", "instantanea.bin"]
+
+        with RegistroCambios(str(tmp_path), cada=3) as cambios:
+            tienda = TiendaMuebles("Otro", cambios=cambios)
+            assert tienda.obtener_estadisticas() == estadisticas
+            assert [(m.nombre, m.material) for m in tienda.inventario] == muebles
+            # los cambios nuevos se anotan sobre la instantánea recuperada
+            tienda.vender_producto("Armario")
+
+        with RegistroCambios(str(tmp_path)) as cambios:
+            tienda = TiendaMuebles("Otro", cambios=cambios)
+            assert len(tienda.inventario) == len(muebles) - 1
+            assert tienda.filtrar_por_tipo("Armario") == []
+
+    def test_caida_entre_instantanea_y_compactacion(self, tmp_path):
+        estadisticas, _ = _sesion(str(tmp_path), cada=3)
+        # WAL viejo que la compactación no llegó a borrar
+        with open(tmp_path / "cambios-1.wal", "wb") as archivo:
+            archivo.write(b"resto de la generacion anterior")
+
+        with RegistroCambios(str(tmp_path)) as cambios:
+            tienda = TiendaMuebles("Otro", cambios=cambios)
+            assert tienda.obtener_estadisticas() == estadisticas
+        assert not os.path.exists(tmp_path / "cambios-1.wal")
+
+    @pytest.mark.parametrize("instantanea", [False, True])
+    def test_recupera_los_mismos_sku(self, tmp_path, instantanea):
+        with RegistroCambios(str(tmp_path), cada=0, ventana=0) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            _operaciones_mixtas(tienda, cambios, instantanea)
+            esperado = _ranuras(tienda)
+            estadisticas = tienda.obtener_estadisticas()
+        sillas = [(r["material"], n) for r, _, n in esperado if r["tipo"] == "Silla"]
+        assert sillas == [("Madera", 1), ("Metal", 1)]
+
+        with RegistroCambios(str(tmp_path), cada=0) as cambios:
+            tienda = TiendaMuebles("Otro", cambios=cambios)
+            assert tienda.obtener_estadisticas() == estadisticas
+            assert _ranuras(tienda) == esperado
+
+    def test_cambio_devuelto_ya_esta_en_el_wal(self, tmp_path):
+        # con una ventana larga, un WAL asíncrono aún tendría el cambio en cola
+        with RegistroCambios(str(tmp_path), cada=0, ventana=1.0) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            tienda.agregar_mueble(Mesa("Mesa", "Roble", "Natural", 300.0))
+            assert tienda.vender_producto("Mesa")
+            ruta = str(tmp_path / "cambios-0.wal")
+            alta, venta = leer_ventas(ruta)
+            assert alta["op"] == "agregar"
+            # la venta y su baja son un solo marco: una caída no las separa
+            assert venta["op"] == "venta" and venta["quitar"][0]["unidades"] == 1
+
+    def test_sku_repetido_en_la_instantanea_se_ajusta_una_vez(self, tmp_path):
+        with RegistroCambios(str(tmp_path), cada=0, ventana=0) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            tienda.agregar_mueble(Silla("Silla", "Madera", "Café", 100.0), cantidad=2)
+            tienda.agregar_mueble(Mesa("Mesa", "Roble", "Natural", 300.0))
+            otra = Silla("Silla B", "Madera", "Café", 100.0)
+            tienda.agregar_mueble(otra)
+            # queda idéntica a la primera, en otra ranura no contigua
+            otra.nombre = "Silla"
+            tienda.actualizar_mueble(otra)
+            cambios.tomar_instantanea()
+            assert tienda.vender_producto("Silla")
+            unidades = len(tienda.inventario)
+            valor = tienda.calcular_valor_inventario()
+
+        with RegistroCambios(str(tmp_path)) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            ranuras = tienda.inventario.ranuras_con_precio()
+            assert sum(n for _, _, _, n in ranuras) == unidades == 3
+            assert tienda.calcular_valor_inventario() == valor
+
+    def test_mismo_registro_con_otro_precio_es_otro_sku(self, tmp_path):
+        with RegistroCambios(str(tmp_path), cada=0, ventana=0) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            sin_respaldo = SofaCama("Sofá Cama", "Madera", "Gris", 800.0)
+            sin_respaldo.tiene_respaldo = False
+            tienda.agregar_muebles_lote(
+                [SofaCama("Sofá Cama", "Madera", "Gris", 800.0), sin_respaldo]
+            )
+            tienda.agregar_mueble(sin_respaldo)
+            carrito = Carrito()
+            carrito.agregar(sin_respaldo)
+            assert "error" not in tienda.cobrar(carrito)
+            esperado = _ranuras(tienda)
+            valor = tienda.calcular_valor_inventario()
+        assert [n for _, _, n in esperado] == [1, 1]
+
+        with RegistroCambios(str(tmp_path)) as cambios:
+            tienda = TiendaMuebles("Otro", cambios=cambios)
+            assert _ranuras(tienda) == esperado
+            assert tienda.calcular_valor_inventario() == valor
+
+    def test_rechaza_muebles_no_persistibles(self, tmp_path):
+        with RegistroCambios(str(tmp_path)) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+
+            class Propio(Silla):
+                pass
+
+            resultado = tienda.agregar_mueble(Propio("Silla", "Madera", "Café", 10.0))
+            assert resultado.startswith("Error")
+            assert len(tienda.inventario) == 0
+
+    def test_excluyente_con_almacen(self, tmp_path):
+        with AlmacenSQLite(str(tmp_path / "t.db")) as almacen:
+            with RegistroCambios(str(tmp_path / "wal")) as cambios:
+                with pytest.raises(ValueError):
+                    TiendaMuebles("Test", almacen=almacen, cambios=cambios)
@@ -0,0 +1,116 @@
+import time
+from unittest.mock import patch
+
+from src.models.concretos.silla import Silla
+from src.models.concretos.sofa import Sofa
+from src.services.almacen import AlmacenSQLite
+from src.services.recuperacion import RegistroCambios
+from src.services.reservas import AgendaVencimientos
+from src.services.tienda import TiendaMuebles
+
+
+def _tienda(almacen=None):
+    tienda = TiendaMuebles("Test", almacen)
+    tienda.agregar_mueble(Sofa("Sofá Cama", "Tela", "Gris", 900.0))
+    tienda.agregar_mueble(Silla("Silla Roble", "Madera", "Roble", 100.0), cantidad=3)
+    return tienda
+
+
+class TestAgendaVencimientos:
+    def test_vencen_en_orden_sin_las_canceladas(self):
+        agenda = AgendaVencimientos()
+        for clave, vence in [("a", 30), ("b", 10), ("c", 20), ("d", 40)]:
+            agenda.programar(clave, vence)
+        assert agenda.cancelar("c") and not agenda.cancelar("c")
+        agenda.programar("d", 5)  # reprogramar deja una lápida
+        assert agenda.proximo() == 5
+        assert agenda.vencidos(25) == ["d", "b"]
+        assert len(agenda) == 1 and "a" in agenda
+        assert agenda.vencidos(29) == [] and agenda.vencidos(30) == ["a"]
+        assert agenda.proximo() is None
+
+    def test_compacta_las_lapidas(self):
+        agenda = AgendaVencimientos()
+        for numero in range(100):
+            agenda.programar(numero, numero)
+        for numero in range(0, 100, 2):
+            agenda.cancelar(numero)
+        agenda.cancelar(1)
+        assert len(agenda._monticulo) == len(agenda) == 49
+        assert agenda.vencidos(10) == [3, 5, 7, 9]
+
+
+class TestReservas:
+    def test_reserva_oculta_el_stock_hasta_vencer(self):
+        tienda = _tienda()
+        ahora = time.time()
+        reserva = tienda.reservar("Sofá Cama", 3600, cliente="Ana", ahora=ahora)
+        assert reserva["vence"] == ahora + 3600 and reserva["cliente"] == "Ana"
+        assert tienda.filtrar_por_tipo("Sofa") == []
+        assert tienda.buscar_muebles_por_nombre("sofa") == []
+        assert [m.nombre for m in tienda.obtener_mas_caros(5)] == ["Silla Roble"]
+        with patch("builtins.print"):
+            assert tienda.vender_producto("Sofá Cama") is False
+        assert "error" in tienda.reservar("Sofá Cama", ahora=ahora)
+        # sigue en el inventario y en su valor
+        assert len(tienda.inventario) == 4
+        assert tienda.obtener_estadisticas()["reservas_activas"] == 1
+
+        assert tienda.vencer_reservas(ahora + 3599) == 0
+        assert tienda.vencer_reservas(ahora + 3600) == 1
+        assert [m.nombre for m in tienda.filtrar_por_tipo("Sofa")] == ["Sofá Cama"]
+        assert tienda.reservas() == []
+
+    def test_reserva_parcial_de_un_sku(self):
+        tienda = _tienda()
+        silla = Silla("Silla Roble", "Madera", "Roble", 100.0)
+        assert "error" in tienda.reservar(silla, cantidad=4)
+        numero = tienda.reservar(silla, cantidad=2)["reserva"]
+        assert tienda.filtrar_por_material("madera")  # queda una libre
+        with patch("builtins.print"):
+            assert tienda.vender_producto("Silla Roble") is True
+            assert tienda.vender_producto("Silla Roble") is False
+        assert tienda.filtrar_por_material("madera") == []
+
+        assert tienda.cancelar_reserva(numero) and not tienda.cancelar_reserva(numero)
+        assert tienda.inventario.cantidad(silla) == 2
+        assert len(tienda.filtrar_por_material("madera")) == 1
+
+    def test_vender_reserva(self):
+        tienda = _tienda()
+        silla = tienda.filtrar_por_tipo("Silla")[0]
+        numero = tienda.reservar(silla, cliente="Luis", cantidad=2)["reserva"]
+        recibo = tienda.vender_reserva(numero)
+        assert recibo["reserva"] == numero and recibo["cliente"] == "Luis"
+        assert (
+            recibo["cantidad"] == 2 and recibo["total"] == 2 * silla.calcular_precio()
+        )
+        assert tienda.inventario.cantidad(silla) == 1
+        assert "error" in tienda.vender_reserva(numero)
+
+        vencida = tienda.reservar("Sofá Cama", 60)["reserva"]
+        assert "error" in tienda.vender_reserva(vencida, ahora=time.time() + 61)
+        assert tienda.filtrar_por_tipo("Sofa")
+
+    def test_filtros_del_almacen_descuentan_las_unidades_reservadas(self, tmp_path):
+        with AlmacenSQLite(str(tmp_path / "tienda.db")) as almacen:
+            tienda = _tienda(almacen)
+            tienda.reservar("Silla Roble", cantidad=2)
+            assert len(tienda.filtrar_por_material("madera")) == 1
+            assert len(tienda.filtrar_por_precio()) == 2
+
+    def test_recuperar_no_vende_la_unidad_reservada(self, tmp_path):
+        with RegistroCambios(str(tmp_path), cada=0, ventana=0) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            tienda.agregar_mueble(Silla("Silla", "Madera", "Roble", 100.0))
+            tienda.agregar_mueble(Silla("Silla", "Metal", "Negro", 80.0), cantidad=2)
+            assert "error" not in tienda.reservar("Silla")
+            # la de madera está reservada: se vende una de metal
+            with patch("builtins.print"):
+                assert tienda.vender_producto("Silla")
+            restantes = [(m.material, m.precio_base) for m in tienda.inventario]
+        assert restantes == [("Madera", 100.0), ("Metal", 80.0)]
+
+        with RegistroCambios(str(tmp_path)) as cambios:
+            tienda = TiendaMuebles("Test", cambios=cambios)
+            assert [(m.material, m.precio_base) for m in tienda.inventario] == restantes
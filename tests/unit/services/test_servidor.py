@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+from src.models.concretos.mesa import Mesa
+from src.models.concretos.silla import Silla
+from src.services.servidor import ServidorTienda
+from src.services.tienda import TiendaMuebles
+
+
+def _tienda():
+    tienda = TiendaMuebles("Test")
+    tienda.agregar_muebles_lote(
+        [
+            Silla("Silla Roble", "Roble", "Café", 100.0),
+            Silla("Silla Pino", "Pino", "Blanco", 80.0),
+            Mesa("Mesa Roble", "Roble", "Natural", 300.0),
+        ]
+    )
+    return tienda
+
+
+def _peticion(metodo, ruta, datos=None, cerrar=False):
+    cuerpo = b"" if datos is None else json.dumps(datos).encode()
+    cabeceras = f"{metodo} {ruta} HTTP/1.1\r\nHost: prueba\r\n"
+    if cuerpo:
+        cabeceras += f"Content-Length: {len(cuerpo)}\r\n"
+    if cerrar:
+        cabeceras += "Connection: close\r\n"
+    return (cabeceras + "\r\n").encode() + cuerpo
+
+
+async def _leer_respuesta(lector):
+    estado = int((await lector.readline()).split()[1])
+    cabeceras = {}
+    while (linea := await lector.readline()) != b"\r\n":
+        nombre, _, valor = linea.decode().partition(":")
+        cabeceras[nombre.lower()] = valor.strip()
+    cuerpo = await lector.readexactly(int(cabeceras["content-length"]))
+    return estado, cabeceras["connection"], json.loads(cuerpo)
+
+
+def _conversar(tienda, *peticiones):
+    """Envía todas las peticiones juntas (pipelining) y lee las respuestas."""
+
+    async def correr():
+        async with ServidorTienda(tienda, hilos=2) as servidor:
+            lector, escritor = await asyncio.open_connection(
+                "127.0.0.1", servidor.puerto
+            )
+            escritor.write(b"".join(peticiones))
+            await escritor.drain()
+            respuestas = [await _leer_respuesta(lector) for _ in peticiones]
+            sobrante = await lector.read()  # el servidor cierra al final
+            escritor.close()
+            return respuestas, sobrante
+
+    return asyncio.run(correr())
+
+
+class TestServidorTienda:
+    def test_pipelining_responde_en_orden_y_mantiene_la_conexion(self):
+        tienda = _tienda()
+        respuestas, sobrante = _conversar(
+            tienda,
+            _peticion("GET", "/muebles?material=roble"),
+            _peticion("GET", "/valoracion"),
+            _peticion("GET", "/buscar?q=pino"),
+            _peticion("GET", "/muebles/caros?cantidad=1", cerrar=True),
+        )
+        (e1, c1, roble), (e2, _, valor), (e3, _, pino), (e4, c4, caros) = respuestas
+        assert (e1, e2, e3, e4) == (200, 200, 200, 200)
+        assert c1 == "keep-alive" and c4 == "close" and sobrante == b""
+        assert [m["nombre"] for m in roble["muebles"]] == ["Silla Roble", "Mesa Roble"]
+        assert valor["valor_lista"] == tienda.calcular_valor_inventario()
+        assert valor["por_tipo"]["Silla"]["muebles"] == 2
+        assert pino["total"] == 1
+        assert caros["muebles"][0]["tipo"] == "Mesa"
+
+    def test_ventas_descuentos_y_estadisticas(self):
+        tienda = _tienda()
+        respuestas, _ = _conversar(
+            tienda,
+            _peticion("POST", "/descuentos", {"categoria": "silla", "porcentaje": 10}),
+            _peticion("POST", "/ventas", {"nombre": "Silla Roble", "cliente": "Ana"}),
+            _peticion("GET", "/estadisticas", cerrar=True),
+        )
+        (_, _, descuento), (estado, _, venta), (_, _, estadisticas) = respuestas
+        assert descuento == {"mensaje": "Descuento de 10% aplicado a silla"}
+        assert estado == 200 and venta["precio_final"] == 90.0
+        assert venta["cliente"] == "Ana"
+        assert estadisticas["total_muebles_vendidos"] == 1
+        assert estadisticas["descuentos_activos"] == {"silla": 10}
+
+    def test_venta_quita_el_mueble_y_respeta_reservas(self):
+        tienda = _tienda()
+        tienda.reservar("Silla Pino")
+        respuestas, _ = _conversar(
+            tienda,
+            _peticion("POST", "/ventas", {"nombre": "Silla Roble"}),
+            _peticion("POST", "/ventas", {"nombre": "Silla Roble"}),
+            _peticion("POST", "/ventas", {"nombre": "Silla Pino"}, cerrar=True),
+        )
+        assert [estado for estado, _, _ in respuestas] == [200, 404, 404]
+        assert len(tienda.inventario) == 2
+        assert tienda.obtener_estadisticas()["total_muebles_vendidos"] == 1
+
+    def test_errores(self):
+        respuestas, _ = _conversar(
+            _tienda(),
+            _peticion("GET", "/nada"),
+            _peticion("DELETE", "/ventas"),
+            _peticion("POST", "/ventas", {"nombre": "Sofá"}),
+            _peticion("GET", "/muebles?precio_min=barato"),
+            _peticion("POST", "/descuentos", {"categoria": "silla", "porcentaje": 200}),
+            b"basura\r\n\r\n",
+        )
+        estados = [estado for estado, _, _ in respuestas]
+        assert estados == [404, 405, 404, 400, 400, 400]
+        assert respuestas[-1][1] == "close"
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import Mock, patch
 from src.services.tienda import TiendaMuebles
 from src.models.concretos.silla import Silla
+from src.models.concretos.sofacama import SofaCama
 
 
 class TestTiendaMuebles:
@@ -34,3 +35,354 @@ class TestTiendaMuebles:
     def test_vender_producto_inexistente(self, tienda_vacia):
         resultado = tienda_vacia.vender_producto("Producto Inexistente")
         assert resultado is False
+
+
+class TestIndicesInventario:
+    @pytest.fixture
+    def tienda_surtida(self):
+        from src.models.concretos.mesa import Mesa
+        from src.models.concretos.armario import Armario
+
+        tienda = TiendaMuebles()
+        tienda.agregar_mueble(Silla("Silla Roble", "Madera", "Café", 100.0))
+        tienda.agregar_mueble(Silla("Silla Metal", "Metal", "Negro", 80.0))
+        tienda.agregar_mueble(Mesa("Mesa Comedor", "madera ", "Negro", 300.0))
+        tienda.agregar_mueble(Armario("Armario Grande", "Pino", "Blanco", 500))
+        return tienda
+
+    def test_filtrar_por_material_normalizado(self, tienda_surtida):
+        nombres = [m.nombre for m in tienda_surtida.filtrar_por_material("MADERA")]
+        assert nombres == ["Silla Roble", "Mesa Comedor"]
+
+    def test_filtrar_por_color_y_tipo(self, tienda_surtida):
+        assert len(tienda_surtida.filtrar_por_color("negro")) == 2
+        assert len(tienda_surtida.filtrar_por_tipo(Silla)) == 2
+        assert len(tienda_surtida.filtrar_por_tipo("armario")) == 1
+        assert tienda_surtida.filtrar_por_tipo("Sofa") == []
+
+    def test_buscar_muebles_por_nombre_parcial(self, tienda_surtida):
+        resultados = tienda_surtida.buscar_muebles_por_nombre("silla")
+        assert [m.nombre for m in resultados] == ["Silla Roble", "Silla Metal"]
+        assert tienda_surtida.buscar_muebles_por_nombre("   ") == []
+
+    def test_indices_se_actualizan_al_vender(self, tienda_surtida):
+        with patch("builtins.print"):
+            assert tienda_surtida.vender_producto("Silla Metal") is True
+        assert tienda_surtida.filtrar_por_material("metal") == []
+        assert len(tienda_surtida.filtrar_por_tipo("Silla")) == 1
+        assert len(tienda_surtida.inventario) == 3
+
+    def test_actualizar_mueble_reindexa(self, tienda_surtida):
+        silla = tienda_surtida.filtrar_por_material("metal")[0]
+        silla.material = "Aluminio"
+        tienda_surtida.actualizar_mueble(silla)
+        assert tienda_surtida.filtrar_por_material("metal") == []
+        assert tienda_surtida.filtrar_por_material("aluminio") == [silla]
+
+
+class TestIndicePrecios:
+    @pytest.fixture
+    def tienda_precios(self):
+        tienda = TiendaMuebles()
+        for nombre, precio in [("A", 300.0), ("B", 100.0), ("C", 200.0), ("D", 200.0)]:
+            tienda.agregar_mueble(Silla(nombre, "Madera", "Café", precio))
+        return tienda
+
+    def test_filtrar_por_precio_rango_inclusivo(self, tienda_precios):
+        resultados = tienda_precios.filtrar_por_precio(100, 200)
+        assert [m.nombre for m in resultados] == ["B", "C", "D"]
+        assert tienda_precios.filtrar_por_precio(301, float("inf")) == []
+
+    def test_mas_baratos_y_mas_caros(self, tienda_precios):
+        assert [m.nombre for m in tienda_precios.obtener_mas_baratos(2)] == ["B", "C"]
+        assert [m.nombre for m in tienda_precios.obtener_mas_caros(2)] == ["A", "D"]
+        assert tienda_precios.obtener_mas_caros(0) == []
+
+    def test_precio_sincronizado_al_vender_y_cambiar_precio(self, tienda_precios):
+        with patch("builtins.print"):
+            tienda_precios.vender_producto("B")
+        silla_a = tienda_precios.buscar_muebles_por_nombre("A")[0]
+        silla_a.precio_base = 50.0
+        tienda_precios.actualizar_mueble(silla_a)
+        assert [m.nombre for m in tienda_precios.filtrar_por_precio(0, 150)] == ["A"]
+
+    def test_productos_sin_precio_no_entran_al_indice(self, tienda_precios):
+        roto = Mock()
+        roto.calcular_precio.side_effect = ValueError("sin precio")
+        tienda_precios.agregar_producto(roto)
+        assert len(tienda_precios.inventario) == 5
+        assert roto not in tienda_precios.filtrar_por_precio(0, float("inf"))
+
+
+class TestBusquedaPorPalabras:
+    @pytest.fixture
+    def tienda_sofas(self):
+        from src.models.concretos.sofa import Sofa
+        from src.models.concretos.sofacama import SofaCama
+
+        tienda = TiendaMuebles()
+        tienda.agregar_mueble(
+            Sofa(
+                "Sofá Chesterfield", "Cuero", "Verde", 2000.0, material_tapizado="cuero"
+            )
+        )
+        tienda.agregar_mueble(Sofa("Sofá Modular", "Tela", "Gris", 1200.0))
+        tienda.agregar_mueble(SofaCama("SofaCama Convertible", "Tela", "Beige", 1500.0))
+        tienda.agregar_mueble(Silla("Silla Clásica", "Madera", "Café", 150.0))
+        return tienda
+
+    def test_busqueda_sin_acentos_ni_mayusculas(self, tienda_sofas):
+        resultados = tienda_sofas.buscar_muebles_por_nombre("SOFA cuero")
+        assert [m.nombre for m in resultados] == ["Sofá Chesterfield"]
+        clasica = tienda_sofas.buscar_muebles_por_nombre("clasica")
+        assert [m.nombre for m in clasica] == ["Silla Clásica"]
+
+    def test_terminos_como_prefijo(self, tienda_sofas):
+        resultados = tienda_sofas.buscar_muebles_por_nombre("sofa")
+        assert len(resultados) == 3
+        assert tienda_sofas.buscar_muebles_por_nombre("sofa madera") == []
+
+    def test_indice_invertido_se_limpia_al_vender(self, tienda_sofas):
+        with patch("builtins.print"):
+            tienda_sofas.vender_producto("Sofá Chesterfield")
+        assert tienda_sofas.buscar_muebles_por_nombre("chesterfield") == []
+        assert "chesterfield" not in tienda_sofas.inventario._vocabulario
+
+
+class TestVentaPorNombre:
+    def test_nombres_duplicados_se_venden_en_orden(self, tienda):
+        sillas = [
+            Silla("Silla Familiar", "Madera", color, 120.0)
+            for color in ("Roble", "Nogal", "Blanco")
+        ]
+        for silla in sillas:
+            tienda.agregar_mueble(silla)
+        with patch("builtins.print"):
+            assert tienda.vender_producto("Silla Familiar") is True
+            assert tienda.vender_producto("Silla Familiar") is True
+        assert list(tienda.inventario) == sillas[2:]
+        assert tienda._total_muebles_vendidos == 2
+
+    def test_vender_por_str_del_mueble(self, tienda, silla_basica):
+        tienda.agregar_mueble(silla_basica)
+        with patch("builtins.print") as mock_print:
+            assert tienda.vender_producto(str(silla_basica)) is True
+        mock_print.assert_called_once_with(f"Vendido: {silla_basica}")
+        assert len(tienda.inventario) == 0
+
+    def test_coincidencia_por_str_anterior_a_la_de_nombre(self, tienda):
+        primera = Silla("Otra", "Madera", "Roble", 100.0)
+        segunda = Silla(str(primera), "Metal", "Negro", 90.0)
+        tienda.agregar_mueble(primera)
+        tienda.agregar_mueble(segunda)
+        with patch("builtins.print"):
+            tienda.vender_producto(str(primera))
+        assert list(tienda.inventario) == [segunda]
+
+    def test_lapidas_de_precio_no_aparecen_en_consultas(self, tienda):
+        for i in range(10):
+            tienda.agregar_mueble(Silla(f"S{i}", "Madera", "Roble", 100.0 + i))
+        with patch("builtins.print"):
+            for i in range(0, 10, 2):
+                tienda.vender_producto(f"S{i}")
+        assert [m.nombre for m in tienda.filtrar_por_precio()] == [
+            "S1",
+            "S3",
+            "S5",
+            "S7",
+            "S9",
+        ]
+        assert [m.nombre for m in tienda.obtener_mas_caros(2)] == ["S9", "S7"]
+
+
+class TestInventarioPorSKU:
+    def test_muebles_identicos_comparten_sku(self, tienda):
+        sillas = [Silla("Silla Familiar", "Madera", "Roble", 120.0) for _ in range(6)]
+        for silla in sillas:
+            tienda.agregar_mueble(silla)
+        inventario = tienda.inventario
+        assert len(inventario) == 6 and len(inventario._items) == 1
+        assert inventario.cantidad(sillas[3]) == 6 and sillas[5] in inventario
+        assert tienda.filtrar_por_tipo("Silla") == [sillas[0]]
+        assert tienda.calcular_valor_inventario() == 6 * sillas[0].calcular_precio()
+
+        with patch("builtins.print"):
+            assert tienda.vender_producto("Silla Familiar") is True
+        assert inventario.quitar(sillas[4]) is True
+        assert list(inventario) == [sillas[0]] * 4
+        assert tienda.calcular_valor_inventario() == 4 * sillas[0].calcular_precio()
+        assert tienda.obtener_estadisticas()["tipos_muebles"] == {"Silla": 4}
+        assert tienda.generar_reporte_inventario().count("Silla Familiar") == 4
+
+    def test_agregar_con_cantidad_y_vender_hasta_agotar(self, tienda, silla_basica):
+        assert tienda.agregar_mueble(silla_basica, cantidad=0).startswith("Error")
+        tienda.agregar_mueble(silla_basica, cantidad=3)
+        resumen = tienda.agregar_muebles_lote(
+            [Silla("Silla Test", "Madera", "Negra", 45.0), silla_basica]
+        )
+        assert resumen["agregados"] == 2
+        assert tienda.inventario.cantidad(silla_basica) == 5
+        assert tienda.valorar_inventario(procesos=2)["por_tipo"]["Silla"] == {
+            "muebles": 5,
+            "valor": 225.0,
+        }
+        with patch("builtins.print"):
+            for _ in range(5):
+                assert tienda.vender_producto("Silla Test") is True
+            assert tienda.vender_producto("Silla Test") is False
+        assert len(tienda.inventario) == 0
+        assert tienda.calcular_valor_inventario() == 0
+
+    def test_actualizar_reprecia_todas_las_unidades(self, tienda, silla_basica):
+        tienda.agregar_mueble(silla_basica, cantidad=4)
+        silla_basica.precio_base = 50.0
+        tienda.actualizar_mueble(silla_basica)
+        assert tienda.calcular_valor_inventario() == 200.0
+        assert tienda.inventario.cantidad(silla_basica) == 4
+        assert (
+            tienda.inventario.cantidad(Silla("Silla Test", "Madera", "Negra", 45.0))
+            == 0
+        )
+
+    def test_distinto_precio_no_se_suma(self, tienda):
+        sofacama = SofaCama("Sofá Cama", "Madera", "Gris", 800.0)
+        sin_respaldo = SofaCama("Sofá Cama", "Madera", "Gris", 800.0)
+        # estado que el constructor no fija: mismos campos, otro precio
+        sin_respaldo.tiene_respaldo = False
+        tienda.agregar_mueble(sofacama)
+        tienda.agregar_mueble(sin_respaldo)
+        valor = sofacama.calcular_precio() + sin_respaldo.calcular_precio()
+        assert sofacama.calcular_precio() != sin_respaldo.calcular_precio()
+        assert len(tienda.inventario._items) == 2
+        assert tienda.calcular_valor_inventario() == valor
+        tienda.agregar_mueble(SofaCama("Sofá Cama", "Madera", "Gris", 800.0))
+        assert tienda.inventario.cantidad(sofacama) == 2
+
+    def test_setter_tras_agregar_no_se_suma(self, tienda):
+        sofacama = SofaCama("Sofá Cama", "Madera", "Gris", 800.0)
+        tienda.agregar_mueble(sofacama)
+        sofacama.tiene_respaldo = False
+        otro = SofaCama("Sofá Cama", "Madera", "Gris", 800.0)
+        tienda.agregar_mueble(otro)
+        assert tienda.inventario.cantidad(otro) == 1
+        valor = sofacama.calcular_precio() + otro.calcular_precio()
+        with pytest.warns(RuntimeWarning, match="desfasado"):
+            assert tienda.calcular_valor_inventario(verificar=True) == valor
+
+    def test_mocks_no_se_agrupan(self, tienda):
+        uno, otro = Mock(spec=Silla), Mock(spec=Silla)
+        for mock in (uno, otro):
+            mock.nombre = "Igual"
+            mock.calcular_precio.return_value = 10.0
+            tienda.agregar_producto(mock)
+        assert list(tienda.inventario) == [uno, otro]
+
+
+class TestValorInventario:
+    def test_valor_incremental_exacto(self, tienda):
+        for _ in range(10):
+            tienda.agregar_mueble(Silla("Silla", "Madera", "Roble", 0.1))
+        assert tienda.calcular_valor_inventario() == 1.0
+        with patch("builtins.print"):
+            tienda.vender_producto("Silla")
+        assert tienda.calcular_valor_inventario() == 0.9
+
+    def test_ignora_productos_sin_precio(self, tienda, silla_basica):
+        roto = Mock()
+        roto.calcular_precio.side_effect = RuntimeError("sin precio")
+        tienda.agregar_producto(roto)
+        tienda.agregar_mueble(silla_basica)
+        assert tienda.calcular_valor_inventario() == 45.0
+
+    def test_actualizar_mueble_ajusta_el_valor(self, tienda, silla_basica):
+        tienda.agregar_mueble(silla_basica)
+        silla_basica.precio_base = 60.0
+        tienda.actualizar_mueble(silla_basica)
+        assert tienda.calcular_valor_inventario() == 60.0
+
+    def test_verificar_detecta_y_corrige_deriva(self, tienda, silla_basica):
+        tienda.agregar_mueble(silla_basica)
+        silla_basica.precio_base = 50.0
+        assert tienda.calcular_valor_inventario() == 45.0
+        with pytest.warns(RuntimeWarning, match="desfasado"):
+            assert tienda.calcular_valor_inventario(verificar=True) == 50.0
+        assert tienda.filtrar_por_precio(50, 50) == [silla_basica]
+
+    def test_obtener_estadisticas(self, tienda, silla_basica, armario_basico):
+        tienda.agregar_mueble(silla_basica)
+        tienda.agregar_mueble(armario_basico)
+        stats = tienda.obtener_estadisticas()
+        assert stats["total_muebles"] == 2
+        assert stats["valor_inventario"] == 45.0 + 300
+        assert stats["tipos_muebles"] == {"Silla": 1, "Armario": 1}
+
+
+class TestCargaPorLote:
+    def test_resumen_compacto_con_errores_por_posicion(self, tienda):
+        roto = Mock()
+        roto.calcular_precio.side_effect = ValueError("sin precio")
+        lote = [
+            Silla("A", "Madera", "Café", 100.0),
+            None,
+            roto,
+            Silla("B", "Metal", "Negro", 80.0),
+        ]
+        resumen = tienda.agregar_muebles_lote(lote)
+        assert resumen == {
+            "agregados": 2,
+            "rechazados": 2,
+            "errores": [(1, "Error: mueble None"), (2, "Error al calcular precio")],
+        }
+        assert [m.nombre for m in tienda.inventario] == ["A", "B"]
+
+    def test_lote_equivale_a_agregar_uno_a_uno(self, tienda):
+        def catalogo():
+            return [
+                Silla(f"Silla Ñandú {i}", "Madera", "Café", 100.0 + (i * 37) % 50)
+                for i in range(30)
+            ]
+
+        uno_a_uno = TiendaMuebles()
+        for silla in catalogo():
+            uno_a_uno.agregar_mueble(silla)
+        tienda.agregar_mueble(Silla("Previa", "Roble", "Natural", 90.0))
+        uno_a_uno.agregar_mueble(Silla("Previa", "Roble", "Natural", 90.0))
+        tienda.agregar_muebles_lote(catalogo())
+
+        inventario, referencia = tienda.inventario, uno_a_uno.inventario
+        assert inventario._vocabulario == sorted(referencia._vocabulario)
+        assert [m.nombre for m in tienda.filtrar_por_precio(110, 130)] == [
+            m.nombre for m in uno_a_uno.filtrar_por_precio(110, 130)
+        ]
+        assert (
+            tienda.calcular_valor_inventario() == uno_a_uno.calcular_valor_inventario()
+        )
+        assert len(tienda.buscar_muebles_por_nombre("nandu")) == 30
+
+    def test_reactiva_el_recolector_aunque_falle_el_iterable(self, tienda):
+        import gc
+
+        def lote():
+            yield Silla("Ok", "Madera", "Café", 100.0)
+            raise RuntimeError("fila corrupta")
+
+        with pytest.raises(RuntimeError):
+            tienda.agregar_muebles_lote(lote())
+        assert gc.isenabled()
+        assert tienda.filtrar_por_precio() == list(tienda.inventario)
+        assert tienda.buscar_muebles_por_nombre("ok")
+
+
+class TestDescuentos:
+    def test_aplicar_descuento_afecta_la_venta(self, tienda, silla_basica):
+        assert tienda.aplicar_descuento(" Silla ", 10) == (
+            "Descuento de 10% aplicado a silla"
+        )
+        assert tienda.realizar_venta(silla_basica)["descuento"] == 10
+        assert tienda.obtener_estadisticas()["descuentos_activos"] == {"silla": 10}
+
+    def test_aplicar_descuento_invalido(self, tienda):
+        assert tienda.aplicar_descuento("silla", 150).startswith("Error")
+        assert tienda.aplicar_descuento("silla", "diez").startswith("Error")
+        assert tienda.aplicar_descuento("", 10).startswith("Error")
+        assert tienda.obtener_estadisticas()["descuentos_activos"] == {}